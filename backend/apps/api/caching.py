@@ -0,0 +1,128 @@
+"""Version-keyed helpers for the shared cache.
+
+Cache entries derived from mutable data embed a version counter in their
+key. Bumping the counter makes every entry built from the previous version
+unreachable at once, on every worker, without the cache backend having to
+enumerate keys (``delete_pattern`` is not available on the file, database
+or local-memory backends).
+
+The counters live in the ``cache_version`` table (:model:`api.CacheVersion`)
+and are bumped with a single upsert, so concurrent bumps are never lost,
+whichever cache backend stores the entries. Bumps caused by a data change
+run once its transaction commits (:func:`bump_version_on_commit`); a reader
+seeing the new version therefore also sees the new data.
+"""
+
+import time
+from functools import partial
+
+from django.db import connection, transaction
+
+
+def _initial_version() -> int:
+    """Return a starting version seeded from the clock.
+
+    A new counter never starts below a version that entries from an earlier
+    counter (e.g. before the table was emptied) may still be stored under.
+    """
+    return time.time_ns() // 1_000_000
+
+
+def get_versions(*namespaces: str) -> dict[str, int]:
+    """Return the current version of each namespace, creating missing ones.
+
+    Args:
+        *namespaces: Namespace names, e.g. ``"project:3"``.
+
+    Returns:
+        dict[str, int]: Mapping of namespace to its version counter.
+    """
+    from .models import CacheVersion
+
+    versions = dict(
+        CacheVersion.objects.filter(namespace__in=namespaces).values_list(
+            "namespace", "version"
+        )
+    )
+    missing = [namespace for namespace in namespaces if namespace not in versions]
+    if missing:
+        initial = _initial_version()
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(namespace=namespace, version=initial) for namespace in missing],
+            ignore_conflicts=True,
+        )
+        versions.update(
+            CacheVersion.objects.filter(namespace__in=missing).values_list(
+                "namespace", "version"
+            )
+        )
+    return versions
+
+
+def get_version(namespace: str) -> int:
+    """Return the current version of a single namespace.
+
+    Args:
+        namespace: Namespace name.
+
+    Returns:
+        int: Version counter.
+    """
+    return get_versions(namespace)[namespace]
+
+
+def bump_version(namespace: str) -> None:
+    """Invalidate every cache entry keyed on ``namespace``.
+
+    Args:
+        namespace: Namespace name.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO cache_version AS v (namespace, version)
+            VALUES (%s, %s)
+            ON CONFLICT (namespace) DO UPDATE SET version = v.version + 1
+            """,
+            [namespace, _initial_version()],
+        )
+
+
+def bump_version_on_commit(namespace: str) -> None:
+    """Bump ``namespace`` once the current transaction commits.
+
+    Bumping earlier would let a concurrent request read the old data and
+    store it under the new version. Outside a transaction the bump runs
+    immediately.
+
+    Args:
+        namespace: Namespace name.
+    """
+    transaction.on_commit(partial(bump_version, namespace))
+
+
+def versioned_key(prefix: str, *namespaces: str) -> str:
+    """Build a cache key that changes whenever one of ``namespaces`` is bumped.
+
+    Args:
+        prefix: Key prefix identifying the cached value.
+        *namespaces: Namespaces the cached value depends on.
+
+    Returns:
+        str: Cache key, e.g. ``"dashboard_stats_3_all:project:3@1718000000000"``.
+    """
+    versions = get_versions(*namespaces)
+    suffix = ":".join(f"{namespace}@{versions[namespace]}" for namespace in namespaces)
+    return f"{prefix}:{suffix}"
+
+
+def project_namespace(project_id) -> str:
+    """Return the data-version namespace of a project.
+
+    Args:
+        project_id: Primary key of :model:`api.Projects`.
+
+    Returns:
+        str: Namespace name.
+    """
+    return f"project:{project_id}"
@@ -0,0 +1,155 @@
+"""Sparse fieldsets: ``?fields=`` and ``?omit=`` for read requests.
+
+``fields`` lists the output fields to keep and ``omit`` the ones to drop,
+both comma separated. GeoJSON serializers always keep their id and geometry
+fields, so trimmed responses stay valid features. Unknown names are ignored.
+
+The viewset mixin also narrows the queryset to the columns and joins the
+remaining fields read, so a trimmed request loads less from the database.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_gis.serializers import GeoFeatureModelSerializer
+
+FIELDS_QUERY_PARAM = "fields"
+OMIT_QUERY_PARAM = "omit"
+
+
+def _names(value: str | None) -> frozenset[str]:
+    """Split a comma-separated field list."""
+    return frozenset(name.strip() for name in (value or "").split(",") if name.strip())
+
+
+def parse_fieldset(request):
+    """Return the sparse fieldset asked for by a read request.
+
+    Args:
+        request: DRF request, or ``None``.
+
+    Returns:
+        tuple | None: ``(fields, omit)``, where ``fields`` is ``None`` when
+            every field is wanted, or ``None`` if neither parameter is given
+            or the request is not a read.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if FIELDS_QUERY_PARAM not in params and OMIT_QUERY_PARAM not in params:
+        return None
+    fields = params.get(FIELDS_QUERY_PARAM)
+    return (
+        _names(fields) if fields is not None else None,
+        _names(params.get(OMIT_QUERY_PARAM)),
+    )
+
+
+def apply_fieldset(serializer, fieldset) -> None:
+    """Drop the readable fields of ``serializer`` excluded by ``fieldset``.
+
+    Args:
+        serializer: Serializer instance (not a list serializer).
+        fieldset: Value returned by :func:`parse_fieldset`.
+    """
+    if fieldset is None:
+        return
+    keep, omit = fieldset
+    required = set()
+    if isinstance(serializer, GeoFeatureModelSerializer):
+        required = {serializer.Meta.id_field, serializer.Meta.geo_field}
+
+    fields = serializer.fields
+    for name in list(fields):
+        if name in required or fields[name].write_only:
+            continue
+        if (keep is not None and name not in keep) or name in omit:
+            fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin honouring ``?fields=`` and ``?omit=`` on reads.
+
+    Only the serializer built by the view is trimmed; nested serializers
+    declared as fields are built without the request and stay complete.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fieldset = parse_fieldset(self.context.get("request"))
+        apply_fieldset(self, self.fieldset)
+
+
+def _source_paths(serializer, model, prefix=""):
+    """Return the model columns and relations a serializer reads.
+
+    Returns:
+        tuple | None: ``(paths, relations)`` of ``only()`` and
+            ``select_related()`` lookups, or ``None`` if a field reads
+            something other than model fields (methods, properties, ``*``).
+    """
+    paths, relations = set(), set()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or (
+            field.source == "*"
+        ):
+            return None
+
+        current, lookup = model, prefix
+        for index, attr in enumerate(field.source_attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+            lookup = f"{lookup}{attr}"
+            last = index == len(field.source_attrs) - 1
+
+            if model_field.many_to_many or model_field.one_to_many:
+                # Loaded by a separate (prefetch) query either way.
+                break
+            if not model_field.is_relation:
+                if not last:
+                    return None
+                paths.add(lookup)
+                break
+            if not model_field.concrete:
+                return None
+
+            if last and not isinstance(field, serializers.BaseSerializer):
+                paths.add(lookup)
+                break
+            relations.add(lookup)
+            current, lookup = model_field.related_model, f"{lookup}__"
+            if last:
+                nested = _source_paths(field, current, lookup)
+                if nested is None:
+                    return None
+                paths |= nested[0]
+                relations |= nested[1]
+                if not nested[0]:
+                    paths.add(f"{lookup}{current._meta.pk.name}")
+    return paths, relations
+
+
+class SparseQuerysetMixin:
+    """Viewset mixin loading only what a sparse fieldset serializes.
+
+    When the request carries ``fields`` or ``omit``, the filtered queryset is
+    limited with ``only()`` and ``select_related()`` to the columns and joins
+    of the remaining fields. If a remaining field reads anything but model
+    fields, the queryset is left unchanged.
+    """
+
+    def filter_queryset(self, queryset):
+        """Filter ``queryset`` and trim it to the requested fieldset."""
+        queryset = super().filter_queryset(queryset)
+        if parse_fieldset(self.request) is None:
+            return queryset
+
+        resolved = _source_paths(self.get_serializer(), queryset.model)
+        if resolved is None:
+            return queryset
+        paths, relations = resolved
+        return queryset.select_related(None).select_related(*relations).only(*paths)
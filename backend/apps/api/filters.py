@@ -0,0 +1,96 @@
+"""Spatial query-parameter filters shared by the layer list endpoints."""
+
+import math
+
+from django.contrib.gis.db.models import GeometryField
+from django.db.models import BooleanField, Exists, F, Func, OuterRef, QuerySet, Value
+from rest_framework.exceptions import ParseError
+
+from .models import TrenchConduitConnection
+
+BBOX_SRID = 3857
+
+
+class _BBoxOverlaps(Func):
+    """``a && b``: bounding boxes overlap, answered by a GiST index on ``a``."""
+
+    arg_joiner = " && "
+    template = "(%(expressions)s)"
+    output_field = BooleanField()
+
+
+def parse_bbox(value: str | None) -> tuple[float, float, float, float] | None:
+    """Parse a ``minx,miny,maxx,maxy`` bounding box in EPSG:3857.
+
+    Args:
+        value: Raw ``bbox`` query parameter.
+
+    Returns:
+        tuple | None: The four coordinates, or ``None`` if ``value`` is empty.
+
+    Raises:
+        ParseError: If the value is not four finite, ordered coordinates.
+    """
+    if not value:
+        return None
+    try:
+        coords = tuple(float(part) for part in value.split(","))
+    except ValueError:
+        coords = ()
+    if (
+        len(coords) != 4
+        or not all(math.isfinite(coord) for coord in coords)
+        or coords[0] > coords[2]
+        or coords[1] > coords[3]
+    ):
+        raise ParseError("bbox must be 'minx,miny,maxx,maxy' in EPSG:3857.")
+    return coords
+
+
+def _envelope(bbox):
+    """Return an ``ST_MakeEnvelope`` expression for ``bbox``."""
+    return Func(
+        *(Value(coord) for coord in bbox),
+        Value(BBOX_SRID),
+        function="ST_MakeEnvelope",
+        output_field=GeometryField(srid=BBOX_SRID),
+    )
+
+
+def filter_bbox(queryset: QuerySet, bbox, field: str = "geom_3857") -> QuerySet:
+    """Keep rows whose geometry's bounding box overlaps ``bbox``.
+
+    The generated ``geom_3857`` columns carry the GiST indexes, so the
+    comparison is made in EPSG:3857.
+
+    Args:
+        queryset: Queryset to filter.
+        bbox: Coordinates returned by :func:`parse_bbox`, or ``None``.
+        field: Lookup path of an EPSG:3857 geometry column.
+
+    Returns:
+        QuerySet: Filtered queryset, unchanged if ``bbox`` is ``None``.
+    """
+    if bbox is None:
+        return queryset
+    return queryset.filter(_BBoxOverlaps(F(field), _envelope(bbox)))
+
+
+def filter_conduits_bbox(queryset: QuerySet, bbox) -> QuerySet:
+    """Keep conduits running through at least one trench inside ``bbox``.
+
+    Args:
+        queryset: :model:`api.Conduit` queryset.
+        bbox: Coordinates returned by :func:`parse_bbox`, or ``None``.
+
+    Returns:
+        QuerySet: Filtered queryset, unchanged if ``bbox`` is ``None``.
+    """
+    if bbox is None:
+        return queryset
+    trenches = filter_bbox(
+        TrenchConduitConnection.objects.filter(uuid_conduit=OuterRef("pk")),
+        bbox,
+        field="uuid_trench__geom_3857",
+    )
+    return queryset.filter(Exists(trenches))
@@ -1,7 +1,14 @@
 """Custom logging handlers for the Qonnectra application."""
 
+import collections
 import logging
+import os
 import re
+import threading
+import weakref
+
+# Buffered handlers of this process, reset in the child after a fork.
+_buffered_handlers = weakref.WeakSet()
 
 
 class DatabaseLogHandler(logging.Handler):
@@ -73,66 +80,77 @@ class DatabaseLogHandler(logging.Handler):
             return
 
         try:
-            message = self._filter_sensitive_data(record.getMessage())
-
-            user = getattr(record, "user", None)
-
-            path = getattr(record, "path", None)
-
-            extra_data = {}
-
-            if hasattr(record, "request"):
-                request = record.request
-                extra_data["method"] = getattr(request, "method", None)
-                extra_data["ip_address"] = self._get_client_ip(request)
-                extra_data["user_agent"] = request.META.get("HTTP_USER_AGENT", "")[:500]
-
-            if record.exc_info:
-                extra_data["exception"] = self.format(record)
-
-            for key, value in record.__dict__.items():
-                if key not in [
-                    "name",
-                    "msg",
-                    "args",
-                    "created",
-                    "filename",
-                    "funcName",
-                    "levelname",
-                    "levelno",
-                    "lineno",
-                    "module",
-                    "msecs",
-                    "message",
-                    "pathname",
-                    "process",
-                    "processName",
-                    "relativeCreated",
-                    "thread",
-                    "threadName",
-                    "exc_info",
-                    "exc_text",
-                    "stack_info",
-                    "user",
-                    "request",
-                    "path",
-                ]:
-                    extra_data[key] = str(value)[:1000]
-
-            LogEntry.objects.create(
-                level=record.levelname,
-                logger_name=record.name,
-                message=message[:10000],
-                user=user,
-                source="backend",
-                path=path,
-                extra_data=extra_data if extra_data else None,
-            )
+            LogEntry.objects.create(**self._entry_fields(record))
 
         except Exception as e:
             self.handleError(record)
             print(f"Error logging to database: {e}")
 
+    def _entry_fields(self, record: logging.LogRecord) -> dict:
+        """Build the :model:`api.LogEntry` field values for a log record.
+
+        Args:
+            record: Standard library ``LogRecord``.
+
+        Returns:
+            dict: Keyword arguments for ``LogEntry``.
+        """
+        message = self._filter_sensitive_data(record.getMessage())
+
+        user = getattr(record, "user", None)
+
+        path = getattr(record, "path", None)
+
+        extra_data = {}
+
+        if hasattr(record, "request"):
+            request = record.request
+            extra_data["method"] = getattr(request, "method", None)
+            extra_data["ip_address"] = self._get_client_ip(request)
+            extra_data["user_agent"] = request.META.get("HTTP_USER_AGENT", "")[:500]
+
+        if record.exc_info:
+            extra_data["exception"] = self.format(record)
+
+        for key, value in record.__dict__.items():
+            if key not in [
+                "name",
+                "msg",
+                "args",
+                "created",
+                "filename",
+                "funcName",
+                "levelname",
+                "levelno",
+                "lineno",
+                "module",
+                "msecs",
+                "message",
+                "pathname",
+                "process",
+                "processName",
+                "relativeCreated",
+                "thread",
+                "threadName",
+                "exc_info",
+                "exc_text",
+                "stack_info",
+                "user",
+                "request",
+                "path",
+            ]:
+                extra_data[key] = str(value)[:1000]
+
+        return {
+            "level": record.levelname,
+            "logger_name": record.name,
+            "message": message[:10000],
+            "user": user,
+            "source": "backend",
+            "path": path,
+            "extra_data": extra_data if extra_data else None,
+        }
+
     def _filter_sensitive_data(self, message: str) -> str:
         """Redact sensitive values (passwords, tokens, keys) from a message.
 
@@ -164,3 +182,236 @@ class DatabaseLogHandler(logging.Handler):
         else:
             ip = request.META.get("REMOTE_ADDR", "")
         return ip[:45]
+
+
+class BufferedDatabaseLogHandler(DatabaseLogHandler):
+    """Write log records to :model:`api.LogEntry` in batches.
+
+    ``emit`` only builds the entry and appends it to a bounded in-memory
+    buffer, so logging never waits for the database. A background thread
+    writes the buffer with ``bulk_create`` once ``flush_size`` entries are
+    pending or every ``flush_interval`` seconds, whichever comes first.
+
+    When the buffer is full, ``overflow`` decides what is lost: the oldest
+    pending entry (``"drop_oldest"``) or the new one (``"drop_newest"``).
+    Lost entries are counted in ``dropped``, see :meth:`stats`.
+
+    Pending entries are written on :meth:`flush` and :meth:`close`, which
+    ``logging.shutdown`` calls when a worker process exits. With
+    ``background=False`` no thread is started and entries are written from
+    the logging thread whenever a batch is full.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+    def __init__(
+        self,
+        *args,
+        capacity: int = 10000,
+        flush_size: int = 200,
+        flush_interval: float = 2.0,
+        overflow: str = DROP_OLDEST,
+        background: bool = True,
+        **kwargs,
+    ):
+        """Initialize the handler.
+
+        Args:
+            capacity: Maximum number of entries held in memory.
+            flush_size: Number of pending entries that triggers a write, and
+                the ``bulk_create`` batch size.
+            flush_interval: Seconds after which pending entries are written
+                even if fewer than ``flush_size``.
+            overflow: ``"drop_oldest"`` or ``"drop_newest"``.
+            background: Whether to write from a background thread.
+        """
+        if overflow not in (self.DROP_OLDEST, self.DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        super().__init__(*args, **kwargs)
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.background = background
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+        self._buffer = collections.deque()
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._worker = None
+        _buffered_handlers.add(self)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a log record for the next batch write.
+
+        Args:
+            record: Standard library ``LogRecord`` with optional ``user``,
+                ``path``, and ``request`` attributes for context.
+        """
+        LogEntry = self._get_log_entry_model()
+
+        if LogEntry is None:
+            return
+
+        try:
+            entry = LogEntry(**self._entry_fields(record))
+        except Exception:
+            self.handleError(record)
+            return
+
+        self.enqueue(entry)
+
+    def enqueue(self, entry) -> None:
+        """Add an unsaved :model:`api.LogEntry` to the next batch write.
+
+        Args:
+            entry: Unsaved ``LogEntry`` instance.
+        """
+        with self._condition:
+            if len(self._buffer) >= self.capacity:
+                self.dropped += 1
+                if self.overflow == self.DROP_NEWEST:
+                    return
+                self._buffer.popleft()
+            self._buffer.append(entry)
+            batch_full = len(self._buffer) >= self.flush_size
+            if batch_full:
+                self._condition.notify()
+
+        if self.background and not self._stopping.is_set():
+            self._ensure_worker()
+        elif batch_full:
+            self._write_pending()
+
+    def flush(self) -> None:
+        """Write every pending entry from the calling thread."""
+        self._write_pending()
+
+    def clear(self) -> None:
+        """Discard every pending entry without writing it."""
+        with self._condition:
+            self._buffer.clear()
+
+    def stop(self) -> None:
+        """Stop the background thread; later batches are written inline."""
+        self._stopping.set()
+        with self._condition:
+            self._condition.notify()
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout=self.flush_interval + 5)
+
+    def close(self) -> None:
+        """Stop the background thread and write what is still pending."""
+        self.stop()
+        self._write_pending()
+        super().close()
+
+    def stats(self) -> dict[str, int]:
+        """Return the handler counters.
+
+        Returns:
+            dict[str, int]: ``pending``, ``written``, ``dropped`` and
+                ``failed`` entry counts of this process.
+        """
+        return {
+            "pending": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _ensure_worker(self) -> None:
+        """Start the background thread if it is not running."""
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="log-writer", daemon=True
+                )
+                self._worker.start()
+
+    def _reset_after_fork(self) -> None:
+        """Start over in a forked worker process.
+
+        The parent's thread and locks do not survive the fork, and its
+        pending entries and counters belong to the parent, which still
+        writes them; copies would be written twice.
+        """
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._worker = None
+        self._buffer = collections.deque()
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def _run(self) -> None:
+        """Write batches until the handler is closed."""
+        from django.db import close_old_connections
+
+        while not self._stopping.is_set():
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._buffer) >= self.flush_size
+                    or self._stopping.is_set(),
+                    timeout=self.flush_interval,
+                )
+            close_old_connections()
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Write all pending entries in ``flush_size`` batches."""
+        LogEntry = self._get_log_entry_model()
+        if LogEntry is None:
+            return
+
+        with self._write_lock:
+            while True:
+                with self._condition:
+                    batch = [
+                        self._buffer.popleft()
+                        for _ in range(min(self.flush_size, len(self._buffer)))
+                    ]
+                if not batch:
+                    return
+                try:
+                    LogEntry.objects.bulk_create(batch)
+                    self.written += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    print(f"Error logging to database: {e}")
+
+
+def buffered_log_handler(logger_name: str = "apps.api"):
+    """Return the buffered database handler configured for a logger.
+
+    Args:
+        logger_name: Logger whose handlers are searched.
+
+    Returns:
+        BufferedDatabaseLogHandler | None: The handler, or ``None`` if the
+            logger has none.
+    """
+    for handler in logging.getLogger(logger_name).handlers:
+        if isinstance(handler, BufferedDatabaseLogHandler):
+            return handler
+    return None
+
+
+def _reset_handlers_after_fork() -> None:
+    """Reset every buffered handler in a forked child (e.g. gunicorn --preload)."""
+    for handler in list(_buffered_handlers):
+        handler._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_handlers_after_fork)
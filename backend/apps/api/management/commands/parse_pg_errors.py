@@ -1,5 +1,6 @@
 """
-Django management command to parse PostgreSQL errors from Docker container logs.
+Django management command to parse PostgreSQL errors from Docker container logs
+or from PostgreSQL's own csvlog/jsonlog files.
 
 This command monitors the PostgreSQL Docker container's stderr for ERROR messages
 and creates LogEntry records for WFS-related errors. It replaces the previous
@@ -16,9 +17,24 @@ error blocks (ERROR + DETAIL + STATEMENT).
 State Recovery:
     On startup, the command reads the last processed timestamp from a state file
     and uses `docker logs --since` to avoid reprocessing old logs.
+
+Log files:
+    With ``--log-dir`` the command needs no Docker CLI. It reads the files
+    PostgreSQL's logging collector writes (``log_destination = 'csvlog'`` or
+    ``'jsonlog'``) from a mounted directory:
+
+        python manage.py parse_pg_errors --log-dir /var/log/postgresql --format csvlog
+
+    Files are read in chunks of ``READ_CHUNK_SIZE`` bytes. The errors of each
+    chunk are inserted and the file's byte offset is checkpointed after it,
+    so a restart resumes where it stopped; rotated or truncated files are
+    read from the start. A crash between insert and checkpoint can repeat
+    that chunk.
 """
 
+import csv
 import fcntl
+import io
 import json
 import logging
 import os
@@ -34,9 +50,123 @@ from django.core.management.base import BaseCommand
 
 logger = logging.getLogger(__name__)
 
+# Column positions in PostgreSQL's csvlog format (stable since 9.0; newer
+# versions only append columns).
+CSVLOG_COLUMNS = {
+    "timestamp": 0,
+    "severity": 11,
+    "message": 13,
+    "detail": 14,
+    "hint": 15,
+    "statement": 19,
+}
+
+# Bytes read from a log file at a time. A record that does not fit is read
+# on until it is complete.
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def split_csvlog_records(data: bytes) -> tuple[list[bytes], int]:
+    """Split csvlog data into complete records.
+
+    Quoted fields may span lines, so a record ends at a newline outside
+    quotes. Quotes and newlines are single bytes in UTF-8, so this works on
+    raw bytes. A trailing record still being written is left for later.
+
+    Args:
+        data: Bytes read from a csvlog file.
+
+    Returns:
+        tuple[list[bytes], int]: Complete records and the number of bytes
+            they span.
+    """
+    records, consumed, start, quotes = [], 0, 0, 0
+    position = data.find(b"\n")
+    while position != -1:
+        quotes += data.count(b'"', start, position)
+        start = position + 1
+        if quotes % 2 == 0:
+            records.append(data[consumed:start])
+            consumed, quotes = start, 0
+        position = data.find(b"\n", start)
+    return records, consumed
+
+
+def parse_csvlog_record(record: bytes) -> dict | None:
+    """Parse one csvlog record.
+
+    Args:
+        record: One complete csvlog record.
+
+    Returns:
+        dict | None: ``timestamp``, ``severity``, ``message``, ``detail``,
+            ``hint`` and ``statement``, or None if the record is malformed.
+    """
+    try:
+        row = next(csv.reader(io.StringIO(record.decode("utf-8", errors="replace"))))
+    except (csv.Error, StopIteration):
+        return None
+    if len(row) <= CSVLOG_COLUMNS["statement"]:
+        return None
+    return {field: row[index] for field, index in CSVLOG_COLUMNS.items()}
+
+
+def split_jsonlog_records(data: bytes) -> tuple[list[bytes], int]:
+    """Split jsonlog data into complete records, one JSON object per line.
+
+    Args:
+        data: Bytes read from a jsonlog file.
+
+    Returns:
+        tuple[list[bytes], int]: Complete records and the number of bytes
+            they span.
+    """
+    consumed = data.rfind(b"\n") + 1
+    return data[:consumed].splitlines(), consumed
+
+
+def parse_jsonlog_record(record: bytes) -> dict | None:
+    """Parse one jsonlog record.
+
+    Args:
+        record: One complete jsonlog line.
+
+    Returns:
+        dict | None: Same keys as :func:`parse_csvlog_record`, or None if
+            the line is not a JSON object.
+    """
+    try:
+        data = json.loads(record)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {
+        "timestamp": data.get("timestamp", ""),
+        "severity": data.get("error_severity", ""),
+        "message": data.get("message", ""),
+        "detail": data.get("detail", ""),
+        "hint": data.get("hint", ""),
+        "statement": data.get("statement", ""),
+    }
+
+
+LOG_FORMATS = {
+    "csvlog": {
+        "suffix": ".csv",
+        "split": split_csvlog_records,
+        "parse": parse_csvlog_record,
+    },
+    "jsonlog": {
+        "suffix": ".json",
+        "split": split_jsonlog_records,
+        "parse": parse_jsonlog_record,
+    },
+}
+
 
 class Command(BaseCommand):
-    help = "Parse PostgreSQL errors from Docker logs and create LogEntry records"
+    help = "Parse PostgreSQL errors from Docker logs or log files into LogEntry records"
 
     def __init__(self, *args, **kwargs):
         """Initialize command state for log parsing.
@@ -50,6 +180,8 @@ class Command(BaseCommand):
         self.process = None
         self.state_file = Path("/tmp/pg_error_parser_state.json")
         self.last_timestamp = None
+        self.offsets_file = Path("/tmp/pg_error_parser_offsets.json")
+        self.offsets = {}
 
     def add_arguments(self, parser):
         """Define CLI arguments for the command.
@@ -69,14 +201,57 @@ class Command(BaseCommand):
             default=5,
             help="Seconds to wait before reconnecting after error (default: 5)",
         )
+        parser.add_argument(
+            "--log-dir",
+            type=Path,
+            default=None,
+            help="Read csvlog/jsonlog files from this directory instead of "
+            "tailing the Docker container",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(LOG_FORMATS),
+            default="csvlog",
+            help="PostgreSQL log_destination of the files in --log-dir "
+            "(default: csvlog)",
+        )
+        parser.add_argument(
+            "--offsets-file",
+            type=Path,
+            default=None,
+            help="Where to checkpoint per-file byte offsets "
+            "(default: /tmp/pg_error_parser_offsets.json)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Maximum log entries per INSERT in --log-dir mode (default: 500)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds between directory scans in --log-dir mode (default: 2)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="In --log-dir mode, ingest what is there and exit",
+        )
 
     def handle(self, *args, **options):
         """Run the error parser loop, reconnecting on failure until interrupted.
 
         Args:
             *args: Positional arguments (unused).
-            **options: Command options including 'container' and 'reconnect_delay'.
+            **options: Command options including 'container', 'reconnect_delay'
+                and the ``--log-dir`` options.
         """
+        if options["log_dir"] is not None:
+            self._handle_log_dir(options)
+            return
+
         container = options["container"]
         reconnect_delay = options["reconnect_delay"]
 
@@ -120,6 +295,46 @@ class Command(BaseCommand):
         self._save_state()
         self.stdout.write(self.style.SUCCESS("PostgreSQL error parser stopped."))
 
+    def _handle_log_dir(self, options):
+        """Poll a directory of PostgreSQL log files until interrupted.
+
+        Args:
+            options: Command options.
+        """
+        log_dir = options["log_dir"]
+        if not log_dir.is_dir():
+            self.stderr.write(self.style.ERROR(f"Log directory not found: {log_dir}"))
+            return
+        if options["offsets_file"] is not None:
+            self.offsets_file = options["offsets_file"]
+        self._load_offsets()
+
+        if not options["once"]:
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Starting PostgreSQL error parser for {options['format']} "
+                    f"files in '{log_dir}' (press Ctrl+C to stop)..."
+                )
+            )
+
+        while not self.should_stop:
+            try:
+                created = self._ingest_log_dir(
+                    log_dir, options["format"], options["batch_size"]
+                )
+                if created:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Created {created} log entries")
+                    )
+            except Exception as e:
+                logger.exception(f"Failed to ingest log files: {e}")
+                self.stdout.write(self.style.ERROR(f"Failed to ingest log files: {e}"))
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
+
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals by stopping the parser loop.
 
@@ -305,6 +520,40 @@ class Command(BaseCommand):
         if not error_msg:
             return
 
+        try:
+            log_entry = self._build_entry(error_msg, detail, hint, statement, timestamp)
+            log_entry.save()
+
+            self.stdout.write(
+                self.style.SUCCESS(f"[{log_entry.timestamp}] ERROR: {error_msg[:80]}")
+            )
+            logger.info(f"Created log entry {log_entry.uuid}: {error_msg}")
+            self._save_state()
+
+        except Exception as e:
+            logger.exception(f"Failed to create log entry: {e}")
+            self.stdout.write(self.style.ERROR(f"Failed to create log entry: {e}"))
+
+    def _build_entry(
+        self,
+        error_msg: str,
+        detail: str | None,
+        hint: str | None,
+        statement: str | None,
+        timestamp: str | None,
+    ) -> LogEntry:
+        """Build an unsaved :model:`api.LogEntry` for a PostgreSQL error.
+
+        Args:
+            error_msg: Primary error message.
+            detail: Optional DETAIL text.
+            hint: Optional HINT text.
+            statement: Optional failing SQL statement.
+            timestamp: PostgreSQL log timestamp string, or None.
+
+        Returns:
+            LogEntry: Entry with source ``wfs``.
+        """
         message = error_msg
         if detail:
             message += f"\nDetail: {detail}"
@@ -317,24 +566,117 @@ class Command(BaseCommand):
         if timestamp:
             extra_data["pg_timestamp"] = timestamp
 
-        try:
-            log_entry = LogEntry.objects.create(
-                level="ERROR",
-                logger_name="postgresql",
-                message=message[:10000],  # Limit message length
-                source="wfs",
-                extra_data=extra_data if extra_data else None,
-                user=None,
-                path=None,
-                project=None,
-            )
+        return LogEntry(
+            level="ERROR",
+            logger_name="postgresql",
+            message=message[:10000],  # Limit message length
+            source="wfs",
+            extra_data=extra_data if extra_data else None,
+            user=None,
+            path=None,
+            project=None,
+        )
 
-            self.stdout.write(
-                self.style.SUCCESS(f"[{log_entry.timestamp}] ERROR: {error_msg[:80]}")
+    def _ingest_log_dir(self, log_dir: Path, log_format: str, batch_size: int) -> int:
+        """Ingest new errors from every log file in ``log_dir``.
+
+        Each file is read from its checkpointed byte offset in chunks of
+        ``READ_CHUNK_SIZE`` bytes, up to its last complete record; an incomplete
+        record at the end of a chunk is carried into the next one. The
+        errors of a chunk are inserted with ``bulk_create`` in batches of
+        ``batch_size``, then the offset is checkpointed. A file whose inode
+        changed or that shrank below its offset was rotated or truncated and
+        is read from the start.
+
+        Args:
+            log_dir: Directory holding PostgreSQL csvlog or jsonlog files.
+            log_format: ``"csvlog"`` or ``"jsonlog"``.
+            batch_size: Maximum number of entries per INSERT.
+
+        Returns:
+            int: Number of log entries created.
+        """
+        suffix = LOG_FORMATS[log_format]["suffix"]
+
+        paths = sorted(log_dir.glob(f"*{suffix}"), key=lambda path: path.stat().st_mtime)
+        # Forget files that were removed by log rotation.
+        live = {path.name for path in paths}
+        self.offsets = {
+            name: state for name, state in self.offsets.items() if name in live
+        }
+
+        created = 0
+        for path in paths:
+            stat = path.stat()
+            state = self.offsets.get(path.name, {})
+            offset = state.get("offset", 0)
+            if state.get("inode") != stat.st_ino or stat.st_size < offset:
+                offset = 0
+            if stat.st_size == offset:
+                continue
+
+            with path.open("rb") as handle:
+                handle.seek(offset)
+                pending = b""
+                while chunk := handle.read(READ_CHUNK_SIZE):
+                    data = pending + chunk
+                    records, consumed = LOG_FORMATS[log_format]["split"](data)
+                    pending = data[consumed:]
+                    if not consumed:
+                        continue
+                    created += self._ingest_records(records, log_format, batch_size)
+                    offset += consumed
+                    self.offsets[path.name] = {"inode": stat.st_ino, "offset": offset}
+                    self._save_offsets()
+
+        return created
+
+    def _ingest_records(
+        self, records: list[bytes], log_format: str, batch_size: int
+    ) -> int:
+        """Insert the errors among ``records``.
+
+        Args:
+            records: Complete csvlog or jsonlog records.
+            log_format: ``"csvlog"`` or ``"jsonlog"``.
+            batch_size: Maximum number of entries per INSERT.
+
+        Returns:
+            int: Number of log entries created.
+        """
+        parse_record = LOG_FORMATS[log_format]["parse"]
+        entries = []
+        for record in records:
+            error = parse_record(record)
+            if error is None or error["severity"] != "ERROR":
+                continue
+            entries.append(
+                self._build_entry(
+                    error["message"],
+                    error["detail"],
+                    error["hint"],
+                    error["statement"],
+                    error["timestamp"],
+                )
             )
-            logger.info(f"Created log entry {log_entry.uuid}: {error_msg}")
-            self._save_state()
+        if entries:
+            LogEntry.objects.bulk_create(entries, batch_size=batch_size)
+        return len(entries)
 
+    def _load_offsets(self):
+        """Load the per-file byte offsets from ``self.offsets_file``."""
+        try:
+            if self.offsets_file.exists():
+                self.offsets = json.loads(self.offsets_file.read_text())
         except Exception as e:
-            logger.exception(f"Failed to create log entry: {e}")
-            self.stdout.write(self.style.ERROR(f"Failed to create log entry: {e}"))
+            logger.warning(f"Failed to load offsets file: {e}")
+            self.offsets = {}
+
+    def _save_offsets(self):
+        """Persist the per-file byte offsets to ``self.offsets_file``."""
+        try:
+            tmp_file = self.offsets_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(self.offsets))
+            tmp_file.replace(self.offsets_file)
+        except Exception as e:
+            logger.warning(f"Failed to save offsets file: {e}")
@@ -0,0 +1,167 @@
+"""
+Management command to enforce the :model:`api.LogEntry` retention period.
+
+Log entries are stored in monthly partitions (``log_entry_pYYYY_MM``). Expired
+months are removed by dropping their partition, which is instant and leaves
+no dead rows behind, instead of a large DELETE. A partition is detached
+concurrently first, so log writes are not blocked while it goes away. The
+command also creates the partitions of the coming months ahead of time.
+
+Usage:
+    python manage.py prune_log_entries --months 12
+
+The ``log-maintenance`` compose service runs it daily.
+"""
+
+import re
+from datetime import UTC, date, datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+PARTITION_NAME = re.compile(r"^log_entry_p(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """Return the first day of the month ``months`` after ``month``.
+
+    Args:
+        month: Any day of the starting month.
+        months: Number of months to add; may be negative.
+
+    Returns:
+        date: First day of the resulting month.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def log_entry_partitions() -> dict[str, date]:
+    """Return the monthly partitions of ``log_entry``.
+
+    Returns:
+        dict[str, date]: Partition table name mapped to the first day of its
+            month.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'log_entry'::regclass
+            """
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+def detach_pending_partitions() -> set[str]:
+    """Return the partitions of ``log_entry`` left half detached.
+
+    A ``DETACH PARTITION ... CONCURRENTLY`` that was interrupted leaves the
+    partition attached but pending, and it has to be finalized instead.
+
+    Returns:
+        set[str]: Names of the pending partitions.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'log_entry'::regclass
+              AND pg_inherits.inhdetachpending
+            """
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+class Command(BaseCommand):
+    """Drop expired :model:`api.LogEntry` partitions and create upcoming ones."""
+
+    help = "Drop log entry partitions older than the retention period"
+
+    def add_arguments(self, parser):
+        """Define CLI arguments for the command.
+
+        Args:
+            parser: ArgumentParser instance to register arguments on.
+        """
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=getattr(settings, "LOG_RETENTION_MONTHS", 12),
+            help="Number of months to keep, including the current one "
+            "(default: LOG_RETENTION_MONTHS or 12)",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=3,
+            help="Number of future months to create partitions for (default: 3)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be done without changing anything",
+        )
+
+    def handle(self, *args, **options):
+        """Create upcoming partitions, then drop the expired ones.
+
+        Args:
+            *args: Positional arguments (unused).
+            **options: Command options including months, ahead and dry_run.
+        """
+        months = options["months"]
+        ahead = options["ahead"]
+        dry_run = options["dry_run"]
+        if months < 1:
+            self.stderr.write(self.style.ERROR("--months must be at least 1"))
+            return
+
+        # Partitions cover calendar months in UTC.
+        current = datetime.now(UTC).date().replace(day=1)
+        cutoff = add_months(current, -(months - 1))
+        partitions = log_entry_partitions()
+
+        for offset in range(ahead + 1):
+            month = add_months(current, offset)
+            if month in partitions.values():
+                continue
+            self.stdout.write(f"Creating partition for {month:%Y-%m}")
+            if not dry_run:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT fn_log_entry_ensure_partition(%s)", [month]
+                    )
+
+        expired = sorted(name for name, month in partitions.items() if month < cutoff)
+        pending = detach_pending_partitions()
+        for name in expired:
+            self.stdout.write(f"Dropping partition {name}")
+            if dry_run:
+                continue
+            # DETACH ... CONCURRENTLY cannot run inside a transaction block;
+            # each statement below commits on its own.
+            mode = "FINALIZE" if name in pending else "CONCURRENTLY"
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE log_entry DETACH PARTITION "{name}" {mode}')
+                cursor.execute(f'DROP TABLE "{name}"')
+
+        if dry_run:
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dropped {len(expired)} partition(s) older than {cutoff:%Y-%m}"
+            )
+        )
@@ -0,0 +1,372 @@
+"""Application metrics in the Prometheus text exposition format.
+
+Counters and histograms are kept in memory per process. Every worker
+process writes its samples to its own JSON file in ``METRICS_DIR`` at most
+every ``METRICS_FLUSH_INTERVAL`` seconds, from a background thread, and
+when it exits. :func:`render_metrics` adds up the files of all processes,
+so whichever gunicorn worker answers the scrape reports totals for the
+whole container. The gunicorn hooks in ``gunicorn.conf.py`` empty the
+directory when the server starts and fold the file of an exited worker into
+one archive file, so counters never go backwards while the server runs.
+Both hold a lock on ``LOCK_FILENAME`` in the directory, so a scrape never
+sees a worker's samples in the archive and in its own file at once.
+
+Without ``METRICS_DIR`` every process only reports its own samples.
+
+Hit ratios are not exported as such: divide the ``result="hit"`` rate of
+``qonnectra_cache_lookups_total`` by the rate of all lookups.
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import ContextDecorator
+from pathlib import Path
+
+from django.conf import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Lock file in METRICS_DIR, shared with the ``child_exit`` hook in
+# gunicorn.conf.py, which holds it exclusively while archiving a worker.
+LOCK_FILENAME = "metrics.lock"
+
+_REGISTRY = {}
+
+
+class _MetricStore:
+    """Samples of this process and the file they are shared through."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.samples = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.filename = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        self.worker = None
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def directory(self) -> Path | None:
+        """Return the shared metrics directory, or None if not configured."""
+        directory = getattr(settings, "METRICS_DIR", None)
+        return Path(directory) if directory else None
+
+    def changed(self) -> None:
+        """Mark the samples as changed and make sure they get written."""
+        self.dirty = True
+        worker = self.worker
+        if worker is None or not worker.is_alive():
+            if self.directory() is None:
+                return
+            with self.lock:
+                if self.worker is None or not self.worker.is_alive():
+                    self.worker = threading.Thread(
+                        target=self._run, name="metrics-writer", daemon=True
+                    )
+                    self.worker.start()
+
+    def flush(self) -> None:
+        """Write the samples of this process to its file."""
+        directory = self.directory()
+        if directory is None or not self.dirty:
+            return
+        with self.lock:
+            self.dirty = False
+            data = {
+                name: {key: list(value) for key, value in series.items()}
+                for name, series in self.samples.items()
+            }
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.filename
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(path)
+
+    def collect(self) -> dict:
+        """Return the samples of every process, added up.
+
+        Returns:
+            dict: Metric name mapped to ``{label key: values}``.
+        """
+        directory = self.directory()
+        if directory is None:
+            with self.lock:
+                return {
+                    name: {key: list(value) for key, value in series.items()}
+                    for name, series in self.samples.items()
+                }
+
+        self.flush()
+        directory.mkdir(parents=True, exist_ok=True)
+        totals = {}
+        with open(directory / LOCK_FILENAME, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            for path in directory.glob("*.json"):
+                try:
+                    data = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                for name, series in data.items():
+                    merged = totals.setdefault(name, {})
+                    for key, values in series.items():
+                        current = merged.get(key)
+                        if current is None or len(current) != len(values):
+                            merged[key] = list(values)
+                        else:
+                            merged[key] = [a + b for a, b in zip(current, values)]
+        return totals
+
+    def _run(self) -> None:
+        """Write changed samples every ``METRICS_FLUSH_INTERVAL`` seconds."""
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0)
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except OSError:
+                self.dirty = True
+
+    def _reset_after_fork(self) -> None:
+        """Start a forked worker with its own file, lock and writer thread."""
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.dirty = False
+        self.filename = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        self.worker = None
+
+
+_store = _MetricStore()
+atexit.register(_store.flush)
+
+
+def _label_key(labelnames, labels) -> str:
+    """Return the series key for ``labels``, checking the label names."""
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {sorted(labels)}")
+    return json.dumps([str(labels[name]) for name in labelnames])
+
+
+class _Metric:
+    """Base class of named metrics with a fixed set of label names."""
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()) -> None:
+        """Register the metric.
+
+        Args:
+            name: Metric name.
+            documentation: Help text.
+            labelnames: Names of the labels every sample must have.
+        """
+        if name in _REGISTRY:
+            raise ValueError(f"Metric {name} is already registered")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _REGISTRY[name] = self
+
+    def _update(self, labels: dict, update) -> None:
+        """Apply ``update`` to the values of the series ``labels``."""
+        key = _label_key(self.labelnames, labels)
+        with _store.lock:
+            series = _store.samples.setdefault(self.name, {})
+            values = series.get(key)
+            if values is None:
+                values = series[key] = self._empty()
+            update(values)
+        _store.changed()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _empty(self) -> list:
+        """Return the values of a new series."""
+        return [0.0]
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the counter.
+
+        Args:
+            amount: Non-negative increment.
+            **labels: Label values.
+        """
+
+        def update(values):
+            values[0] += amount
+
+        self._update(labels, update)
+
+    def _render(self, series: dict) -> list[str]:
+        """Return the exposition lines of ``series``."""
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {values[0]}"
+            for key, values in sorted(series.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> None:
+        """Register the histogram.
+
+        Args:
+            name: Metric name.
+            documentation: Help text.
+            labelnames: Names of the labels every sample must have.
+            buckets: Sorted upper bounds; ``+Inf`` is added.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _empty(self) -> list:
+        """Return per-bucket counts, then the ``+Inf`` count, sum and count."""
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one value.
+
+        Args:
+            value: Observed value, e.g. a duration in seconds.
+            **labels: Label values.
+        """
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+
+        def update(values):
+            values[index] += 1
+            values[-2] += value
+            values[-1] += 1
+
+        self._update(labels, update)
+
+    def time(self, **labels) -> "_Timer":
+        """Return a context manager/decorator observing its duration.
+
+        Args:
+            **labels: Label values.
+        """
+        return _Timer(self, labels)
+
+    def _render(self, series: dict) -> list[str]:
+        """Return the exposition lines of ``series``."""
+        lines = []
+        for key, values in sorted(series.items()):
+            cumulative = 0
+            bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, le=bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {values[-2]}")
+            lines.append(f"{self.name}_count{labels} {values[-1]}")
+        return lines
+
+
+class _Timer(ContextDecorator):
+    """Observe the wall-clock duration of a block into a histogram."""
+
+    def __init__(self, histogram: Histogram, labels: dict) -> None:
+        """Initialize the timer for ``histogram`` and ``labels``."""
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        """Start timing."""
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Observe the elapsed time, also when the block raised."""
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def _format_value(value: float) -> str:
+    """Format a bucket bound the way Prometheus clients do."""
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, key: str, **extra) -> str:
+    """Format a series key (and extra labels) as ``{name="value",...}``."""
+    pairs = list(zip(labelnames, json.loads(key))) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def render_metrics() -> str:
+    """Render every registered metric, added up over all worker processes.
+
+    Returns:
+        str: Metrics in the Prometheus text exposition format.
+    """
+    totals = _store.collect()
+    lines = []
+    for name, metric in sorted(_REGISTRY.items()):
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines.extend(metric._render(totals.get(name, {})))
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_DURATION = Histogram(
+    "qonnectra_request_duration_seconds",
+    "Time spent handling API requests, per view and action.",
+    ["view", "action", "method", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "qonnectra_request_db_queries",
+    "Number of SQL statements run per API request, per view and action.",
+    ["view", "action"],
+    buckets=COUNT_BUCKETS,
+)
+TRACE_DURATION = Histogram(
+    "qonnectra_trace_duration_seconds",
+    "Time spent computing fiber traces, per start object.",
+    ["kind"],
+)
+FAULT_SIMULATION_DURATION = Histogram(
+    "qonnectra_fault_simulation_duration_seconds",
+    "Time spent simulating faults.",
+)
+TILE_RENDER_DURATION = Histogram(
+    "qonnectra_tile_render_duration_seconds",
+    "Time spent rendering vector tiles, per layer. Tiles served from the "
+    "proxy cache never reach the backend.",
+    ["layer"],
+)
+CACHE_LOOKUPS = Counter(
+    "qonnectra_cache_lookups_total",
+    "Lookups in the application caches, per cache and result (hit or miss).",
+    ["cache", "result"],
+)
+WMS_SEMAPHORE_WAIT = Histogram(
+    "qonnectra_wms_semaphore_wait_seconds",
+    "Time WMS proxy requests waited for an upstream slot, per outcome.",
+    ["acquired"],
+)
@@ -1,6 +1,16 @@
-"""Middleware for cross-subdomain cookie handling."""
+"""Middleware for cross-subdomain cookie handling, request metrics and profiling."""
+
+import random
+import time
+from contextlib import ExitStack
 
 from django.conf import settings
+from django.db import connections
+
+from .handlers import buffered_log_handler
+from .metrics import REQUEST_DB_QUERIES, REQUEST_DURATION
+from .models import LogEntry
+from .profiling import RequestProfile, activate, deactivate
 
 
 class CookieDomainMiddleware:
@@ -39,3 +49,182 @@ class CookieDomainMiddleware:
                 response.cookies["api-refresh-token"]["domain"] = settings.COOKIE_DOMAIN
 
         return response
+
+
+class _QueryCounter:
+    """Count the statements run on a connection (an ``execute_wrapper``)."""
+
+    def __init__(self) -> None:
+        """Start counting at zero."""
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count one statement and run it."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _view_labels(request) -> tuple[str, str]:
+    """Return the view class name and action handling ``request``.
+
+    The action is the viewset action (``list``, ``retrieve``, custom
+    ``@action`` names) or, for plain views, the lowercase HTTP method.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched", ""
+    callback = match.func
+    view_class = getattr(callback, "cls", None)
+    name = view_class.__name__ if view_class else callback.__name__
+    method = request.method.lower()
+    actions = getattr(callback, "actions", None) or {}
+    return name, actions.get(method, method)
+
+
+class RequestMetricsMiddleware:
+    """Record the latency and query count of every request per view and action.
+
+    Counting statements costs one function call per query, so unlike
+    :class:`RequestProfilingMiddleware` this runs on every request. Queries
+    run while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response: callable) -> None:
+        """Initialize the middleware.
+
+        Args:
+            get_response: The next middleware or view in the chain.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Process the request and record its duration and query count.
+
+        Args:
+            request: The incoming Django HTTP request.
+
+        Returns:
+            HttpResponse: The unchanged response.
+        """
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view, action = _view_labels(request)
+        REQUEST_DURATION.observe(
+            duration,
+            view=view,
+            action=action,
+            method=request.method,
+            status=response.status_code,
+        )
+        REQUEST_DB_QUERIES.observe(counter.count, view=view, action=action)
+        return response
+
+
+class RequestProfilingMiddleware:
+    """Profile a sample of requests and report their database and cache use.
+
+    A share of ``REQUEST_PROFILING_SAMPLE_RATE`` requests is profiled, plus
+    every request sending the ``X-Request-Profile`` header. For a profiled
+    request, staff users get a ``Server-Timing`` header with the query
+    count, database time, cache hits and misses and serialization time, and
+    requests slower than ``REQUEST_PROFILING_SLOW_MS`` are written to
+    :model:`api.LogEntry` together with their slowest statements.
+
+    Queries run while a streaming response is consumed happen after this
+    middleware returns and are not counted.
+    """
+
+    def __init__(self, get_response: callable) -> None:
+        """Initialize the middleware.
+
+        Args:
+            get_response: The next middleware or view in the chain.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Process the request, profiling it if it is sampled.
+
+        Args:
+            request: The incoming Django HTTP request.
+
+        Returns:
+            HttpResponse: The response, with ``Server-Timing`` for staff users
+                when profiled.
+        """
+        sample_rate = getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 0.0)
+        if (
+            "HTTP_X_REQUEST_PROFILE" not in request.META
+            and random.random() >= sample_rate
+        ):
+            return self.get_response(request)
+
+        profile = RequestProfile(
+            top_queries=getattr(settings, "REQUEST_PROFILING_TOP_QUERIES", 5)
+        )
+        token = activate(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            deactivate(token)
+        total = time.perf_counter() - start
+
+        # DRF authenticates inside the view and sets the user on the request.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = profile.server_timing(total)
+
+        slow_ms = getattr(settings, "REQUEST_PROFILING_SLOW_MS", 1000)
+        if total * 1000 >= slow_ms:
+            self._log_slow_request(request, response, profile, total)
+
+        return response
+
+    def _log_slow_request(self, request, response, profile, total) -> None:
+        """Write a slow request and its slowest statements to the log.
+
+        Args:
+            request: The Django HTTP request.
+            response: The response returned for it.
+            profile: Profile of the request.
+            total: Wall-clock duration of the request in seconds.
+        """
+        user = getattr(request, "user", None)
+        entry = LogEntry(
+            level="WARNING",
+            logger_name="apps.api.profiling",
+            message=(
+                f"Slow request: {request.method} {request.path} took "
+                f"{total * 1000:.0f} ms ({profile.query_count} queries, "
+                f"{profile.db_time * 1000:.0f} ms in the database)"
+            )[:10000],
+            user=user if user is not None and user.is_authenticated else None,
+            source="backend",
+            path=request.path[:500],
+            extra_data={
+                "method": request.method,
+                "status_code": response.status_code,
+                "duration_ms": round(total * 1000, 1),
+                "query_count": profile.query_count,
+                "db_time_ms": round(profile.db_time * 1000, 1),
+                "cache_hits": profile.cache_hits,
+                "cache_misses": profile.cache_misses,
+                "serialization_ms": round(profile.serialization_time * 1000, 1),
+                "top_queries": profile.slowest_queries(),
+            },
+        )
+        handler = buffered_log_handler()
+        if handler is None:
+            entry.save()
+        else:
+            handler.enqueue(entry)
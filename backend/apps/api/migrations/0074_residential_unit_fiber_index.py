@@ -0,0 +1,195 @@
+"""Add a trigger-maintained reverse index from residential units to fiber splices."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0073_valuation_free_text_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResidentialUnitFiberIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "side",
+                    models.CharField(
+                        help_text="Splice side ('a' or 'b') the residential unit is attached to",
+                        max_length=1,
+                        verbose_name="Side",
+                    ),
+                ),
+                (
+                    "residential_unit",
+                    models.ForeignKey(
+                        db_column="residential_unit",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="fiber_index",
+                        to="api.residentialunit",
+                        verbose_name="Residential Unit",
+                    ),
+                ),
+                (
+                    "fiber_splice",
+                    models.ForeignKey(
+                        db_column="fiber_splice",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.fibersplice",
+                        verbose_name="Fiber Splice",
+                    ),
+                ),
+                (
+                    "fiber",
+                    models.ForeignKey(
+                        db_column="fiber",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.fiber",
+                        verbose_name="Fiber",
+                    ),
+                ),
+                (
+                    "cable",
+                    models.ForeignKey(
+                        db_column="cable",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.cable",
+                        verbose_name="Cable",
+                    ),
+                ),
+                (
+                    "entry_fiber",
+                    models.ForeignKey(
+                        db_column="entry_fiber",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.fiber",
+                        verbose_name="Entry Fiber",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Residential Unit Fiber Index",
+                "verbose_name_plural": "Residential Unit Fiber Index",
+                "db_table": "residential_unit_fiber_index",
+                "indexes": [
+                    models.Index(
+                        fields=["residential_unit"], name="idx_ru_fiber_index_ru"
+                    ),
+                    models.Index(
+                        fields=["fiber_splice"], name="idx_ru_fiber_index_splice"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("fiber_splice", "side"),
+                        name="unique_ru_fiber_index_splice_side",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_sync_residential_unit_fiber_index()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        DELETE FROM residential_unit_fiber_index
+                        WHERE fiber_splice = OLD.uuid;
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        -- A unit on side A is served by the fiber on side B and
+                        -- vice versa; merge groups resolve to their shared fiber.
+                        INSERT INTO residential_unit_fiber_index
+                            (residential_unit, fiber_splice, side, fiber, cable, entry_fiber)
+                        SELECT v.ru, NEW.uuid, v.side, v.fiber, v.cable,
+                               COALESCE(NEW.fiber_a, NEW.shared_fiber_a,
+                                        NEW.fiber_b, NEW.shared_fiber_b)
+                        FROM (VALUES
+                            ('a', NEW.residential_unit_a_id,
+                             CASE WHEN NEW.merge_group_b IS NOT NULL AND NEW.shared_fiber_b IS NOT NULL
+                                  THEN NEW.shared_fiber_b ELSE NEW.fiber_b END,
+                             CASE WHEN NEW.merge_group_b IS NOT NULL AND NEW.shared_fiber_b IS NOT NULL
+                                  THEN NEW.shared_cable_b ELSE NEW.cable_b END),
+                            ('b', NEW.residential_unit_b_id,
+                             CASE WHEN NEW.merge_group_a IS NOT NULL AND NEW.shared_fiber_a IS NOT NULL
+                                  THEN NEW.shared_fiber_a ELSE NEW.fiber_a END,
+                             CASE WHEN NEW.merge_group_a IS NOT NULL AND NEW.shared_fiber_a IS NOT NULL
+                                  THEN NEW.shared_cable_a ELSE NEW.cable_a END)
+                        ) AS v(side, ru, fiber, cable)
+                        WHERE v.ru IS NOT NULL;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS fn_sync_residential_unit_fiber_index();",
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TRIGGER tg_sync_residential_unit_fiber_index
+                    AFTER INSERT OR DELETE OR UPDATE OF
+                        fiber_a, cable_a, fiber_b, cable_b,
+                        merge_group_a, merge_group_b,
+                        shared_fiber_a, shared_cable_a, shared_fiber_b, shared_cable_b,
+                        residential_unit_a_id, residential_unit_b_id
+                    ON fiber_splice
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_sync_residential_unit_fiber_index();
+            """,
+            reverse_sql="DROP TRIGGER IF EXISTS tg_sync_residential_unit_fiber_index ON fiber_splice;",
+        ),
+        # Backfill from existing splices
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO residential_unit_fiber_index
+                    (residential_unit, fiber_splice, side, fiber, cable, entry_fiber)
+                SELECT fs.residential_unit_a_id, fs.uuid, 'a',
+                       CASE WHEN fs.merge_group_b IS NOT NULL AND fs.shared_fiber_b IS NOT NULL
+                            THEN fs.shared_fiber_b ELSE fs.fiber_b END,
+                       CASE WHEN fs.merge_group_b IS NOT NULL AND fs.shared_fiber_b IS NOT NULL
+                            THEN fs.shared_cable_b ELSE fs.cable_b END,
+                       COALESCE(fs.fiber_a, fs.shared_fiber_a, fs.fiber_b, fs.shared_fiber_b)
+                FROM fiber_splice fs
+                WHERE fs.residential_unit_a_id IS NOT NULL
+                UNION ALL
+                SELECT fs.residential_unit_b_id, fs.uuid, 'b',
+                       CASE WHEN fs.merge_group_a IS NOT NULL AND fs.shared_fiber_a IS NOT NULL
+                            THEN fs.shared_fiber_a ELSE fs.fiber_a END,
+                       CASE WHEN fs.merge_group_a IS NOT NULL AND fs.shared_fiber_a IS NOT NULL
+                            THEN fs.shared_cable_a ELSE fs.cable_a END,
+                       COALESCE(fs.fiber_a, fs.shared_fiber_a, fs.fiber_b, fs.shared_fiber_b)
+                FROM fiber_splice fs
+                WHERE fs.residential_unit_b_id IS NOT NULL;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
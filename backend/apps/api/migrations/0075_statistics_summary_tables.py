@@ -0,0 +1,1096 @@
+"""Add trigger-maintained per-project statistics summary tables."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0074_residential_unit_fiber_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrenchStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("house_connection", models.BooleanField(null=True, verbose_name="House Connection")),
+                ("funding_status", models.BooleanField(null=True, verbose_name="Funding Status")),
+                ("internal_execution", models.BooleanField(null=True, verbose_name="Internal Execution")),
+                ("trench_count", models.IntegerField(default=0, verbose_name="Trench Count")),
+                (
+                    "total_length",
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=0,
+                        max_digits=16,
+                        verbose_name="Total Length",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_column="project",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.projects",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "flag",
+                    models.ForeignKey(
+                        db_column="flag",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.flags",
+                        verbose_name="Flag",
+                    ),
+                ),
+                (
+                    "construction_type",
+                    models.ForeignKey(
+                        db_column="construction_type",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesconstructiontype",
+                        verbose_name="Construction Type",
+                    ),
+                ),
+                (
+                    "surface",
+                    models.ForeignKey(
+                        db_column="surface",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributessurface",
+                        verbose_name="Surface",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        db_column="status",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesstatus",
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "phase",
+                    models.ForeignKey(
+                        db_column="phase",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesphase",
+                        verbose_name="Phase",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Trench Statistics",
+                "verbose_name_plural": "Trench Statistics",
+                "db_table": "trench_statistics",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "project",
+                            "flag",
+                            "construction_type",
+                            "surface",
+                            "status",
+                            "phase",
+                            "house_connection",
+                            "funding_status",
+                            "internal_execution",
+                        ),
+                        name="unique_trench_statistics_bucket",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="NodeStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("city", models.TextField(null=True, verbose_name="City")),
+                ("node_count", models.IntegerField(default=0, verbose_name="Node Count")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_column="project",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.projects",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "flag",
+                    models.ForeignKey(
+                        db_column="flag",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.flags",
+                        verbose_name="Flag",
+                    ),
+                ),
+                (
+                    "node_type",
+                    models.ForeignKey(
+                        db_column="node_type",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesnodetype",
+                        verbose_name="Node Type",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        db_column="status",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesstatus",
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "network_level",
+                    models.ForeignKey(
+                        db_column="network_level",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesnetworklevel",
+                        verbose_name="Network Level",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_column="owner",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributescompany",
+                        verbose_name="Owner",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Node Statistics",
+                "verbose_name_plural": "Node Statistics",
+                "db_table": "node_statistics",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "project",
+                            "flag",
+                            "node_type",
+                            "status",
+                            "network_level",
+                            "owner",
+                            "city",
+                        ),
+                        name="unique_node_statistics_bucket",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AddressStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("city", models.TextField(verbose_name="City")),
+                ("address_count", models.IntegerField(default=0, verbose_name="Address Count")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_column="project",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.projects",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "flag",
+                    models.ForeignKey(
+                        db_column="flag",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.flags",
+                        verbose_name="Flag",
+                    ),
+                ),
+                (
+                    "status_development",
+                    models.ForeignKey(
+                        db_column="status_development",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesstatusdevelopment",
+                        verbose_name="Status Development",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Address Statistics",
+                "verbose_name_plural": "Address Statistics",
+                "db_table": "address_statistics",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "project",
+                            "flag",
+                            "city",
+                            "status_development",
+                        ),
+                        name="unique_address_statistics_bucket",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ResidentialUnitStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("city", models.TextField(verbose_name="City")),
+                ("unit_count", models.IntegerField(default=0, verbose_name="Unit Count")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_column="project",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.projects",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "flag",
+                    models.ForeignKey(
+                        db_column="flag",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.flags",
+                        verbose_name="Flag",
+                    ),
+                ),
+                (
+                    "residential_unit_type",
+                    models.ForeignKey(
+                        db_column="residential_unit_type",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesresidentialunittype",
+                        verbose_name="Residential Unit Type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Residential Unit Statistics",
+                "verbose_name_plural": "Residential Unit Statistics",
+                "db_table": "residential_unit_statistics",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "project",
+                            "flag",
+                            "city",
+                            "residential_unit_type",
+                        ),
+                        name="unique_residential_unit_statistics_bucket",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ConduitStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(null=True, verbose_name="Month")),
+                ("conduit_count", models.IntegerField(default=0, verbose_name="Conduit Count")),
+                (
+                    "total_length",
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=0,
+                        max_digits=16,
+                        verbose_name="Total Length",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_column="project",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.projects",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "flag",
+                    models.ForeignKey(
+                        db_column="flag",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.flags",
+                        verbose_name="Flag",
+                    ),
+                ),
+                (
+                    "conduit_type",
+                    models.ForeignKey(
+                        db_column="conduit_type",
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesconduittype",
+                        verbose_name="Conduit Type",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        db_column="status",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesstatus",
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "network_level",
+                    models.ForeignKey(
+                        db_column="network_level",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributesnetworklevel",
+                        verbose_name="Network Level",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        db_column="owner",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributescompany",
+                        verbose_name="Owner",
+                    ),
+                ),
+                (
+                    "manufacturer",
+                    models.ForeignKey(
+                        db_column="manufacturer",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.attributescompany",
+                        verbose_name="Manufacturer",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Conduit Statistics",
+                "verbose_name_plural": "Conduit Statistics",
+                "db_table": "conduit_statistics",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "project",
+                            "flag",
+                            "conduit_type",
+                            "status",
+                            "network_level",
+                            "owner",
+                            "manufacturer",
+                            "month",
+                        ),
+                        name="unique_conduit_statistics_bucket",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        # Upsert helpers: add a count/length delta to one bucket and drop the
+        # bucket once it no longer holds any rows.
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_bump_trench_statistics(
+                    p_project integer, p_flag integer,
+                    p_construction_type integer, p_surface integer,
+                    p_status integer, p_phase integer,
+                    p_house_connection boolean, p_funding_status boolean,
+                    p_internal_execution boolean,
+                    p_count bigint, p_length numeric
+                ) RETURNS void AS $$
+                DECLARE
+                    v_id bigint;
+                    v_count integer;
+                BEGIN
+                    INSERT INTO trench_statistics AS s
+                        (project, flag, construction_type, surface, status, phase,
+                         house_connection, funding_status, internal_execution,
+                         trench_count, total_length)
+                    VALUES
+                        (p_project, p_flag, p_construction_type, p_surface, p_status,
+                         p_phase, p_house_connection, p_funding_status,
+                         p_internal_execution, p_count, p_length)
+                    ON CONFLICT (project, flag, construction_type, surface, status, phase,
+                                 house_connection, funding_status, internal_execution)
+                    DO UPDATE SET
+                        trench_count = s.trench_count + EXCLUDED.trench_count,
+                        total_length = s.total_length + EXCLUDED.total_length
+                    RETURNING s.id, s.trench_count INTO v_id, v_count;
+
+                    IF v_count <= 0 THEN
+                        DELETE FROM trench_statistics WHERE id = v_id;
+                    END IF;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE OR REPLACE FUNCTION fn_bump_node_statistics(
+                    p_project integer, p_flag integer, p_node_type integer,
+                    p_status integer, p_network_level integer, p_owner integer,
+                    p_city text, p_count bigint
+                ) RETURNS void AS $$
+                DECLARE
+                    v_id bigint;
+                    v_count integer;
+                BEGIN
+                    INSERT INTO node_statistics AS s
+                        (project, flag, node_type, status, network_level, owner, city,
+                         node_count)
+                    VALUES
+                        (p_project, p_flag, p_node_type, p_status, p_network_level,
+                         p_owner, p_city, p_count)
+                    ON CONFLICT (project, flag, node_type, status, network_level, owner, city)
+                    DO UPDATE SET node_count = s.node_count + EXCLUDED.node_count
+                    RETURNING s.id, s.node_count INTO v_id, v_count;
+
+                    IF v_count <= 0 THEN
+                        DELETE FROM node_statistics WHERE id = v_id;
+                    END IF;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE OR REPLACE FUNCTION fn_bump_address_statistics(
+                    p_project integer, p_flag integer, p_city text,
+                    p_status_development integer, p_count bigint
+                ) RETURNS void AS $$
+                DECLARE
+                    v_id bigint;
+                    v_count integer;
+                BEGIN
+                    INSERT INTO address_statistics AS s
+                        (project, flag, city, status_development, address_count)
+                    VALUES (p_project, p_flag, p_city, p_status_development, p_count)
+                    ON CONFLICT (project, flag, city, status_development)
+                    DO UPDATE SET address_count = s.address_count + EXCLUDED.address_count
+                    RETURNING s.id, s.address_count INTO v_id, v_count;
+
+                    IF v_count <= 0 THEN
+                        DELETE FROM address_statistics WHERE id = v_id;
+                    END IF;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE OR REPLACE FUNCTION fn_bump_residential_unit_statistics(
+                    p_project integer, p_flag integer, p_city text,
+                    p_residential_unit_type integer, p_count bigint
+                ) RETURNS void AS $$
+                DECLARE
+                    v_id bigint;
+                    v_count integer;
+                BEGIN
+                    INSERT INTO residential_unit_statistics AS s
+                        (project, flag, city, residential_unit_type, unit_count)
+                    VALUES (p_project, p_flag, p_city, p_residential_unit_type, p_count)
+                    ON CONFLICT (project, flag, city, residential_unit_type)
+                    DO UPDATE SET unit_count = s.unit_count + EXCLUDED.unit_count
+                    RETURNING s.id, s.unit_count INTO v_id, v_count;
+
+                    IF v_count <= 0 THEN
+                        DELETE FROM residential_unit_statistics WHERE id = v_id;
+                    END IF;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE OR REPLACE FUNCTION fn_bump_conduit_statistics(
+                    p_project integer, p_flag integer, p_conduit_type integer,
+                    p_status integer, p_network_level integer, p_owner integer,
+                    p_manufacturer integer, p_month date,
+                    p_count bigint, p_length numeric
+                ) RETURNS void AS $$
+                DECLARE
+                    v_id bigint;
+                    v_count integer;
+                BEGIN
+                    INSERT INTO conduit_statistics AS s
+                        (project, flag, conduit_type, status, network_level, owner,
+                         manufacturer, month, conduit_count, total_length)
+                    VALUES
+                        (p_project, p_flag, p_conduit_type, p_status, p_network_level,
+                         p_owner, p_manufacturer, p_month, p_count, p_length)
+                    ON CONFLICT (project, flag, conduit_type, status, network_level,
+                                 owner, manufacturer, month)
+                    DO UPDATE SET
+                        conduit_count = s.conduit_count + EXCLUDED.conduit_count,
+                        total_length = s.total_length + EXCLUDED.total_length
+                    RETURNING s.id, s.conduit_count INTO v_id, v_count;
+
+                    IF v_count <= 0 THEN
+                        DELETE FROM conduit_statistics WHERE id = v_id;
+                    END IF;
+                END;
+                $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="""
+                DROP FUNCTION IF EXISTS fn_bump_trench_statistics(
+                    integer, integer, integer, integer, integer, integer,
+                    boolean, boolean, boolean, bigint, numeric);
+                DROP FUNCTION IF EXISTS fn_bump_node_statistics(
+                    integer, integer, integer, integer, integer, integer, text, bigint);
+                DROP FUNCTION IF EXISTS fn_bump_address_statistics(
+                    integer, integer, text, integer, bigint);
+                DROP FUNCTION IF EXISTS fn_bump_residential_unit_statistics(
+                    integer, integer, text, integer, bigint);
+                DROP FUNCTION IF EXISTS fn_bump_conduit_statistics(
+                    integer, integer, integer, integer, integer, integer, integer,
+                    date, bigint, numeric);
+            """,
+        ),
+        # Trench: own bucket, plus the derived length of connected conduits
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_trench_statistics()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP = 'DELETE' AND TG_WHEN = 'BEFORE' THEN
+                        -- Connections removed by the FK cascade can no longer
+                        -- see the trench, so take its length off here.
+                        PERFORM fn_bump_conduit_statistics(
+                            c.project, c.flag, c.conduit_type, c.status,
+                            c.network_level, c.owner, c.manufacturer,
+                            DATE_TRUNC('month', c.date)::date, 0, -OLD.length)
+                        FROM trench_conduit_connect tcc
+                        JOIN conduit c ON c.uuid = tcc.uuid_conduit
+                        WHERE tcc.uuid_trench = OLD.uuid;
+                        RETURN OLD;
+                    END IF;
+
+                    IF TG_OP = 'UPDATE'
+                        AND (OLD.project, OLD.flag, OLD.construction_type, OLD.surface,
+                             OLD.status, OLD.phase, OLD.house_connection,
+                             OLD.funding_status, OLD.internal_execution, OLD.length)
+                        IS NOT DISTINCT FROM
+                            (NEW.project, NEW.flag, NEW.construction_type, NEW.surface,
+                             NEW.status, NEW.phase, NEW.house_connection,
+                             NEW.funding_status, NEW.internal_execution, NEW.length)
+                    THEN
+                        RETURN NULL;
+                    END IF;
+
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        PERFORM fn_bump_trench_statistics(
+                            OLD.project, OLD.flag, OLD.construction_type, OLD.surface,
+                            OLD.status, OLD.phase, OLD.house_connection,
+                            OLD.funding_status, OLD.internal_execution,
+                            -1, -OLD.length);
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        PERFORM fn_bump_trench_statistics(
+                            NEW.project, NEW.flag, NEW.construction_type, NEW.surface,
+                            NEW.status, NEW.phase, NEW.house_connection,
+                            NEW.funding_status, NEW.internal_execution,
+                            1, NEW.length);
+                    END IF;
+
+                    IF TG_OP = 'UPDATE' AND NEW.length IS DISTINCT FROM OLD.length THEN
+                        PERFORM fn_bump_conduit_statistics(
+                            c.project, c.flag, c.conduit_type, c.status,
+                            c.network_level, c.owner, c.manufacturer,
+                            DATE_TRUNC('month', c.date)::date,
+                            0, NEW.length - OLD.length)
+                        FROM trench_conduit_connect tcc
+                        JOIN conduit c ON c.uuid = tcc.uuid_conduit
+                        WHERE tcc.uuid_trench = NEW.uuid;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_trench_statistics
+                    AFTER INSERT OR DELETE OR UPDATE OF
+                        project, flag, construction_type, surface, status, phase,
+                        house_connection, funding_status, internal_execution,
+                        length, geom
+                    ON trench
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_trench_statistics();
+
+                CREATE TRIGGER tg_trench_statistics_before_delete
+                    BEFORE DELETE ON trench
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_trench_statistics();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_trench_statistics ON trench;
+                DROP TRIGGER IF EXISTS tg_trench_statistics_before_delete ON trench;
+                DROP FUNCTION IF EXISTS fn_trench_statistics();
+            """,
+        ),
+        # Trench/conduit connections move trench length in and out of conduit buckets
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_trench_conduit_statistics()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    -- Either side may already be gone when the row is removed
+                    -- by an FK cascade; its parent trigger accounted for it.
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        PERFORM fn_bump_conduit_statistics(
+                            c.project, c.flag, c.conduit_type, c.status,
+                            c.network_level, c.owner, c.manufacturer,
+                            DATE_TRUNC('month', c.date)::date, 0, -t.length)
+                        FROM conduit c, trench t
+                        WHERE c.uuid = OLD.uuid_conduit AND t.uuid = OLD.uuid_trench;
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        PERFORM fn_bump_conduit_statistics(
+                            c.project, c.flag, c.conduit_type, c.status,
+                            c.network_level, c.owner, c.manufacturer,
+                            DATE_TRUNC('month', c.date)::date, 0, t.length)
+                        FROM conduit c, trench t
+                        WHERE c.uuid = NEW.uuid_conduit AND t.uuid = NEW.uuid_trench;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_trench_conduit_statistics
+                    AFTER INSERT OR DELETE OR UPDATE OF uuid_trench, uuid_conduit
+                    ON trench_conduit_connect
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_trench_conduit_statistics();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_trench_conduit_statistics ON trench_conduit_connect;
+                DROP FUNCTION IF EXISTS fn_trench_conduit_statistics();
+            """,
+        ),
+        # Conduit: own count, carrying its connected length between buckets
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_conduit_statistics()
+                RETURNS TRIGGER AS $$
+                DECLARE
+                    v_length numeric;
+                BEGIN
+                    IF TG_OP = 'UPDATE'
+                        AND (OLD.project, OLD.flag, OLD.conduit_type, OLD.status,
+                             OLD.network_level, OLD.owner, OLD.manufacturer,
+                             DATE_TRUNC('month', OLD.date))
+                        IS NOT DISTINCT FROM
+                            (NEW.project, NEW.flag, NEW.conduit_type, NEW.status,
+                             NEW.network_level, NEW.owner, NEW.manufacturer,
+                             DATE_TRUNC('month', NEW.date))
+                    THEN
+                        RETURN NULL;
+                    END IF;
+
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        SELECT COALESCE(SUM(t.length), 0) INTO v_length
+                        FROM trench_conduit_connect tcc
+                        JOIN trench t ON t.uuid = tcc.uuid_trench
+                        WHERE tcc.uuid_conduit = OLD.uuid;
+
+                        PERFORM fn_bump_conduit_statistics(
+                            OLD.project, OLD.flag, OLD.conduit_type, OLD.status,
+                            OLD.network_level, OLD.owner, OLD.manufacturer,
+                            DATE_TRUNC('month', OLD.date)::date, -1, -v_length);
+                    END IF;
+
+                    IF TG_OP = 'DELETE' THEN
+                        RETURN OLD;
+                    END IF;
+
+                    PERFORM fn_bump_conduit_statistics(
+                        NEW.project, NEW.flag, NEW.conduit_type, NEW.status,
+                        NEW.network_level, NEW.owner, NEW.manufacturer,
+                        DATE_TRUNC('month', NEW.date)::date, 1, COALESCE(v_length, 0));
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_conduit_statistics
+                    AFTER INSERT OR UPDATE OF
+                        project, flag, conduit_type, status, network_level, owner,
+                        manufacturer, date
+                    ON conduit
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_conduit_statistics();
+
+                -- Runs before the FK cascade removes the conduit's connections
+                CREATE TRIGGER tg_conduit_statistics_before_delete
+                    BEFORE DELETE ON conduit
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_conduit_statistics();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_conduit_statistics ON conduit;
+                DROP TRIGGER IF EXISTS tg_conduit_statistics_before_delete ON conduit;
+                DROP FUNCTION IF EXISTS fn_conduit_statistics();
+            """,
+        ),
+        # Node: city comes from the linked address
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_node_statistics()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP = 'UPDATE'
+                        AND (OLD.project, OLD.flag, OLD.node_type, OLD.status,
+                             OLD.network_level, OLD.owner, OLD.uuid_address)
+                        IS NOT DISTINCT FROM
+                            (NEW.project, NEW.flag, NEW.node_type, NEW.status,
+                             NEW.network_level, NEW.owner, NEW.uuid_address)
+                    THEN
+                        RETURN NULL;
+                    END IF;
+
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        PERFORM fn_bump_node_statistics(
+                            OLD.project, OLD.flag, OLD.node_type, OLD.status,
+                            OLD.network_level, OLD.owner,
+                            (SELECT a.city FROM address a WHERE a.uuid = OLD.uuid_address),
+                            -1);
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        PERFORM fn_bump_node_statistics(
+                            NEW.project, NEW.flag, NEW.node_type, NEW.status,
+                            NEW.network_level, NEW.owner,
+                            (SELECT a.city FROM address a WHERE a.uuid = NEW.uuid_address),
+                            1);
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_node_statistics
+                    AFTER INSERT OR DELETE OR UPDATE OF
+                        project, flag, node_type, status, network_level, owner,
+                        uuid_address
+                    ON node
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_node_statistics();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_node_statistics ON node;
+                DROP FUNCTION IF EXISTS fn_node_statistics();
+            """,
+        ),
+        # Address: own bucket, plus the city/project of its nodes and units
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_address_statistics()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP = 'DELETE' AND TG_WHEN = 'BEFORE' THEN
+                        -- Dependent rows can no longer resolve the address
+                        -- afterwards: nodes lose their city, units their bucket.
+                        PERFORM fn_bump_node_statistics(
+                                    n.project, n.flag, n.node_type, n.status,
+                                    n.network_level, n.owner, OLD.city, -n.cnt),
+                                fn_bump_node_statistics(
+                                    n.project, n.flag, n.node_type, n.status,
+                                    n.network_level, n.owner, NULL, n.cnt)
+                        FROM (
+                            SELECT project, flag, node_type, status, network_level,
+                                   owner, COUNT(*) AS cnt
+                            FROM node
+                            WHERE uuid_address = OLD.uuid
+                            GROUP BY project, flag, node_type, status, network_level, owner
+                        ) n;
+
+                        PERFORM fn_bump_residential_unit_statistics(
+                            OLD.project, OLD.flag, OLD.city, r.residential_unit_type, -r.cnt)
+                        FROM (
+                            SELECT residential_unit_type, COUNT(*) AS cnt
+                            FROM residential_unit
+                            WHERE uuid_address = OLD.uuid
+                            GROUP BY residential_unit_type
+                        ) r;
+                        RETURN OLD;
+                    END IF;
+
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        PERFORM fn_bump_address_statistics(
+                            OLD.project, OLD.flag, OLD.city, OLD.status_development, -1);
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        PERFORM fn_bump_address_statistics(
+                            NEW.project, NEW.flag, NEW.city, NEW.status_development, 1);
+                    END IF;
+
+                    IF TG_OP = 'UPDATE' AND NEW.city IS DISTINCT FROM OLD.city THEN
+                        PERFORM fn_bump_node_statistics(
+                                    n.project, n.flag, n.node_type, n.status,
+                                    n.network_level, n.owner, OLD.city, -n.cnt),
+                                fn_bump_node_statistics(
+                                    n.project, n.flag, n.node_type, n.status,
+                                    n.network_level, n.owner, NEW.city, n.cnt)
+                        FROM (
+                            SELECT project, flag, node_type, status, network_level,
+                                   owner, COUNT(*) AS cnt
+                            FROM node
+                            WHERE uuid_address = NEW.uuid
+                            GROUP BY project, flag, node_type, status, network_level, owner
+                        ) n;
+                    END IF;
+
+                    IF TG_OP = 'UPDATE'
+                        AND (NEW.project, NEW.flag, NEW.city)
+                            IS DISTINCT FROM (OLD.project, OLD.flag, OLD.city)
+                    THEN
+                        PERFORM fn_bump_residential_unit_statistics(
+                                    OLD.project, OLD.flag, OLD.city,
+                                    r.residential_unit_type, -r.cnt),
+                                fn_bump_residential_unit_statistics(
+                                    NEW.project, NEW.flag, NEW.city,
+                                    r.residential_unit_type, r.cnt)
+                        FROM (
+                            SELECT residential_unit_type, COUNT(*) AS cnt
+                            FROM residential_unit
+                            WHERE uuid_address = NEW.uuid
+                            GROUP BY residential_unit_type
+                        ) r;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_address_statistics
+                    AFTER INSERT OR DELETE OR UPDATE OF
+                        project, flag, city, status_development
+                    ON address
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_address_statistics();
+
+                CREATE TRIGGER tg_address_statistics_before_delete
+                    BEFORE DELETE ON address
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_address_statistics();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_address_statistics ON address;
+                DROP TRIGGER IF EXISTS tg_address_statistics_before_delete ON address;
+                DROP FUNCTION IF EXISTS fn_address_statistics();
+            """,
+        ),
+        # Residential unit: bucketed by its address' project, flag and city
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_residential_unit_statistics()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        PERFORM fn_bump_residential_unit_statistics(
+                            a.project, a.flag, a.city, OLD.residential_unit_type, -1)
+                        FROM address a
+                        WHERE a.uuid = OLD.uuid_address;
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        PERFORM fn_bump_residential_unit_statistics(
+                            a.project, a.flag, a.city, NEW.residential_unit_type, 1)
+                        FROM address a
+                        WHERE a.uuid = NEW.uuid_address;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_residential_unit_statistics
+                    AFTER INSERT OR DELETE OR UPDATE OF uuid_address, residential_unit_type
+                    ON residential_unit
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_residential_unit_statistics();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_residential_unit_statistics ON residential_unit;
+                DROP FUNCTION IF EXISTS fn_residential_unit_statistics();
+            """,
+        ),
+        # Backfill from existing data
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO trench_statistics
+                    (project, flag, construction_type, surface, status, phase,
+                     house_connection, funding_status, internal_execution,
+                     trench_count, total_length)
+                SELECT project, flag, construction_type, surface, status, phase,
+                       house_connection, funding_status, internal_execution,
+                       COUNT(*), SUM(length)
+                FROM trench
+                GROUP BY project, flag, construction_type, surface, status, phase,
+                         house_connection, funding_status, internal_execution;
+
+                INSERT INTO node_statistics
+                    (project, flag, node_type, status, network_level, owner, city,
+                     node_count)
+                SELECT n.project, n.flag, n.node_type, n.status, n.network_level,
+                       n.owner, a.city, COUNT(*)
+                FROM node n
+                LEFT JOIN address a ON a.uuid = n.uuid_address
+                GROUP BY n.project, n.flag, n.node_type, n.status, n.network_level,
+                         n.owner, a.city;
+
+                INSERT INTO address_statistics
+                    (project, flag, city, status_development, address_count)
+                SELECT project, flag, city, status_development, COUNT(*)
+                FROM address
+                GROUP BY project, flag, city, status_development;
+
+                INSERT INTO residential_unit_statistics
+                    (project, flag, city, residential_unit_type, unit_count)
+                SELECT a.project, a.flag, a.city, ru.residential_unit_type, COUNT(*)
+                FROM residential_unit ru
+                JOIN address a ON a.uuid = ru.uuid_address
+                GROUP BY a.project, a.flag, a.city, ru.residential_unit_type;
+
+                INSERT INTO conduit_statistics
+                    (project, flag, conduit_type, status, network_level, owner,
+                     manufacturer, month, conduit_count, total_length)
+                SELECT c.project, c.flag, c.conduit_type, c.status, c.network_level,
+                       c.owner, c.manufacturer, DATE_TRUNC('month', c.date)::date,
+                       COUNT(*), COALESCE(SUM(cl.length), 0)
+                FROM conduit c
+                LEFT JOIN (
+                    SELECT tcc.uuid_conduit, SUM(t.length) AS length
+                    FROM trench_conduit_connect tcc
+                    JOIN trench t ON t.uuid = tcc.uuid_trench
+                    GROUP BY tcc.uuid_conduit
+                ) cl ON cl.uuid_conduit = c.uuid
+                GROUP BY c.project, c.flag, c.conduit_type, c.status, c.network_level,
+                         c.owner, c.manufacturer, DATE_TRUNC('month', c.date)::date;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,412 @@
+"""Add the trigger-maintained unified search index."""
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0075_statistics_summary_tables"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity_type",
+                    models.CharField(
+                        choices=[
+                            ("address", "Address"),
+                            ("node", "Node"),
+                            ("cable", "Cable"),
+                            ("residential_unit", "Residential Unit"),
+                            ("trench", "Trench"),
+                            ("conduit", "Conduit"),
+                        ],
+                        max_length=20,
+                        verbose_name="Entity Type",
+                    ),
+                ),
+                ("entity_uuid", models.UUIDField(verbose_name="Entity UUID")),
+                ("label", models.TextField(verbose_name="Label")),
+                ("document", models.TextField(verbose_name="Document")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_column="project",
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="api.projects",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Index Entry",
+                "verbose_name_plural": "Search Index",
+                "db_table": "search_index",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("entity_type", "entity_uuid"),
+                        name="unique_search_index_entity",
+                    )
+                ],
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            "document", name="gin_trgm_ops"
+                        ),
+                        name="idx_search_index_trgm",
+                    ),
+                    models.Index(
+                        django.contrib.postgres.indexes.OpClass(
+                            "document", name="text_pattern_ops"
+                        ),
+                        name="idx_search_index_prefix",
+                    ),
+                    models.Index(
+                        fields=["project", "entity_type"],
+                        name="idx_search_index_project",
+                    ),
+                ],
+            },
+        ),
+        # Document builders: one (label, document) pair per entity row. Joined
+        # rows (type, address) may be NULL.
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_normalize(p_text text)
+                RETURNS text AS $$
+                    SELECT lower(btrim(regexp_replace(coalesce(p_text, ''), '\\s+', ' ', 'g')));
+                $$ LANGUAGE sql IMMUTABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_address(a address)
+                RETURNS TABLE (label text, document text) AS $$
+                    SELECT
+                        concat_ws(', ',
+                            nullif(concat_ws(' ', a.street,
+                                a.housenumber::text || coalesce(a.house_number_suffix, '')), ''),
+                            nullif(concat_ws(' ', a.zip_code, a.city), '')),
+                        fn_search_normalize(concat_ws(' ', a.street,
+                            a.housenumber::text || coalesce(a.house_number_suffix, ''),
+                            a.housenumber, a.zip_code, a.city, a.district,
+                            a.id_address, a.id_address_2));
+                $$ LANGUAGE sql STABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_node(n node, t attributes_node_type)
+                RETURNS TABLE (label text, document text) AS $$
+                    SELECT n.name, fn_search_normalize(concat_ws(' ', n.name, t.node_type));
+                $$ LANGUAGE sql STABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_cable(c cable, t attributes_cable_type)
+                RETURNS TABLE (label text, document text) AS $$
+                    SELECT c.name, fn_search_normalize(concat_ws(' ', c.name, t.cable_type));
+                $$ LANGUAGE sql STABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_residential_unit(
+                    r residential_unit, a address
+                )
+                RETURNS TABLE (label text, document text) AS $$
+                    SELECT
+                        concat_ws(', ', r.id_residential_unit,
+                            nullif(concat_ws(' ', a.street,
+                                a.housenumber::text || coalesce(a.house_number_suffix, '')), ''),
+                            r.side),
+                        fn_search_normalize(concat_ws(' ', r.id_residential_unit,
+                            r.external_id_1, r.external_id_2, r.side, r.building_section,
+                            a.street,
+                            a.housenumber::text || coalesce(a.house_number_suffix, ''),
+                            a.city));
+                $$ LANGUAGE sql STABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_trench(t trench)
+                RETURNS TABLE (label text, document text) AS $$
+                    SELECT t.id_trench::text,
+                           fn_search_normalize(concat_ws(' ', t.id_trench, t.comment));
+                $$ LANGUAGE sql STABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_conduit(c conduit)
+                RETURNS TABLE (label text, document text) AS $$
+                    SELECT c.name,
+                           fn_search_normalize(concat_ws(' ', c.name, c.outer_conduit));
+                $$ LANGUAGE sql STABLE;
+
+                CREATE OR REPLACE FUNCTION fn_search_index_upsert(
+                    p_entity_type text, p_entity_uuid uuid, p_project integer,
+                    p_label text, p_document text
+                ) RETURNS void AS $$
+                    INSERT INTO search_index AS s
+                        (entity_type, entity_uuid, project, label, document)
+                    VALUES
+                        (p_entity_type, p_entity_uuid, p_project,
+                         coalesce(p_label, ''), p_document)
+                    ON CONFLICT (entity_type, entity_uuid) DO UPDATE SET
+                        project = EXCLUDED.project,
+                        label = EXCLUDED.label,
+                        document = EXCLUDED.document;
+                $$ LANGUAGE sql;
+            """,
+            reverse_sql="""
+                DROP FUNCTION IF EXISTS fn_search_index_upsert(text, uuid, integer, text, text);
+                DROP FUNCTION IF EXISTS fn_search_conduit(conduit);
+                DROP FUNCTION IF EXISTS fn_search_trench(trench);
+                DROP FUNCTION IF EXISTS fn_search_residential_unit(residential_unit, address);
+                DROP FUNCTION IF EXISTS fn_search_cable(cable, attributes_cable_type);
+                DROP FUNCTION IF EXISTS fn_search_node(node, attributes_node_type);
+                DROP FUNCTION IF EXISTS fn_search_address(address);
+                DROP FUNCTION IF EXISTS fn_search_normalize(text);
+            """,
+        ),
+        # Address: own entry, plus the units that show its street and project
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_index_address()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        DELETE FROM search_index
+                        WHERE entity_type = 'address' AND entity_uuid = OLD.uuid;
+                        RETURN NULL;
+                    END IF;
+
+                    PERFORM fn_search_index_upsert(
+                        'address', NEW.uuid, NEW.project, d.label, d.document)
+                    FROM fn_search_address(NEW) d;
+
+                    IF TG_OP = 'UPDATE' THEN
+                        PERFORM fn_search_index_upsert(
+                            'residential_unit', r.uuid, NEW.project, d.label, d.document)
+                        FROM residential_unit r,
+                             LATERAL fn_search_residential_unit(r, NEW) d
+                        WHERE r.uuid_address = NEW.uuid;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_search_index_address
+                    AFTER INSERT OR DELETE OR UPDATE OF
+                        street, housenumber, house_number_suffix, zip_code, city,
+                        district, id_address, id_address_2, project
+                    ON address
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_search_index_address();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_search_index_address ON address;
+                DROP FUNCTION IF EXISTS fn_search_index_address();
+            """,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_index_node()
+                RETURNS TRIGGER AS $$
+                DECLARE
+                    v_type attributes_node_type;
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        DELETE FROM search_index
+                        WHERE entity_type = 'node' AND entity_uuid = OLD.uuid;
+                        RETURN NULL;
+                    END IF;
+
+                    SELECT t.* INTO v_type
+                    FROM attributes_node_type t WHERE t.id = NEW.node_type;
+                    PERFORM fn_search_index_upsert(
+                        'node', NEW.uuid, NEW.project, d.label, d.document)
+                    FROM fn_search_node(NEW, v_type) d;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_search_index_node
+                    AFTER INSERT OR DELETE OR UPDATE OF name, node_type, project
+                    ON node
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_search_index_node();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_search_index_node ON node;
+                DROP FUNCTION IF EXISTS fn_search_index_node();
+            """,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_index_cable()
+                RETURNS TRIGGER AS $$
+                DECLARE
+                    v_type attributes_cable_type;
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        DELETE FROM search_index
+                        WHERE entity_type = 'cable' AND entity_uuid = OLD.uuid;
+                        RETURN NULL;
+                    END IF;
+
+                    SELECT t.* INTO v_type
+                    FROM attributes_cable_type t WHERE t.id = NEW.cable_type;
+                    PERFORM fn_search_index_upsert(
+                        'cable', NEW.uuid, NEW.project, d.label, d.document)
+                    FROM fn_search_cable(NEW, v_type) d;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_search_index_cable
+                    AFTER INSERT OR DELETE OR UPDATE OF name, cable_type, project
+                    ON cable
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_search_index_cable();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_search_index_cable ON cable;
+                DROP FUNCTION IF EXISTS fn_search_index_cable();
+            """,
+        ),
+        # Residential unit: scoped to its address' project
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_index_residential_unit()
+                RETURNS TRIGGER AS $$
+                DECLARE
+                    v_address address;
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        DELETE FROM search_index
+                        WHERE entity_type = 'residential_unit' AND entity_uuid = OLD.uuid;
+                        RETURN NULL;
+                    END IF;
+
+                    SELECT a.* INTO v_address
+                    FROM address a WHERE a.uuid = NEW.uuid_address;
+                    PERFORM fn_search_index_upsert(
+                        'residential_unit', NEW.uuid, v_address.project,
+                        d.label, d.document)
+                    FROM fn_search_residential_unit(NEW, v_address) d;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_search_index_residential_unit
+                    AFTER INSERT OR DELETE OR UPDATE OF
+                        uuid_address, id_residential_unit, external_id_1,
+                        external_id_2, side, building_section
+                    ON residential_unit
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_search_index_residential_unit();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_search_index_residential_unit ON residential_unit;
+                DROP FUNCTION IF EXISTS fn_search_index_residential_unit();
+            """,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_index_trench()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        DELETE FROM search_index
+                        WHERE entity_type = 'trench' AND entity_uuid = OLD.uuid;
+                        RETURN NULL;
+                    END IF;
+
+                    PERFORM fn_search_index_upsert(
+                        'trench', NEW.uuid, NEW.project, d.label, d.document)
+                    FROM fn_search_trench(NEW) d;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_search_index_trench
+                    AFTER INSERT OR DELETE OR UPDATE OF id_trench, comment, project
+                    ON trench
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_search_index_trench();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_search_index_trench ON trench;
+                DROP FUNCTION IF EXISTS fn_search_index_trench();
+            """,
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_search_index_conduit()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP = 'DELETE' THEN
+                        DELETE FROM search_index
+                        WHERE entity_type = 'conduit' AND entity_uuid = OLD.uuid;
+                        RETURN NULL;
+                    END IF;
+
+                    PERFORM fn_search_index_upsert(
+                        'conduit', NEW.uuid, NEW.project, d.label, d.document)
+                    FROM fn_search_conduit(NEW) d;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER tg_search_index_conduit
+                    AFTER INSERT OR DELETE OR UPDATE OF name, outer_conduit, project
+                    ON conduit
+                    FOR EACH ROW
+                EXECUTE FUNCTION fn_search_index_conduit();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS tg_search_index_conduit ON conduit;
+                DROP FUNCTION IF EXISTS fn_search_index_conduit();
+            """,
+        ),
+        # Backfill from existing data
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO search_index (entity_type, entity_uuid, project, label, document)
+                SELECT 'address', a.uuid, a.project, coalesce(d.label, ''), d.document
+                FROM address a, LATERAL fn_search_address(a) d;
+
+                INSERT INTO search_index (entity_type, entity_uuid, project, label, document)
+                SELECT 'node', n.uuid, n.project, coalesce(d.label, ''), d.document
+                FROM node n
+                LEFT JOIN attributes_node_type t ON t.id = n.node_type,
+                LATERAL fn_search_node(n, t) d;
+
+                INSERT INTO search_index (entity_type, entity_uuid, project, label, document)
+                SELECT 'cable', c.uuid, c.project, coalesce(d.label, ''), d.document
+                FROM cable c
+                LEFT JOIN attributes_cable_type t ON t.id = c.cable_type,
+                LATERAL fn_search_cable(c, t) d;
+
+                INSERT INTO search_index (entity_type, entity_uuid, project, label, document)
+                SELECT 'residential_unit', r.uuid, a.project, coalesce(d.label, ''),
+                       d.document
+                FROM residential_unit r
+                LEFT JOIN address a ON a.uuid = r.uuid_address,
+                LATERAL fn_search_residential_unit(r, a) d;
+
+                INSERT INTO search_index (entity_type, entity_uuid, project, label, document)
+                SELECT 'trench', t.uuid, t.project, coalesce(d.label, ''), d.document
+                FROM trench t, LATERAL fn_search_trench(t) d;
+
+                INSERT INTO search_index (entity_type, entity_uuid, project, label, document)
+                SELECT 'conduit', c.uuid, c.project, coalesce(d.label, ''), d.document
+                FROM conduit c, LATERAL fn_search_conduit(c) d;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
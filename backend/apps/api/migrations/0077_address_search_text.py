@@ -0,0 +1,70 @@
+"""Add a generated, accent-folded search column to addresses."""
+
+import django.contrib.postgres.indexes
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, UnaccentExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("api", "0076_search_index"),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        # unaccent() is only STABLE (its dictionary could change), so it cannot
+        # be used in a generated column directly. Pinning the dictionary makes
+        # the wrapper safe to declare IMMUTABLE.
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION fn_unaccent(text) RETURNS text AS $$
+                    SELECT public.unaccent('public.unaccent'::regdictionary, $1);
+                $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS fn_unaccent(text);",
+        ),
+        migrations.AddField(
+            model_name="address",
+            name="search_text",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.Func(
+                    django.db.models.functions.text.Lower(
+                        django.db.models.functions.text.Concat(
+                            "street",
+                            models.Value(" "),
+                            django.db.models.functions.comparison.Cast(
+                                "housenumber", models.TextField()
+                            ),
+                            "house_number_suffix",
+                            models.Value(" "),
+                            "zip_code",
+                            models.Value(" "),
+                            "city",
+                            models.Value(" "),
+                            "district",
+                            models.Value(" "),
+                            "id_address",
+                        )
+                    ),
+                    function="fn_unaccent",
+                    output_field=models.TextField(),
+                ),
+                output_field=models.TextField(),
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="address",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    "search_text", name="gin_trgm_ops"
+                ),
+                name="idx_address_search_text_trgm",
+            ),
+        ),
+    ]
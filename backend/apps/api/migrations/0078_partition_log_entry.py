@@ -0,0 +1,137 @@
+"""Store log entries in monthly range partitions on their timestamp.
+
+The model is unchanged. Only the table is rebuilt as a partitioned table
+whose primary key is ``(uuid, timestamp)``, because a partitioned table's
+unique constraints must include the partition key.
+"""
+
+from django.db import migrations
+
+PARTITION_FUNCTION_SQL = """
+-- Create (if missing) the partition holding the month that contains
+-- ``p_month``. Rows of that month already sitting in the default partition
+-- are moved into it first, as attaching would fail otherwise.
+CREATE OR REPLACE FUNCTION fn_log_entry_ensure_partition(p_month date)
+RETURNS boolean AS $$
+DECLARE
+    v_start timestamptz := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+    v_end timestamptz := (date_trunc('month', p_month::timestamp) + interval '1 month')
+        AT TIME ZONE 'UTC';
+    v_name text := 'log_entry_p' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE log_entry INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    EXECUTE format(
+        'WITH moved AS (
+            DELETE FROM log_entry_default
+            WHERE "timestamp" >= %L AND "timestamp" < %L
+            RETURNING *
+        )
+        INSERT INTO %I SELECT * FROM moved',
+        v_start, v_end, v_name
+    );
+    EXECUTE format(
+        'ALTER TABLE log_entry ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PARTITION_SQL = """
+ALTER TABLE log_entry RENAME TO log_entry_unpartitioned;
+ALTER TABLE log_entry_unpartitioned RENAME CONSTRAINT log_entry_pkey
+    TO log_entry_unpartitioned_pkey;
+ALTER INDEX idx_log_entry_timestamp RENAME TO idx_log_entry_unpartitioned_timestamp;
+ALTER INDEX idx_log_entry_level RENAME TO idx_log_entry_unpartitioned_level;
+ALTER INDEX idx_log_entry_user RENAME TO idx_log_entry_unpartitioned_user;
+ALTER INDEX idx_log_entry_source RENAME TO idx_log_entry_unpartitioned_source;
+ALTER INDEX idx_log_entry_logger_name RENAME TO idx_log_entry_unpartitioned_logger_name;
+ALTER INDEX idx_log_entry_project RENAME TO idx_log_entry_unpartitioned_project;
+
+CREATE TABLE log_entry (
+    LIKE log_entry_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (uuid, "timestamp")
+) PARTITION BY RANGE ("timestamp");
+
+ALTER TABLE log_entry
+    ADD CONSTRAINT log_entry_user_id_fk_auth_user_id
+    FOREIGN KEY (user_id) REFERENCES auth_user (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE log_entry
+    ADD CONSTRAINT log_entry_project_id_fk_projects_id
+    FOREIGN KEY (project_id) REFERENCES projects (id) DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX idx_log_entry_timestamp ON log_entry ("timestamp" DESC);
+CREATE INDEX idx_log_entry_level ON log_entry (level);
+CREATE INDEX idx_log_entry_user ON log_entry (user_id);
+CREATE INDEX idx_log_entry_source ON log_entry (source);
+CREATE INDEX idx_log_entry_logger_name ON log_entry (logger_name);
+CREATE INDEX idx_log_entry_project ON log_entry (project_id);
+
+-- Catches rows outside every monthly partition, so inserts never fail.
+CREATE TABLE log_entry_default PARTITION OF log_entry DEFAULT;
+
+DO $$
+DECLARE
+    v_month date;
+BEGIN
+    SELECT date_trunc('month', coalesce(min("timestamp"), now()) AT TIME ZONE 'UTC')::date
+    INTO v_month
+    FROM log_entry_unpartitioned;
+
+    WHILE v_month <= (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date LOOP
+        PERFORM fn_log_entry_ensure_partition(v_month);
+        v_month := (v_month + interval '1 month')::date;
+    END LOOP;
+END;
+$$;
+
+INSERT INTO log_entry SELECT * FROM log_entry_unpartitioned;
+DROP TABLE log_entry_unpartitioned;
+"""
+
+UNPARTITION_SQL = """
+CREATE TABLE log_entry_unpartitioned (
+    LIKE log_entry INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+);
+INSERT INTO log_entry_unpartitioned SELECT * FROM log_entry;
+DROP TABLE log_entry;
+ALTER TABLE log_entry_unpartitioned RENAME TO log_entry;
+
+ALTER TABLE log_entry ADD CONSTRAINT log_entry_pkey PRIMARY KEY (uuid);
+ALTER TABLE log_entry
+    ADD CONSTRAINT log_entry_user_id_fk_auth_user_id
+    FOREIGN KEY (user_id) REFERENCES auth_user (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE log_entry
+    ADD CONSTRAINT log_entry_project_id_fk_projects_id
+    FOREIGN KEY (project_id) REFERENCES projects (id) DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX idx_log_entry_timestamp ON log_entry ("timestamp" DESC);
+CREATE INDEX idx_log_entry_level ON log_entry (level);
+CREATE INDEX idx_log_entry_user ON log_entry (user_id);
+CREATE INDEX idx_log_entry_source ON log_entry (source);
+CREATE INDEX idx_log_entry_logger_name ON log_entry (logger_name);
+CREATE INDEX idx_log_entry_project ON log_entry (project_id);
+
+DROP FUNCTION IF EXISTS fn_log_entry_ensure_partition(date);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0077_address_search_text"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=PARTITION_FUNCTION_SQL + PARTITION_SQL,
+            reverse_sql=UNPARTITION_SQL,
+        ),
+    ]
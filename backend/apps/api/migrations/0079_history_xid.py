@@ -0,0 +1,42 @@
+"""Record the writing transaction on the history rows of the synced layers.
+
+``apps.api.sync`` uses the column to find history rows committed after a
+sync token was issued by transactions that were still open at the time.
+Existing rows stay NULL; they were committed long before any new token.
+The column is not part of the historical models and is filled by its
+default.
+"""
+
+from django.db import migrations
+
+HISTORY_TABLES = [
+    "api_historicaltrench",
+    "api_historicalconduit",
+    "api_historicaladdress",
+    "api_historicalnode",
+    "api_historicalcable",
+    "api_historicalarea",
+]
+
+ADD_SQL = "".join(
+    f"""
+ALTER TABLE {table} ADD COLUMN history_xid xid8;
+ALTER TABLE {table} ALTER COLUMN history_xid SET DEFAULT pg_current_xact_id();
+CREATE INDEX idx_{table}_history_xid ON {table} (history_xid);
+"""
+    for table in HISTORY_TABLES
+)
+
+DROP_SQL = "".join(
+    f"ALTER TABLE {table} DROP COLUMN history_xid;\n" for table in HISTORY_TABLES
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0078_partition_log_entry"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=ADD_SQL, reverse_sql=DROP_SQL),
+    ]
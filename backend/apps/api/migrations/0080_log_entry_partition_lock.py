@@ -0,0 +1,67 @@
+"""Lock the default log entry partition while a month is moved out of it.
+
+A row of the month inserted into ``log_entry_default`` after its rows were
+moved, but before the new partition is attached, made the attach fail.
+"""
+
+import importlib
+
+from django.db import migrations
+
+PREVIOUS_FUNCTION_SQL = importlib.import_module(
+    "apps.api.migrations.0078_partition_log_entry"
+).PARTITION_FUNCTION_SQL
+
+PARTITION_FUNCTION_SQL = """
+-- Create (if missing) the partition holding the month that contains
+-- ``p_month``. Rows of that month already sitting in the default partition
+-- are moved into it first, as attaching would fail otherwise. The default
+-- partition stays locked until the transaction ends, so no row of the month
+-- can be inserted into it in between.
+CREATE OR REPLACE FUNCTION fn_log_entry_ensure_partition(p_month date)
+RETURNS boolean AS $$
+DECLARE
+    v_start timestamptz := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+    v_end timestamptz := (date_trunc('month', p_month::timestamp) + interval '1 month')
+        AT TIME ZONE 'UTC';
+    v_name text := 'log_entry_p' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE log_entry INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    LOCK TABLE log_entry_default IN ACCESS EXCLUSIVE MODE;
+    EXECUTE format(
+        'WITH moved AS (
+            DELETE FROM log_entry_default
+            WHERE "timestamp" >= %L AND "timestamp" < %L
+            RETURNING *
+        )
+        INSERT INTO %I SELECT * FROM moved',
+        v_start, v_end, v_name
+    );
+    EXECUTE format(
+        'ALTER TABLE log_entry ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0079_history_xid"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=PARTITION_FUNCTION_SQL,
+            reverse_sql=PREVIOUS_FUNCTION_SQL,
+        ),
+    ]
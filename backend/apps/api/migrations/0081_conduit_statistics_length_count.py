@@ -0,0 +1,253 @@
+"""Count the trench lengths summed into each conduit statistics bucket.
+
+A conduit without connected trenches used to add NULL to the dashboard's
+``SUM(length)``, so breakdowns in which no conduit had a trench reported
+NULL. The buckets start at a length of 0 instead; ``length_count`` lets the
+dashboard tell the two apart and report NULL again.
+"""
+
+import importlib
+import re
+
+from django.db import migrations, models
+
+_STATISTICS_MIGRATION = importlib.import_module(
+    "apps.api.migrations.0075_statistics_summary_tables"
+)
+
+
+def _previous_function_sql(name):
+    """Return the ``CREATE FUNCTION`` statement of ``name`` from 0075."""
+    pattern = re.compile(
+        rf"CREATE OR REPLACE FUNCTION {name}\(.*?\$\$ LANGUAGE plpgsql;", re.DOTALL
+    )
+    for operation in _STATISTICS_MIGRATION.Migration.operations:
+        match = pattern.search(getattr(operation, "sql", "") or "")
+        if match:
+            return match.group(0)
+    raise LookupError(name)
+
+
+FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION fn_bump_conduit_statistics(
+    p_project integer, p_flag integer, p_conduit_type integer,
+    p_status integer, p_network_level integer, p_owner integer,
+    p_manufacturer integer, p_month date,
+    p_count bigint, p_length_count bigint, p_length numeric
+) RETURNS void AS $$
+DECLARE
+    v_id bigint;
+    v_count integer;
+BEGIN
+    INSERT INTO conduit_statistics AS s
+        (project, flag, conduit_type, status, network_level, owner,
+         manufacturer, month, conduit_count, length_count, total_length)
+    VALUES
+        (p_project, p_flag, p_conduit_type, p_status, p_network_level,
+         p_owner, p_manufacturer, p_month, p_count, p_length_count,
+         COALESCE(p_length, 0))
+    ON CONFLICT (project, flag, conduit_type, status, network_level,
+                 owner, manufacturer, month)
+    DO UPDATE SET
+        conduit_count = s.conduit_count + EXCLUDED.conduit_count,
+        length_count = s.length_count + EXCLUDED.length_count,
+        total_length = s.total_length + EXCLUDED.total_length
+    RETURNING s.id, s.conduit_count INTO v_id, v_count;
+
+    IF v_count <= 0 THEN
+        DELETE FROM conduit_statistics WHERE id = v_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_trench_statistics()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' AND TG_WHEN = 'BEFORE' THEN
+        -- Connections removed by the FK cascade can no longer
+        -- see the trench, so take its length off here.
+        PERFORM fn_bump_conduit_statistics(
+            c.project, c.flag, c.conduit_type, c.status,
+            c.network_level, c.owner, c.manufacturer,
+            DATE_TRUNC('month', c.date)::date,
+            0, -(OLD.length IS NOT NULL)::integer, -OLD.length)
+        FROM trench_conduit_connect tcc
+        JOIN conduit c ON c.uuid = tcc.uuid_conduit
+        WHERE tcc.uuid_trench = OLD.uuid;
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'UPDATE'
+        AND (OLD.project, OLD.flag, OLD.construction_type, OLD.surface,
+             OLD.status, OLD.phase, OLD.house_connection,
+             OLD.funding_status, OLD.internal_execution, OLD.length)
+        IS NOT DISTINCT FROM
+            (NEW.project, NEW.flag, NEW.construction_type, NEW.surface,
+             NEW.status, NEW.phase, NEW.house_connection,
+             NEW.funding_status, NEW.internal_execution, NEW.length)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM fn_bump_trench_statistics(
+            OLD.project, OLD.flag, OLD.construction_type, OLD.surface,
+            OLD.status, OLD.phase, OLD.house_connection,
+            OLD.funding_status, OLD.internal_execution,
+            -1, -OLD.length);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM fn_bump_trench_statistics(
+            NEW.project, NEW.flag, NEW.construction_type, NEW.surface,
+            NEW.status, NEW.phase, NEW.house_connection,
+            NEW.funding_status, NEW.internal_execution,
+            1, NEW.length);
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND NEW.length IS DISTINCT FROM OLD.length THEN
+        PERFORM fn_bump_conduit_statistics(
+            c.project, c.flag, c.conduit_type, c.status,
+            c.network_level, c.owner, c.manufacturer,
+            DATE_TRUNC('month', c.date)::date, 0,
+            (NEW.length IS NOT NULL)::integer - (OLD.length IS NOT NULL)::integer,
+            COALESCE(NEW.length, 0) - COALESCE(OLD.length, 0))
+        FROM trench_conduit_connect tcc
+        JOIN conduit c ON c.uuid = tcc.uuid_conduit
+        WHERE tcc.uuid_trench = NEW.uuid;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_trench_conduit_statistics()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Either side may already be gone when the row is removed
+    -- by an FK cascade; its parent trigger accounted for it.
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM fn_bump_conduit_statistics(
+            c.project, c.flag, c.conduit_type, c.status,
+            c.network_level, c.owner, c.manufacturer,
+            DATE_TRUNC('month', c.date)::date,
+            0, -(t.length IS NOT NULL)::integer, -t.length)
+        FROM conduit c, trench t
+        WHERE c.uuid = OLD.uuid_conduit AND t.uuid = OLD.uuid_trench;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM fn_bump_conduit_statistics(
+            c.project, c.flag, c.conduit_type, c.status,
+            c.network_level, c.owner, c.manufacturer,
+            DATE_TRUNC('month', c.date)::date,
+            0, (t.length IS NOT NULL)::integer, t.length)
+        FROM conduit c, trench t
+        WHERE c.uuid = NEW.uuid_conduit AND t.uuid = NEW.uuid_trench;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_conduit_statistics()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_length numeric;
+    v_length_count bigint;
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND (OLD.project, OLD.flag, OLD.conduit_type, OLD.status,
+             OLD.network_level, OLD.owner, OLD.manufacturer,
+             DATE_TRUNC('month', OLD.date))
+        IS NOT DISTINCT FROM
+            (NEW.project, NEW.flag, NEW.conduit_type, NEW.status,
+             NEW.network_level, NEW.owner, NEW.manufacturer,
+             DATE_TRUNC('month', NEW.date))
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COALESCE(SUM(t.length), 0), COUNT(t.length)
+        INTO v_length, v_length_count
+        FROM trench_conduit_connect tcc
+        JOIN trench t ON t.uuid = tcc.uuid_trench
+        WHERE tcc.uuid_conduit = OLD.uuid;
+
+        PERFORM fn_bump_conduit_statistics(
+            OLD.project, OLD.flag, OLD.conduit_type, OLD.status,
+            OLD.network_level, OLD.owner, OLD.manufacturer,
+            DATE_TRUNC('month', OLD.date)::date,
+            -1, -v_length_count, -v_length);
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    PERFORM fn_bump_conduit_statistics(
+        NEW.project, NEW.flag, NEW.conduit_type, NEW.status,
+        NEW.network_level, NEW.owner, NEW.manufacturer,
+        DATE_TRUNC('month', NEW.date)::date,
+        1, COALESCE(v_length_count, 0), COALESCE(v_length, 0));
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP FUNCTION fn_bump_conduit_statistics(
+    integer, integer, integer, integer, integer, integer, integer,
+    date, bigint, numeric);
+"""
+
+REVERSE_FUNCTIONS_SQL = "\n\n".join(
+    [
+        _previous_function_sql("fn_bump_conduit_statistics"),
+        _previous_function_sql("fn_trench_statistics"),
+        _previous_function_sql("fn_trench_conduit_statistics"),
+        _previous_function_sql("fn_conduit_statistics"),
+        """
+DROP FUNCTION fn_bump_conduit_statistics(
+    integer, integer, integer, integer, integer, integer, integer,
+    date, bigint, bigint, numeric);
+""",
+    ]
+)
+
+BACKFILL_SQL = """
+DELETE FROM conduit_statistics;
+
+INSERT INTO conduit_statistics
+    (project, flag, conduit_type, status, network_level, owner,
+     manufacturer, month, conduit_count, length_count, total_length)
+SELECT c.project, c.flag, c.conduit_type, c.status, c.network_level,
+       c.owner, c.manufacturer, DATE_TRUNC('month', c.date)::date,
+       COUNT(*), COALESCE(SUM(cl.length_count), 0), COALESCE(SUM(cl.length), 0)
+FROM conduit c
+LEFT JOIN (
+    SELECT tcc.uuid_conduit, SUM(t.length) AS length,
+           COUNT(t.length) AS length_count
+    FROM trench_conduit_connect tcc
+    JOIN trench t ON t.uuid = tcc.uuid_trench
+    GROUP BY tcc.uuid_conduit
+) cl ON cl.uuid_conduit = c.uuid
+GROUP BY c.project, c.flag, c.conduit_type, c.status, c.network_level,
+         c.owner, c.manufacturer, DATE_TRUNC('month', c.date)::date;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0080_log_entry_partition_lock"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conduitstatistics",
+            name="length_count",
+            field=models.IntegerField(default=0, verbose_name="Length Count"),
+        ),
+        migrations.RunSQL(sql=FUNCTIONS_SQL, reverse_sql=REVERSE_FUNCTIONS_SQL),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
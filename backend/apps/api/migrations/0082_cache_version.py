@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0081_conduit_statistics_length_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheVersion",
+            fields=[
+                (
+                    "namespace",
+                    models.CharField(
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Namespace",
+                    ),
+                ),
+                ("version", models.BigIntegerField(verbose_name="Version")),
+            ],
+            options={
+                "verbose_name": "Cache Version",
+                "verbose_name_plural": "Cache Versions",
+                "db_table": "cache_version",
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+"""Set the ``%>`` threshold of pg_trgm for the database.
+
+The trigram word similarity operators are the only form the GIN trigram
+indexes can serve, and they compare against
+``pg_trgm.word_similarity_threshold`` (0.6 by default) rather than a value
+passed with the query. The threshold is set for every new session of the
+database and for the migrating one, to match ``search.SIMILARITY_THRESHOLD``.
+Searches that need a stricter match add an explicit bound on top.
+"""
+
+from django.db import migrations
+
+THRESHOLD = 0.3
+
+# Calling a pg_trgm function loads the module, which registers the setting.
+SET_THRESHOLD_SQL = f"""
+SELECT word_similarity('', '');
+DO $$
+BEGIN
+    EXECUTE format(
+        'ALTER DATABASE %I SET pg_trgm.word_similarity_threshold = {THRESHOLD}',
+        current_database()
+    );
+END
+$$;
+SET pg_trgm.word_similarity_threshold = {THRESHOLD};
+"""
+
+RESET_THRESHOLD_SQL = """
+DO $$
+BEGIN
+    EXECUTE format(
+        'ALTER DATABASE %I RESET pg_trgm.word_similarity_threshold',
+        current_database()
+    );
+END
+$$;
+RESET pg_trgm.word_similarity_threshold;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0082_cache_version"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=SET_THRESHOLD_SQL, reverse_sql=RESET_THRESHOLD_SQL),
+    ]
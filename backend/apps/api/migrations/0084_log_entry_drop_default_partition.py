@@ -0,0 +1,83 @@
+"""Drop the default log entry partition and create month partitions on demand.
+
+``DETACH PARTITION ... CONCURRENTLY`` is not allowed while the table has a
+default partition, so expiring a month had to lock out every log write.
+The rows of the default partition are moved into their month partitions
+before it is dropped. From now on a row without a partition fails to
+insert, and the model creates the partition and retries.
+"""
+
+import importlib
+
+from django.db import migrations
+
+PREVIOUS_FUNCTION_SQL = importlib.import_module(
+    "apps.api.migrations.0080_log_entry_partition_lock"
+).PARTITION_FUNCTION_SQL
+
+DROP_DEFAULT_SQL = """
+DO $$
+DECLARE
+    v_month date;
+BEGIN
+    FOR v_month IN
+        SELECT DISTINCT date_trunc('month', "timestamp" AT TIME ZONE 'UTC')::date
+        FROM log_entry_default
+    LOOP
+        PERFORM fn_log_entry_ensure_partition(v_month);
+    END LOOP;
+END
+$$;
+DROP TABLE log_entry_default;
+"""
+
+PARTITION_FUNCTION_SQL = """
+-- Create (if missing) the partition holding the month that contains
+-- ``p_month``. The empty table is attached rather than created as a
+-- partition, which only takes a SHARE UPDATE EXCLUSIVE lock on log_entry.
+-- A concurrent caller creating the same month makes this one return false.
+CREATE OR REPLACE FUNCTION fn_log_entry_ensure_partition(p_month date)
+RETURNS boolean AS $$
+DECLARE
+    v_start timestamptz := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+    v_end timestamptz := (date_trunc('month', p_month::timestamp) + interval '1 month')
+        AT TIME ZONE 'UTC';
+    v_name text := 'log_entry_p' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE log_entry INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    EXECUTE format(
+        'ALTER TABLE log_entry ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+    RETURN true;
+EXCEPTION
+    WHEN duplicate_table THEN
+        RETURN false;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+RESTORE_DEFAULT_SQL = """
+CREATE TABLE log_entry_default PARTITION OF log_entry DEFAULT;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0083_word_similarity_threshold"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=DROP_DEFAULT_SQL, reverse_sql=RESTORE_DEFAULT_SQL),
+        migrations.RunSQL(
+            sql=PARTITION_FUNCTION_SQL,
+            reverse_sql=PREVIOUS_FUNCTION_SQL,
+        ),
+    ]
@@ -1,3 +1,4 @@
+import datetime
 import logging
 import os
 import uuid
@@ -8,8 +9,10 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db import models as gis_models
 from django.contrib.gis.db.models.functions import Transform
-from django.db import models
-from django.db.models import Q
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Func, Q, Value
+from django.db.models.functions import Cast, Concat, Lower
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
@@ -1691,6 +1694,31 @@ class Address(models.Model):
         output_field=gis_models.PointField(srid=3857),
         db_persist=True,
     )
+    # Lower-cased, accent-folded text searched through one trigram index.
+    search_text = models.GeneratedField(
+        expression=Func(
+            Lower(
+                Concat(
+                    "street",
+                    Value(" "),
+                    Cast("housenumber", models.TextField()),
+                    "house_number_suffix",
+                    Value(" "),
+                    "zip_code",
+                    Value(" "),
+                    "city",
+                    Value(" "),
+                    "district",
+                    Value(" "),
+                    "id_address",
+                )
+            ),
+            function="fn_unaccent",
+            output_field=models.TextField(),
+        ),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
 
     flag = models.ForeignKey(
         Flags,
@@ -1709,7 +1737,7 @@ class Address(models.Model):
         verbose_name=_("Project"),
     )
 
-    history = HistoricalRecords(excluded_fields=["geom_3857"])
+    history = HistoricalRecords(excluded_fields=["geom_3857", "search_text"])
 
     class Meta:
         db_table = "address"
@@ -1732,6 +1760,10 @@ class Address(models.Model):
             models.Index(fields=["project"], name="idx_address_project"),
             models.Index(fields=["flag"], name="idx_address_flag"),
             gis_models.Index(fields=["geom"], name="idx_address_geom"),
+            GinIndex(
+                OpClass("search_text", name="gin_trgm_ops"),
+                name="idx_address_search_text_trgm",
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -3294,11 +3326,71 @@ def qgis_data_file_deleted(sender, instance, **kwargs):
             )
 
 
+# SQLSTATE of "no partition of relation found for row".
+NO_PARTITION_SQLSTATE = "23514"
+
+
+def _insert_log_entries(entries, using, insert):
+    """Run ``insert``, creating the missing partitions of ``entries`` once.
+
+    The insert runs in a savepoint, so a row without a partition does not
+    break the surrounding transaction. The partitions of the months the
+    entries fall into are then created and the insert is retried.
+
+    Args:
+        entries: :model:`api.LogEntry` instances being inserted.
+        using: Database alias to write to.
+        insert: Callable performing the insert.
+
+    Returns:
+        The result of ``insert``.
+    """
+    try:
+        with transaction.atomic(using=using):
+            return insert()
+    except IntegrityError as error:
+        if getattr(error.__cause__, "sqlstate", None) != NO_PARTITION_SQLSTATE:
+            raise
+
+    # Partitions cover calendar months in UTC; auto_now_add has filled in
+    # the timestamps on the first attempt.
+    months = {
+        (entry.timestamp or timezone.now())
+        .astimezone(datetime.UTC)
+        .date()
+        .replace(day=1)
+        for entry in entries
+    }
+    with connections[using].cursor() as cursor:
+        for month in sorted(months):
+            cursor.execute("SELECT fn_log_entry_ensure_partition(%s)", [month])
+    return insert()
+
+
+class LogEntryQuerySet(models.QuerySet):
+    """QuerySet creating the :model:`api.LogEntry` partitions it inserts into."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert ``objs``, creating missing monthly partitions on demand."""
+        objs = list(objs)
+        insert = super().bulk_create
+        return _insert_log_entries(
+            objs, self.db, lambda: insert(objs, *args, **kwargs)
+        )
+
+
 class LogEntry(models.Model):
     """Stores application logs for monitoring and debugging.
 
     Captures logs from both backend (Django) and frontend (SvelteKit) with
     context about the user, request path, and additional metadata.
+
+    The table is range-partitioned by month on ``timestamp`` (see migration
+    ``0078``), with a primary key of ``(uuid, timestamp)`` in the database.
+    Filtering on ``timestamp`` lets PostgreSQL skip whole months, and the
+    ``prune_log_entries`` command expires old months by dropping partitions.
+    There is no default partition: the partition of a month is created by
+    the first insert that needs it, and ahead of time by ``prune_log_entries``.
     """
 
     LOG_LEVEL_CHOICES = [
@@ -3373,6 +3465,8 @@ class LogEntry(models.Model):
         help_text=_("Project associated with this log entry (if applicable)"),
     )
 
+    objects = LogEntryQuerySet.as_manager()
+
     class Meta:
         db_table = "log_entry"
         verbose_name = _("Log Entry")
@@ -3390,6 +3484,12 @@ class LogEntry(models.Model):
     def __str__(self):
         return f"[{self.timestamp}] {self.level}: {self.message[:50]}"
 
+    def save(self, *args, **kwargs):
+        """Save the entry, creating its monthly partition on demand."""
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        insert = super().save
+        return _insert_log_entries([self], using, lambda: insert(*args, **kwargs))
+
 
 def get_feature_folder_identifier(instance):
     """Return the folder identifier for a feature, mirroring FeatureFiles.get_feature_identifier.
@@ -4069,6 +4169,552 @@ class FiberSplice(models.Model):
         return f"{self.node_structure} Port {self.port_number}: {a_str} ↔ {b_str}"
 
 
+class ResidentialUnitFiberIndex(models.Model):
+    """Reverse index from a :model:`api.ResidentialUnit` to the splices serving it.
+
+    One row per splice side that references a residential unit. Rows are
+    maintained exclusively by the ``tg_sync_residential_unit_fiber_index``
+    trigger on ``fiber_splice`` and must not be written from Python.
+
+    ``fiber``/``cable`` hold the fiber on the opposite side of the splice
+    (resolving merge groups to their shared fiber), which is what serves the
+    unit. ``entry_fiber`` is the first populated fiber of the splice and is
+    the starting point used by :func:`~apps.api.services.trace_residential_unit`.
+    """
+
+    residential_unit = models.ForeignKey(
+        ResidentialUnit,
+        on_delete=models.DO_NOTHING,
+        db_column="residential_unit",
+        db_constraint=False,
+        db_index=False,
+        related_name="fiber_index",
+        verbose_name=_("Residential Unit"),
+    )
+    fiber_splice = models.ForeignKey(
+        FiberSplice,
+        on_delete=models.DO_NOTHING,
+        db_column="fiber_splice",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Fiber Splice"),
+    )
+    side = models.CharField(
+        _("Side"),
+        max_length=1,
+        help_text=_("Splice side ('a' or 'b') the residential unit is attached to"),
+    )
+    fiber = models.ForeignKey(
+        Fiber,
+        on_delete=models.DO_NOTHING,
+        db_column="fiber",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Fiber"),
+    )
+    cable = models.ForeignKey(
+        Cable,
+        on_delete=models.DO_NOTHING,
+        db_column="cable",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Cable"),
+    )
+    entry_fiber = models.ForeignKey(
+        Fiber,
+        on_delete=models.DO_NOTHING,
+        db_column="entry_fiber",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Entry Fiber"),
+    )
+
+    class Meta:
+        db_table = "residential_unit_fiber_index"
+        verbose_name = _("Residential Unit Fiber Index")
+        verbose_name_plural = _("Residential Unit Fiber Index")
+        indexes = [
+            models.Index(
+                fields=["residential_unit"], name="idx_ru_fiber_index_ru"
+            ),
+            models.Index(fields=["fiber_splice"], name="idx_ru_fiber_index_splice"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["fiber_splice", "side"],
+                name="unique_ru_fiber_index_splice_side",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.residential_unit_id} ← {self.fiber_splice_id} ({self.side})"
+
+
+class TrenchStatistics(models.Model):
+    """Per-project trench count and length summary for one attribute bucket.
+
+    One row per distinct combination of the grouping columns of
+    :model:`api.Trench` that dashboard breakdowns are taken from. Rows are
+    maintained incrementally by the ``tg_trench_statistics`` trigger and must
+    not be written from Python; empty buckets are removed.
+    """
+
+    project = models.ForeignKey(
+        Projects,
+        on_delete=models.DO_NOTHING,
+        db_column="project",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Project"),
+    )
+    flag = models.ForeignKey(
+        Flags,
+        on_delete=models.DO_NOTHING,
+        db_column="flag",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Flag"),
+    )
+    construction_type = models.ForeignKey(
+        AttributesConstructionType,
+        on_delete=models.DO_NOTHING,
+        db_column="construction_type",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Construction Type"),
+    )
+    surface = models.ForeignKey(
+        AttributesSurface,
+        on_delete=models.DO_NOTHING,
+        db_column="surface",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Surface"),
+    )
+    status = models.ForeignKey(
+        AttributesStatus,
+        on_delete=models.DO_NOTHING,
+        db_column="status",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Status"),
+    )
+    phase = models.ForeignKey(
+        AttributesPhase,
+        on_delete=models.DO_NOTHING,
+        db_column="phase",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Phase"),
+    )
+    house_connection = models.BooleanField(_("House Connection"), null=True)
+    funding_status = models.BooleanField(_("Funding Status"), null=True)
+    internal_execution = models.BooleanField(_("Internal Execution"), null=True)
+    trench_count = models.IntegerField(_("Trench Count"), default=0)
+    total_length = models.DecimalField(
+        _("Total Length"), max_digits=16, decimal_places=4, default=0
+    )
+
+    class Meta:
+        db_table = "trench_statistics"
+        verbose_name = _("Trench Statistics")
+        verbose_name_plural = _("Trench Statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "project",
+                    "flag",
+                    "construction_type",
+                    "surface",
+                    "status",
+                    "phase",
+                    "house_connection",
+                    "funding_status",
+                    "internal_execution",
+                ],
+                name="unique_trench_statistics_bucket",
+                nulls_distinct=False,
+            )
+        ]
+
+
+class NodeStatistics(models.Model):
+    """Per-project node count summary for one attribute bucket.
+
+    ``city`` is taken from the node's :model:`api.Address` and is ``NULL`` for
+    nodes without one. Maintained by the ``tg_node_statistics`` and
+    ``tg_address_statistics`` triggers; must not be written from Python.
+    """
+
+    project = models.ForeignKey(
+        Projects,
+        on_delete=models.DO_NOTHING,
+        db_column="project",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Project"),
+    )
+    flag = models.ForeignKey(
+        Flags,
+        on_delete=models.DO_NOTHING,
+        db_column="flag",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Flag"),
+    )
+    node_type = models.ForeignKey(
+        AttributesNodeType,
+        on_delete=models.DO_NOTHING,
+        db_column="node_type",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Node Type"),
+    )
+    status = models.ForeignKey(
+        AttributesStatus,
+        on_delete=models.DO_NOTHING,
+        db_column="status",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Status"),
+    )
+    network_level = models.ForeignKey(
+        AttributesNetworkLevel,
+        on_delete=models.DO_NOTHING,
+        db_column="network_level",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Network Level"),
+    )
+    owner = models.ForeignKey(
+        AttributesCompany,
+        on_delete=models.DO_NOTHING,
+        db_column="owner",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Owner"),
+    )
+    city = models.TextField(_("City"), null=True)
+    node_count = models.IntegerField(_("Node Count"), default=0)
+
+    class Meta:
+        db_table = "node_statistics"
+        verbose_name = _("Node Statistics")
+        verbose_name_plural = _("Node Statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "project",
+                    "flag",
+                    "node_type",
+                    "status",
+                    "network_level",
+                    "owner",
+                    "city",
+                ],
+                name="unique_node_statistics_bucket",
+                nulls_distinct=False,
+            )
+        ]
+
+
+class AddressStatistics(models.Model):
+    """Per-project address count summary by city and development status.
+
+    Maintained by the ``tg_address_statistics`` trigger; must not be written
+    from Python.
+    """
+
+    project = models.ForeignKey(
+        Projects,
+        on_delete=models.DO_NOTHING,
+        db_column="project",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Project"),
+    )
+    flag = models.ForeignKey(
+        Flags,
+        on_delete=models.DO_NOTHING,
+        db_column="flag",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Flag"),
+    )
+    city = models.TextField(_("City"))
+    status_development = models.ForeignKey(
+        AttributesStatusDevelopment,
+        on_delete=models.DO_NOTHING,
+        db_column="status_development",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Status Development"),
+    )
+    address_count = models.IntegerField(_("Address Count"), default=0)
+
+    class Meta:
+        db_table = "address_statistics"
+        verbose_name = _("Address Statistics")
+        verbose_name_plural = _("Address Statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "flag", "city", "status_development"],
+                name="unique_address_statistics_bucket",
+                nulls_distinct=False,
+            )
+        ]
+
+
+class ResidentialUnitStatistics(models.Model):
+    """Per-project residential unit count summary by city and unit type.
+
+    ``project``, ``flag`` and ``city`` are those of the unit's
+    :model:`api.Address`. Maintained by the ``tg_residential_unit_statistics``
+    and ``tg_address_statistics`` triggers; must not be written from Python.
+    """
+
+    project = models.ForeignKey(
+        Projects,
+        on_delete=models.DO_NOTHING,
+        db_column="project",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Project"),
+    )
+    flag = models.ForeignKey(
+        Flags,
+        on_delete=models.DO_NOTHING,
+        db_column="flag",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Flag"),
+    )
+    city = models.TextField(_("City"))
+    residential_unit_type = models.ForeignKey(
+        AttributesResidentialUnitType,
+        on_delete=models.DO_NOTHING,
+        db_column="residential_unit_type",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Residential Unit Type"),
+    )
+    unit_count = models.IntegerField(_("Unit Count"), default=0)
+
+    class Meta:
+        db_table = "residential_unit_statistics"
+        verbose_name = _("Residential Unit Statistics")
+        verbose_name_plural = _("Residential Unit Statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "flag", "city", "residential_unit_type"],
+                name="unique_residential_unit_statistics_bucket",
+                nulls_distinct=False,
+            )
+        ]
+
+
+class ConduitStatistics(models.Model):
+    """Per-project conduit count and length summary for one attribute bucket.
+
+    ``total_length`` is the summed length of the trenches the bucket's
+    conduits run through (via :model:`api.TrenchConduitConnection`) and
+    ``month`` is the conduit date truncated to the first of the month.
+    ``length_count`` is the number of trench lengths summed into
+    ``total_length``; without any the length is unknown rather than 0.
+    Maintained by the ``tg_conduit_statistics``, ``tg_trench_statistics`` and
+    ``tg_trench_conduit_statistics`` triggers; must not be written from Python.
+    """
+
+    project = models.ForeignKey(
+        Projects,
+        on_delete=models.DO_NOTHING,
+        db_column="project",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Project"),
+    )
+    flag = models.ForeignKey(
+        Flags,
+        on_delete=models.DO_NOTHING,
+        db_column="flag",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Flag"),
+    )
+    conduit_type = models.ForeignKey(
+        AttributesConduitType,
+        on_delete=models.DO_NOTHING,
+        db_column="conduit_type",
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Conduit Type"),
+    )
+    status = models.ForeignKey(
+        AttributesStatus,
+        on_delete=models.DO_NOTHING,
+        db_column="status",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Status"),
+    )
+    network_level = models.ForeignKey(
+        AttributesNetworkLevel,
+        on_delete=models.DO_NOTHING,
+        db_column="network_level",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Network Level"),
+    )
+    owner = models.ForeignKey(
+        AttributesCompany,
+        on_delete=models.DO_NOTHING,
+        db_column="owner",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Owner"),
+    )
+    manufacturer = models.ForeignKey(
+        AttributesCompany,
+        on_delete=models.DO_NOTHING,
+        db_column="manufacturer",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Manufacturer"),
+    )
+    month = models.DateField(_("Month"), null=True)
+    conduit_count = models.IntegerField(_("Conduit Count"), default=0)
+    length_count = models.IntegerField(_("Length Count"), default=0)
+    total_length = models.DecimalField(
+        _("Total Length"), max_digits=16, decimal_places=4, default=0
+    )
+
+    class Meta:
+        db_table = "conduit_statistics"
+        verbose_name = _("Conduit Statistics")
+        verbose_name_plural = _("Conduit Statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "project",
+                    "flag",
+                    "conduit_type",
+                    "status",
+                    "network_level",
+                    "owner",
+                    "manufacturer",
+                    "month",
+                ],
+                name="unique_conduit_statistics_bucket",
+                nulls_distinct=False,
+            )
+        ]
+
+
+class SearchIndex(models.Model):
+    """One normalized search document per searchable feature.
+
+    Holds addresses, nodes, cables, residential units, trenches and
+    conduits, so typeahead search scans a single GIN trigram index across
+    all entity types. ``document`` is the lower-cased, whitespace-collapsed
+    text a feature is found by and ``label`` what the picker shows.
+    Maintained by the ``tg_search_index_*`` triggers; must not be written
+    from Python.
+    """
+
+    class EntityType(models.TextChoices):
+        ADDRESS = "address", _("Address")
+        NODE = "node", _("Node")
+        CABLE = "cable", _("Cable")
+        RESIDENTIAL_UNIT = "residential_unit", _("Residential Unit")
+        TRENCH = "trench", _("Trench")
+        CONDUIT = "conduit", _("Conduit")
+
+    entity_type = models.CharField(
+        _("Entity Type"), max_length=20, choices=EntityType.choices
+    )
+    entity_uuid = models.UUIDField(_("Entity UUID"))
+    project = models.ForeignKey(
+        Projects,
+        on_delete=models.DO_NOTHING,
+        db_column="project",
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name=_("Project"),
+    )
+    label = models.TextField(_("Label"))
+    document = models.TextField(_("Document"))
+
+    class Meta:
+        db_table = "search_index"
+        verbose_name = _("Search Index Entry")
+        verbose_name_plural = _("Search Index")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity_type", "entity_uuid"],
+                name="unique_search_index_entity",
+            )
+        ]
+        indexes = [
+            GinIndex(
+                OpClass("document", name="gin_trgm_ops"),
+                name="idx_search_index_trgm",
+            ),
+            models.Index(
+                OpClass("document", name="text_pattern_ops"),
+                name="idx_search_index_prefix",
+            ),
+            models.Index(
+                fields=["project", "entity_type"],
+                name="idx_search_index_project",
+            ),
+        ]
+
+
 class ContainerType(models.Model):
     """Global container type definition managed via Django Admin.
 
@@ -4429,3 +5075,23 @@ class RoutePermission(models.Model):
     def __str__(self):
         status = "✓" if self.allowed else "✗"
         return f"{self.group.name} - {self.route_pattern}: {status}"
+
+
+class CacheVersion(models.Model):
+    """Version counter of a cache namespace, see :mod:`apps.api.caching`.
+
+    Kept in the database rather than the cache, so bumps are atomic upserts
+    on every cache backend and a counter is never evicted. Written by
+    ``apps.api.caching`` only.
+    """
+
+    namespace = models.CharField(_("Namespace"), max_length=255, primary_key=True)
+    version = models.BigIntegerField(_("Version"))
+
+    class Meta:
+        db_table = "cache_version"
+        verbose_name = _("Cache Version")
+        verbose_name_plural = _("Cache Versions")
+
+    def __str__(self):
+        return f"{self.namespace}@{self.version}"
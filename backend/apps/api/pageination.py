@@ -1,5 +1,10 @@
 """Custom pagination classes for the Qonnectra API."""
 
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 
 
@@ -13,3 +18,77 @@ class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination:
+    """Seek pagination over the primary key for the unpaginated ``all`` endpoints.
+
+    A client opts in with ``limit`` and continues with the ``cursor`` returned
+    as ``next_cursor`` until it is ``null``. Each page is a range scan on the
+    primary key index, so late pages cost the same as the first one, unlike
+    page-number offsets. Rows are ordered by primary key while paginating.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 1000
+    max_limit = 5000
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, request):
+        params = request.query_params
+        self.requested = self.is_requested(request)
+        self.after = self.decode_cursor(params.get(self.cursor_query_param))
+        try:
+            limit = int(params.get(self.limit_query_param, self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        self.limit = min(max(limit, 1), self.max_limit)
+        self.next_cursor = None
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        """Return whether ``request`` asks for keyset pagination."""
+        params = request.query_params
+        return cls.limit_query_param in params or cls.cursor_query_param in params
+
+    def decode_cursor(self, cursor):
+        """Return the primary key encoded in ``cursor``, or ``None``.
+
+        Raises:
+            NotFound: If the cursor cannot be decoded.
+        """
+        if not cursor:
+            return None
+        try:
+            return b64decode(cursor.encode("ascii"), altchars=b"-_").decode("utf-8")
+        except (ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, pk) -> str:
+        """Return the opaque cursor continuing after ``pk``."""
+        return b64encode(str(pk).encode("utf-8"), altchars=b"-_").decode("ascii")
+
+    def paginate_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Return the next page of ``queryset`` and set :attr:`next_cursor`.
+
+        Args:
+            queryset: Filtered queryset; may be a ``values_list`` queryset.
+
+        Returns:
+            QuerySet: At most ``limit`` rows ordered by primary key.
+        """
+        queryset = queryset.order_by("pk")
+        if self.after is not None:
+            try:
+                queryset = queryset.filter(pk__gt=self.after)
+            except (ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # The last key of this page and the first of the next one, if any.
+        boundary = list(
+            queryset.values_list("pk", flat=True)[self.limit - 1 : self.limit + 1]
+        )
+        if len(boundary) == 2:
+            self.next_cursor = self.encode_cursor(boundary[0])
+        return queryset[: self.limit]
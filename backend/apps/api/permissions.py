@@ -4,8 +4,23 @@ Provide DRF permission classes that check :model:`api.ModelPermission`
 and helper functions for retrieving effective user permissions.
 """
 
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
+from django.http import HttpRequest
+from django.urls import URLResolver
 from rest_framework.permissions import BasePermission
+from rest_framework.request import Request
+
+from .caching import versioned_key
+from .profiling import record_cache_lookup
+
+# Version namespace bumped by every permission change.
+PERMISSIONS_NAMESPACE = "permissions"
+PERMISSIONS_CACHE_TIMEOUT = 300
+LEVEL_ORDER = ["none", "view", "edit", "full"]
 
 
 class RoleBasedPermission(BasePermission):
@@ -50,13 +65,15 @@ class RoleBasedPermission(BasePermission):
         if not model_name:
             return True
 
-        access_level = self._get_access_level(user, model_name)
+        access_level = self._get_access_level(user, model_name, request)
         allowed_methods = self.ACCESS_LEVELS.get(access_level, [])
 
         return request.method in allowed_methods
 
     def _get_model_name(self, view):
-        """Extract lowercase model name from a ViewSet or view.
+        """Return the lowercase model name guarding ``view``.
+
+        Resolved once per view class, see :func:`view_model_name`.
 
         Args:
             view: DRF view, typically a ModelViewSet with a queryset.
@@ -64,118 +81,262 @@ class RoleBasedPermission(BasePermission):
         Returns:
             str | None: Lowercase model name, or None if not determinable.
         """
-        if hasattr(view, "queryset") and view.queryset is not None:
-            return view.queryset.model._meta.model_name
-        if hasattr(view, "get_queryset"):
-            try:
-                queryset = view.get_queryset()
-                if queryset is not None:
-                    return queryset.model._meta.model_name
-            except Exception:
-                pass
-        return None
+        return view_model_name(view)
 
-    def _get_access_level(self, user, model_name):
-        """Return the highest access level for a user on a model, with caching.
+    def _get_access_level(self, user, model_name, request=None):
+        """Return the highest access level for a user on a model.
 
         Args:
             user: Django User instance.
             model_name: Lowercase model name to check permissions for.
+            request: Optional request the compiled permissions are memoized on.
 
         Returns:
             str: Access level string ('none', 'view', 'edit', or 'full').
         """
-        cache_key = f"user_permissions:{user.pk}"
-        permissions = cache.get(cache_key)
+        permissions = compiled_permissions(user, request)
+        return permissions["models"].get(model_name, "none")
 
-        if permissions is None:
-            permissions = self._load_permissions(user)
-            cache.set(cache_key, permissions, timeout=300)
 
-        return permissions.get(model_name, "none")
+# View class -> lowercase model name (or None), filled at URL loading time.
+_VIEW_MODEL_NAMES: dict[type, str | None] = {}
+# Marks a view class whose queryset needs a real request to build.
+_UNRESOLVED = object()
 
-    def _load_permissions(self, user):
-        """Load all :model:`api.ModelPermission` entries for a user's groups.
 
-        When a user belongs to multiple groups, the highest access level
-        wins for each model.
+def _queryset_model_name(view):
+    """Return the model name of a view's queryset.
 
-        Args:
-            user: Django User instance.
+    Returns:
+        str | None | object: Lowercase model name, ``None`` if the view has
+            no queryset, or ``_UNRESOLVED`` if ``get_queryset()`` failed.
+    """
+    if getattr(view, "queryset", None) is not None:
+        return view.queryset.model._meta.model_name
+    if not hasattr(view, "get_queryset"):
+        return None
+    try:
+        queryset = view.get_queryset()
+    except Exception:
+        return _UNRESOLVED
+    if queryset is None:
+        return None
+    return queryset.model._meta.model_name
 
-        Returns:
-            dict[str, str]: Mapping of model name to highest access level.
-        """
-        from .models import ModelPermission
 
-        group_ids = list(user.groups.values_list("id", flat=True))
-        if not group_ids:
-            return {}
+def _resolve_view_class(view_class, initkwargs=None):
+    """Resolve the model name of a view class without a real request.
 
-        perms = ModelPermission.objects.filter(group_id__in=group_ids)
+    ``get_queryset()`` is called on an instance bound to an anonymous,
+    parameterless GET request. Querysets are lazy, so this only builds the
+    query; nothing is sent to the database.
+    """
+    if getattr(view_class, "queryset", None) is not None:
+        return view_class.queryset.model._meta.model_name
+    if not hasattr(view_class, "get_queryset"):
+        return None
 
-        result = {}
-        level_order = ["none", "view", "edit", "full"]
+    http_request = HttpRequest()
+    http_request.method = "GET"
+    request = Request(http_request)
+    request.user = AnonymousUser()
+    try:
+        view = view_class(**(initkwargs or {}))
+    except Exception:
+        return _UNRESOLVED
+    view.request = request
+    view.args, view.kwargs = (), {}
+    view.format_kwarg = None
+    view.action = None
+    return _queryset_model_name(view)
 
-        for perm in perms:
-            current = result.get(perm.model_name, "none")
-            if level_order.index(perm.access_level) > level_order.index(current):
-                result[perm.model_name] = perm.access_level
 
-        return result
+def register_view_model_names(urlpatterns) -> None:
+    """Resolve the permission model name of every class-based view.
 
+    Called once from the URL configuration, so permission checks never
+    have to build a queryset to learn the model.
 
-def get_user_permissions(user):
-    """Return effective permissions for a user across models and routes.
+    Args:
+        urlpatterns: URL patterns and resolvers to walk recursively.
+    """
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLResolver):
+            register_view_model_names(pattern.url_patterns)
+            continue
+        view_class = getattr(pattern.callback, "cls", None)
+        if view_class is None or view_class in _VIEW_MODEL_NAMES:
+            continue
+        _VIEW_MODEL_NAMES[view_class] = _resolve_view_class(
+            view_class, getattr(pattern.callback, "initkwargs", None)
+        )
+
+
+def view_model_name(view) -> str | None:
+    """Return the lowercase model name guarding ``view``.
+
+    Looks the view class up in the registry filled by
+    :func:`register_view_model_names`. Classes missing from it are resolved
+    once and added. Only when a view cannot build its queryset without a
+    real request is ``get_queryset()`` called on the view itself, until it
+    succeeds once.
 
-    Aggregate :model:`api.ModelPermission` and :model:`api.RoutePermission`
-    entries from all groups the user belongs to. Highest access level wins
-    for models; True wins over False for routes.
+    Args:
+        view: DRF view instance handling the request.
+
+    Returns:
+        str | None: Lowercase model name, or None if not determinable.
+    """
+    view_class = type(view)
+    model_name = _VIEW_MODEL_NAMES.get(view_class, _UNRESOLVED)
+    if model_name is _UNRESOLVED and view_class not in _VIEW_MODEL_NAMES:
+        model_name = _resolve_view_class(view_class)
+        _VIEW_MODEL_NAMES[view_class] = model_name
+    if model_name is _UNRESOLVED:
+        model_name = _queryset_model_name(view)
+        if model_name is _UNRESOLVED:
+            return None
+        _VIEW_MODEL_NAMES[view_class] = model_name
+    return model_name
+
+
+def user_groups_cache_key(user_id) -> str:
+    """Return the cache key holding a user's group IDs.
 
     Args:
-        user: Django User instance.
+        user_id: Primary key of the user.
 
     Returns:
-        dict: Contains 'models' (dict[str, str]), 'routes' (dict[str, bool]),
-            and 'is_superuser' (bool). Superusers get wildcard full access.
+        str: Cache key.
     """
-    from .models import ModelPermission, RoutePermission
+    return f"user_permission_groups:{user_id}"
 
-    if user.is_superuser:
-        return {
-            "models": {"*": "full"},
-            "routes": {"*": True},
-            "is_superuser": True,
-        }
 
-    group_ids = list(user.groups.values_list("id", flat=True))
+def _user_group_ids(user) -> tuple[int, ...]:
+    """Return the sorted group IDs of a user, cached per user."""
+    cache_key = user_groups_cache_key(user.pk)
+    group_ids = cache.get(cache_key)
+    record_cache_lookup("permission_groups", group_ids is not None)
+    if group_ids is None:
+        group_ids = tuple(sorted(user.groups.values_list("id", flat=True)))
+        cache.set(cache_key, group_ids, timeout=PERMISSIONS_CACHE_TIMEOUT)
+    return group_ids
+
+
+def _compile_permissions(group_ids) -> dict:
+    """Aggregate the permissions of a group set.
+
+    Highest access level wins for models; True wins over False for routes.
+
+    Args:
+        group_ids: IDs of the groups to aggregate.
+
+    Returns:
+        dict: Contains 'models' (dict[str, str]) and 'routes'
+            (dict[str, bool]).
+    """
+    from .models import ModelPermission, RoutePermission
+
     if not group_ids:
-        return {
-            "models": {},
-            "routes": {},
-            "is_superuser": False,
-        }
+        return {"models": {}, "routes": {}}
 
-    model_perms = ModelPermission.objects.filter(group_id__in=group_ids)
     models = {}
-    level_order = ["none", "view", "edit", "full"]
+    for model_name, access_level in ModelPermission.objects.filter(
+        group_id__in=group_ids
+    ).values_list("model_name", "access_level"):
+        current = models.get(model_name, "none")
+        if LEVEL_ORDER.index(access_level) > LEVEL_ORDER.index(current):
+            models[model_name] = access_level
 
-    for perm in model_perms:
-        current = models.get(perm.model_name, "none")
-        if level_order.index(perm.access_level) > level_order.index(current):
-            models[perm.model_name] = perm.access_level
-
-    route_perms = RoutePermission.objects.filter(group_id__in=group_ids)
     routes = {}
+    for route_pattern, allowed in RoutePermission.objects.filter(
+        group_id__in=group_ids
+    ).values_list("route_pattern", "allowed"):
+        if allowed:
+            routes[route_pattern] = True
+        elif route_pattern not in routes:
+            routes[route_pattern] = False
+
+    return {"models": models, "routes": routes}
+
+
+def compiled_permissions(user, request=None) -> dict:
+    """Return the compiled permissions of a user.
 
-    for perm in route_perms:
-        if perm.allowed:
-            routes[perm.route_pattern] = True
-        elif perm.route_pattern not in routes:
-            routes[perm.route_pattern] = False
+    Permissions are compiled once per group set and cached under the
+    ``permissions`` version, which any :model:`api.ModelPermission` or
+    :model:`api.RoutePermission` change bumps. Users sharing the same groups
+    share one cache entry. When ``request`` is given, the result is also
+    memoized on it, so repeated checks within a request hit neither the
+    cache nor the database.
+
+    Args:
+        user: Django User instance.
+        request: Optional Django or DRF request.
+
+    Returns:
+        dict: Contains 'models' (dict[str, str]) and 'routes'
+            (dict[str, bool]). Superusers get wildcard full access.
+    """
+    if user.is_superuser:
+        return {"models": {"*": "full"}, "routes": {"*": True}}
+
+    # DRF requests proxy attribute reads, but not writes, to the HttpRequest.
+    holder = getattr(request, "_request", request)
+    memo = getattr(holder, "_compiled_permissions", None)
+    if memo is not None and memo[0] == user.pk:
+        return memo[1]
+
+    group_ids = _user_group_ids(user)
+    cache_key = versioned_key(
+        "permissions:" + ",".join(map(str, group_ids)), PERMISSIONS_NAMESPACE
+    )
+    permissions = cache.get(cache_key)
+    record_cache_lookup("permissions", permissions is not None)
+    if permissions is None:
+        permissions = _compile_permissions(group_ids)
+        cache.set(cache_key, permissions, timeout=PERMISSIONS_CACHE_TIMEOUT)
+
+    if holder is not None:
+        holder._compiled_permissions = (user.pk, permissions)
+    return permissions
+
+
+def get_user_permissions(user, request=None):
+    """Return effective permissions for a user across models and routes.
 
+    Aggregate :model:`api.ModelPermission` and :model:`api.RoutePermission`
+    entries from all groups the user belongs to. Highest access level wins
+    for models; True wins over False for routes. Shares the compiled,
+    cached permissions used by :class:`RoleBasedPermission`.
+
+    Args:
+        user: Django User instance.
+        request: Optional request the compiled permissions are memoized on.
+
+    Returns:
+        dict: Contains 'models' (dict[str, str]), 'routes' (dict[str, bool]),
+            and 'is_superuser' (bool). Superusers get wildcard full access.
+    """
+    permissions = compiled_permissions(user, request)
     return {
-        "models": models,
-        "routes": routes,
-        "is_superuser": False,
+        "models": permissions["models"],
+        "routes": permissions["routes"],
+        "is_superuser": bool(user.is_superuser),
     }
+
+
+class HasMetricsToken(BasePermission):
+    """Allow requests bearing ``settings.METRICS_TOKEN``.
+
+    Used for the metrics endpoint, which is scraped without a user. Every
+    request is denied while no token is configured.
+    """
+
+    def has_permission(self, request, view):
+        """Compare the bearer token with ``METRICS_TOKEN`` in constant time."""
+        expected = getattr(settings, "METRICS_TOKEN", "")
+        scheme, _, token = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+        if not expected or scheme.lower() != "bearer":
+            return False
+        return hmac.compare_digest(token.strip().encode(), expected.encode())
@@ -0,0 +1,139 @@
+"""Per-request profiling of database queries, cache lookups and rendering.
+
+:class:`RequestProfilingMiddleware` activates a :class:`RequestProfile` for a
+sample of requests. While it is active, every SQL statement run on any
+database connection is counted and timed, code that reads one of the app's
+caches reports hits and misses through :func:`record_cache_lookup`, and the
+JSON renderer reports its encoding time through :func:`track_serialization`.
+Outside a profiled request these helpers return immediately, except that
+cache lookups are always counted in :mod:`apps.api.metrics`.
+"""
+
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .metrics import CACHE_LOOKUPS
+
+_current_profile = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """Query, cache and serialization statistics of one request.
+
+    Only the ``top_queries`` slowest statements are kept, so a request
+    running thousands of queries costs a bounded amount of memory.
+    """
+
+    def __init__(self, top_queries: int = 5) -> None:
+        """Initialize empty statistics.
+
+        Args:
+            top_queries: Number of slowest statements to keep.
+        """
+        self.top_queries = top_queries
+        self.query_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serialization_time = 0.0
+        self._slowest = []
+        self._sequence = itertools.count()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Time one statement; installed with ``connection.execute_wrapper``."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.db_time += duration
+            item = (duration, next(self._sequence), sql)
+            if len(self._slowest) < self.top_queries:
+                heapq.heappush(self._slowest, item)
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def slowest_queries(self) -> list[dict]:
+        """Return the slowest statements, slowest first.
+
+        Returns:
+            list[dict]: ``sql`` (without parameter values) and ``duration_ms``.
+        """
+        return [
+            {"sql": sql[:2000], "duration_ms": round(duration * 1000, 2)}
+            for duration, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def server_timing(self, total: float) -> str:
+        """Format the statistics as a ``Server-Timing`` header value.
+
+        Args:
+            total: Wall-clock duration of the request in seconds.
+
+        Returns:
+            str: Header value.
+        """
+        metrics = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f"serialize;dur={self.serialization_time * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ]
+        if self._slowest:
+            slowest = max(self._slowest)[0]
+            metrics.insert(1, f"db-slowest;dur={slowest * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+def activate(profile: RequestProfile):
+    """Make ``profile`` the profile of the current request.
+
+    Returns:
+        Token: Token to pass to :func:`deactivate`.
+    """
+    return _current_profile.set(profile)
+
+
+def deactivate(token) -> None:
+    """Restore the profile active before :func:`activate`."""
+    _current_profile.reset(token)
+
+
+def current_profile() -> RequestProfile | None:
+    """Return the profile of the current request, if it is being profiled."""
+    return _current_profile.get()
+
+
+def record_cache_lookup(cache_name: str, hit: bool) -> None:
+    """Count a cache hit or miss, in the metrics and the current profile.
+
+    Args:
+        cache_name: Name of the cache, e.g. ``"dashboard"``.
+        hit: Whether the value was found.
+    """
+    CACHE_LOOKUPS.inc(cache=cache_name, result="hit" if hit else "miss")
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    if hit:
+        profile.cache_hits += 1
+    else:
+        profile.cache_misses += 1
+
+
+@contextmanager
+def track_serialization():
+    """Add the time spent in the ``with`` block to the serialization time."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialization_time += time.perf_counter() - start
@@ -1,20 +1,37 @@
 """Reusable trigram search utilities using PostgreSQL pg_trgm extension."""
 
 from django.contrib.postgres.search import TrigramWordSimilarity
-from django.db.models import F, Q, QuerySet, Value
-from django.db.models.functions import Coalesce, Greatest
+from django.db.models import (
+    Case,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    Q,
+    QuerySet,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Lower
+
+from .models import SearchIndex
 
+# Word similarity of the ``%>`` operator, set for the database by migration
+# 0083_word_similarity_threshold (``pg_trgm.word_similarity_threshold``).
 SIMILARITY_THRESHOLD = 0.3
 
-_ADDRESS_ICONTAINS_FIELDS = (
-    "street",
-    "housenumber",
-    "house_number_suffix",
-    "zip_code",
-    "city",
-    "district",
-    "id_address",
-)
+# Stricter word similarity for the unified search index, checked on top of
+# the ``%>`` matches the index returns.
+SEARCH_INDEX_SIMILARITY_THRESHOLD = 0.6
+
+# Candidates whose ranking is refined with per-field similarity.
+ADDRESS_RERANK_LIMIT = 100
+
+
+def _folded(text):
+    """Lower-case and accent-fold ``text`` like ``Address.search_text``."""
+    return Func(Lower(Value(text)), function="fn_unaccent", output_field=TextField())
 
 
 def _address_similarity_for_token(token):
@@ -41,13 +58,20 @@ def _address_similarity_for_token(token):
 def trigram_address_search(queryset: QuerySet, search_term: str) -> QuerySet:
     """Filter and rank addresses by trigram similarity across multiple fields.
 
-    Tokenize the search term on whitespace and AND tokens together.
-    Each token is matched against street, city, zip_code, and district
-    using TrigramWordSimilarity. Tokens shorter than 3 characters fall
-    back to icontains since trigrams require at least 3 characters.
-    Non-text fields (housenumber, id_address) are always matched via
-    icontains as an OR alternative to the trigram filter.
-    Results are annotated with a ``similarity`` score and ordered descending.
+    Tokenize the search term on whitespace and AND tokens together. Each
+    token is matched against the generated ``search_text`` column (street,
+    house number, zip code, city, district and address ID, lower-cased and
+    accent-folded), served by a single GIN trigram index. Tokens of 3 or
+    more characters match as a substring or by the ``%>`` operator, i.e. a
+    trigram word similarity of at least ``SIMILARITY_THRESHOLD`` (the
+    database's ``pg_trgm.word_similarity_threshold``); shorter tokens, which
+    trigrams cannot serve, match as a substring only.
+
+    Matches are ranked by word similarity of the whole term to
+    ``search_text``. The best ``ADDRESS_RERANK_LIMIT`` of them are then
+    ranked first, by the similarity of the first token to the individual
+    street, city, zip code and district fields. Results are annotated with
+    the ``similarity`` used for ordering.
 
     Args:
         queryset: Base :model:`api.Address` queryset to filter.
@@ -61,30 +85,42 @@ def trigram_address_search(queryset: QuerySet, search_term: str) -> QuerySet:
         return queryset
 
     tokens = search_term.strip().split()
-
     trigram_tokens = [t for t in tokens if len(t) >= 3]
-    short_tokens = [t for t in tokens if len(t) < 3]
 
-    for short in short_tokens:
-        q = Q()
-        for field in _ADDRESS_ICONTAINS_FIELDS:
-            q |= Q(**{f"{field}__icontains": short})
+    for token in tokens:
+        folded = _folded(token)
+        q = Q(search_text__contains=folded)
+        if len(token) >= 3:
+            q |= Q(search_text__trigram_word_similar=folded)
         queryset = queryset.filter(q)
 
     if not trigram_tokens:
         return queryset
 
-    for i, token in enumerate(trigram_tokens):
-        sim_alias = f"_sim_{i}"
-        icontains_q = Q(**{"housenumber__icontains": token}) | Q(
-            **{"id_address__icontains": token}
+    queryset = queryset.annotate(
+        search_similarity=TrigramWordSimilarity(
+            _folded(" ".join(trigram_tokens)), "search_text"
         )
-        queryset = queryset.annotate(
-            **{sim_alias: _address_similarity_for_token(token)}
-        ).filter(Q(**{f"{sim_alias}__gte": SIMILARITY_THRESHOLD}) | icontains_q)
-
-    queryset = queryset.annotate(similarity=F("_sim_0"))
-    return queryset.order_by("-similarity")
+    )
+    candidates = queryset.order_by("-search_similarity").values("pk")[
+        :ADDRESS_RERANK_LIMIT
+    ]
+    queryset = queryset.annotate(
+        reranked=Case(
+            When(pk__in=candidates, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        similarity=Case(
+            When(
+                pk__in=candidates,
+                then=_address_similarity_for_token(trigram_tokens[0]),
+            ),
+            default=F("search_similarity"),
+            output_field=FloatField(),
+        ),
+    )
+    return queryset.order_by("-reranked", "-similarity")
 
 
 def trigram_name_search(
@@ -119,3 +155,72 @@ def trigram_name_search(
         .filter(similarity__gte=SIMILARITY_THRESHOLD)
         .order_by("-similarity")
     )
+
+
+def normalize_search_term(search_term: str | None) -> str:
+    """Normalize a search term the way :model:`api.SearchIndex` documents are.
+
+    Args:
+        search_term: Raw search input.
+
+    Returns:
+        str: Lower-cased term with runs of whitespace collapsed.
+    """
+    return " ".join((search_term or "").lower().split())
+
+
+def search_index(
+    search_term: str,
+    entity_types=None,
+    project_id=None,
+) -> QuerySet:
+    """Find and rank :model:`api.SearchIndex` entries across entity types.
+
+    Every token must match the document. Tokens of 3 or more characters
+    match as a substring or by a trigram word similarity of at least
+    ``SEARCH_INDEX_SIMILARITY_THRESHOLD``; the GIN trigram index serves both
+    through ``LIKE`` and the ``%>`` operator, and the stricter bound is
+    checked on the rows it returns. Shorter tokens, which trigrams cannot
+    serve, match as a substring, so ``12`` still finds ``K12``. Documents
+    starting with the whole term rank first, then by word similarity.
+
+    Args:
+        search_term: Raw search input; tokenized on whitespace.
+        entity_types: Optional iterable of ``SearchIndex.EntityType`` values
+            to restrict the search to.
+        project_id: Optional project ID to scope results.
+
+    Returns:
+        QuerySet: Ranked entries annotated with ``similarity`` and
+            ``prefix_match``; empty for a blank term.
+    """
+    term = normalize_search_term(search_term)
+    if not term:
+        return SearchIndex.objects.none()
+
+    queryset = SearchIndex.objects.all()
+    if entity_types:
+        queryset = queryset.filter(entity_type__in=entity_types)
+    if project_id:
+        queryset = queryset.filter(project=project_id)
+
+    for index, token in enumerate(term.split()):
+        q = Q(document__contains=token)
+        if len(token) >= 3:
+            alias = f"token_similarity_{index}"
+            queryset = queryset.alias(
+                **{alias: TrigramWordSimilarity(token, "document")}
+            )
+            q |= Q(document__trigram_word_similar=token) & Q(
+                **{f"{alias}__gte": SEARCH_INDEX_SIMILARITY_THRESHOLD}
+            )
+        queryset = queryset.filter(q)
+
+    return queryset.annotate(
+        similarity=TrigramWordSimilarity(term, "document"),
+        prefix_match=Case(
+            When(document__startswith=term, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+    ).order_by("-prefix_match", "-similarity", "label")
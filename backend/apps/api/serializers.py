@@ -1,9 +1,21 @@
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import (
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.manager import BaseManager
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer, GeometryField
 
+from .fieldsets import SparseFieldsetMixin
 from .models import (
     Address,
     Area,
@@ -284,7 +296,7 @@ class AttributesComponentStructureSerializer(serializers.ModelSerializer):
         fields = ["id", "component_type", "in_or_out", "port", "port_alias"]
 
 
-class TrenchSerializer(GeoFeatureModelSerializer):
+class TrenchSerializer(SparseFieldsetMixin, GeoFeatureModelSerializer):
     """Serialize :model:`api.Trench` as GeoJSON with nested attribute objects.
 
     Read operations return nested serializers for FK fields (surface,
@@ -458,7 +470,7 @@ class FeatureFilesSerializer(serializers.ModelSerializer):
         return fields
 
 
-class ConduitSerializer(serializers.ModelSerializer):
+class ConduitSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serialize :model:`api.Conduit` with nested attribute objects.
 
     Read operations return nested serializers for FK fields.
@@ -560,7 +572,7 @@ class ConduitSerializer(serializers.ModelSerializer):
         return fields
 
 
-class ConduitListSerializer(serializers.ModelSerializer):
+class ConduitListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for paginated conduit lists (no nested serializers)."""
 
     conduit_type = serializers.CharField(
@@ -662,7 +674,7 @@ class TrenchConduitCanvasSerializer(serializers.ModelSerializer):
         read_only_fields = ["uuid", "conduit_name", "conduit_type_name"]
 
 
-class AddressSerializer(GeoFeatureModelSerializer):
+class AddressSerializer(SparseFieldsetMixin, GeoFeatureModelSerializer):
     """Serialize :model:`api.Address` as GeoJSON with nested attribute objects.
 
     Geometry is validated as Point in EPSG:25832. Includes a read-only
@@ -706,7 +718,7 @@ class AddressSerializer(GeoFeatureModelSerializer):
     class Meta:
         model = Address
         geo_field = "geom"
-        fields = "__all__"
+        exclude = ["search_text"]
         ordering = ["street", "housenumber", "house_number_suffix"]
 
     def get_fields(self):
@@ -757,7 +769,7 @@ class AddressSerializer(GeoFeatureModelSerializer):
         return value
 
 
-class AddressListSerializer(serializers.ModelSerializer):
+class AddressListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for paginated address lists (no geometry)."""
 
     status_development = serializers.CharField(
@@ -877,7 +889,7 @@ class ParentNodeSerializer(serializers.ModelSerializer):
         fields = ["uuid", "name"]
 
 
-class NodeSerializer(GeoFeatureModelSerializer):
+class NodeSerializer(SparseFieldsetMixin, GeoFeatureModelSerializer):
     """Serialize :model:`api.Node` as GeoJSON with nested attribute objects.
 
     Includes canvas position fields for diagram rendering and an
@@ -1012,7 +1024,7 @@ class NodeSerializer(GeoFeatureModelSerializer):
         return fields
 
 
-class AreaSerializer(GeoFeatureModelSerializer):
+class AreaSerializer(SparseFieldsetMixin, GeoFeatureModelSerializer):
     """Serialize :model:`api.Area` as GeoJSON with Polygon geometry validation."""
 
     uuid = serializers.UUIDField(read_only=True)
@@ -1124,11 +1136,81 @@ class MicroductSerializer(serializers.ModelSerializer):
         allow_null=True,
     )
 
+    CABLE_CONNECTIONS_ATTR = "prefetched_cable_connections"
+    HEX_CODES_CONTEXT_KEY = "microduct_hex_codes"
+
     class Meta:
         model = Microduct
         fields = "__all__"
         ordering = ["number"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, prefix=""):
+        """Load everything the serializer reads with a fixed number of queries.
+
+        Joins the nested conduit, node and status and prefetches the cable
+        connections read by :meth:`get_cable_connection`.
+
+        Args:
+            queryset: Queryset of the microducts, or of a model pointing to
+                them when ``prefix`` is given.
+            prefix: Lookup path to the microduct, e.g. ``"uuid_microduct_from__"``.
+
+        Returns:
+            QuerySet: The queryset with joins and prefetches applied.
+        """
+        related = [
+            "uuid_conduit__conduit_type",
+            "uuid_conduit__status",
+            "uuid_conduit__network_level",
+            "uuid_conduit__owner",
+            "uuid_conduit__constructor",
+            "uuid_conduit__manufacturer",
+            "uuid_conduit__project",
+            "uuid_conduit__flag",
+            "microduct_status",
+            "uuid_node__uuid_address__status_development",
+            "uuid_node__uuid_address__flag",
+            "uuid_node__uuid_address__project",
+            "uuid_node__node_type",
+            "uuid_node__status",
+            "uuid_node__network_level",
+            "uuid_node__owner",
+            "uuid_node__constructor",
+            "uuid_node__manufacturer",
+            "uuid_node__project",
+            "uuid_node__flag",
+            "uuid_node__parent_node",
+        ]
+        return queryset.select_related(
+            *(f"{prefix}{lookup}" for lookup in related)
+        ).prefetch_related(
+            Prefetch(
+                f"{prefix}microductcableconnection_set",
+                queryset=MicroductCableConnection.objects.select_related(
+                    "uuid_cable__cable_type"
+                ),
+                to_attr=cls.CABLE_CONNECTIONS_ATTR,
+            )
+        )
+
+    def _hex_codes(self):
+        """Return active color names mapped to hex codes.
+
+        The map is loaded once and kept in the serializer context, so all
+        microducts of a request share a single query.
+        """
+        hex_codes = self.context.get(self.HEX_CODES_CONTEXT_KEY)
+        if hex_codes is None:
+            hex_codes = {
+                name_de.lower(): hex_code
+                for name_de, hex_code in AttributesMicroductColor.objects.filter(
+                    is_active=True
+                ).values_list("name_de", "hex_code")
+            }
+            self.context[self.HEX_CODES_CONTEXT_KEY] = hex_codes
+        return hex_codes
+
     def get_hex_code(self, obj):
         """Return primary hex code from :model:`api.AttributesMicroductColor`.
 
@@ -1145,13 +1227,7 @@ class MicroductSerializer(serializers.ModelSerializer):
         if "-" in color_name:
             color_name = color_name.split("-")[0]
 
-        try:
-            color_obj = AttributesMicroductColor.objects.get(
-                name_de__iexact=color_name, is_active=True
-            )
-            return color_obj.hex_code
-        except AttributesMicroductColor.DoesNotExist:
-            return "#64748b"
+        return self._hex_codes().get(color_name, "#64748b")
 
     def get_hex_code_secondary(self, obj):
         """Return secondary hex code for two-layer (striped) colors.
@@ -1168,13 +1244,7 @@ class MicroductSerializer(serializers.ModelSerializer):
 
         color_name = obj.color.lower().split("-")[1]
 
-        try:
-            color_obj = AttributesMicroductColor.objects.get(
-                name_de__iexact=color_name, is_active=True
-            )
-            return color_obj.hex_code
-        except AttributesMicroductColor.DoesNotExist:
-            return None
+        return self._hex_codes().get(color_name)
 
     def get_is_two_layer(self, obj):
         """Check if the microduct has a two-layer/striped color (dash-separated name).
@@ -1193,14 +1263,21 @@ class MicroductSerializer(serializers.ModelSerializer):
         Args:
             obj: Microduct instance.
 
+        Uses the connections loaded by :meth:`setup_eager_loading` when
+        present and queries them otherwise.
+
         Returns:
             dict | None: Cable name and type, or None if no connection exists.
         """
-        connection = (
-            MicroductCableConnection.objects.filter(uuid_microduct=obj)
-            .select_related("uuid_cable__cable_type")
-            .first()
-        )
+        connections = getattr(obj, self.CABLE_CONNECTIONS_ATTR, None)
+        if connections is not None:
+            connection = connections[0] if connections else None
+        else:
+            connection = (
+                MicroductCableConnection.objects.filter(uuid_microduct=obj)
+                .select_related("uuid_cable__cable_type")
+                .first()
+            )
         if not connection:
             return None
         cable = connection.uuid_cable
@@ -1293,7 +1370,7 @@ class MicroductConnectionSerializer(serializers.ModelSerializer):
         return fields
 
 
-class CableSerializer(serializers.ModelSerializer):
+class CableSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serialize :model:`api.Cable` with start/end node references.
 
     Enforces unique cable name per project. Includes computed fields
@@ -1607,28 +1684,36 @@ class NodeStructureBulkCreateSerializer(serializers.Serializer):
     occupied_slots_per_component = serializers.IntegerField(min_value=1)
 
 
-class NodeSlotConfigurationSerializer(serializers.ModelSerializer):
-    """Serialize :model:`api.NodeSlotConfiguration` with computed slot usage."""
+class SlotUsageMixin:
+    """Slot usage fields for :model:`api.NodeSlotConfiguration` serializers.
 
-    uuid = serializers.UUIDField(read_only=True)
+    Used slots are read from the ``used_slot_count`` annotation added by
+    :meth:`annotate_used_slots`. Without it they are summed from the
+    configuration's structures once per instance.
+    """
 
-    uuid_node = NodeSerializer(read_only=True)
+    USED_SLOTS_ANNOTATION = "used_slot_count"
 
-    uuid_node_id = serializers.PrimaryKeyRelatedField(
-        write_only=True,
-        queryset=Node.objects.all(),
-        source="uuid_node",
-    )
-    side = serializers.CharField(required=True, max_length=50)
-    total_slots = serializers.IntegerField(required=True)
+    @classmethod
+    def annotate_used_slots(cls, queryset):
+        """Annotate each configuration with the slots its structures occupy.
 
-    used_slots = serializers.SerializerMethodField(read_only=True)
-    free_slots = serializers.SerializerMethodField(read_only=True)
+        Args:
+            queryset: NodeSlotConfiguration queryset.
 
-    class Meta:
-        model = NodeSlotConfiguration
-        fields = "__all__"
-        ordering = ["uuid_node", "side"]
+        Returns:
+            QuerySet: The queryset with a ``used_slot_count`` annotation.
+        """
+        used = (
+            NodeStructure.objects.filter(slot_configuration=OuterRef("pk"))
+            .order_by()
+            .values("slot_configuration")
+            .annotate(total=Sum(F("slot_end") - F("slot_start") + 1))
+            .values("total")
+        )
+        return queryset.annotate(
+            **{cls.USED_SLOTS_ANNOTATION: Coalesce(Subquery(used), 0)}
+        )
 
     def get_used_slots(self, obj):
         """Calculate total occupied slots from :model:`api.NodeStructure` entries.
@@ -1639,8 +1724,11 @@ class NodeSlotConfigurationSerializer(serializers.ModelSerializer):
         Returns:
             int: Sum of slot ranges occupied by structures.
         """
-        structures = obj.structures.all()
-        return sum(s.slot_end - s.slot_start + 1 for s in structures)
+        used = getattr(obj, self.USED_SLOTS_ANNOTATION, None)
+        if used is None:
+            used = sum(s.slot_end - s.slot_start + 1 for s in obj.structures.all())
+            setattr(obj, self.USED_SLOTS_ANNOTATION, used)
+        return used
 
     def get_free_slots(self, obj):
         """Calculate remaining available slots.
@@ -1653,6 +1741,30 @@ class NodeSlotConfigurationSerializer(serializers.ModelSerializer):
         """
         return obj.total_slots - self.get_used_slots(obj)
 
+
+class NodeSlotConfigurationSerializer(SlotUsageMixin, serializers.ModelSerializer):
+    """Serialize :model:`api.NodeSlotConfiguration` with computed slot usage."""
+
+    uuid = serializers.UUIDField(read_only=True)
+
+    uuid_node = NodeSerializer(read_only=True)
+
+    uuid_node_id = serializers.PrimaryKeyRelatedField(
+        write_only=True,
+        queryset=Node.objects.all(),
+        source="uuid_node",
+    )
+    side = serializers.CharField(required=True, max_length=50)
+    total_slots = serializers.IntegerField(required=True)
+
+    used_slots = serializers.SerializerMethodField(read_only=True)
+    free_slots = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = NodeSlotConfiguration
+        fields = "__all__"
+        ordering = ["uuid_node", "side"]
+
     def get_fields(self):
         """Dynamically translate field labels."""
         fields = super().get_fields()
@@ -1870,6 +1982,23 @@ class NodeSlotClipNumberSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class FiberSpliceListSerializer(serializers.ListSerializer):
+    """Serialize many :model:`api.FiberSplice` rows with batched lookups.
+
+    Splice closures can have a thousand ports, so the fibers, cables and
+    residential units the rows refer to are loaded with one query per
+    relation (none if already joined), and the ports of every referenced
+    merge group with a single query.
+    """
+
+    def to_representation(self, data):
+        """Load shared lookups for all splices, then serialize each one."""
+        splices = list(data.all() if isinstance(data, BaseManager) else data)
+        prefetch_related_objects(splices, *FiberSpliceSerializer.RELATED_FIELDS)
+        self.child.preload_merge_groups(splices)
+        return super().to_representation(splices)
+
+
 class FiberSpliceSerializer(serializers.ModelSerializer):
     """Serialize :model:`api.FiberSplice` with fiber details and merge group info.
 
@@ -1878,6 +2007,20 @@ class FiberSpliceSerializer(serializers.ModelSerializer):
     Include residential unit endpoint details for connection tracking.
     """
 
+    RELATED_FIELDS = (
+        "fiber_a",
+        "cable_a",
+        "fiber_b",
+        "cable_b",
+        "shared_fiber_a",
+        "shared_cable_a",
+        "shared_fiber_b",
+        "shared_cable_b",
+        "residential_unit_a",
+        "residential_unit_b",
+    )
+    MERGE_GROUPS_CONTEXT_KEY = "fiber_splice_merge_groups"
+
     fiber_a_details = serializers.SerializerMethodField()
     fiber_b_details = serializers.SerializerMethodField()
     merge_group_a_info = serializers.SerializerMethodField()
@@ -1887,6 +2030,7 @@ class FiberSpliceSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = FiberSplice
+        list_serializer_class = FiberSpliceListSerializer
         fields = [
             "uuid",
             "node_structure",
@@ -1911,6 +2055,37 @@ class FiberSpliceSerializer(serializers.ModelSerializer):
             "residential_unit_b_details",
         ]
 
+    def preload_merge_groups(self, splices):
+        """Load the port numbers of all merge groups used by ``splices``.
+
+        The ports are stored in the serializer context, keyed by side and
+        merge group, where :meth:`_get_merge_group_info` looks them up.
+
+        Args:
+            splices: FiberSplice instances about to be serialized.
+        """
+        groups_a = {s.merge_group_a for s in splices if s.merge_group_a}
+        groups_b = {s.merge_group_b for s in splices if s.merge_group_b}
+        merge_groups = self.context.setdefault(self.MERGE_GROUPS_CONTEXT_KEY, {})
+        for side, groups in (("a", groups_a), ("b", groups_b)):
+            for group in groups:
+                merge_groups.setdefault((side, group), [])
+        if not groups_a and not groups_b:
+            return
+
+        rows = (
+            FiberSplice.objects.filter(
+                Q(merge_group_a__in=groups_a) | Q(merge_group_b__in=groups_b)
+            )
+            .order_by("port_number")
+            .values_list("merge_group_a", "merge_group_b", "port_number")
+        )
+        for group_a, group_b, port_number in rows:
+            if group_a in groups_a:
+                merge_groups[("a", group_a)].append(port_number)
+            if group_b in groups_b:
+                merge_groups[("b", group_b)].append(port_number)
+
     def _get_fiber_details(self, fiber, cable):
         """Build a fiber details dict for serialized output.
 
@@ -1974,11 +2149,15 @@ class FiberSpliceSerializer(serializers.ModelSerializer):
         if not merge_group:
             return None
 
-        siblings = list(
-            FiberSplice.objects.filter(**{f"merge_group_{side}": merge_group})
-            .values_list("port_number", flat=True)
-            .order_by("port_number")
-        )
+        merge_groups = self.context.setdefault(self.MERGE_GROUPS_CONTEXT_KEY, {})
+        siblings = merge_groups.get((side, merge_group))
+        if siblings is None:
+            siblings = list(
+                FiberSplice.objects.filter(**{f"merge_group_{side}": merge_group})
+                .values_list("port_number", flat=True)
+                .order_by("port_number")
+            )
+            merge_groups[(side, merge_group)] = siblings
 
         if not siblings:
             return None
@@ -2207,6 +2386,9 @@ class ContainerTreeSerializer(serializers.ModelSerializer):
     children = serializers.SerializerMethodField()
     slot_configurations = serializers.SerializerMethodField()
 
+    CHILDREN_CONTEXT_KEY = "container_children"
+    SLOT_CONFIGURATIONS_CONTEXT_KEY = "container_slot_configurations"
+
     class Meta:
         model = Container
         fields = [
@@ -2234,31 +2416,48 @@ class ContainerTreeSerializer(serializers.ModelSerializer):
     def get_children(self, obj):
         """Recursively serialize child containers ordered by sort_order.
 
+        Children are taken from the ``container_children`` context map
+        (parent UUID to ordered children) when present, otherwise queried.
+
         Args:
             obj: Container instance.
 
         Returns:
             list[dict]: Serialized child containers.
         """
-        children = obj.children.all().order_by("sort_order")
+        children_by_parent = self.context.get(self.CHILDREN_CONTEXT_KEY)
+        if children_by_parent is not None:
+            children = children_by_parent.get(obj.uuid, [])
+        else:
+            children = obj.children.all().order_by("sort_order")
         return ContainerTreeSerializer(children, many=True, context=self.context).data
 
     def get_slot_configurations(self, obj):
         """Serialize :model:`api.NodeSlotConfiguration` entries in this container.
 
+        Configurations are taken from the ``container_slot_configurations``
+        context map (container UUID to ordered configurations) when present,
+        otherwise queried.
+
         Args:
             obj: Container instance.
 
         Returns:
             list[dict]: Serialized slot configurations.
         """
-        configs = obj.slot_configurations.all().order_by("sort_order", "side")
+        configs_by_container = self.context.get(self.SLOT_CONFIGURATIONS_CONTEXT_KEY)
+        if configs_by_container is not None:
+            configs = configs_by_container.get(obj.uuid, [])
+        else:
+            configs = obj.slot_configurations.all().order_by("sort_order", "side")
         return NodeSlotConfigurationListSerializer(
             configs, many=True, context=self.context
         ).data
 
 
-class NodeSlotConfigurationListSerializer(serializers.ModelSerializer):
+class NodeSlotConfigurationListSerializer(
+    SlotUsageMixin, serializers.ModelSerializer
+):
     """Lightweight :model:`api.NodeSlotConfiguration` serializer for container trees.
 
     Exclude nested node data to avoid circular references. Include
@@ -2280,29 +2479,6 @@ class NodeSlotConfigurationListSerializer(serializers.ModelSerializer):
             "free_slots",
         ]
 
-    def get_used_slots(self, obj):
-        """Calculate total occupied slots from :model:`api.NodeStructure` entries.
-
-        Args:
-            obj: NodeSlotConfiguration instance.
-
-        Returns:
-            int: Sum of slot ranges occupied by structures.
-        """
-        structures = obj.structures.all()
-        return sum(s.slot_end - s.slot_start + 1 for s in structures)
-
-    def get_free_slots(self, obj):
-        """Calculate remaining available slots.
-
-        Args:
-            obj: NodeSlotConfiguration instance.
-
-        Returns:
-            int: Total slots minus used slots.
-        """
-        return obj.total_slots - self.get_used_slots(obj)
-
 
 class FiberSerializer(serializers.ModelSerializer):
     """Serialize :model:`api.Fiber` with cable name and fiber status."""
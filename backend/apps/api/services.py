@@ -25,12 +25,14 @@ from shapely import is_valid, make_valid
 from shapely.geometry import LineString, MultiLineString, Point, Polygon, mapping, shape
 from shapely.ops import linemerge, substring
 
+from .flatgeobuf import flatgeobuf_stream, infer_columns
 from .models import (
     Address,
     Area,
     AttributesCompany,
     AttributesComponentStructure,
     AttributesConduitType,
+    AttributesFiberColor,
     AttributesMicroductColor,
     AttributesNetworkLevel,
     AttributesStatus,
@@ -49,6 +51,7 @@ from .models import (
     PipelineInquiryArea,
     PipelineRecord,
     Projects,
+    ResidentialUnitFiberIndex,
     StoragePreferences,
     Trench,
     TrenchConduitConnection,
@@ -2251,7 +2254,8 @@ def trace_address(
     """Trace all fibers connected to an :model:`api.Address`.
 
     Collect fibers via nodes linked to this address and via residential
-    units under this address that participate in fiber splices.
+    units under this address, the latter read from
+    :model:`api.ResidentialUnitFiberIndex`.
 
     Args:
         address_id: UUID of the address.
@@ -2278,15 +2282,11 @@ def trace_address(
         UNION
 
         -- Fibers connected to residential units under this address
-        SELECT DISTINCT
-            COALESCE(fs.fiber_a, fs.shared_fiber_a, fs.fiber_b, fs.shared_fiber_b) as fiber_id
+        SELECT DISTINCT idx.entry_fiber as fiber_id
         FROM residential_unit ru
-        JOIN fiber_splice fs ON (
-            fs.residential_unit_a_id = ru.uuid OR fs.residential_unit_b_id = ru.uuid
-        )
+        JOIN residential_unit_fiber_index idx ON idx.residential_unit = ru.uuid
         WHERE ru.uuid_address = %(address_id)s
-          AND (fs.fiber_a IS NOT NULL OR fs.shared_fiber_a IS NOT NULL
-               OR fs.fiber_b IS NOT NULL OR fs.shared_fiber_b IS NOT NULL)
+          AND idx.entry_fiber IS NOT NULL
     ) combined
     WHERE fiber_id IS NOT NULL
     """
@@ -2367,6 +2367,8 @@ def trace_residential_unit(
 ) -> dict:
     """Trace all fibers connected to a :model:`api.ResidentialUnit` via fiber splices.
 
+    Starting fibers are read from :model:`api.ResidentialUnitFiberIndex`.
+
     Args:
         residential_unit_id: UUID of the residential unit.
         include_geometry (bool): If ``True``, include trench geometry.
@@ -2378,12 +2380,10 @@ def trace_residential_unit(
             ``'cable_infrastructure'``, and ``'statistics'``.
     """
     sql = """
-    SELECT DISTINCT
-        COALESCE(fs.fiber_a, fs.shared_fiber_a, fs.fiber_b, fs.shared_fiber_b) as fiber_id
-    FROM fiber_splice fs
-    WHERE (fs.residential_unit_a_id = %(ru_id)s OR fs.residential_unit_b_id = %(ru_id)s)
-      AND (fs.fiber_a IS NOT NULL OR fs.shared_fiber_a IS NOT NULL
-           OR fs.fiber_b IS NOT NULL OR fs.shared_fiber_b IS NOT NULL)
+    SELECT DISTINCT idx.entry_fiber as fiber_id
+    FROM residential_unit_fiber_index idx
+    WHERE idx.residential_unit = %(ru_id)s
+      AND idx.entry_fiber IS NOT NULL
     """
 
     entry_point = _get_entry_point_info(
@@ -2456,6 +2456,67 @@ def trace_residential_unit(
     }
 
 
+def get_residential_unit_fiber_connections(residential_unit_ids) -> dict:
+    """Resolve the fibers serving each residential unit.
+
+    Read from :model:`api.ResidentialUnitFiberIndex`, so the lookup is a single
+    indexed query regardless of how many splices exist in the project.
+
+    Args:
+        residential_unit_ids: Iterable of :model:`api.ResidentialUnit` UUIDs.
+
+    Returns:
+        dict: Maps each unit UUID (as string) to a list of connection dicts
+            with node, cable, fiber and color details. Units without a
+            connection map to an empty list.
+    """
+    residential_unit_ids = list(residential_unit_ids)
+    result = {str(unit_id): [] for unit_id in residential_unit_ids}
+    if not residential_unit_ids:
+        return result
+
+    color_map = {}
+    for color in AttributesFiberColor.objects.filter(is_active=True):
+        color_map[color.name_de] = color.hex_code
+        color_map[color.name_en] = color.hex_code
+
+    entries = (
+        ResidentialUnitFiberIndex.objects.filter(
+            residential_unit__in=residential_unit_ids,
+            fiber__isnull=False,
+            cable__isnull=False,
+        )
+        .select_related(
+            "fiber",
+            "cable",
+            "fiber_splice__node_structure__uuid_node__parent_node",
+        )
+        .order_by("fiber_splice__node_structure", "fiber_splice__port_number", "side")
+    )
+
+    for entry in entries:
+        fiber = entry.fiber
+        node = entry.fiber_splice.node_structure.uuid_node
+        result[str(entry.residential_unit_id)].append(
+            {
+                "node_name": node.name or "",
+                "parent_node_name": (
+                    node.parent_node.name or "" if node.parent_node else ""
+                ),
+                "cable_name": entry.cable.name,
+                "fiber_number_absolute": fiber.fiber_number_absolute,
+                "bundle_number": fiber.bundle_number,
+                "bundle_color": fiber.bundle_color,
+                "bundle_color_hex": color_map.get(fiber.bundle_color, "#999999"),
+                "fiber_number": fiber.fiber_number_in_bundle,
+                "fiber_color": fiber.fiber_color,
+                "fiber_color_hex": color_map.get(fiber.fiber_color, "#999999"),
+            }
+        )
+
+    return result
+
+
 def _get_starting_fiber_splices(fiber_id) -> list[dict]:
     """
     Get splice info for a fiber where it sits in a splice (as fiber_a or fiber_b)
@@ -4755,12 +4816,13 @@ _LAYER_STYLES = {
 }
 
 
-def _build_qlr(layer_names):
+def _build_qlr(layer_names, extension="geojson"):
     """Build a QGIS Layer Definition (QLR) XML string.
 
     Args:
         layer_names (list[str]): Layer names that have features and were
-            written as GeoJSON files.
+            written as layer files.
+        extension (str): File extension of the layer files.
 
     Returns:
         str: UTF-8 encoded QLR XML.
@@ -4785,7 +4847,7 @@ def _build_qlr(layer_names):
                 "layer-tree-layer",
                 id=f"{name}_layer",
                 name=name,
-                source=f"./layers/{name}.geojson",
+                source=f"./layers/{name}.{extension}",
                 providerKey="ogr",
                 checked="Qt::Checked",
             )
@@ -4802,7 +4864,7 @@ def _build_qlr(layer_names):
                     "layer-tree-layer",
                     id=f"{sub}_layer",
                     name=sub,
-                    source=f"./layers/{sub}.geojson",
+                    source=f"./layers/{sub}.{extension}",
                     providerKey="ogr",
                     checked="Qt::Checked",
                 )
@@ -4817,7 +4879,7 @@ def _build_qlr(layer_names):
             "layer-tree-layer",
             id="cables_layer",
             name="cables",
-            source="./layers/cables.geojson",
+            source=f"./layers/cables.{extension}",
             providerKey="ogr",
             checked="Qt::Checked",
         )
@@ -4831,7 +4893,7 @@ def _build_qlr(layer_names):
         )
         ET.SubElement(ml, "id").text = f"{name}_layer"
         ET.SubElement(ml, "layername").text = name
-        ET.SubElement(ml, "datasource").text = f"./layers/{name}.geojson"
+        ET.SubElement(ml, "datasource").text = f"./layers/{name}.{extension}"
         ET.SubElement(ml, "provider").text = "ogr"
 
         srs = ET.SubElement(ml, "srs")
@@ -4882,7 +4944,10 @@ _FEATURE_BUILDERS = {
 }
 
 
-def build_inquiry_export_zip(pipeline_record_uuid):
+INQUIRY_LAYER_FORMATS = ("geojson", "fgb")
+
+
+def build_inquiry_export_zip(pipeline_record_uuid, layer_format="geojson"):
     """Build a ZIP archive with GeoJSON layers and feature files for a pipeline inquiry.
 
     Query all :model:`api.PipelineInquiryArea` polygons for the given record,
@@ -4896,18 +4961,24 @@ def build_inquiry_export_zip(pipeline_record_uuid):
     Args:
         pipeline_record_uuid (str | uuid.UUID): UUID of the
             :model:`api.PipelineRecord`.
+        layer_format (str): ``"geojson"``, or ``"fgb"`` for FlatGeobuf
+            layers.
 
     Returns:
-        BytesIO: ZIP archive containing ``layers/*.geojson`` files,
+        BytesIO: ZIP archive containing ``layers/*.geojson`` (or ``*.fgb``) files,
             ``inquiry_export.qlr``, and ``files/<feature>/<filename>``
             attachments.
 
     Raises:
-        ValueError: If no inquiry areas exist for the record or if the
-            geometry union is empty.
+        ValueError: If no inquiry areas exist for the record, if the
+            geometry union is empty or if ``layer_format`` is unknown.
     """
     from django.contrib.gis.db.models import Union
 
+    if layer_format not in INQUIRY_LAYER_FORMATS:
+        raise ValueError(_("Unsupported layer format: %s") % layer_format)
+    srid = getattr(settings, "DEFAULT_SRID", 25832)
+
     pipeline_record = PipelineRecord.objects.get(pk=pipeline_record_uuid)
     project = pipeline_record.project
 
@@ -5045,7 +5116,30 @@ def build_inquiry_export_zip(pipeline_record_uuid):
                 )
                 feature_uuids.add(obj.uuid)
 
-            if features:
+            if not features:
+                continue
+            if layer_format == "fgb":
+                properties = [feature["properties"] for feature in features]
+                geometries = [
+                    shape(feature["geometry"]) if feature["geometry"] else None
+                    for feature in features
+                ]
+                geometry_types = {
+                    geometry.geom_type
+                    for geometry in geometries
+                    if geometry is not None
+                }
+                chunks = flatgeobuf_stream(
+                    zip(properties, geometries),
+                    layer_name,
+                    infer_columns(properties),
+                    srid,
+                    geometry_types.pop() if len(geometry_types) == 1 else None,
+                )
+                with zf.open(f"layers/{layer_name}.fgb", "w") as layer_file:
+                    for chunk in chunks:
+                        layer_file.write(chunk)
+            else:
                 geojson = {
                     "type": "FeatureCollection",
                     "features": features,
@@ -5054,10 +5148,12 @@ def build_inquiry_export_zip(pipeline_record_uuid):
                     f"layers/{layer_name}.geojson",
                     json.dumps(geojson, ensure_ascii=False, indent=2),
                 )
-                written_layers.append(layer_name)
+            written_layers.append(layer_name)
 
         if written_layers:
-            zf.writestr("inquiry_export.qlr", _build_qlr(written_layers))
+            zf.writestr(
+                "inquiry_export.qlr", _build_qlr(written_layers, layer_format)
+            )
 
         if feature_uuids:
             content_types = ContentType.objects.filter(
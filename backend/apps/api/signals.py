@@ -1,23 +1,34 @@
-"""Signal handlers for permission cache invalidation.
+"""Signal handlers for cache invalidation.
 
-Listens to changes on :model:`api.ModelPermission`,
-:model:`api.RoutePermission`, and user-group M2M relations to keep
-the per-user permission cache in sync.
+Listens to changes on :model:`api.ModelPermission` and
+:model:`api.RoutePermission` to bump the permission version, and on
+user-group M2M relations to drop the cached group IDs of a user, and to changes on project
+features to bump the project data version that keys derived caches
+such as the dashboard statistics.
 """
 
+from functools import partial
+
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
+from .caching import bump_version_on_commit, project_namespace
+from .permissions import PERMISSIONS_NAMESPACE, user_groups_cache_key
+
 
 User = get_user_model()
 
 
 def invalidate_all_permission_caches():
-    """Delete the cached permission set for every user."""
-    for user_id in User.objects.values_list("id", flat=True):
-        cache.delete(f"user_permissions:{user_id}")
+    """Invalidate the compiled permissions of every group set, on commit.
+
+    A request racing the change could otherwise cache the old grants under
+    the new version.
+    """
+    bump_version_on_commit(PERMISSIONS_NAMESPACE)
 
 
 @receiver(post_save, sender="api.ModelPermission")
@@ -45,13 +56,93 @@ def invalidate_on_route_permission_change(sender, **kwargs):
 
 
 @receiver(m2m_changed, sender=User.groups.through)
-def invalidate_on_user_group_change(sender, instance, **kwargs):
-    """Invalidate the permission cache for a user whose group membership changed.
+def invalidate_on_user_group_change(sender, instance, action, pk_set, **kwargs):
+    """Drop the cached group IDs of users whose group membership changed.
+
+    Compiled permissions are keyed by group set, so they stay valid.
 
     Args:
         sender: The intermediary M2M model class.
-        instance: The User instance whose groups changed.
+        instance: The User (or Group, for reverse changes) that changed.
+        action: The M2M action, e.g. ``"post_add"``.
+        pk_set: Primary keys of the related objects, or ``None`` on clear.
         **kwargs: Signal keyword arguments.
     """
+    if not action.startswith("post_") and action != "pre_clear":
+        return
     if isinstance(instance, User):
-        cache.delete(f"user_permissions:{instance.pk}")
+        user_ids = [instance.pk]
+    elif action == "pre_clear":
+        # A cleared group no longer knows its members after the fact.
+        user_ids = list(instance.user_set.values_list("pk", flat=True))
+    elif pk_set:
+        user_ids = list(pk_set)
+    else:
+        return
+    # Dropped on commit, so a racing request cannot cache the old groups.
+    transaction.on_commit(
+        partial(cache.delete_many, [user_groups_cache_key(pk) for pk in user_ids])
+    )
+
+
+@receiver(post_save, sender="api.Trench")
+@receiver(post_delete, sender="api.Trench")
+@receiver(post_save, sender="api.Node")
+@receiver(post_delete, sender="api.Node")
+@receiver(post_save, sender="api.Address")
+@receiver(post_delete, sender="api.Address")
+@receiver(post_save, sender="api.Conduit")
+@receiver(post_delete, sender="api.Conduit")
+@receiver(post_save, sender="api.Area")
+@receiver(post_delete, sender="api.Area")
+def invalidate_on_project_feature_change(sender, instance, **kwargs):
+    """Bump the data version of the project a feature belongs to, on commit.
+
+    Args:
+        sender: The model class that sent the signal.
+        instance: The saved or deleted feature.
+        **kwargs: Signal keyword arguments.
+    """
+    bump_version_on_commit(project_namespace(instance.project_id))
+
+
+@receiver(post_save, sender="api.ResidentialUnit")
+@receiver(post_delete, sender="api.ResidentialUnit")
+def invalidate_on_residential_unit_change(sender, instance, **kwargs):
+    """Bump the data version of the project of a residential unit's address.
+
+    Args:
+        sender: The model class that sent the signal.
+        instance: The saved or deleted :model:`api.ResidentialUnit`.
+        **kwargs: Signal keyword arguments.
+    """
+    from .models import Address
+
+    project_id = (
+        Address.objects.filter(uuid=instance.uuid_address_id)
+        .values_list("project_id", flat=True)
+        .first()
+    )
+    if project_id is not None:
+        bump_version_on_commit(project_namespace(project_id))
+
+
+@receiver(post_save, sender="api.TrenchConduitConnection")
+@receiver(post_delete, sender="api.TrenchConduitConnection")
+def invalidate_on_trench_conduit_change(sender, instance, **kwargs):
+    """Bump the data version of the project of a connected conduit.
+
+    Args:
+        sender: The model class that sent the signal.
+        instance: The saved or deleted :model:`api.TrenchConduitConnection`.
+        **kwargs: Signal keyword arguments.
+    """
+    from .models import Conduit
+
+    project_id = (
+        Conduit.objects.filter(uuid=instance.uuid_conduit_id)
+        .values_list("project_id", flat=True)
+        .first()
+    )
+    if project_id is not None:
+        bump_version_on_commit(project_namespace(project_id))
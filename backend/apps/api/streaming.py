@@ -0,0 +1,581 @@
+"""Database-side JSON rendering for the large ``all`` list endpoints.
+
+DRF resolves every serializer field of every instance in Python, and
+rest_framework_gis converts each geometry through GEOS and OGR. For layers
+with tens of thousands of features that dominates the response time.
+
+The helpers here translate a serializer's readable fields into a single SQL
+expression that renders the same compact JSON text for a row inside
+PostgreSQL (``to_json`` for scalars, ``ST_AsGeoJSON`` for geometries). The
+rows are then streamed to the client in chunks, so neither the instances
+nor the complete document are ever held in memory. Serializers that cannot
+be translated are rendered by DRF instead, one chunk at a time.
+
+The database writes numbers the way PostgreSQL prints them, so the parsed
+documents are equal but the bytes may differ from DRF's output:
+
+* GeoJSON coordinates are rounded to 15 decimal places and integral ones
+  lose their ``.0`` (``[565000, 6050000]`` instead of
+  ``[565000.0, 6050000.0]``).
+* EWKT strings carry the shortest digits PostGIS round-trips, which may
+  differ from GEOS in the last digit.
+"""
+
+import functools
+import json
+import logging
+
+from django.contrib.gis.db.models import GeometryField as GeometryModelField
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    Func,
+    GeneratedField,
+    Q,
+    QuerySet,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
+from django.db.models.query import ModelIterable
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework_gis.fields import GeometryField
+from rest_framework_gis.serializers import GeoFeatureModelSerializer
+
+from .fieldsets import apply_fieldset
+from .pageination import KeysetPagination
+
+logger = logging.getLogger(__name__)
+
+ROW_ALIAS = "json_row"
+STREAM_CHUNK_SIZE = 2000
+GEOJSON_MAX_DECIMAL_DIGITS = 15
+
+# Placeholder marking where the streamed rows go inside a response envelope.
+ROWS = "\x00rows\x00"
+
+_INTEGER_TYPES = {
+    "AutoField",
+    "BigAutoField",
+    "SmallAutoField",
+    "IntegerField",
+    "BigIntegerField",
+    "SmallIntegerField",
+    "PositiveIntegerField",
+    "PositiveBigIntegerField",
+    "PositiveSmallIntegerField",
+}
+_NUMERIC_TYPES = _INTEGER_TYPES | {"FloatField", "DecimalField"}
+_TEXT_TYPES = _INTEGER_TYPES | {
+    "CharField",
+    "TextField",
+    "SlugField",
+    "EmailField",
+    "URLField",
+    "UUIDField",
+}
+_PLAIN_TYPES = _TEXT_TYPES | _NUMERIC_TYPES | {"BooleanField"}
+
+# strftime directives used by the serializers and their to_char() patterns.
+_DATE_PATTERNS = {"%d": "DD", "%m": "MM", "%Y": "YYYY", "%y": "YY"}
+_DATE_LITERALS = set(".-/ ")
+
+
+class UnsupportedField(ImproperlyConfigured):
+    """Raised when a serializer field has no SQL rendering."""
+
+
+class _ToJSON(Func):
+    """Render a value as JSON text, ``null`` for SQL NULL."""
+
+    template = "COALESCE(TO_JSON(%(expressions)s)::text, 'null')"
+    output_field = TextField()
+
+
+class _GeoJSON(Func):
+    """Render a geometry the way rest_framework_gis' GeometryField does."""
+
+    template = (
+        "COALESCE(ST_AsGeoJSON(%(expressions)s, "
+        f"{GEOJSON_MAX_DECIMAL_DIGITS}, 0), 'null')"
+    )
+    output_field = TextField()
+
+
+class _EWKT(Func):
+    """Render a geometry as the EWKT string ``str(GEOSGeometry)`` returns.
+
+    GEOS writes ``LINESTRING (0 0, 1 1)`` where PostGIS writes
+    ``LINESTRING(0 0,1 1)``; the separators are adjusted to match.
+    """
+
+    output_field = TextField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        wkt = (
+            rf"REGEXP_REPLACE(REPLACE(ST_AsText({sql}), ',', ', '), "
+            r"'^(\w+)\(', '\1 (')"
+        )
+        srid = (
+            f"CASE WHEN ST_SRID({sql}) = 0 THEN '' "
+            f"ELSE 'SRID=' || ST_SRID({sql}) || ';' END"
+        )
+        return (
+            f"CASE WHEN {sql} IS NULL THEN 'null' "
+            f"ELSE TO_JSON({srid} || {wkt})::text END",
+            [*params, *params, *params, *params],
+        )
+
+
+class _JSONObject(Func):
+    """Concatenate ``(key, json_text)`` pairs into a compact JSON object.
+
+    ``JSON_BUILD_OBJECT`` pads separators with spaces and ``JSONB`` reorders
+    keys, so neither matches DRF's ``JSONRenderer`` output.
+    """
+
+    output_field = TextField()
+
+    def __init__(self, pairs):
+        self.keys = [key for key, _ in pairs]
+        super().__init__(*(value for _, value in pairs))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        if not self.keys:
+            return "'{}'", []
+
+        parts, params = [], []
+        for index, (key, expression) in enumerate(
+            zip(self.keys, self.get_source_expressions())
+        ):
+            sql, expression_params = compiler.compile(expression)
+            parts.append(f"%s::text || {sql}")
+            params.append(("{" if index == 0 else ",") + _dumps(key) + ":")
+            params.extend(expression_params)
+        return f"({' || '.join(parts)} || '}}')", params
+
+
+class _Missing(Exception):
+    """The source attribute does not exist on the model."""
+
+
+def _dumps(value) -> str:
+    """Encode ``value`` with the separators DRF's JSONRenderer uses."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _unsupported(field, reason: str) -> UnsupportedField:
+    """Build the error raised for a field without SQL rendering."""
+    return UnsupportedField(
+        f"Cannot render {field.parent.__class__.__name__}.{field.field_name} "
+        f"in SQL: {reason}."
+    )
+
+
+def _resolve(model, attrs):
+    """Map a DRF ``source`` path onto an ORM lookup.
+
+    Args:
+        model: Model class the path starts from.
+        attrs: ``field.source_attrs`` of the serializer field.
+
+    Returns:
+        tuple: ``(lookup, model_field, nullable_hops)`` where
+            ``nullable_hops`` lists the lookups of nullable relations that
+            are traversed before the final attribute.
+
+    Raises:
+        _Missing: If an attribute is neither a field nor any other
+            attribute of the model, i.e. DRF would raise AttributeError.
+        UnsupportedField: If an attribute is a property or method.
+    """
+    if not attrs:
+        raise UnsupportedField("source='*' cannot be rendered in SQL.")
+
+    lookup, nullable_hops = [], []
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            if hasattr(model, attr):
+                raise UnsupportedField(
+                    f"{model.__name__}.{attr} is not a database field."
+                )
+            raise _Missing
+
+        lookup.append(attr)
+        if index < len(attrs) - 1:
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise UnsupportedField(f"{attr} is not a forward relation.")
+            if model_field.null:
+                nullable_hops.append("__".join(lookup))
+            model = model_field.related_model
+
+    return "__".join(lookup), model_field, nullable_hops
+
+
+def _default_sql(field):
+    """Return the JSON text of ``field``'s default, or ``None`` if it has none."""
+    if field.default is empty:
+        return None
+    if isinstance(field, serializers.CharField) and isinstance(field.default, str):
+        return Value(_dumps(field.default))
+    raise _unsupported(field, "only string defaults of CharFields are supported")
+
+
+def _date_pattern(field, output_format):
+    """Translate a strftime ``output_format`` into a ``to_char`` pattern."""
+    pattern, index = [], 0
+    while index < len(output_format):
+        directive = output_format[index : index + 2]
+        if directive in _DATE_PATTERNS:
+            pattern.append(_DATE_PATTERNS[directive])
+            index += 2
+        elif output_format[index] in _DATE_LITERALS:
+            pattern.append(output_format[index])
+            index += 1
+        else:
+            raise _unsupported(field, f"date format {output_format!r}")
+    return "".join(pattern)
+
+
+def _scalar_sql(field, lookup, model_field):
+    """Return the JSON text expression of a non-nested serializer field."""
+    expression = F(lookup)
+    internal_type = model_field.get_internal_type()
+    is_geometry = isinstance(model_field, GeometryModelField) or (
+        isinstance(model_field, GeneratedField)
+        and isinstance(model_field.output_field, GeometryModelField)
+    )
+
+    if isinstance(field, GeometryField):
+        if (
+            field.precision is not None
+            or field.transform is not None
+            or field.remove_dupes
+            or field.auto_bbox
+        ):
+            raise _unsupported(field, "geometry options are not supported")
+        if not is_geometry:
+            raise _unsupported(field, "source is not a geometry column")
+        return _GeoJSON(expression)
+
+    if isinstance(field, serializers.ModelField):
+        if not is_geometry:
+            raise _unsupported(field, "only geometry model fields are supported")
+        return _EWKT(expression)
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None or not model_field.many_to_one:
+            raise _unsupported(field, "only plain foreign keys are supported")
+        return _ToJSON(expression)
+
+    if isinstance(field, serializers.RelatedField):
+        raise _unsupported(field, f"{type(field).__name__} is not supported")
+
+    if isinstance(field, serializers.DecimalField):
+        if field.localize or getattr(field, "normalize_output", False):
+            raise _unsupported(field, "localized decimals are not supported")
+        if internal_type not in _INTEGER_TYPES | {"DecimalField"}:
+            raise _unsupported(field, f"{internal_type} source")
+        value = Cast(expression, DecimalField())
+        if field.decimal_places is not None:
+            value = Func(
+                value,
+                template=f"ROUND(%(expressions)s, {int(field.decimal_places)})",
+                output_field=DecimalField(),
+            )
+        if field.coerce_to_string:
+            value = Cast(value, TextField())
+        return _ToJSON(value)
+
+    if isinstance(field, serializers.DateTimeField):
+        raise _unsupported(field, "datetimes are not supported")
+
+    if isinstance(field, serializers.DateField):
+        if internal_type != "DateField":
+            raise _unsupported(field, f"{internal_type} source")
+        output_format = (
+            api_settings.DATE_FORMAT if field.format is empty else field.format
+        )
+        if output_format is None or output_format.lower() == "iso-8601":
+            return _ToJSON(expression)
+        return _ToJSON(
+            Func(
+                expression,
+                Value(_date_pattern(field, output_format)),
+                function="TO_CHAR",
+                output_field=TextField(),
+            )
+        )
+
+    if isinstance(field, serializers.UUIDField):
+        if field.uuid_format != "hex_verbose" or internal_type != "UUIDField":
+            raise _unsupported(field, "only hyphenated UUID columns are supported")
+        return _ToJSON(expression)
+
+    if isinstance(field, serializers.CharField):
+        if internal_type not in _TEXT_TYPES:
+            raise _unsupported(field, f"{internal_type} source")
+        return _ToJSON(Cast(expression, TextField()))
+
+    if isinstance(field, serializers.BooleanField):
+        allowed = {"BooleanField"}
+    elif isinstance(field, serializers.IntegerField):
+        allowed = _INTEGER_TYPES
+    elif isinstance(field, serializers.FloatField):
+        allowed = _NUMERIC_TYPES
+    elif isinstance(field, serializers.MultipleChoiceField):
+        allowed = set()
+    elif isinstance(field, (serializers.ChoiceField, serializers.ReadOnlyField)):
+        allowed = _PLAIN_TYPES
+    else:
+        allowed = set()
+
+    if internal_type not in allowed:
+        raise _unsupported(field, f"{type(field).__name__} on {internal_type}")
+    return _ToJSON(expression)
+
+
+def _field_sql(field, model, prefix):
+    """Return the JSON text expression of one readable serializer field."""
+    if isinstance(field, serializers.ListSerializer) or isinstance(
+        field, serializers.ManyRelatedField
+    ):
+        raise _unsupported(field, "to-many fields are not supported")
+    if isinstance(field, serializers.SerializerMethodField):
+        raise _unsupported(field, "method fields are not supported")
+
+    default = _default_sql(field)
+    try:
+        lookup, model_field, nullable_hops = _resolve(model, field.source_attrs)
+    except _Missing:
+        # DRF swallows the AttributeError and falls back to the default.
+        if default is not None:
+            return default
+        if field.allow_null:
+            return Value("null")
+        raise _unsupported(field, "source does not exist")
+
+    if isinstance(field, serializers.BaseSerializer):
+        if not (model_field.many_to_one or model_field.one_to_one):
+            raise _unsupported(field, "nested source is not a forward relation")
+        value = _object_sql(
+            field, model_field.related_model, f"{prefix}{lookup}__"
+        )
+        if model_field.null:
+            value = Case(
+                When(**{f"{prefix}{lookup}__isnull": True}, then=Value("null")),
+                default=value,
+                output_field=TextField(),
+            )
+    else:
+        value = _scalar_sql(field, f"{prefix}{lookup}", model_field)
+
+    if not nullable_hops:
+        return value
+    if default is None:
+        if field.allow_null and not isinstance(field, serializers.BaseSerializer):
+            # The LEFT JOIN yields NULL, which renders as null like DRF does.
+            return value
+        raise _unsupported(field, "nullable relation without a default")
+
+    missing = Q()
+    for hop in nullable_hops:
+        missing |= Q(**{f"{prefix}{hop}__isnull": True})
+    return Case(When(missing, then=default), default=value, output_field=TextField())
+
+
+def _check_representation(serializer, base):
+    """Reject serializers that customize how instances are represented."""
+    cls = type(serializer)
+    overridden = cls.to_representation is not base.to_representation or (
+        base is GeoFeatureModelSerializer
+        and cls.get_properties is not base.get_properties
+    )
+    if overridden:
+        raise UnsupportedField(f"{cls.__name__} overrides its representation.")
+
+
+def _object_sql(serializer, model, prefix):
+    """Return the JSON text expression of a (possibly nested) serializer."""
+    fields = serializer.fields
+
+    if not isinstance(serializer, GeoFeatureModelSerializer):
+        _check_representation(serializer, serializers.Serializer)
+        return _JSONObject(
+            [
+                (name, _field_sql(field, model, prefix))
+                for name, field in fields.items()
+                if not field.write_only
+            ]
+        )
+
+    _check_representation(serializer, GeoFeatureModelSerializer)
+    meta = serializer.Meta
+    if meta.auto_bbox or meta.bbox_geo_field:
+        raise UnsupportedField(f"{type(serializer).__name__} uses bounding boxes.")
+
+    pairs, processed = [], set()
+    if meta.id_field:
+        pairs.append(("id", _field_sql(fields[meta.id_field], model, prefix)))
+        processed.add(meta.id_field)
+    pairs.append(("type", Value('"Feature"')))
+    if meta.geo_field:
+        pairs.append(
+            ("geometry", _field_sql(fields[meta.geo_field], model, prefix))
+        )
+        processed.add(meta.geo_field)
+    else:
+        pairs.append(("geometry", Value("null")))
+
+    properties = [
+        (name, _field_sql(field, model, prefix))
+        for name, field in fields.items()
+        if name not in processed and not field.write_only
+    ]
+    pairs.append(("properties", _JSONObject(properties)))
+    return _JSONObject(pairs)
+
+
+@functools.lru_cache(maxsize=256)
+def row_expression(serializer_class, fieldset=None):
+    """Return the SQL expression rendering one row like ``serializer_class``.
+
+    Args:
+        serializer_class: ModelSerializer or GeoFeatureModelSerializer class.
+        fieldset: Sparse fieldset from :func:`~.fieldsets.parse_fieldset`;
+            only its fields are rendered, and joined.
+
+    Returns:
+        Func: Expression yielding the row's compact JSON text.
+
+    Raises:
+        UnsupportedField: If a readable field has no SQL rendering.
+    """
+    serializer = serializer_class()
+    apply_fieldset(serializer, fieldset)
+    return _object_sql(serializer, serializer.Meta.model, "")
+
+
+@functools.lru_cache(maxsize=256)
+def _serialized_iterable(serializer_class, fieldset=None):
+    """Return an iterable class rendering instances through the serializer."""
+    serializer = serializer_class()
+    apply_fieldset(serializer, fieldset)
+    renderer = JSONRenderer()
+
+    class SerializedIterable(ModelIterable):
+        """Yield the JSON text DRF renders for each instance."""
+
+        def __iter__(self):
+            for instance in super().__iter__():
+                yield renderer.render(serializer.to_representation(instance)).decode()
+
+    return SerializedIterable
+
+
+@functools.lru_cache(maxsize=256)
+def _translated(serializer_class, fieldset=None):
+    """Return :func:`row_expression`, or ``None`` if it is unsupported."""
+    try:
+        return row_expression(serializer_class, fieldset)
+    except UnsupportedField as error:
+        logger.warning("Rendering %s in Python: %s", serializer_class.__name__, error)
+        return None
+
+
+def json_rows(queryset: QuerySet, serializer_class, fieldset=None) -> QuerySet:
+    """Return ``queryset`` as JSON texts rendered by the database.
+
+    If the serializer cannot be translated, the instances are rendered by
+    the serializer instead while iterating. Either way the result is a lazy
+    queryset of JSON strings and may still be filtered, ordered and sliced.
+
+    Args:
+        queryset: Filtered and ordered queryset of the serializer's model.
+        serializer_class: Serializer whose output the rows reproduce.
+        fieldset: Optional sparse fieldset limiting the rendered fields.
+
+    Returns:
+        QuerySet: JSON strings, one per row.
+    """
+    expression = _translated(serializer_class, fieldset)
+    if expression is None:
+        rows = queryset.all()
+        rows._iterable_class = _serialized_iterable(serializer_class, fieldset)
+        return rows
+    annotated = queryset.annotate(**{ROW_ALIAS: expression})
+    return annotated.values_list(ROW_ALIAS, flat=True)
+
+
+def _encode(batch) -> bytes:
+    """Join a batch of rows, escaping line separators like JSONRenderer."""
+    text = ",".join(batch)
+    return text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+def _stream(rows, head, tail, chunk_size):
+    """Yield ``head``, the rows as one JSON array in chunks, then ``tail``."""
+    yield head + b"["
+    separator, batch = b"", []
+    for row in rows.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) == chunk_size:
+            yield separator + _encode(batch)
+            separator, batch = b",", []
+    if batch:
+        yield separator + _encode(batch)
+    yield b"]" + tail
+
+
+def stream_json(rows: QuerySet, envelope=ROWS, chunk_size=STREAM_CHUNK_SIZE):
+    """Stream database-rendered rows inside a JSON envelope.
+
+    Args:
+        rows: Queryset returned by :func:`json_rows`.
+        envelope: JSON-serializable structure containing :data:`ROWS` once,
+            where the array of rows is placed. Defaults to the bare array.
+        chunk_size: Number of rows fetched and sent per chunk.
+
+    Returns:
+        StreamingHttpResponse: ``application/json`` response.
+    """
+    renderer = JSONRenderer()
+    head, tail = renderer.render(envelope).split(renderer.render(ROWS))
+    return StreamingHttpResponse(
+        _stream(rows, head, tail, chunk_size), content_type="application/json"
+    )
+
+
+def stream_layer(request, rows: QuerySet, envelope=ROWS):
+    """Stream a layer, one keyset page at a time if the client asks for it.
+
+    Without ``limit`` or ``cursor`` this is :func:`stream_json`. Otherwise
+    only the requested page is streamed and ``next_cursor`` is added to the
+    envelope; a bare array becomes ``{"results": [...], "next_cursor": ...}``.
+
+    Args:
+        request: DRF request carrying the pagination parameters.
+        rows: Queryset returned by :func:`json_rows`.
+        envelope: Envelope as accepted by :func:`stream_json`.
+
+    Returns:
+        StreamingHttpResponse: ``application/json`` response.
+    """
+    paginator = KeysetPagination(request)
+    if not paginator.requested:
+        return stream_json(rows, envelope)
+
+    rows = paginator.paginate_queryset(rows)
+    if envelope == ROWS:
+        envelope = {"results": ROWS}
+    return stream_json(rows, {**envelope, "next_cursor": paginator.next_cursor})
@@ -47,6 +47,28 @@ def use_english_locale():
     translation.deactivate()
 
 
+@pytest.fixture(autouse=True)
+def local_cache(settings):
+    """Run every test against an empty in-process cache.
+
+    The configured cache is shared on disk and outlives the test database,
+    whose user and group ids restart with every run, so cached permission
+    groups, log deduplication keys and throttle history would leak between
+    runs and tests.
+    """
+    from django.core.cache import cache
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tests",
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def clear_content_type_cache():
     """Clear the ContentType cache before each test.
@@ -64,6 +86,27 @@ def clear_content_type_cache():
     ContentType.objects.clear_cache()
 
 
+@pytest.fixture(autouse=True)
+def log_buffer(monkeypatch):
+    """Keep the buffered database log handler in the test thread.
+
+    Without a background writer, buffered entries are only written when a
+    test calls ``log_buffer.flush()`` (or a batch fills up), through the
+    test's own connection and transaction. Entries left over are discarded.
+    """
+    from apps.api.handlers import buffered_log_handler
+
+    handler = buffered_log_handler()
+    if handler is None:
+        yield None
+        return
+    monkeypatch.setattr(handler, "background", False)
+    handler.stop()
+    handler.clear()
+    yield handler
+    handler.clear()
+
+
 User = get_user_model()
 
 
@@ -0,0 +1,140 @@
+"""Tests for the trigger-maintained per-project statistics summary tables."""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.gis.geos import LineString
+from django.db.models import Sum
+
+from apps.api.models import (
+    AddressStatistics,
+    ConduitStatistics,
+    NodeStatistics,
+    ResidentialUnitStatistics,
+    Trench,
+    TrenchStatistics,
+)
+
+from ..factories import (
+    AddressFactory,
+    ConduitFactory,
+    NodeFactory,
+    ResidentialUnitFactory,
+    StatusFactory,
+    TrenchConduitConnectionFactory,
+    TrenchFactory,
+)
+
+
+def _totals(model, count_field, project, length_field=None):
+    """Sum the summary rows of ``project`` into ``(count, length)``."""
+    aggregates = {"count": Sum(count_field)}
+    if length_field:
+        aggregates["length"] = Sum(length_field)
+    totals = model.objects.filter(project=project).aggregate(**aggregates)
+    return totals["count"] or 0, totals.get("length") or 0
+
+
+@pytest.mark.django_db
+class TestTrenchStatistics:
+    """Tests for the trench and conduit summary triggers."""
+
+    def test_insert_update_delete(self, project, flag):
+        """Trench writes keep count and length in the right bucket."""
+        status_a = StatusFactory()
+        status_b = StatusFactory()
+        trench = TrenchFactory(
+            project=project,
+            flag=flag,
+            status=status_a,
+            geom=LineString((0, 0), (100, 0), srid=25832),
+        )
+        assert _totals(TrenchStatistics, "trench_count", project, "total_length") == (
+            1,
+            Decimal("100"),
+        )
+
+        trench.status = status_b
+        trench.geom = LineString((0, 0), (40, 0), srid=25832)
+        trench.save()
+        row = TrenchStatistics.objects.get(project=project)
+        assert row.status_id == status_b.id
+        assert row.trench_count == 1
+        assert row.total_length == Decimal("40")
+
+        trench.delete()
+        assert not TrenchStatistics.objects.filter(project=project).exists()
+
+    def test_conduit_length_follows_trenches(self, project, flag):
+        """Conduit buckets track the length of the trenches they run through."""
+        conduit = ConduitFactory(project=project, flag=flag)
+        trench = TrenchFactory(
+            project=project,
+            flag=flag,
+            geom=LineString((0, 0), (25, 0), srid=25832),
+        )
+        assert _totals(
+            ConduitStatistics, "conduit_count", project, "total_length"
+        ) == (1, 0)
+
+        TrenchConduitConnectionFactory(uuid_trench=trench, uuid_conduit=conduit)
+        assert _totals(
+            ConduitStatistics, "conduit_count", project, "total_length"
+        ) == (1, Decimal("25"))
+        assert ConduitStatistics.objects.get(project=project).length_count == 1
+
+        trench.geom = LineString((0, 0), (60, 0), srid=25832)
+        trench.save()
+        assert _totals(
+            ConduitStatistics, "conduit_count", project, "total_length"
+        ) == (1, Decimal("60"))
+
+        Trench.objects.filter(uuid=trench.uuid).delete()
+        assert _totals(
+            ConduitStatistics, "conduit_count", project, "total_length"
+        ) == (1, 0)
+        assert ConduitStatistics.objects.get(project=project).length_count == 0
+
+        conduit.delete()
+        assert not ConduitStatistics.objects.filter(project=project).exists()
+
+
+@pytest.mark.django_db
+class TestAddressStatistics:
+    """Tests for the address, residential unit and node summary triggers."""
+
+    def test_city_change_moves_dependents(self, project, flag):
+        """Renaming an address' city moves its nodes and units along."""
+        address = AddressFactory(project=project, flag=flag, city="Kiel")
+        ResidentialUnitFactory(uuid_address=address)
+        ResidentialUnitFactory(uuid_address=address)
+        NodeFactory(project=project, flag=flag, uuid_address=address)
+
+        address.city = "Flensburg"
+        address.save()
+
+        assert list(
+            AddressStatistics.objects.filter(project=project).values_list(
+                "city", "address_count"
+            )
+        ) == [("Flensburg", 1)]
+        assert list(
+            ResidentialUnitStatistics.objects.filter(project=project).values_list(
+                "city", "unit_count"
+            )
+        ) == [("Flensburg", 2)]
+        assert list(
+            NodeStatistics.objects.filter(project=project).values_list(
+                "city", "node_count"
+            )
+        ) == [("Flensburg", 1)]
+
+    def test_delete_clears_buckets(self, project, flag):
+        """Deleting an address removes it and its units from the summaries."""
+        address = AddressFactory(project=project, flag=flag)
+        ResidentialUnitFactory(uuid_address=address)
+
+        address.delete()
+
+        assert _totals(AddressStatistics, "address_count", project) == (0, 0)
+        assert _totals(ResidentialUnitStatistics, "unit_count", project) == (0, 0)
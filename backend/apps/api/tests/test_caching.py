@@ -0,0 +1,63 @@
+"""Tests for the version-keyed cache helpers."""
+
+import pytest
+from django.core.cache import cache
+
+from apps.api.caching import (
+    bump_version,
+    bump_version_on_commit,
+    get_version,
+    versioned_key,
+)
+from apps.api.models import CacheVersion
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear the cache before and after each test."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestVersionedKey:
+    """Tests for versioned_key, get_version and bump_version."""
+
+    def test_key_is_stable_until_bumped(self):
+        """The same namespaces produce the same key until one is bumped."""
+        key = versioned_key("stats", "project:1")
+        assert versioned_key("stats", "project:1") == key
+
+        bump_version("project:1")
+        assert versioned_key("stats", "project:1") != key
+
+    def test_namespaces_are_independent(self):
+        """Bumping one namespace leaves the others untouched."""
+        other = get_version("project:2")
+        bump_version("project:1")
+        assert get_version("project:2") == other
+
+    def test_bumps_are_counted_exactly(self):
+        """Every bump increments the counter by one, also on a cleared cache."""
+        before = get_version("project:1")
+        cache.clear()
+        bump_version("project:1")
+        bump_version("project:1")
+        assert get_version("project:1") == before + 2
+
+    def test_bump_of_new_namespace_creates_counter(self):
+        """Bumping a namespace nobody has read yet seeds its counter."""
+        bump_version("project:3")
+        assert CacheVersion.objects.filter(namespace="project:3").exists()
+
+    def test_bump_on_commit_waits_for_the_transaction(
+        self, django_capture_on_commit_callbacks
+    ):
+        """The version only changes once the writing transaction commits."""
+        before = get_version("project:1")
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_version_on_commit("project:1")
+            assert get_version("project:1") == before
+        assert get_version("project:1") == before + 1
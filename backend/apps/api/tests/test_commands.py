@@ -1,11 +1,21 @@
 """Tests for management command helper functions."""
 
+import json
 import math
+from datetime import UTC, date, datetime
 
 import pytest
+from apps.api.management.commands import parse_pg_errors
 from apps.api.management.commands.warm_wms_cache import lat_lon_to_tile, tile_to_bbox
 from apps.api.management.commands.parse_pg_errors import Command as ParsePgErrorsCommand
+from apps.api.management.commands.parse_pg_errors import split_csvlog_records
+from apps.api.management.commands.prune_log_entries import (
+    add_months,
+    log_entry_partitions,
+)
 from apps.api.models import LogEntry
+from django.core.management import call_command
+from django.db import connection
 
 
 class TestTileToBbox:
@@ -156,3 +166,230 @@ class TestProcessErrorBlock:
         assert "SELECT *" in entry.extra_data["statement"]
         assert "FROM table1" in entry.extra_data["statement"]
         assert "WHERE id = 1" in entry.extra_data["statement"]
+
+
+CSVLOG_ERROR = (
+    '2026-01-09 13:58:50.274 UTC,"qgis","krit_gis",42,"10.0.0.5:5050",'
+    '"6960c9a2.2a",3,"SELECT",2026-01-09 13:58:40 UTC,3/12,0,ERROR,42P01,'
+    '"relation ""public.missing_table"" does not exist",'
+    '"The requested table was not found.",,,,,'
+    '"SELECT *\nFROM public.missing_table",15,,"QGIS Server","client backend",,0\n'
+)
+CSVLOG_LOG = (
+    '2026-01-09 13:58:51.000 UTC,,,40,,"6960c9a2.28",1,,'
+    "2026-01-09 13:58:40 UTC,,0,LOG,00000,"
+    '"checkpoint starting: time",,,,,,,,,"","checkpointer",,0\n'
+)
+
+
+def _jsonlog_line(severity, message, **extra):
+    """Return one jsonlog line."""
+    record = {
+        "timestamp": "2026-01-09 13:58:50.274 UTC",
+        "error_severity": severity,
+        "message": message,
+        **extra,
+    }
+    return json.dumps(record) + "\n"
+
+
+@pytest.mark.django_db
+class TestParsePgErrorsLogDir:
+    """Tests for parse_pg_errors reading csvlog/jsonlog files."""
+
+    def _run(self, tmp_path, log_format="csvlog"):
+        """Ingest ``tmp_path/logs`` once with offsets kept in ``tmp_path``."""
+        call_command(
+            "parse_pg_errors",
+            log_dir=tmp_path / "logs",
+            format=log_format,
+            offsets_file=tmp_path / "offsets.json",
+            once=True,
+        )
+        return LogEntry.objects.filter(logger_name="postgresql")
+
+    @pytest.fixture
+    def log_dir(self, tmp_path):
+        """Create an empty log directory."""
+        (tmp_path / "logs").mkdir()
+        return tmp_path / "logs"
+
+    def test_csvlog_errors_become_entries(self, tmp_path, log_dir):
+        """Verify only ERROR records are ingested, with detail and statement."""
+        (log_dir / "postgresql-2026-01-09.csv").write_text(CSVLOG_ERROR + CSVLOG_LOG)
+
+        entries = self._run(tmp_path)
+
+        assert entries.count() == 1
+        entry = entries.get()
+        assert entry.source == "wfs"
+        assert entry.message == (
+            'relation "public.missing_table" does not exist'
+            "\nDetail: The requested table was not found."
+        )
+        assert entry.extra_data == {
+            "statement": "SELECT *\nFROM public.missing_table",
+            "pg_timestamp": "2026-01-09 13:58:50.274 UTC",
+        }
+
+    def test_jsonlog_errors_become_entries(self, tmp_path, log_dir):
+        """Verify jsonlog files are parsed the same way."""
+        (log_dir / "postgresql-2026-01-09.json").write_text(
+            _jsonlog_line("ERROR", "out of memory", hint="Reduce work_mem.")
+            + _jsonlog_line("LOG", "checkpoint starting: time")
+        )
+
+        entries = self._run(tmp_path, log_format="jsonlog")
+
+        assert list(entries.values_list("message", flat=True)) == [
+            "out of memory\nHint: Reduce work_mem."
+        ]
+
+    def test_resumes_from_checkpoint(self, tmp_path, log_dir):
+        """Verify already ingested records are not read again."""
+        path = log_dir / "postgresql-2026-01-09.csv"
+        path.write_text(CSVLOG_ERROR)
+        self._run(tmp_path)
+
+        with path.open("a") as handle:
+            handle.write(CSVLOG_ERROR)
+        entries = self._run(tmp_path)
+
+        assert entries.count() == 2
+
+    def test_rotated_file_is_read_from_start(self, tmp_path, log_dir):
+        """Verify a truncated file is re-read instead of skipped."""
+        path = log_dir / "postgresql-Fri.csv"
+        path.write_text(CSVLOG_ERROR + CSVLOG_ERROR)
+        self._run(tmp_path)
+
+        path.write_text(CSVLOG_ERROR)
+        entries = self._run(tmp_path)
+
+        assert entries.count() == 3
+
+    def test_partial_record_waits_for_completion(self, tmp_path, log_dir):
+        """Verify a record still being written is ingested once complete."""
+        path = log_dir / "postgresql-2026-01-09.csv"
+        split = CSVLOG_ERROR.index("SELECT *") + len("SELECT *\n")
+        path.write_text(CSVLOG_ERROR[:split])
+        assert not self._run(tmp_path).exists()
+
+        with path.open("a") as handle:
+            handle.write(CSVLOG_ERROR[split:])
+        assert self._run(tmp_path).count() == 1
+
+    def test_reads_in_chunks(self, tmp_path, log_dir, monkeypatch):
+        """Verify records spanning chunks are ingested and offsets checkpointed."""
+        monkeypatch.setattr(parse_pg_errors, "READ_CHUNK_SIZE", 64)
+        path = log_dir / "postgresql-2026-01-09.csv"
+        path.write_text(CSVLOG_ERROR + CSVLOG_LOG + CSVLOG_ERROR)
+
+        entries = self._run(tmp_path)
+
+        assert entries.count() == 2
+        offsets = json.loads((tmp_path / "offsets.json").read_text())
+        assert offsets[path.name]["offset"] == path.stat().st_size
+
+
+class TestSplitCsvlogRecords:
+    """Tests for parse_pg_errors split_csvlog_records helper."""
+
+    def test_keeps_quoted_newlines_in_one_record(self):
+        """Verify newlines inside quoted fields do not end a record."""
+        data = b'a,"line one\nline two"\nb,c\npartial,"open'
+        records, consumed = split_csvlog_records(data)
+
+        assert records == [b'a,"line one\nline two"\n', b"b,c\n"]
+        assert data[consumed:] == b'partial,"open'
+
+
+class TestAddMonths:
+    """Tests for prune_log_entries add_months helper."""
+
+    def test_crosses_year_boundaries(self):
+        """Verify months wrap around the year in both directions."""
+        assert add_months(date(2025, 11, 15), 3) == date(2026, 2, 1)
+        assert add_months(date(2025, 1, 31), -1) == date(2024, 12, 1)
+
+
+@pytest.mark.django_db
+class TestPruneLogEntries:
+    """Tests for the prune_log_entries management command."""
+
+    def _entry(self, message, timestamp):
+        """Create a log entry and move it to ``timestamp``."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT fn_log_entry_ensure_partition(%s)", [timestamp.date()]
+            )
+        entry = LogEntry.objects.create(
+            level="INFO", logger_name="prune", message=message
+        )
+        LogEntry.objects.filter(uuid=entry.uuid).update(timestamp=timestamp)
+
+    # DETACH PARTITION ... CONCURRENTLY refuses to run in a transaction block.
+    @pytest.mark.django_db(transaction=True)
+    def test_drops_expired_partitions(self):
+        """Verify expired months are dropped as partitions, recent ones kept."""
+        self._entry("expired", datetime(2020, 3, 10, tzinfo=UTC))
+        self._entry("recent", datetime.now(UTC))
+
+        call_command("prune_log_entries", months=12)
+
+        assert "log_entry_p2020_03" not in log_entry_partitions()
+        assert list(
+            LogEntry.objects.filter(logger_name="prune").values_list(
+                "message", flat=True
+            )
+        ) == ["recent"]
+
+    def test_creates_upcoming_partitions(self):
+        """Verify partitions are created ahead of time."""
+        call_command("prune_log_entries", ahead=6)
+
+        months = set(log_entry_partitions().values())
+        current = datetime.now(UTC).date().replace(day=1)
+        assert {add_months(current, offset) for offset in range(7)} <= months
+
+    def test_dry_run_changes_nothing(self):
+        """Verify --dry-run keeps expired data."""
+        self._entry("expired", datetime(2019, 6, 1, tzinfo=UTC))
+
+        call_command("prune_log_entries", months=1, dry_run=True)
+
+        assert LogEntry.objects.filter(logger_name="prune").exists()
+        assert "log_entry_p2019_06" in log_entry_partitions()
+
+
+@pytest.mark.django_db
+class TestLogEntryPartitions:
+    """Tests for creating log entry partitions on demand."""
+
+    def _drop_current_partition(self):
+        """Drop the partition of the current month and return its name."""
+        name = f"log_entry_p{datetime.now(UTC):%Y_%m}"
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS "{name}"')
+        return name
+
+    def test_create_adds_missing_partition(self):
+        """Verify saving an entry creates the partition of its month."""
+        name = self._drop_current_partition()
+
+        LogEntry.objects.create(level="INFO", logger_name="partition", message="a")
+
+        assert name in log_entry_partitions()
+        assert LogEntry.objects.filter(logger_name="partition").count() == 1
+
+    def test_bulk_create_adds_missing_partition(self):
+        """Verify a batch insert creates the partition and keeps every row."""
+        name = self._drop_current_partition()
+
+        LogEntry.objects.bulk_create(
+            LogEntry(level="INFO", logger_name="partition", message=str(index))
+            for index in range(3)
+        )
+
+        assert name in log_entry_partitions()
+        assert LogEntry.objects.filter(logger_name="partition").count() == 3
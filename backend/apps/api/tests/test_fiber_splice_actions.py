@@ -1,4 +1,6 @@
-"""Tests for FiberSpliceViewSet custom actions: upsert, clear_port, merge_ports, unmerge_ports."""
+"""Tests for FiberSpliceViewSet listing and custom actions: upsert, clear_port, merge_ports, unmerge_ports."""
+
+import uuid
 
 import pytest
 from apps.api.models import (
@@ -8,6 +10,8 @@ from apps.api.models import (
     NodeStructure,
 )
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -428,3 +432,58 @@ class TestUnmergePorts:
         splices = FiberSplice.objects.filter(node_structure=ns)
         for splice in splices:
             assert splice.merge_group_a is None
+
+
+@pytest.mark.django_db
+class TestListing:
+    """Tests for listing the splices of a node structure."""
+
+    def _create_splices(self, splice_setup, ports):
+        """Connect ``ports`` ports, merging the last two on side B."""
+        ns = splice_setup["node_structure"]
+        merge_group = uuid.uuid4()
+        for port in range(1, ports + 1):
+            merged = port > ports - 2
+            FiberSplice.objects.create(
+                node_structure=ns,
+                port_number=port,
+                fiber_a=splice_setup["fibers_a"][(port - 1) % 4],
+                cable_a=splice_setup["cable_a"],
+                merge_group_b=merge_group if merged else None,
+                shared_fiber_b=splice_setup["fibers_b"][0] if merged else None,
+                shared_cable_b=splice_setup["cable_b"] if merged else None,
+            )
+        return ns
+
+    def test_list_includes_details(self, authenticated_client, splice_setup):
+        """Listed splices carry fiber details and merge group info."""
+        ns = self._create_splices(splice_setup, 3)
+
+        response = authenticated_client.get(
+            f"/api/v1/fiber-splice/?node_structure={ns.uuid}"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        by_port = {row["port_number"]: row for row in response.json()}
+        assert by_port[1]["fiber_a_details"]["cable_name"] == (
+            splice_setup["cable_a"].name
+        )
+        assert by_port[1]["merge_group_b_info"] is None
+        assert by_port[3]["fiber_b_details"]["uuid"] == str(
+            splice_setup["fibers_b"][0].uuid
+        )
+        assert by_port[3]["merge_group_b_info"]["port_numbers"] == [2, 3]
+
+    def test_list_query_count_is_constant(self, authenticated_client, splice_setup):
+        """Listing many splices takes as many queries as listing a few."""
+
+        def query_count(ports):
+            FiberSplice.objects.all().delete()
+            ns = self._create_splices(splice_setup, ports)
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_client.get(
+                    f"/api/v1/fiber-splice/?node_structure={ns.uuid}"
+                )
+            assert len(response.json()) == ports
+            return len(queries)
+
+        assert query_count(3) == query_count(12)
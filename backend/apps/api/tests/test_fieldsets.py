@@ -0,0 +1,102 @@
+"""Tests for the ``?fields=`` and ``?omit=`` sparse fieldsets."""
+
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .factories import ConduitFactory, TrenchFactory
+
+User = get_user_model()
+
+
+@pytest.fixture
+def authenticated_client(db):
+    """Create an authenticated superuser API client."""
+    user = User.objects.create_superuser(
+        username="fieldsets_user",
+        email="fieldsets@example.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests for sparse fieldsets on the feature viewsets."""
+
+    def test_fields_keeps_listed_properties(self, authenticated_client, project, flag):
+        """Only listed properties remain; id and geometry are always kept."""
+        trench = TrenchFactory(project=project, flag=flag)
+        response = authenticated_client.get(
+            f"/api/v1/trench/{trench.id_trench}/?fields=id_trench,length"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == str(trench.uuid)
+        assert response.data["geometry"] is not None
+        assert set(response.data["properties"]) == {"id_trench", "length"}
+
+    def test_omit_drops_properties(self, authenticated_client, project, flag):
+        """Omitted fields are left out of every feature."""
+        TrenchFactory(project=project, flag=flag)
+        response = authenticated_client.get(
+            f"/api/v1/trench/?project={project.id}&omit=surface,comment"
+        )
+        properties = response.data["results"]["features"][0]["properties"]
+        assert "surface" not in properties
+        assert "comment" not in properties
+        assert "id_trench" in properties
+
+    def test_trimmed_query_skips_columns_and_joins(
+        self, authenticated_client, project, flag
+    ):
+        """A trimmed request selects neither dropped columns nor their joins."""
+        TrenchFactory(project=project, flag=flag)
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.get(
+                f"/api/v1/trench/?project={project.id}&fields=id_trench"
+            )
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "trench"' in query["sql"] and "COUNT(" not in query["sql"]
+        ]
+        assert selects
+        assert '"trench"."comment"' not in selects[-1]
+        assert "JOIN" not in selects[-1]
+
+    def test_unknown_fields_are_ignored(self, authenticated_client, project, flag):
+        """Unknown names do not cause an error."""
+        conduit = ConduitFactory(project=project, flag=flag)
+        response = authenticated_client.get(
+            f"/api/v1/conduit/{conduit.uuid}/?fields=name,nonexistent"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {"name"}
+
+    def test_streamed_layer(self, authenticated_client, project, flag):
+        """The streamed ``all`` layers render only the requested fields."""
+        TrenchFactory(project=project, flag=flag)
+        response = authenticated_client.get(
+            f"/api/v1/trench/all/?project={project.id}&fields=id_trench"
+        )
+        feature = json.loads(response.getvalue())["features"][0]
+        assert list(feature) == ["id", "type", "geometry", "properties"]
+        assert list(feature["properties"]) == ["id_trench"]
+
+    def test_writes_ignore_fieldsets(self, authenticated_client, project, flag):
+        """Fieldsets only apply to reads."""
+        conduit = ConduitFactory(project=project, flag=flag)
+        response = authenticated_client.patch(
+            f"/api/v1/conduit/{conduit.uuid}/?fields=name",
+            {"name": "renamed"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "uuid" in response.data
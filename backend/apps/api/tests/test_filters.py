@@ -0,0 +1,162 @@
+"""Tests for the bbox filter and keyset pagination of the ``all`` endpoints."""
+
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import LineString
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+from apps.api.filters import filter_bbox, parse_bbox
+from apps.api.models import Trench
+
+from .factories import (
+    CableLabelFactory,
+    ConduitFactory,
+    TrenchConduitConnectionFactory,
+    TrenchFactory,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def authenticated_client(db):
+    """Create an authenticated superuser API client."""
+    user = User.objects.create_superuser(
+        username="filters_user",
+        email="filters@example.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def trenches(db, project, flag):
+    """Create a near and a far trench and return them with the near bbox."""
+    near = TrenchFactory(
+        project=project,
+        flag=flag,
+        geom=LineString((565000, 6050000), (565010, 6050000), srid=25832),
+    )
+    far = TrenchFactory(
+        project=project,
+        flag=flag,
+        geom=LineString((575000, 6060000), (575010, 6060000), srid=25832),
+    )
+    near.refresh_from_db()
+    minx, miny, maxx, maxy = near.geom_3857.extent
+    bbox = f"{minx - 1},{miny - 1},{maxx + 1},{maxy + 1}"
+    return {"near": near, "far": far, "bbox": bbox}
+
+
+class TestParseBBox:
+    """Tests for parse_bbox."""
+
+    def test_empty_value(self):
+        """No parameter means no filter."""
+        assert parse_bbox(None) is None
+        assert parse_bbox("") is None
+
+    def test_valid_value(self):
+        """Four ordered coordinates are returned as floats."""
+        assert parse_bbox("1,2,3.5,4") == (1.0, 2.0, 3.5, 4.0)
+
+    @pytest.mark.parametrize(
+        "value", ["1,2,3", "a,b,c,d", "3,2,1,4", "1,2,nan,4", "1,2,3,4,5"]
+    )
+    def test_invalid_value(self, value):
+        """Malformed or inverted boxes are rejected."""
+        with pytest.raises(ParseError):
+            parse_bbox(value)
+
+
+@pytest.mark.django_db
+class TestBBoxFilter:
+    """Tests for the bbox parameter of the ``all`` endpoints."""
+
+    def test_filter_bbox(self, trenches):
+        """Only trenches overlapping the box are kept."""
+        queryset = filter_bbox(Trench.objects.all(), parse_bbox(trenches["bbox"]))
+        assert list(queryset) == [trenches["near"]]
+
+    def test_trench_endpoint(self, authenticated_client, project, trenches):
+        """The trench layer only streams features inside the box."""
+        response = authenticated_client.get(
+            f"/api/v1/trench/all/?project={project.id}&bbox={trenches['bbox']}"
+        )
+        features = json.loads(response.getvalue())["features"]
+        assert [feature["id"] for feature in features] == [str(trenches["near"].pk)]
+
+    def test_conduit_endpoint(self, authenticated_client, project, flag, trenches):
+        """Conduits are filtered by the trenches they run through."""
+        inside = ConduitFactory(project=project, flag=flag)
+        outside = ConduitFactory(project=project, flag=flag)
+        TrenchConduitConnectionFactory(uuid_trench=trenches["near"], uuid_conduit=inside)
+        TrenchConduitConnectionFactory(uuid_trench=trenches["far"], uuid_conduit=outside)
+
+        response = authenticated_client.get(
+            f"/api/v1/conduit/all/?project={project.id}"
+            f"&no_pagination=true&bbox={trenches['bbox']}"
+        )
+        results = json.loads(response.getvalue())
+        assert [row["uuid"] for row in results] == [str(inside.uuid)]
+
+    def test_invalid_bbox(self, authenticated_client, project):
+        """A malformed bbox returns a 400 error."""
+        response = authenticated_client.get(
+            f"/api/v1/trench/all/?project={project.id}&bbox=1,2"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Tests for the limit and cursor parameters of the ``all`` endpoints."""
+
+    def test_default_response_unchanged(self, authenticated_client, project, trenches):
+        """Without limit or cursor the whole layer is returned."""
+        response = authenticated_client.get(f"/api/v1/trench/all/?project={project.id}")
+        data = json.loads(response.getvalue())
+        assert "next_cursor" not in data
+        assert len(data["features"]) == 2
+
+    def test_follows_cursor(self, authenticated_client, project, trenches):
+        """Following next_cursor visits every feature once, in key order."""
+        url = f"/api/v1/trench/all/?project={project.id}&limit=1"
+        seen = []
+        data = json.loads(authenticated_client.get(url).getvalue())
+        while True:
+            assert len(data["features"]) == 1
+            seen.extend(feature["id"] for feature in data["features"])
+            if data["next_cursor"] is None:
+                break
+            response = authenticated_client.get(f"{url}&cursor={data['next_cursor']}")
+            data = json.loads(response.getvalue())
+        assert seen == sorted(str(trenches[key].pk) for key in ("near", "far"))
+
+    def test_serialized_endpoint(self, authenticated_client, cable):
+        """Serializer-backed layers return results with a cursor."""
+        labels = [CableLabelFactory(cable=cable) for _ in range(3)]
+        response = authenticated_client.get("/api/v1/cable_label/all/?limit=2")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+
+        response = authenticated_client.get(
+            f"/api/v1/cable_label/all/?cursor={response.data['next_cursor']}"
+        )
+        assert len(response.data["results"]) == 1
+        assert response.data["next_cursor"] is None
+        returned = {row["uuid"] for row in response.data["results"]}
+        assert returned <= {str(label.uuid) for label in labels}
+
+    def test_invalid_cursor(self, authenticated_client, project):
+        """An undecodable cursor returns a 404 error."""
+        response = authenticated_client.get(
+            f"/api/v1/trench/all/?project={project.id}&cursor=%25%25"
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -238,3 +238,119 @@ class TestEmit:
         entry = LogEntry.objects.filter(logger_name="test.handler.redact").last()
         assert "supersecret" not in entry.message
         assert "***REDACTED***" in entry.message
+
+
+def _record(name, msg="buffered message"):
+    """Build a WARNING log record."""
+    return logging.LogRecord(
+        name=name,
+        level=logging.WARNING,
+        pathname="",
+        lineno=0,
+        msg=msg,
+        args=(),
+        exc_info=None,
+    )
+
+
+@pytest.mark.django_db
+class TestBufferedDatabaseLogHandler:
+    """Tests for BufferedDatabaseLogHandler batching and backpressure."""
+
+    def test_emit_does_not_write(self):
+        """Verify records are only buffered until flushed."""
+        from apps.api.handlers import BufferedDatabaseLogHandler
+        from apps.api.models import LogEntry
+
+        buffered = BufferedDatabaseLogHandler(background=False)
+        buffered.emit(_record("test.buffered.pending"))
+
+        assert not LogEntry.objects.filter(logger_name="test.buffered.pending").exists()
+        assert buffered.stats()["pending"] == 1
+
+        buffered.flush()
+        assert LogEntry.objects.filter(logger_name="test.buffered.pending").count() == 1
+        assert buffered.stats()["written"] == 1
+
+    def test_full_batch_written_in_one_insert(self):
+        """Verify a full batch is written with a single bulk insert."""
+        from apps.api.handlers import BufferedDatabaseLogHandler
+        from apps.api.models import LogEntry
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        buffered = BufferedDatabaseLogHandler(flush_size=5, background=False)
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(5):
+                buffered.emit(_record("test.buffered.batch"))
+
+        assert len(queries) == 1
+        assert LogEntry.objects.filter(logger_name="test.buffered.batch").count() == 5
+
+    def test_drop_oldest(self):
+        """Verify the oldest records are dropped and counted when full."""
+        from apps.api.handlers import BufferedDatabaseLogHandler
+        from apps.api.models import LogEntry
+
+        buffered = BufferedDatabaseLogHandler(
+            capacity=2, flush_size=10, background=False
+        )
+        for msg in ("first", "second", "third"):
+            buffered.emit(_record("test.buffered.oldest", msg))
+        buffered.flush()
+
+        messages = LogEntry.objects.filter(logger_name="test.buffered.oldest")
+        assert sorted(messages.values_list("message", flat=True)) == [
+            "second",
+            "third",
+        ]
+        assert buffered.stats()["dropped"] == 1
+
+    def test_drop_newest(self):
+        """Verify new records are dropped when full with drop_newest."""
+        from apps.api.handlers import BufferedDatabaseLogHandler
+        from apps.api.models import LogEntry
+
+        buffered = BufferedDatabaseLogHandler(
+            capacity=2, flush_size=10, overflow="drop_newest", background=False
+        )
+        for msg in ("first", "second", "third"):
+            buffered.emit(_record("test.buffered.newest", msg))
+        buffered.close()
+
+        messages = LogEntry.objects.filter(logger_name="test.buffered.newest")
+        assert sorted(messages.values_list("message", flat=True)) == [
+            "first",
+            "second",
+        ]
+        assert buffered.stats()["dropped"] == 1
+
+    def test_forked_child_starts_empty(self):
+        """Verify a forked child neither rewrites nor counts parent entries."""
+        import os
+
+        from apps.api.handlers import BufferedDatabaseLogHandler
+
+        buffered = BufferedDatabaseLogHandler(
+            capacity=1, flush_size=10, background=False
+        )
+        for msg in ("first", "second"):
+            buffered.emit(_record("test.buffered.fork", msg))
+
+        pid = os.fork()
+        if pid == 0:
+            empty = {"pending": 0, "written": 0, "dropped": 0, "failed": 0}
+            os._exit(0 if buffered.stats() == empty else 1)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert buffered.stats()["pending"] == 1
+        assert buffered.stats()["dropped"] == 1
+        buffered.clear()
+
+    def test_unknown_overflow_policy(self):
+        """Verify an unknown overflow policy is rejected."""
+        from apps.api.handlers import BufferedDatabaseLogHandler
+
+        with pytest.raises(ValueError):
+            BufferedDatabaseLogHandler(overflow="block")
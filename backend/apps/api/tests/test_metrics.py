@@ -0,0 +1,180 @@
+"""Tests for the metrics registry, worker aggregation and metrics endpoint."""
+
+import fcntl
+import importlib.util
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.api import metrics
+from apps.api.metrics import Counter, Histogram, render_metrics
+from apps.api.profiling import record_cache_lookup
+
+
+@pytest.fixture
+def temporary_metrics():
+    """Unregister the metrics a test defines and drop their samples."""
+    before = set(metrics._REGISTRY)
+    yield
+    for name in set(metrics._REGISTRY) - before:
+        del metrics._REGISTRY[name]
+        metrics._store.samples.pop(name, None)
+
+
+@pytest.mark.usefixtures("temporary_metrics")
+class TestRendering:
+    """Tests for the text exposition of counters and histograms."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Verify buckets count every observation up to their bound."""
+        histogram = Histogram("test_latency_seconds", "Test.", ["view"], [0.1, 1])
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, view="TrenchViewSet")
+
+        lines = render_metrics().splitlines()
+
+        labels = 'view="TrenchViewSet"'
+        assert f'test_latency_seconds_bucket{{{labels},le="0.1"}} 1' in lines
+        assert f'test_latency_seconds_bucket{{{labels},le="1.0"}} 2' in lines
+        assert f'test_latency_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+        assert f"test_latency_seconds_sum{{{labels}}} 5.55" in lines
+        assert f"test_latency_seconds_count{{{labels}}} 3" in lines
+        assert "# TYPE test_latency_seconds histogram" in lines
+
+    def test_label_values_are_escaped(self):
+        """Verify quotes and backslashes in label values are escaped."""
+        counter = Counter("test_events_total", "Test.", ["name"])
+        counter.inc(name='a"b\\c')
+
+        assert 'test_events_total{name="a\\"b\\\\c"} 1.0' in render_metrics()
+
+    def test_labels_must_match(self):
+        """Verify observations with wrong label names are rejected."""
+        counter = Counter("test_checked_total", "Test.", ["cache"])
+        with pytest.raises(ValueError):
+            counter.inc(view="x")
+
+    def test_cache_lookups_are_counted(self):
+        """Verify cache lookups are exported per cache and result."""
+        record_cache_lookup("test_cache", hit=True)
+        record_cache_lookup("test_cache", hit=False)
+
+        output = render_metrics()
+
+        name = "qonnectra_cache_lookups_total"
+        assert f'{name}{{cache="test_cache",result="hit"}}' in output
+        assert f'{name}{{cache="test_cache",result="miss"}}' in output
+
+
+@pytest.mark.usefixtures("temporary_metrics")
+class TestWorkerAggregation:
+    """Tests for adding up the samples of several worker processes."""
+
+    def test_samples_of_all_workers_are_added(self, tmp_path):
+        """Verify files written by other workers are merged into the output."""
+        counter = Counter("test_requests_total", "Test.", ["view"])
+        other_worker = {"test_requests_total": {json.dumps(["NodeViewSet"]): [4.0]}}
+        (tmp_path / "123-abcdef12.json").write_text(json.dumps(other_worker))
+
+        with override_settings(METRICS_DIR=str(tmp_path)):
+            counter.inc(view="NodeViewSet")
+            output = render_metrics()
+
+        assert 'test_requests_total{view="NodeViewSet"} 5.0' in output
+        assert (tmp_path / metrics._store.filename).exists()
+
+    def test_exited_workers_are_archived(self, tmp_path, monkeypatch):
+        """Verify the gunicorn hook folds dead worker files into one archive."""
+        spec = importlib.util.spec_from_file_location(
+            "gunicorn_conf", Path(__file__).resolve().parents[3] / "gunicorn.conf.py"
+        )
+        gunicorn_conf = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(gunicorn_conf)
+        monkeypatch.setenv("METRICS_DIR", str(tmp_path))
+        key = json.dumps(["NodeViewSet"])
+        for pid in (101, 102):
+            (tmp_path / f"{pid}-abcdef12.json").write_text(
+                json.dumps({"test_requests_total": {key: [2.0]}})
+            )
+
+        for pid in (101, 102):
+            gunicorn_conf.child_exit(None, SimpleNamespace(pid=pid))
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "archive.json",
+            metrics.LOCK_FILENAME,
+        ]
+        archive = json.loads((tmp_path / "archive.json").read_text())
+        assert archive == {"test_requests_total": {key: [4.0]}}
+
+    def test_collect_waits_for_archiving(self, tmp_path):
+        """Verify a scrape waits while a worker's samples are being archived."""
+        collected = []
+        with override_settings(METRICS_DIR=str(tmp_path)):
+            with open(tmp_path / metrics.LOCK_FILENAME, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                scrape = threading.Thread(
+                    target=lambda: collected.append(metrics._store.collect())
+                )
+                scrape.start()
+                scrape.join(timeout=0.2)
+                assert scrape.is_alive()
+            scrape.join(timeout=5)
+
+        assert collected
+
+
+@pytest.mark.django_db
+class TestMetricsView:
+    """Tests for the metrics endpoint."""
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_requires_token(self):
+        """Verify requests without the configured token are rejected."""
+        client = APIClient()
+        response = client.get("/api/v1/metrics/")
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        client.credentials(HTTP_AUTHORIZATION="Bearer wrong")
+        response = client.get("/api/v1/metrics/")
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    @override_settings(METRICS_TOKEN="")
+    def test_disabled_without_token(self):
+        """Verify the endpoint is closed while no token is configured."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer ")
+        response = client.get("/api/v1/metrics/")
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_reports_request_latency_per_view(self):
+        """Verify requests are recorded per view and action."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer scrape-secret")
+        client.get("/api/v1/metrics/")
+        response = client.get("/api/v1/metrics/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == metrics.CONTENT_TYPE
+        body = response.content.decode()
+        assert (
+            "qonnectra_request_duration_seconds_count"
+            '{view="MetricsView",action="get",method="GET",status="200"}'
+        ) in body
+        assert "# TYPE qonnectra_wms_semaphore_wait_seconds histogram" in body
@@ -1,9 +1,21 @@
-"""Tests for CookieDomainMiddleware."""
+"""Tests for CookieDomainMiddleware and RequestProfilingMiddleware."""
 
 import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.http import HttpResponse
 from django.test import RequestFactory, override_settings
-from apps.api.middleware import CookieDomainMiddleware
+from apps.api.middleware import CookieDomainMiddleware, RequestProfilingMiddleware
+from apps.api.models import LogEntry
+from apps.api.profiling import (
+    RequestProfile,
+    current_profile,
+    record_cache_lookup,
+    track_serialization,
+)
+
+User = get_user_model()
 
 
 @pytest.fixture
@@ -67,3 +79,124 @@ class TestCookieDomainMiddleware:
 
         assert result.status_code == 200
         assert "api-access-token" not in result.cookies
+
+
+def profiled_view(request):
+    """Run two queries and one cache lookup, then return a response."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+    record_cache_lookup("dashboard", hit=True)
+    with track_serialization():
+        pass
+    return HttpResponse("OK")
+
+
+@pytest.mark.django_db
+class TestRequestProfilingMiddleware:
+    """Tests for per-request profiling."""
+
+    def _request(self, request_factory, user, **headers):
+        """Build a GET request for ``user``."""
+        request = request_factory.get("/api/v1/trench/", headers=headers)
+        request.user = user
+        return request
+
+    @pytest.fixture
+    def staff_user(self):
+        """Create a staff user."""
+        return User.objects.create_user(
+            username="profiled_staff", password="testpass123", is_staff=True
+        )
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0)
+    def test_staff_get_server_timing(self, request_factory, staff_user):
+        """Verify staff users receive query and cache statistics."""
+        response = RequestProfilingMiddleware(profiled_view)(
+            self._request(request_factory, staff_user)
+        )
+
+        timing = response["Server-Timing"]
+        assert 'desc="2 queries"' in timing
+        assert 'cache;desc="1 hits, 0 misses"' in timing
+        assert "serialize;dur=" in timing
+        assert "total;dur=" in timing
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0)
+    def test_other_users_get_no_header(self, request_factory):
+        """Verify the statistics are not exposed to non-staff users."""
+        response = RequestProfilingMiddleware(profiled_view)(
+            self._request(request_factory, AnonymousUser())
+        )
+
+        assert "Server-Timing" not in response
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_profiled(self, request_factory, staff_user):
+        """Verify requests outside the sample are passed through."""
+        seen = []
+
+        def view(request):
+            seen.append(current_profile())
+            return HttpResponse("OK")
+
+        response = RequestProfilingMiddleware(view)(
+            self._request(request_factory, staff_user)
+        )
+
+        assert seen == [None]
+        assert "Server-Timing" not in response
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0.0)
+    def test_header_forces_profiling(self, request_factory, staff_user):
+        """Verify X-Request-Profile profiles a request outside the sample."""
+        response = RequestProfilingMiddleware(profiled_view)(
+            self._request(request_factory, staff_user, x_request_profile="1")
+        )
+
+        assert "Server-Timing" in response
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0, REQUEST_PROFILING_SLOW_MS=0)
+    def test_slow_requests_are_logged(self, request_factory, staff_user, log_buffer):
+        """Verify slow requests are logged with their slowest statements."""
+        RequestProfilingMiddleware(profiled_view)(
+            self._request(request_factory, staff_user)
+        )
+        if log_buffer is not None:
+            log_buffer.flush()
+
+        entry = LogEntry.objects.get(logger_name="apps.api.profiling")
+        assert entry.level == "WARNING"
+        assert entry.user == staff_user
+        assert entry.path == "/api/v1/trench/"
+        assert entry.extra_data["query_count"] == 2
+        assert {query["sql"] for query in entry.extra_data["top_queries"]} == {
+            "SELECT 1",
+            "SELECT 2",
+        }
+
+
+class TestRequestProfile:
+    """Tests for RequestProfile statistics."""
+
+    def test_keeps_only_slowest_queries(self, monkeypatch):
+        """Verify only the slowest statements are kept, slowest first."""
+        # Start and end of each statement: "a" 3 ms, "b" 1 ms, "c" 5 ms.
+        clock = iter([0.0, 0.003, 1.0, 1.001, 2.0, 2.005])
+        monkeypatch.setattr("apps.api.profiling.time.perf_counter", lambda: next(clock))
+        profile = RequestProfile(top_queries=2)
+        for sql in ["a", "b", "c"]:
+            profile(lambda *args: None, sql, None, False, {})
+
+        assert profile.slowest_queries() == [
+            {"sql": "c", "duration_ms": 5.0},
+            {"sql": "a", "duration_ms": 3.0},
+        ]
+        assert profile.query_count == 3
+
+    def test_helpers_are_noops_outside_a_profile(self):
+        """Verify recording without an active profile does nothing."""
+        assert current_profile() is None
+        record_cache_lookup("dashboard", hit=False)
+        with track_serialization():
+            pass
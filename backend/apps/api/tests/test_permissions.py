@@ -1,10 +1,26 @@
 """Tests for role-based permission system."""
 
+from unittest.mock import patch
+
 import pytest
 from apps.api.models import ModelPermission, RoutePermission
-from apps.api.permissions import RoleBasedPermission, get_user_permissions
+from apps.api.permissions import (
+    RoleBasedPermission,
+    compiled_permissions,
+    get_user_permissions,
+    view_model_name,
+)
+from apps.api.views import (
+    ConduitViewSet,
+    TrenchViewSet,
+    UserPermissionsView,
+    WMSLayerViewSet,
+)
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 User = get_user_model()
@@ -285,7 +301,7 @@ class TestMultiGroupPermissions:
         assert permissions["routes"]["/admin/*"] is True
 
     def test_permission_cache_populated_and_reused(self, db, editor_group):
-        """Verify permissions are cached after first access."""
+        """Verify compiled permissions are cached and reused."""
         user = User.objects.create_user(
             username="cache_test",
             email="cache@example.com",
@@ -293,13 +309,56 @@ class TestMultiGroupPermissions:
         )
         user.groups.add(editor_group)
 
-        cache_key = f"user_permissions:{user.pk}"
-        assert cache.get(cache_key) is None
-
         perm = RoleBasedPermission()
-        level = perm._get_access_level(user, "trench")
-        assert level == "edit"
+        assert perm._get_access_level(user, "trench") == "edit"
+
+        with CaptureQueriesContext(connection) as queries:
+            assert perm._get_access_level(user, "trench") == "edit"
+        assert len(queries) == 0
+
+    def test_group_set_is_compiled_once(self, db, editor_group):
+        """Verify users with the same groups share one compiled entry."""
+        first, second = (
+            User.objects.create_user(username=f"shared_{i}", password="pass")
+            for i in range(2)
+        )
+        first.groups.add(editor_group)
+        second.groups.add(editor_group)
+        get_user_permissions(first)
+
+        with CaptureQueriesContext(connection) as queries:
+            permissions = get_user_permissions(second)
+        # Only the group IDs of the second user are loaded.
+        assert len(queries) == 1
+        assert permissions["models"]["trench"] == "edit"
+
+    def test_memoized_per_request(self, db, editor_user):
+        """Verify repeated checks within a request skip the cache."""
+        request = RequestFactory().get("/")
+        compiled_permissions(editor_user, request)
+
+        with patch("apps.api.permissions.cache") as mocked_cache:
+            permissions = get_user_permissions(editor_user, request)
+        mocked_cache.get.assert_not_called()
+        assert permissions["models"]["trench"] == "edit"
+
+
+class TestViewModelNames:
+    """Tests for the per-view-class model name registry."""
+
+    def test_resolved_at_url_loading(self):
+        """Views without a class-level queryset are resolved up front."""
+        import apps.api.urls  # noqa: F401
+
+        with patch.object(ConduitViewSet, "get_queryset") as get_queryset:
+            assert view_model_name(ConduitViewSet()) == "conduit"
+            assert view_model_name(WMSLayerViewSet()) == "wmslayer"
+        get_queryset.assert_not_called()
+
+    def test_class_level_queryset(self):
+        """A class-level queryset decides the model name."""
+        assert view_model_name(TrenchViewSet()) == "trench"
 
-        cached = cache.get(cache_key)
-        assert cached is not None
-        assert cached["trench"] == "edit"
+    def test_view_without_queryset(self):
+        """Plain API views have no model name."""
+        assert view_model_name(UserPermissionsView()) is None
@@ -0,0 +1,88 @@
+"""Tests for the orjson-backed FastJSONRenderer."""
+
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from apps.api.models import Trench
+from apps.api.renderers import FastJSONRenderer
+from apps.api.serializers import TrenchSerializer
+
+from .factories import TrenchFactory
+
+
+def _render_both(data):
+    """Render ``data`` with the stock and the fast renderer."""
+    return JSONRenderer().render(data), FastJSONRenderer().render(data)
+
+
+class TestFastJSONRenderer:
+    """Tests for FastJSONRenderer output equivalence."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            decimal.Decimal("12.50"),
+            datetime.datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=datetime.UTC),
+            datetime.datetime(2024, 5, 6, 7, 8, 9),
+            datetime.date(2024, 5, 6),
+            datetime.time(7, 8, 9, 1000),
+            datetime.timedelta(minutes=3),
+            gettext_lazy("Trench"),
+            b"bytes",
+            (1, "two", None),
+            "Zeile\u2028Absatz\u2029 äöü",
+            {1: "int key", "nested": [True, False, 0.1]},
+        ],
+    )
+    def test_matches_stock_renderer(self, value):
+        """Each supported type renders to the same bytes as JSONRenderer."""
+        stock, fast = _render_both({"value": value})
+        assert fast == stock
+
+    def test_serializer_containers(self):
+        """ReturnDict and ReturnList render like plain containers."""
+        data = ReturnList(
+            [ReturnDict({"uuid": uuid.uuid4(), "length": 1.5}, serializer=None)],
+            serializer=None,
+        )
+        stock, fast = _render_both(data)
+        assert fast == stock
+
+    def test_float_exponents_are_equivalent(self):
+        """Exponent notation may differ in digits but parses identically."""
+        stock, fast = _render_both([1e-7, 1e20, 12345678.125])
+        assert json.loads(fast) == json.loads(stock)
+
+    def test_falls_back_for_big_integers(self):
+        """Integers beyond 64 bits are rendered by the stock renderer."""
+        stock, fast = _render_both({"big": 2**70})
+        assert fast == stock
+
+    def test_none_renders_empty(self):
+        """``None`` renders to an empty body, like JSONRenderer."""
+        assert FastJSONRenderer().render(None) == b""
+
+    def test_indent_uses_stock_renderer(self):
+        """Pretty-printed output is produced by the stock renderer."""
+        data = {"a": [1, 2]}
+        media_type = "application/json; indent=2"
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(
+            data, media_type
+        )
+
+    @pytest.mark.django_db
+    def test_serialized_layer_is_equivalent(self, project, flag):
+        """A serialized GeoJSON layer parses to the same document."""
+        TrenchFactory(project=project, flag=flag, comment="Zeile\u2028")
+        TrenchFactory(project=project, flag=flag, length=12.34)
+        data = TrenchSerializer(Trench.objects.order_by("pk"), many=True).data
+        stock, fast = _render_both(data)
+        assert json.loads(fast) == json.loads(stock)
@@ -1,17 +1,27 @@
 """Tests for pg_trgm trigram search functionality."""
 
+import json
+
 import pytest
-from apps.api.models import Address, Area, Node
-from apps.api.search import trigram_address_search, trigram_name_search
+from apps.api.models import Address, Area, Node, SearchIndex
+from apps.api.search import (
+    SIMILARITY_THRESHOLD,
+    search_index,
+    trigram_address_search,
+    trigram_name_search,
+)
 from apps.api.tests.factories import (
     AddressFactory,
     AreaFactory,
+    CableFactory,
     FlagFactory,
     NodeFactory,
     NodeTypeFactory,
     ProjectFactory,
+    ResidentialUnitFactory,
 )
 from django.contrib.auth import get_user_model
+from django.db import connection
 from rest_framework.test import APIClient
 
 User = get_user_model()
@@ -222,6 +232,35 @@ class TestTrigramAddressSearch:
         districts = list(result.values_list("district", flat=True))
         assert "Mürwik" in districts
 
+    def test_accent_folding(self, address_data):
+        """Searching without umlauts should find accented values."""
+        qs = Address.objects.all()
+        result = trigram_address_search(qs, "Murwik")
+        districts = list(result.values_list("district", flat=True))
+        assert "Mürwik" in districts
+
+    def test_house_number_token(self, address_data):
+        """Short tokens also match the house number."""
+        qs = Address.objects.all()
+        result = trigram_address_search(qs, "Berliner 99")
+        assert list(result.values_list("street", flat=True)) == ["Berliner Allee"]
+
+    def test_search_text_is_generated(self, address_data):
+        """The search column is lower-cased and accent-folded."""
+        address = Address.objects.get(pk=address_data[0].pk)
+        assert address.search_text.startswith("hauptstrasse 1 24941 flensburg murwik")
+
+    def test_filter_uses_indexable_operator(self, address_data):
+        """Tokens are filtered with ``%>``, which the GIN trigram index serves."""
+        result = trigram_address_search(Address.objects.all(), "Hauptstrasse")
+        assert "%>" in str(result.query)
+
+    def test_threshold_is_set_for_the_database(self, db):
+        """The ``%>`` operator uses the search threshold."""
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW pg_trgm.word_similarity_threshold")
+            assert float(cursor.fetchone()[0]) == SIMILARITY_THRESHOLD
+
 
 # ---------------------------------------------------------------------------
 # Unit tests for trigram_name_search
@@ -378,7 +417,7 @@ class TestAddressAllTrigram:
             {"search": "Hauptstr", "project": search_project.pk},
         )
         assert response.status_code == 200
-        results = response.data["results"]
+        results = json.loads(response.getvalue())["results"]
         streets = [r["street"] for r in results]
         assert "Hauptstraße" in streets
 
@@ -396,8 +435,9 @@ class TestAddressAllTrigram:
             },
         )
         assert response.status_code == 200
-        assert "count" in response.data
-        assert "results" in response.data
+        data = json.loads(response.getvalue())
+        assert "count" in data
+        assert "results" in data
 
 
 # ---------------------------------------------------------------------------
@@ -415,7 +455,7 @@ class TestNodeAllTrigram:
             {"search": "Hauptvert", "project": search_project.pk},
         )
         assert response.status_code == 200
-        data = response.data
+        data = json.loads(response.getvalue())
         features = data.get("features", data) if isinstance(data, dict) else data
         if isinstance(features, list):
             names = [
@@ -443,3 +483,108 @@ class TestAreaAllTrigram:
             {"search": "Baugebit", "project": search_project.pk},
         )
         assert response.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Unified search index
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+class TestSearchIndexTriggers:
+    """The search_index table follows inserts, updates and deletes."""
+
+    def test_address_entry_follows_changes(self, address_data):
+        """Address entries carry label and normalized document."""
+        address = address_data[0]
+        entry = SearchIndex.objects.get(entity_type="address", entity_uuid=address.uuid)
+        assert entry.label == "Hauptstraße 1, 24941 Flensburg"
+        assert "mürwik" in entry.document
+        assert entry.project_id == address.project_id
+
+        address.city = "Glücksburg"
+        address.save()
+        entry.refresh_from_db()
+        assert "glücksburg" in entry.document
+
+        address.delete()
+        assert not SearchIndex.objects.filter(entity_uuid=address.uuid).exists()
+
+    def test_residential_unit_follows_its_address(self, address_data):
+        """Units are found by their address and move with it."""
+        address = address_data[1]
+        unit = ResidentialUnitFactory(uuid_address=address, side="links")
+
+        address.street = "Neue Straße"
+        address.save()
+        entry = SearchIndex.objects.get(
+            entity_type="residential_unit", entity_uuid=unit.uuid
+        )
+        assert "neue straße 42" in entry.document
+        assert entry.project_id == address.project_id
+
+    def test_search_ranks_across_types(self, address_data, node_data):
+        """One query returns matches of every entity type, prefixes first."""
+        results = list(search_index("haupt"))
+        types = {entry.entity_type for entry in results}
+        assert types == {"address", "node"}
+        assert all(entry.prefix_match == 1 for entry in results)
+
+    def test_search_matches_every_token(self, address_data):
+        """All tokens must match, including short ones."""
+        results = search_index("kieler 7")
+        assert [entry.label for entry in results] == ["Kieler Weg 7, 24103 Kiel"]
+
+    def test_short_token_matches_inside_words(self, search_project):
+        """Tokens under 3 characters match anywhere in the document."""
+        node_type = NodeTypeFactory(node_type="Muffe")
+        NodeFactory(name="K12", node_type=node_type, project=search_project)
+        NodeFactory(name="K7", node_type=node_type, project=search_project)
+        assert [entry.label for entry in search_index("12")] == ["K12"]
+
+    def test_blank_search_returns_nothing(self, address_data):
+        """Blank terms return no entries."""
+        assert not search_index("   ").exists()
+
+
+class TestSearchView:
+    """Integration tests for /api/v1/search/."""
+
+    def test_returns_typed_results(
+        self, authenticated_client, address_data, node_data, search_project
+    ):
+        """Results carry type, uuid and label and can be limited by type."""
+        response = authenticated_client.get(
+            "/api/v1/search/",
+            {"search": "haupt", "type": "node", "project": search_project.pk},
+        )
+        assert response.status_code == 200
+        assert [r["label"] for r in response.data["results"]] == [
+            "Hauptverteiler Nord"
+        ]
+        assert response.data["results"][0]["type"] == "node"
+
+    def test_rejects_unknown_type(self, authenticated_client, address_data):
+        """Unknown entity types are rejected."""
+        response = authenticated_client.get(
+            "/api/v1/search/", {"search": "haupt", "type": "area"}
+        )
+        assert response.status_code == 400
+
+    def test_rejects_non_numeric_project(self, authenticated_client, address_data):
+        """A malformed project ID is a client error."""
+        response = authenticated_client.get(
+            "/api/v1/search/", {"search": "haupt", "project": "abc"}
+        )
+        assert response.status_code == 400
+
+    def test_trace_search_cable_uses_index(self, authenticated_client, search_project):
+        """Typed trace searches for cables are served from the index."""
+        CableFactory(name="Hauptkabel 144", project=search_project)
+        CableFactory(name="Nebenkabel", project=search_project)
+        response = authenticated_client.get(
+            "/api/v1/trace-search/",
+            {"search": "hauptkabel", "type": "cable", "project": search_project.pk},
+        )
+        assert response.status_code == 200
+        assert [r["name"] for r in response.data["results"]] == ["Hauptkabel 144"]
@@ -1516,6 +1516,29 @@ class TestBuildInquiryExportZip:
         zf = self._get_zip(export_data)
         assert "inquiry_export.qlr" in zf.namelist()
 
+    def test_flatgeobuf_layers(self, export_data, tmp_path):
+        """The fgb layer format writes FlatGeobuf files referenced by the QLR."""
+        import geopandas as gpd
+
+        buf = build_inquiry_export_zip(
+            export_data["pipeline_record"].uuid, layer_format="fgb"
+        )
+        zf = zipfile.ZipFile(buf, "r")
+        assert "layers/trenches.fgb" in zf.namelist()
+        assert "layers/trenches.geojson" not in zf.namelist()
+        assert "./layers/trenches.fgb" in zf.read("inquiry_export.qlr").decode()
+
+        zf.extract("layers/trenches.fgb", tmp_path)
+        frame = gpd.read_file(tmp_path / "layers" / "trenches.fgb")
+        assert set(frame["id_trench"]) == {"TR-AAAAAAA", "TR-BBBBBBB"}
+
+    def test_rejects_unknown_layer_format(self, export_data):
+        """An unsupported layer format raises ValueError."""
+        with pytest.raises(ValueError, match="Unsupported layer format"):
+            build_inquiry_export_zip(
+                export_data["pipeline_record"].uuid, layer_format="kml"
+            )
+
     def test_features_outside_area_excluded(self, export_data):
         """Trenches outside the inquiry polygon are not included."""
         zf = self._get_zip(export_data)
@@ -8,6 +8,7 @@ and folder renaming.
 from unittest.mock import patch
 
 import pytest
+from apps.api.caching import get_version
 from apps.api.models import (
     Cable,
     CableLabel,
@@ -19,9 +20,17 @@ from apps.api.models import (
     RoutePermission,
     TrenchConduitConnection,
 )
+from apps.api.permissions import (
+    PERMISSIONS_NAMESPACE,
+    get_user_permissions,
+    user_groups_cache_key,
+)
+from apps.api.signals import invalidate_all_permission_caches
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import LineString
 from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from .factories import (
     CableTypeColorMappingFactory,
@@ -785,56 +794,121 @@ class TestPermissionCacheInvalidation:
         """Get the Admin group with all permission data seeded."""
         return seed_permission_data["admin_group"]
 
-    def test_model_permission_save_invalidates_cache(self, test_user, admin_group):
-        """Verify saving a ModelPermission clears all user permission caches."""
-        cache_key = f"user_permissions:{test_user.pk}"
-        cache.set(cache_key, {"trench": "view"})
-        assert cache.get(cache_key) is not None
+    def test_model_permission_save_invalidates_cache(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify saving a ModelPermission bumps the permission version."""
+        version = get_version(PERMISSIONS_NAMESPACE)
 
         perm = ModelPermission.objects.filter(group=admin_group).first()
-        perm.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            perm.save()
 
-        assert cache.get(cache_key) is None
+        assert get_version(PERMISSIONS_NAMESPACE) > version
 
-    def test_model_permission_delete_invalidates_cache(self, test_user, admin_group):
-        """Verify deleting a ModelPermission clears all user permission caches."""
-        cache_key = f"user_permissions:{test_user.pk}"
-        cache.set(cache_key, {"trench": "view"})
+    def test_model_permission_delete_invalidates_cache(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify deleting a ModelPermission bumps the permission version."""
+        version = get_version(PERMISSIONS_NAMESPACE)
 
         perm = ModelPermission.objects.filter(group=admin_group).first()
-        perm.delete()
+        with django_capture_on_commit_callbacks(execute=True):
+            perm.delete()
 
-        assert cache.get(cache_key) is None
+        assert get_version(PERMISSIONS_NAMESPACE) > version
 
-    def test_route_permission_save_invalidates_cache(self, test_user, admin_group):
-        """Verify saving a RoutePermission clears all user permission caches."""
-        cache_key = f"user_permissions:{test_user.pk}"
-        cache.set(cache_key, {"trench": "view"})
+    def test_route_permission_save_invalidates_cache(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify saving a RoutePermission bumps the permission version."""
+        version = get_version(PERMISSIONS_NAMESPACE)
 
         perm = RoutePermission.objects.filter(group=admin_group).first()
-        perm.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            perm.save()
+
+        assert get_version(PERMISSIONS_NAMESPACE) > version
+
+    def test_permission_change_needs_no_per_user_work(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify a permission change only bumps the version counter on commit."""
+        with django_capture_on_commit_callbacks() as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                invalidate_all_permission_caches()
+        assert len(queries) == 0
+        assert len(callbacks) == 1
+
+        with CaptureQueriesContext(connection) as queries:
+            callbacks[0]()
+        assert [query["sql"].split()[:3] for query in queries] == [
+            ["INSERT", "INTO", "cache_version"]
+        ]
+
+    def test_permission_change_waits_for_commit(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify the version is not bumped before the transaction commits."""
+        version = get_version(PERMISSIONS_NAMESPACE)
+
+        perm = ModelPermission.objects.filter(group=admin_group).first()
+        with django_capture_on_commit_callbacks(execute=False):
+            perm.save()
+            assert get_version(PERMISSIONS_NAMESPACE) == version
+
+    def test_changed_permission_is_seen(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify compiled permissions are rebuilt after a change."""
+        with django_capture_on_commit_callbacks(execute=True):
+            test_user.groups.add(admin_group)
+        assert get_user_permissions(test_user)["models"]["trench"] == "full"
+
+        perm = ModelPermission.objects.get(group=admin_group, model_name="trench")
+        perm.access_level = "view"
+        with django_capture_on_commit_callbacks(execute=True):
+            perm.save()
+
+        assert get_user_permissions(test_user)["models"]["trench"] == "view"
+
+    def test_user_group_change_invalidates_user_cache(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify changing user groups clears that user's cached groups."""
+        cache_key = user_groups_cache_key(test_user.pk)
+        cache.set(cache_key, ())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            test_user.groups.add(admin_group)
 
         assert cache.get(cache_key) is None
 
-    def test_user_group_change_invalidates_user_cache(self, test_user, admin_group):
-        """Verify changing user groups clears that user's permission cache."""
-        cache_key = f"user_permissions:{test_user.pk}"
-        cache.set(cache_key, {"trench": "view"})
+    def test_reverse_group_change_invalidates_user_cache(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
+        """Verify adding a user from the group side clears their cached groups."""
+        cache_key = user_groups_cache_key(test_user.pk)
+        cache.set(cache_key, ())
 
-        test_user.groups.add(admin_group)
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_group.user_set.add(test_user)
 
         assert cache.get(cache_key) is None
 
-    def test_other_user_cache_survives_group_change(self, test_user, admin_group):
+    def test_other_user_cache_survives_group_change(
+        self, test_user, admin_group, django_capture_on_commit_callbacks
+    ):
         """Verify other users' caches are not affected by one user's group change."""
         other_user = User.objects.create_user(
             username="other_user",
             email="other@example.com",
             password="pass",
         )
-        other_key = f"user_permissions:{other_user.pk}"
-        cache.set(other_key, {"trench": "full"})
+        other_key = user_groups_cache_key(other_user.pk)
+        cache.set(other_key, ())
 
-        test_user.groups.add(admin_group)
+        with django_capture_on_commit_callbacks(execute=True):
+            test_user.groups.add(admin_group)
 
         assert cache.get(other_key) is not None
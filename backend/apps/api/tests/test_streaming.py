@@ -0,0 +1,296 @@
+"""Tests for the database-side JSON rendering of the ``all`` endpoints."""
+
+import datetime
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import GEOSGeometry, LineString, Point
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.api.models import Address, Area, Conduit, Node, Trench
+from apps.api.serializers import (
+    AddressListSerializer,
+    AreaSerializer,
+    ConduitListSerializer,
+    NodeSerializer,
+    ParentNodeSerializer,
+    TrenchSerializer,
+)
+from apps.api.streaming import UnsupportedField, json_rows, row_expression
+
+from .factories import (
+    AddressFactory,
+    AreaFactory,
+    CompanyFactory,
+    ConduitFactory,
+    NodeFactory,
+    StatusFactory,
+    TrenchFactory,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def authenticated_client(db):
+    """Create an authenticated superuser API client."""
+    user = User.objects.create_superuser(
+        username="streaming_user",
+        email="streaming@example.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _normalize(value):
+    """Parse EWKT strings so geometries compare independent of digit count."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str) and value.startswith("SRID="):
+        return GEOSGeometry(value)
+    return value
+
+
+def _assert_equivalent(streamed, expected):
+    """Assert two parsed JSON documents match, geometries within 1 µm.
+
+    The database prints numbers differently from DRF (see the module
+    docstring of ``apps.api.streaming``), so only the parsed values match.
+    """
+    streamed, expected = _normalize(streamed), _normalize(expected)
+    if isinstance(expected, GEOSGeometry):
+        assert expected.equals_exact(streamed, 1e-6)
+        assert expected.srid == streamed.srid
+    elif isinstance(expected, dict):
+        assert list(streamed) == list(expected)
+        for key in expected:
+            _assert_equivalent(streamed[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(streamed) == len(expected)
+        for streamed_item, expected_item in zip(streamed, expected):
+            _assert_equivalent(streamed_item, expected_item)
+    else:
+        assert streamed == expected
+
+
+def _serialized(serializer_class, queryset):
+    """Render ``queryset`` through the serializer as the API used to."""
+    return json.loads(JSONRenderer().render(serializer_class(queryset, many=True).data))
+
+
+@pytest.fixture
+def layer_data(db, project, flag):
+    """Populate a project with features using nullable and dated fields."""
+    owner = CompanyFactory()
+    address = AddressFactory(
+        project=project, flag=flag, house_number_suffix="a", district=None
+    )
+    parent = NodeFactory(
+        project=project,
+        flag=flag,
+        uuid_address=address,
+        owner=owner,
+        date=datetime.date(2024, 3, 9),
+        canvas_x=1.5,
+        geom=Point(565000.125, 6050000.5, srid=25832),
+    )
+    NodeFactory(project=project, flag=flag, parent_node=parent)
+    TrenchFactory(
+        project=project,
+        flag=flag,
+        status=StatusFactory(),
+        date=datetime.date(2024, 1, 31),
+        comment="Quote \" and newline\n",
+        geom=LineString((565000.1, 6050000.2), (565010.3, 6050001.4), srid=25832),
+    )
+    TrenchFactory(project=project, flag=flag, length=12.34)
+    AreaFactory(project=project, flag=flag)
+    ConduitFactory(project=project, flag=flag, owner=owner)
+    ConduitFactory(project=project, flag=flag)
+    return {"project": project, "flag": flag}
+
+
+@pytest.mark.django_db
+class TestRowExpression:
+    """Tests for the serializer-to-SQL translation."""
+
+    @pytest.mark.parametrize(
+        "serializer_class, model",
+        [
+            (TrenchSerializer, Trench),
+            (NodeSerializer, Node),
+            (AreaSerializer, Area),
+            (AddressListSerializer, Address),
+            (ConduitListSerializer, Conduit),
+        ],
+    )
+    def test_rows_match_serializer(self, layer_data, serializer_class, model):
+        """Each database-rendered row parses to the serializer's output."""
+        queryset = model.objects.filter(project=layer_data["project"]).order_by("pk")
+        streamed = [json.loads(row) for row in json_rows(queryset, serializer_class)]
+        expected = _serialized(serializer_class, queryset)
+        if isinstance(expected, dict):
+            expected = expected["features"]
+        _assert_equivalent(streamed, expected)
+
+    def test_rejects_method_fields(self):
+        """Fields computed in Python cannot be rendered by the database."""
+
+        class MethodSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Area
+                fields = ["uuid", "label"]
+
+            def get_label(self, obj):
+                return obj.name
+
+        with pytest.raises(UnsupportedField):
+            row_expression(MethodSerializer)
+
+    @pytest.mark.parametrize(
+        "serializer_class",
+        [
+            TrenchSerializer,
+            NodeSerializer,
+            AreaSerializer,
+            AddressListSerializer,
+            ConduitListSerializer,
+            ParentNodeSerializer,
+        ],
+    )
+    def test_streamed_serializers_translate(self, serializer_class):
+        """The ``all`` endpoints never fall back to rendering in Python."""
+        row_expression(serializer_class)
+
+    def test_untranslatable_serializer_falls_back(self, layer_data):
+        """Serializers without SQL rendering stream DRF's exact output."""
+
+        class MethodSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Area
+                fields = ["uuid", "label"]
+
+            def get_label(self, obj):
+                return obj.name
+
+        queryset = Area.objects.filter(project=layer_data["project"]).order_by("pk")
+        streamed = list(json_rows(queryset, MethodSerializer).iterator(chunk_size=1))
+        expected = [
+            JSONRenderer().render(item).decode()
+            for item in MethodSerializer(queryset, many=True).data
+        ]
+        assert streamed == expected
+
+
+@pytest.mark.django_db
+class TestStreamedEndpoints:
+    """Tests for the streamed ``all`` list endpoints."""
+
+    def test_trenches_stream_feature_collection(
+        self, authenticated_client, layer_data
+    ):
+        """The trench layer streams the serializer's FeatureCollection."""
+        project = layer_data["project"]
+        response = authenticated_client.get(f"/api/v1/trench/all/?project={project.id}")
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/json"
+
+        queryset = Trench.objects.filter(project=project).order_by("id_trench")
+        _assert_equivalent(
+            json.loads(response.getvalue()), _serialized(TrenchSerializer, queryset)
+        )
+
+    def test_nodes_keep_metadata(self, authenticated_client, layer_data):
+        """Node features are followed by the settings metadata."""
+        project = layer_data["project"]
+        response = authenticated_client.get(f"/api/v1/node/all/?project={project.id}")
+        data = json.loads(response.getvalue())
+
+        assert list(data) == ["type", "features", "metadata"]
+        assert len(data["features"]) == 2
+        assert data["metadata"]["excluded_node_type_ids"] == []
+
+    def test_minimal_nodes_page_by_cursor(self, authenticated_client, layer_data):
+        """Minimal node lists are streamed and keyset paginated."""
+        project = layer_data["project"]
+        url = f"/api/v1/node/all/?project={project.id}&minimal=true&limit=1"
+        response = authenticated_client.get(url)
+        assert response.streaming
+        data = json.loads(response.getvalue())
+
+        assert list(data) == ["nodes", "metadata", "next_cursor"]
+        first = Node.objects.filter(project=project).order_by("pk").first()
+        assert data["nodes"] == [{"uuid": str(first.uuid), "name": first.name}]
+
+        response = authenticated_client.get(f"{url}&cursor={data['next_cursor']}")
+        data = json.loads(response.getvalue())
+        assert len(data["nodes"]) == 1
+        assert data["next_cursor"] is None
+
+    def test_pagination_envelope(self, authenticated_client, layer_data):
+        """Paginated layers stream one page inside the usual envelope."""
+        project = layer_data["project"]
+        response = authenticated_client.get(
+            f"/api/v1/conduit/all/?project={project.id}&page=2&page_size=1"
+        )
+        data = json.loads(response.getvalue())
+
+        assert data["count"] == 2
+        assert data["total_pages"] == 2
+        assert len(data["results"]) == 1
+        queryset = Conduit.objects.filter(project=project).order_by("name")[1:2]
+        _assert_equivalent(
+            data["results"], _serialized(ConduitListSerializer, queryset)
+        )
+
+    def test_flatgeobuf_layer(self, authenticated_client, layer_data, tmp_path):
+        """Negotiating FlatGeobuf streams the layer as a .fgb file."""
+        import geopandas as gpd
+
+        project = layer_data["project"]
+        response = authenticated_client.get(
+            f"/api/v1/trench/all/?project={project.id}",
+            HTTP_ACCEPT="application/vnd.flatgeobuf",
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/vnd.flatgeobuf"
+        assert response.streaming
+        assert 'filename="trenches.fgb"' in response["Content-Disposition"]
+
+        path = tmp_path / "trenches.fgb"
+        path.write_bytes(response.getvalue())
+        frame = gpd.read_file(path)
+        trenches = Trench.objects.filter(project=project)
+        assert set(frame["uuid"]) == {str(trench.uuid) for trench in trenches}
+        assert frame.crs.to_epsg() == 25832
+        assert "id_trench" in frame.columns
+
+    def test_empty_flatgeobuf_layer(self, authenticated_client, project, tmp_path):
+        """A layer without features is still a readable FlatGeobuf file."""
+        import geopandas as gpd
+
+        response = authenticated_client.get(
+            f"/api/v1/area/all/?project={project.id}&format=fgb"
+        )
+        assert response.status_code == 200
+
+        path = tmp_path / "areas.fgb"
+        path.write_bytes(response.getvalue())
+        assert gpd.read_file(path).empty
+
+    def test_empty_layer(self, authenticated_client, project):
+        """A layer without features streams an empty collection."""
+        response = authenticated_client.get(f"/api/v1/area/all/?project={project.id}")
+        assert response.getvalue() == b'{"type":"FeatureCollection","features":[]}'
@@ -0,0 +1,162 @@
+"""Tests for the history-driven ``changes`` layer endpoints."""
+
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.api.models import Trench
+
+from .factories import CableFactory, ConduitFactory, ProjectFactory, TrenchFactory
+
+User = get_user_model()
+
+
+@pytest.fixture
+def authenticated_client(db):
+    """Create an authenticated superuser API client."""
+    user = User.objects.create_superuser(
+        username="sync_user",
+        email="sync@example.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _changes(client, url):
+    """Return the parsed body of a (possibly streamed) changes response."""
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    if response.streaming:
+        return json.loads(response.getvalue())
+    return response.data
+
+
+@pytest.mark.django_db
+class TestLayerChanges:
+    """Tests for incremental sync of the layers."""
+
+    def test_without_since_returns_token_only(
+        self, authenticated_client, project, flag
+    ):
+        """Without since the current token comes with no features."""
+        TrenchFactory(project=project, flag=flag)
+        data = _changes(
+            authenticated_client, f"/api/v1/trench/changes/?project={project.id}"
+        )
+        assert data["features"] == []
+        assert data["removed"] == []
+        assert data["token"].split(":")[0] == str(
+            Trench.history.latest("history_id").history_id
+        )
+
+    def test_reports_upserts_and_deletions(self, authenticated_client, project, flag):
+        """Features touched after the token are returned or listed as removed."""
+        unchanged = TrenchFactory(project=project, flag=flag)
+        updated = TrenchFactory(project=project, flag=flag)
+        deleted = TrenchFactory(project=project, flag=flag)
+        url = f"/api/v1/trench/changes/?project={project.id}"
+        token = _changes(authenticated_client, url)["token"]
+
+        created = TrenchFactory(project=project, flag=flag)
+        updated.comment = "moved"
+        updated.save()
+        deleted_pk = str(deleted.pk)
+        deleted.delete()
+
+        data = _changes(authenticated_client, f"{url}&since={token}")
+        ids = {feature["id"] for feature in data["features"]}
+        assert ids == {str(created.pk), str(updated.pk)}
+        assert str(unchanged.pk) not in ids
+        assert data["removed"] == [deleted_pk]
+        assert data["token"] != token
+
+        data = _changes(authenticated_client, f"{url}&since={data['token']}")
+        assert data["features"] == []
+        assert data["removed"] == []
+
+    def test_moved_out_of_project_is_removed(
+        self, authenticated_client, project, flag
+    ):
+        """A conduit moved to another project leaves the filtered layer."""
+        conduit = ConduitFactory(project=project, flag=flag)
+        url = f"/api/v1/conduit/changes/?project={project.id}"
+        token = _changes(authenticated_client, url)["token"]
+
+        conduit.name = "renamed"
+        conduit.save()
+        conduit.project = ProjectFactory()
+        conduit.save()
+
+        data = _changes(authenticated_client, f"{url}&since={token}")
+        assert data["results"] == []
+        assert data["removed"] == [str(conduit.pk)]
+
+    def test_project_change_in_single_save_is_removed(
+        self, authenticated_client, project, flag
+    ):
+        """A conduit whose project changes in its only save since is removed."""
+        conduit = ConduitFactory(project=project, flag=flag)
+        url = f"/api/v1/conduit/changes/?project={project.id}"
+        token = _changes(authenticated_client, url)["token"]
+
+        conduit.project = ProjectFactory()
+        conduit.save()
+
+        data = _changes(authenticated_client, f"{url}&since={token}")
+        assert data["results"] == []
+        assert data["removed"] == [str(conduit.pk)]
+
+    def test_token_covers_transactions_open_when_issued(
+        self, authenticated_client, project, flag
+    ):
+        """History rows invisible to the token's snapshot are reported later."""
+        url = f"/api/v1/trench/changes/?project={project.id}"
+        token = _changes(authenticated_client, url)["token"]
+        trench = TrenchFactory(project=project, flag=flag)
+        # Pretend the trench was written by transaction 5, which the token's
+        # snapshot saw in progress, and got an id below the token's.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE api_historicaltrench SET history_xid = '5' WHERE uuid = %s",
+                [trench.pk],
+            )
+        later = f"{int(token.split(':')[0]) + 100}:5:6:5"
+
+        data = _changes(authenticated_client, f"{url}&since={later}")
+        assert [feature["id"] for feature in data["features"]] == [str(trench.pk)]
+
+    def test_since_timestamp(self, authenticated_client, project, flag):
+        """An ISO 8601 timestamp selects changes made after it."""
+        TrenchFactory(project=project, flag=flag)
+        since = timezone.now()
+        created = TrenchFactory(project=project, flag=flag)
+
+        data = _changes(
+            authenticated_client,
+            f"/api/v1/trench/changes/?project={project.id}"
+            f"&since={since.isoformat().replace('+', '%2B')}",
+        )
+        assert [feature["id"] for feature in data["features"]] == [str(created.pk)]
+
+    def test_serialized_layer(self, authenticated_client, project, flag):
+        """Cables report their changes through the cable serializer."""
+        url = f"/api/v1/cable/changes/?project={project.id}"
+        token = _changes(authenticated_client, url)["token"]
+        cable = CableFactory(project=project, flag=flag)
+
+        data = _changes(authenticated_client, f"{url}&since={token}")
+        assert [row["uuid"] for row in data["results"]] == [str(cable.uuid)]
+
+    def test_invalid_since(self, authenticated_client, project):
+        """A malformed since parameter returns a 400 error."""
+        response = authenticated_client.get(
+            f"/api/v1/trench/changes/?project={project.id}&since=yesterday"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -14,6 +14,9 @@ from apps.api.wms_service import (
 )
 from django.core.cache import cache
 
+# Cache keys embed a version counter stored in the database.
+pytestmark = pytest.mark.django_db
+
 
 @pytest.fixture(autouse=True)
 def clear_wms_cache():
@@ -78,11 +81,20 @@ class TestClearCapabilitiesCache:
         clear_capabilities_cache("https://wms.example.com")
         assert _get_cached_layers(key) is None
 
-    def test_clear_all_without_delete_pattern_logs_warning(self):
-        """Verify warning when cache backend lacks delete_pattern."""
-        with patch("apps.api.wms_service.logger") as mock_logger:
-            clear_capabilities_cache()
-            mock_logger.warning.assert_called_once()
+    def test_clear_all(self):
+        """Verify clearing without a URL invalidates every cached entry."""
+        key1 = _get_cache_key("https://wms1.example.com")
+        key2 = _get_cache_key("https://wms2.example.com", "user1")
+        _cache_layers(key1, [{"name": "one"}])
+        _cache_layers(key2, [{"name": "two"}])
+
+        clear_capabilities_cache()
+
+        assert _get_cached_layers(_get_cache_key("https://wms1.example.com")) is None
+        assert (
+            _get_cached_layers(_get_cache_key("https://wms2.example.com", "user1"))
+            is None
+        )
 
 
 class TestCalculateRecommendedMinZoom:
@@ -199,22 +199,134 @@ class TestDashboardStatisticsView:
         assert response.data["trench"]["total_length"] == 0
         assert response.data["area"]["area_count"] == 0
 
-    def test_response_is_cached(self, authenticated_client, dashboard_data):
-        """A second request for the same project is served from the cache."""
+    def test_response_is_cached(
+        self, authenticated_client, dashboard_data, monkeypatch
+    ):
+        """A second request for unchanged project data is served from the cache."""
+        from apps.api.views import DashboardStatisticsView
+
         project = dashboard_data["project"]
         url = f"/api/v1/dashboard/statistics/?project={project.id}"
 
         first = authenticated_client.get(url)
         assert first.status_code == status.HTTP_200_OK
 
-        # Adding a trench after the first call must not change the cached response.
-        TrenchFactory(
-            project=project,
-            flag=dashboard_data["flag"],
-            length=999.0,
-            geom=LineString((0, 30), (999, 30), srid=25832),
-        )
+        def fail(*args, **kwargs):
+            raise AssertionError("statistics recomputed for a cached response")
+
+        monkeypatch.setattr(DashboardStatisticsView, "_get_trench_statistics", fail)
+        second = authenticated_client.get(url)
+        assert second.data == first.data
+
+    def test_project_change_invalidates_cache(
+        self, authenticated_client, dashboard_data, django_capture_on_commit_callbacks
+    ):
+        """Writing to the project bumps its data version and refreshes the stats."""
+        project = dashboard_data["project"]
+        url = f"/api/v1/dashboard/statistics/?project={project.id}"
+
+        first = authenticated_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TrenchFactory(
+                project=project,
+                flag=dashboard_data["flag"],
+                length=999.0,
+                geom=LineString((0, 30), (999, 30), srid=25832),
+            )
         second = authenticated_client.get(url)
-        assert second.data["trench"]["total_length"] == first.data["trench"][
-            "total_length"
+        assert second.data["trench"]["count"] == first.data["trench"]["count"] + 1
+
+    def test_rejects_non_numeric_project(self, authenticated_client):
+        """A non-numeric project parameter returns a 400 error."""
+        response = authenticated_client.get(
+            "/api/v1/dashboard/statistics/?project=abc"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_trench_breakdowns(self, authenticated_client, dashboard_data):
+        """Type, status and phase breakdowns each sum to the total length."""
+        project = dashboard_data["project"]
+        response = authenticated_client.get(
+            f"/api/v1/dashboard/statistics/?project={project.id}"
+        )
+        trench = response.data["trench"]
+        for key in ("length_by_types", "length_by_status", "length_by_phase"):
+            assert sum(row["gesamt_länge"] for row in trench[key]) == 175.0
+        assert set(trench["length_by_types"][0]) == {
+            "bauweise",
+            "oberfläche",
+            "gesamt_länge",
+        }
+        assert trench["average_house_connection_length"] == 100.0
+        assert trench["length_with_funding"] == 100.0
+        assert trench["length_with_internal_execution"] == 50.0
+
+    def test_conduit_statistics(self, authenticated_client, dashboard_data):
+        """Conduit length is derived from the connected trench."""
+        project = dashboard_data["project"]
+        response = authenticated_client.get(
+            f"/api/v1/dashboard/statistics/?project={project.id}"
+        )
+        conduit = response.data["conduit"]
+        assert conduit["count"] == 1
+        assert conduit["total_length"] == 25.0
+        assert sum(row["total"] for row in conduit["length_by_type"]) == 25.0
+        assert conduit["longest_conduits"][0]["total_length"] == 25.0
+
+    def test_conduits_without_trenches_have_no_length(self, dashboard_data):
+        """Groups without any trench length sum to NULL and sort first."""
+        from apps.api.models import Conduit
+        from apps.api.views import DashboardStatisticsView
+
+        project = dashboard_data["project"]
+        routed = Conduit.objects.get(project=project)
+        unrouted = ConduitFactory(project=project, flag=dashboard_data["flag"])
+
+        stats = DashboardStatisticsView()._get_conduit_statistics(project.id, None)
+
+        assert [row["type_name"] for row in stats["length_by_type"]] == [
+            unrouted.conduit_type.conduit_type,
+            routed.conduit_type.conduit_type,
         ]
+        assert stats["length_by_type"][0]["total"] == 0
+
+    def test_sections_use_bounded_query_count(
+        self, authenticated_client, dashboard_data, django_assert_max_num_queries
+    ):
+        """Trench, node, address and conduit sections need few queries."""
+        from apps.api.views import DashboardStatisticsView
+
+        view = DashboardStatisticsView()
+        project_id = dashboard_data["project"].id
+        with django_assert_max_num_queries(10):
+            view._get_trench_statistics(project_id, None)
+            view._get_node_statistics(project_id, None)
+            view._get_address_statistics(project_id, None)
+            view._get_conduit_statistics(project_id, None)
+
+    def test_area_coverage(self, authenticated_client, dashboard_data):
+        """Coverage counts only features strictly inside an area polygon."""
+        from ..factories import ResidentialUnitFactory
+
+        project = dashboard_data["project"]
+        flag = dashboard_data["flag"]
+        inside = AddressFactory(
+            project=project, flag=flag, geom=Point(50, 50, srid=25832)
+        )
+        ResidentialUnitFactory(uuid_address=inside)
+        ResidentialUnitFactory(uuid_address=inside)
+        NodeFactory(project=project, flag=flag, geom=Point(500, 500, srid=25832))
+
+        response = authenticated_client.get(
+            f"/api/v1/dashboard/statistics/?project={project.id}"
+        )
+        area = response.data["area"]
+        assert area["total_addresses"] == 4
+        assert area["addresses_in_areas"] == 1
+        assert area["total_nodes"] == 3
+        assert area["nodes_in_areas"] == 2
+        assert area["residential_units_in_areas"] == 2
+        assert area["addresses_per_area"][0]["count"] == 1
+        assert area["nodes_per_area"][0]["count"] == 2
+        assert sum(row["count"] for row in area["residential_by_area_type"]) == 2
@@ -2,7 +2,8 @@
 
 Covers AddressViewSet.fiber_connections and
 ResidentialUnitViewSet.fiber_connections, which resolve fiber splices linked
-to an address' residential units into per-unit connection payloads.
+to an address' residential units into per-unit connection payloads, and the
+trigger-maintained ResidentialUnitFiberIndex they read from.
 """
 
 import pytest
@@ -11,6 +12,7 @@ from apps.api.models import (
     FiberSplice,
     NodeSlotConfiguration,
     NodeStructure,
+    ResidentialUnitFiberIndex,
 )
 from django.contrib.auth import get_user_model
 from rest_framework import status
@@ -161,3 +163,49 @@ class TestResidentialUnitFiberConnections:
             status.HTTP_401_UNAUTHORIZED,
             status.HTTP_403_FORBIDDEN,
         )
+
+
+@pytest.mark.django_db
+class TestResidentialUnitFiberIndex:
+    """Tests for the trigger that keeps ResidentialUnitFiberIndex in sync."""
+
+    def test_index_row_created_with_splice(self, spliced_unit):
+        """Inserting a splice indexes the unit with the opposite-side fiber."""
+        entry = ResidentialUnitFiberIndex.objects.get(
+            residential_unit=spliced_unit["unit"]
+        )
+        assert entry.side == "b"
+        assert entry.fiber_id == spliced_unit["fiber"].uuid
+        assert entry.cable_id == spliced_unit["cable"].uuid
+        assert entry.entry_fiber_id == spliced_unit["fiber"].uuid
+
+    def test_index_follows_unit_reassignment(self, spliced_unit):
+        """Moving the unit to the other side re-resolves the serving fiber."""
+        splice = FiberSplice.objects.get(residential_unit_b=spliced_unit["unit"])
+        splice.residential_unit_b = None
+        splice.residential_unit_a = spliced_unit["unit"]
+        splice.save()
+
+        entry = ResidentialUnitFiberIndex.objects.get(
+            residential_unit=spliced_unit["unit"]
+        )
+        assert entry.side == "a"
+        assert entry.fiber_id is None
+        assert entry.entry_fiber_id == spliced_unit["fiber"].uuid
+
+    def test_index_cleared_when_splice_deleted(self, spliced_unit):
+        """Deleting the splice removes its index rows."""
+        FiberSplice.objects.filter(residential_unit_b=spliced_unit["unit"]).delete()
+
+        assert not ResidentialUnitFiberIndex.objects.filter(
+            residential_unit=spliced_unit["unit"]
+        ).exists()
+
+    def test_index_cleared_when_unit_deleted(self, spliced_unit):
+        """Deleting the unit nulls the splice reference and drops the row."""
+        unit_uuid = spliced_unit["unit"].uuid
+        spliced_unit["unit"].delete()
+
+        assert not ResidentialUnitFiberIndex.objects.filter(
+            residential_unit=unit_uuid
+        ).exists()
@@ -1,5 +1,7 @@
 """Tests for GeoJSON ViewSets: Trench, Node, Address, Area."""
 
+import json
+
 import pytest
 from apps.api.models import Node, Trench
 from django.contrib.auth import get_user_model
@@ -640,8 +642,9 @@ class TestTrenchViewSet:
 
         response = authenticated_client.get(f"/api/v1/trench/all/?project={project.id}")
         assert response.status_code == status.HTTP_200_OK
-        assert response.data["type"] == "FeatureCollection"
-        assert len(response.data["features"]) == 15
+        data = json.loads(response.getvalue())
+        assert data["type"] == "FeatureCollection"
+        assert len(data["features"]) == 15
 
     def test_all_trenches_search(self, authenticated_client):
         """Test that the all endpoint supports search by id_trench."""
@@ -656,7 +659,7 @@ class TestTrenchViewSet:
             f"/api/v1/trench/all/?project={project.id}&search={trench1.id_trench}"
         )
         assert response.status_code == status.HTTP_200_OK
-        features = response.data["features"]
+        features = json.loads(response.getvalue())["features"]
         assert len(features) == 1
         assert features[0]["id"] == str(trench1.uuid)
 
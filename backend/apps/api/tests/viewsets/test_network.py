@@ -1,8 +1,16 @@
 """Tests for network ViewSets: Cable, Conduit, Fiber, Microduct, connections."""
 
 import pytest
-from apps.api.models import Cable, Conduit, MicroductCableConnection
+from apps.api.models import (
+    Cable,
+    Conduit,
+    MicroductCableConnection,
+    NodeSlotConfiguration,
+    NodeStructure,
+)
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -16,6 +24,7 @@ from ..factories import (
     FiberStatusFactory,
     FlagFactory,
     MicroductCableConnectionFactory,
+    MicroductColorFactory,
     MicroductConnectionFactory,
     MicroductFactory,
     NodeFactory,
@@ -257,6 +266,49 @@ class TestMicroductViewSet:
         )
         assert response.status_code == status.HTTP_200_OK
 
+    def test_all_microducts_resolves_colors_and_cables(self, authenticated_client):
+        """Hex codes and the cable connection come from the shared lookups."""
+        MicroductColorFactory(name_de="rot", hex_code="#dc2626")
+        MicroductColorFactory(name_de="weiss", hex_code="#ffffff")
+        conduit = ConduitFactory()
+        striped = MicroductFactory(uuid_conduit=conduit, number=1, color="Rot-Weiss")
+        MicroductFactory(uuid_conduit=conduit, number=2, color="unbekannt")
+        cable = CableFactory(name="Cable In Microduct")
+        MicroductCableConnectionFactory(uuid_microduct=striped, uuid_cable=cable)
+
+        response = authenticated_client.get(
+            f"/api/v1/microduct/all/?uuid_conduit={conduit.uuid}"
+        )
+        by_number = {row["number"]: row for row in response.data}
+        assert by_number[1]["hex_code"] == "#dc2626"
+        assert by_number[1]["hex_code_secondary"] == "#ffffff"
+        assert by_number[1]["cable_connection"]["name"] == "Cable In Microduct"
+        assert by_number[2]["hex_code"] == "#64748b"
+        assert by_number[2]["cable_connection"] is None
+
+    def test_all_microducts_query_count_is_constant(
+        self, authenticated_client, django_assert_max_num_queries
+    ):
+        """Listing microducts takes the same queries for 2 or 20 rows."""
+        MicroductColorFactory(name_de="rot", hex_code="#dc2626")
+        node = NodeFactory(uuid_address=AddressFactory())
+
+        def query_count(count):
+            conduit = ConduitFactory()
+            for microduct in MicroductFactory.create_batch(
+                count, uuid_conduit=conduit, color="rot", uuid_node=node
+            ):
+                MicroductCableConnectionFactory(uuid_microduct=microduct)
+            url = f"/api/v1/microduct/all/?uuid_conduit={conduit.uuid}"
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_client.get(url)
+            assert len(response.data) == count
+            return len(queries)
+
+        assert query_count(2) == query_count(20)
+        with django_assert_max_num_queries(10):
+            authenticated_client.get("/api/v1/microduct/all/")
+
 
 @pytest.mark.django_db
 class TestFiberViewSet:
@@ -400,6 +452,53 @@ class TestContainerViewSet:
         response = authenticated_client.get(f"/api/v1/container/?node={node.uuid}")
         assert response.status_code == status.HTTP_200_OK
 
+    @staticmethod
+    def _build_tree(node, depth):
+        """Create a chain of ``depth`` nested containers, each with a used slot side."""
+        parent = None
+        for level in range(depth):
+            parent = ContainerFactory(
+                uuid_node=node, parent_container=parent, sort_order=level
+            )
+            config = NodeSlotConfiguration.objects.create(
+                uuid_node=node, container=parent, side="A", total_slots=10
+            )
+            NodeStructure.objects.create(
+                uuid_node=node, slot_configuration=config, slot_start=1, slot_end=3
+            )
+
+    def test_tree_nests_containers_and_slots(self, authenticated_client):
+        """The tree nests children and slot configurations under their containers."""
+        node = NodeFactory()
+        self._build_tree(node, 2)
+        NodeSlotConfiguration.objects.create(uuid_node=node, side="B", total_slots=4)
+
+        response = authenticated_client.get(f"/api/v1/container/tree/{node.uuid}/")
+        assert response.status_code == status.HTTP_200_OK
+        (root,) = response.data["containers"]
+        (child,) = root["children"]
+        assert child["children"] == []
+        assert root["slot_configurations"][0]["used_slots"] == 3
+        assert child["slot_configurations"][0]["free_slots"] == 7
+        (root_config,) = response.data["root_slot_configurations"]
+        assert root_config["side"] == "B"
+        assert root_config["used_slots"] == 0
+
+    def test_tree_query_count_is_constant(self, authenticated_client):
+        """Deeper trees do not take more queries."""
+
+        def query_count(depth):
+            node = NodeFactory()
+            self._build_tree(node, depth)
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_client.get(
+                    f"/api/v1/container/tree/{node.uuid}/"
+                )
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+
+        assert query_count(1) == query_count(6)
+
 
 @pytest.mark.django_db
 class TestTrenchConduitConnectionViewSet:
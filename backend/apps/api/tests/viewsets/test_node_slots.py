@@ -9,8 +9,11 @@ from apps.api.models import (
     NodeSlotClipNumber,
     NodeSlotConfiguration,
     NodeSlotDivider,
+    NodeStructure,
 )
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -217,6 +220,31 @@ class TestNodeSlotConfigurationViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
 
+    def test_slot_usage_is_annotated(self, authenticated_client, slot_config):
+        """Used and free slots are computed in SQL, not per configuration."""
+        node = slot_config.uuid_node
+        NodeSlotConfiguration.objects.create(uuid_node=node, side="B", total_slots=8)
+        for start, end in ((1, 2), (5, 7)):
+            NodeStructure.objects.create(
+                uuid_node=node,
+                slot_configuration=slot_config,
+                slot_start=start,
+                slot_end=end,
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(
+                f"/api/v1/node-slot-configuration/by-node/{node.uuid}/"
+            )
+        usage = {
+            row["side"]: (row["used_slots"], row["free_slots"]) for row in response.data
+        }
+        assert usage == {"A": (5, 15), "B": (0, 8)}
+        assert not any(
+            'WHERE "node_structure"."slot_configuration" =' in query["sql"]
+            for query in queries.captured_queries
+        )
+
     def test_move_to_container(self, authenticated_client, slot_config):
         """move-to-container assigns a same-node container to the config."""
         container = ContainerFactory(uuid_node=slot_config.uuid_node)
@@ -10,8 +10,11 @@ Covers:
 
 import pytest
 from apps.api.models import LogEntry, MicroductCableConnection
+from apps.api.views import FrontendLogView
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import LineString
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -55,7 +58,7 @@ def authenticated_client(db):
 class TestFrontendLogView:
     """Tests for the FrontendLogView."""
 
-    def test_creates_log_entry(self, authenticated_client, project):
+    def test_creates_log_entry(self, authenticated_client, project, log_buffer):
         """A valid payload creates a frontend log entry."""
         response = authenticated_client.post(
             "/api/v1/logs/frontend/",
@@ -68,12 +71,13 @@ class TestFrontendLogView:
             format="json",
         )
         assert response.status_code == status.HTTP_201_CREATED
+        log_buffer.flush()
         entry = LogEntry.objects.get(source="frontend")
         assert entry.level == "ERROR"
         assert entry.message == "Something broke"
         assert entry.project_id == project.id
 
-    def test_invalid_level_falls_back_to_info(self, authenticated_client):
+    def test_invalid_level_falls_back_to_info(self, authenticated_client, log_buffer):
         """An unrecognised level is stored as INFO."""
         response = authenticated_client.post(
             "/api/v1/logs/frontend/",
@@ -81,9 +85,10 @@ class TestFrontendLogView:
             format="json",
         )
         assert response.status_code == status.HTTP_201_CREATED
+        log_buffer.flush()
         assert LogEntry.objects.get(source="frontend").level == "INFO"
 
-    def test_unknown_project_is_ignored(self, authenticated_client):
+    def test_unknown_project_is_ignored(self, authenticated_client, log_buffer):
         """A non-existent project id is dropped rather than erroring."""
         response = authenticated_client.post(
             "/api/v1/logs/frontend/",
@@ -91,6 +96,7 @@ class TestFrontendLogView:
             format="json",
         )
         assert response.status_code == status.HTTP_201_CREATED
+        log_buffer.flush()
         assert LogEntry.objects.get(source="frontend").project_id is None
 
     def test_requires_authentication(self, api_client):
@@ -103,6 +109,102 @@ class TestFrontendLogView:
             status.HTTP_403_FORBIDDEN,
         )
 
+    def test_batch_written_in_one_insert(self, authenticated_client, log_buffer):
+        """An array of entries is stored with a single bulk insert."""
+        response = authenticated_client.post(
+            "/api/v1/logs/frontend/",
+            data=[{"level": "WARNING", "message": f"entry {i}"} for i in range(5)],
+            format="json",
+        )
+        assert response.data["accepted"] == 5
+
+        with CaptureQueriesContext(connection) as queries:
+            log_buffer.flush()
+        assert len(queries) == 1
+        assert LogEntry.objects.filter(source="frontend").count() == 5
+
+    def test_identical_entries_collapsed(self, authenticated_client, log_buffer):
+        """Identical entries of a batch become one entry with a repeat count."""
+        response = authenticated_client.post(
+            "/api/v1/logs/frontend/",
+            data=[{"level": "ERROR", "message": "loop", "path": "/map"}] * 4,
+            format="json",
+        )
+        assert response.data["accepted"] == 1
+        log_buffer.flush()
+        entry = LogEntry.objects.get(source="frontend")
+        assert entry.extra_data["repeat_count"] == 4
+
+    def test_repeats_suppressed_within_window(self, authenticated_client, log_buffer):
+        """A message already stored is suppressed on the next request."""
+        payload = {"level": "ERROR", "message": "again"}
+        authenticated_client.post("/api/v1/logs/frontend/", payload, format="json")
+        response = authenticated_client.post(
+            "/api/v1/logs/frontend/", [payload, payload], format="json"
+        )
+        assert response.data["accepted"] == 0
+        assert response.data["suppressed"] == 2
+        log_buffer.flush()
+        assert LogEntry.objects.filter(source="frontend").count() == 1
+
+    def test_batch_size_capped(self, authenticated_client, log_buffer, monkeypatch):
+        """Entries beyond the batch limit are dropped."""
+        monkeypatch.setattr(FrontendLogView, "max_batch_size", 3)
+        response = authenticated_client.post(
+            "/api/v1/logs/frontend/",
+            data=[{"message": f"entry {i}"} for i in range(5)],
+            format="json",
+        )
+        assert response.data["accepted"] == 3
+        assert response.data["dropped"] == 2
+
+    def test_per_minute_quota(self, authenticated_client, log_buffer, monkeypatch):
+        """A user cannot store more than the per-minute quota."""
+        monkeypatch.setattr(FrontendLogView, "max_entries_per_minute", 4)
+        first = authenticated_client.post(
+            "/api/v1/logs/frontend/",
+            data=[{"message": f"first {i}"} for i in range(3)],
+            format="json",
+        )
+        second = authenticated_client.post(
+            "/api/v1/logs/frontend/",
+            data=[{"message": f"second {i}"} for i in range(3)],
+            format="json",
+        )
+        assert first.data["accepted"] == 3
+        assert second.data["accepted"] == 1
+        assert second.data["dropped"] == 2
+
+    def test_over_quota_entry_is_not_marked_seen(
+        self, authenticated_client, log_buffer, monkeypatch
+    ):
+        """An entry dropped for the quota is stored once the quota allows."""
+        monkeypatch.setattr(FrontendLogView, "max_entries_per_minute", 1)
+        authenticated_client.post(
+            "/api/v1/logs/frontend/", {"message": "first"}, format="json"
+        )
+        dropped = authenticated_client.post(
+            "/api/v1/logs/frontend/", {"message": "second"}, format="json"
+        )
+        assert dropped.data["dropped"] == 1
+        assert dropped.data["suppressed"] == 0
+
+        monkeypatch.setattr(FrontendLogView, "max_entries_per_minute", 3)
+        retried = authenticated_client.post(
+            "/api/v1/logs/frontend/", {"message": "second"}, format="json"
+        )
+        assert retried.data["accepted"] == 1
+
+    def test_invalid_items_counted_as_dropped(self, authenticated_client, log_buffer):
+        """Items that are not entries are reported as dropped."""
+        response = authenticated_client.post(
+            "/api/v1/logs/frontend/",
+            data=[{"message": "valid"}, "not an entry", 42],
+            format="json",
+        )
+        assert response.data["accepted"] == 1
+        assert response.data["dropped"] == 2
+
 
 @pytest.mark.django_db
 class TestLayerExtentView:
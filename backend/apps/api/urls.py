@@ -7,6 +7,7 @@ GIS features, file management, WMS/WFS proxying, and dashboard statistics.
 from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
+from .permissions import register_view_model_names
 from .views import (
     AddressViewSet,
     AppLoginView,
@@ -39,6 +40,7 @@ from .views import (
     CableTypeColorMappingViewSet,
     CableViewSet,
     ConfigView,
+    MetricsView,
     FaultSimulationView,
     ConduitImportTemplateView,
     ConduitImportView,
@@ -51,6 +53,7 @@ from .views import (
     FeatureFilesViewSet,
     FiberSpliceViewSet,
     FiberTraceSummaryView,
+    SearchView,
     SignalAnalysisView,
     TraceSearchView,
     FiberTraceView,
@@ -416,6 +419,16 @@ urlpatterns = [
         ConfigView.as_view(),
         name="config",
     ),
+    path(
+        "metrics/",
+        MetricsView.as_view(),
+        name="metrics",
+    ),
+    path(
+        "search/",
+        SearchView.as_view(),
+        name="search",
+    ),
     path(
         "trace-search/",
         TraceSearchView.as_view(),
@@ -442,3 +455,5 @@ urlpatterns = [
         name="fault-simulation",
     ),
 ]
+
+register_view_model_names(urlpatterns)
@@ -6,11 +6,13 @@ WMS/WFS proxy views, dashboard statistics, and fiber trace analysis.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import mimetypes
 import os
 import threading
+import time
 import uuid
 from collections import defaultdict
 from datetime import date
@@ -25,8 +27,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.db import connection, transaction
-from django.db.models import Avg, Count, F, Q, Sum, Value
-from django.db.models.functions import TruncMonth
+from django.db.models import Count, F, Q, Sum, Value
 from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.utils.encoding import iri_to_uri
@@ -43,6 +44,19 @@ from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from .caching import project_namespace, versioned_key
+from .filters import filter_bbox, filter_conduits_bbox, parse_bbox
+from .fieldsets import SparseQuerysetMixin, parse_fieldset
+from .flatgeobuf import LAYER_RENDERER_CLASSES, flatgeobuf_response, wants_flatgeobuf
+from .handlers import buffered_log_handler
+from .metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    FAULT_SIMULATION_DURATION,
+    TILE_RENDER_DURATION,
+    TRACE_DURATION,
+    WMS_SEMAPHORE_WAIT,
+    render_metrics,
+)
 from .models import (
     Address,
     Area,
@@ -84,6 +98,7 @@ from .models import (
     NodeSlotClipNumber,
     NodeSlotConfiguration,
     NodeSlotDivider,
+    NodeStatistics,
     NodeStructure,
     NodeTrenchSelection,
     PipeBranchSettings,
@@ -93,18 +108,21 @@ from .models import (
     QGISProject,
     RequestReason,
     ResidentialUnit,
+    SearchIndex,
     Trench,
     TrenchConduitCanvas,
     TrenchConduitConnection,
+    TrenchStatistics,
     TypeOfWork,
     ValuationCostRate,
     WMSLayer,
     WMSSource,
 )
-from .pageination import CustomPagination
-from .permissions import RoleBasedPermission, get_user_permissions
+from .pageination import CustomPagination, KeysetPagination
+from .permissions import HasMetricsToken, RoleBasedPermission, get_user_permissions
+from .profiling import record_cache_lookup
 from .routing import find_shortest_path
-from .search import trigram_address_search, trigram_name_search
+from .search import search_index, trigram_address_search, trigram_name_search
 from .serializers import (
     AddressListSerializer,
     AddressSerializer,
@@ -179,10 +197,13 @@ from .services import (
     generate_conduit_import_template,
     generate_geopackage_schema,
     generate_node_structure_excel,
+    get_residential_unit_fiber_connections,
     import_conduits_from_excel,
     link_cable_to_chosen_microduct,
     trace_address,
 )
+from .streaming import ROWS, json_rows, stream_json, stream_layer
+from .sync import layer_changes
 from .wms_service import WMSServiceError, fetch_wms_layers, scan_wms_capabilities
 
 if TYPE_CHECKING:
@@ -367,7 +388,7 @@ class AttributesResidentialUnitStatusViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_url_kwarg = "pk"
 
 
-class TrenchViewSet(viewsets.ModelViewSet):
+class TrenchViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD operations for :model:`api.Trench`.
 
     Supports spatial queries, filtering by project and flag,
@@ -404,6 +425,53 @@ class TrenchViewSet(viewsets.ModelViewSet):
                 queryset = queryset.none()
         return queryset
 
+    def _get_statistics_source(self):
+        """Return the queryset and aggregates backing the length statistics.
+
+        Project and flag level figures are read from the trigger-maintained
+        :model:`api.TrenchStatistics` summary. Requests narrowed down to
+        individual trenches via ``id_trench`` or ``uuid`` fall back to
+        aggregating :model:`api.Trench` directly.
+
+        Returns:
+            tuple: ``(queryset, length, count)`` where ``length`` and ``count``
+                are aggregate expressions for ``queryset``.
+        """
+        params = self.request.query_params
+        if params.get("id_trench") or params.get("uuid"):
+            return self.get_queryset(), Sum("length"), Count("uuid")
+        return (
+            TrenchStatistics.objects.all(),
+            Sum("total_length"),
+            Sum("trench_count"),
+        )
+
+    def _get_length_totals(self, **filters):
+        """Aggregate total length and count for the request's project and flag.
+
+        Args:
+            **filters: Additional lookups applied before aggregating.
+
+        Returns:
+            dict: ``total_length`` and ``count``, zero when nothing matches.
+        """
+        project = self.request.query_params.get("project")
+        flag = self.request.query_params.get("flag")
+
+        queryset, length, count = self._get_statistics_source()
+        queryset = queryset.filter(**filters)
+
+        if project:
+            queryset = queryset.filter(project=project)
+        if flag:
+            queryset = queryset.filter(flag=flag)
+
+        totals = queryset.aggregate(total_length=length, count=count)
+        return {
+            "total_length": totals["total_length"] or 0,
+            "count": totals["count"] or 0,
+        }
+
     @action(detail=False, methods=["get"])
     def length_by_types(self, request):
         """Get trench lengths grouped by construction type and surface.
@@ -414,7 +482,7 @@ class TrenchViewSet(viewsets.ModelViewSet):
         project = request.query_params.get("project")
         flag = request.query_params.get("flag")
 
-        queryset = Trench.objects.all()
+        queryset, length, _ = self._get_statistics_source()
 
         if project:
             queryset = queryset.filter(project=project)
@@ -427,7 +495,7 @@ class TrenchViewSet(viewsets.ModelViewSet):
                 oberfläche=F("surface__surface"),
             )
             .values("bauweise", "oberfläche")
-            .annotate(gesamt_länge=Sum("length"))
+            .annotate(gesamt_länge=length)
             .order_by("bauweise", "oberfläche")
         )
 
@@ -438,84 +506,33 @@ class TrenchViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def total_length(self, request):
         """Return total trench length and count, filterable by status, project, flag, surface, and construction type."""
-        status = self.request.query_params.get("status")
-        project = self.request.query_params.get("project")
-        flag = self.request.query_params.get("flag")
-        surface = self.request.query_params.get("surface")
-        construction_type = self.request.query_params.get("construction_type")
-
-        queryset = self.get_queryset()
-        if status:
-            queryset = queryset.filter(status=status)
-        if project:
-            queryset = queryset.filter(project=project)
-        if flag:
-            queryset = queryset.filter(flag=flag)
-        if surface:
-            queryset = queryset.filter(surface=surface)
-        if construction_type:
-            queryset = queryset.filter(construction_type=construction_type)
-
-        total_length = (
-            queryset.aggregate(total_length=Sum("length"))["total_length"] or 0
-        )
+        filters = {}
+        for param in ("status", "surface", "construction_type"):
+            value = self.request.query_params.get(param)
+            if value:
+                filters[param] = value
 
-        return Response({"total_length": total_length, "count": queryset.count()})
+        return Response(self._get_length_totals(**filters))
 
     @action(detail=False, methods=["get"])
     def average_house_connection_length(self, request):
         """Return average length of house-connection trenches, filterable by project and flag."""
-        project = self.request.query_params.get("project")
-        flag = self.request.query_params.get("flag")
-
-        queryset = self.get_queryset().filter(house_connection=True)
-
-        if project:
-            queryset = queryset.filter(project=project)
-        if flag:
-            queryset = queryset.filter(flag=flag)
-
-        avg_length = queryset.aggregate(avg_length=Avg("length"))["avg_length"] or 0
+        totals = self._get_length_totals(house_connection=True)
+        avg_length = (
+            totals["total_length"] / totals["count"] if totals["count"] else 0
+        )
 
-        return Response({"average_length": avg_length, "count": queryset.count()})
+        return Response({"average_length": avg_length, "count": totals["count"]})
 
     @action(detail=False, methods=["get"])
     def length_with_funding(self, request):
         """Return total length and count of funded trenches, filterable by project and flag."""
-        project = self.request.query_params.get("project")
-        flag = self.request.query_params.get("flag")
-
-        queryset = self.get_queryset().filter(funding_status=True)
-
-        if project:
-            queryset = queryset.filter(project=project)
-        if flag:
-            queryset = queryset.filter(flag=flag)
-
-        total_length = (
-            queryset.aggregate(total_length=Sum("length"))["total_length"] or 0
-        )
-
-        return Response({"total_length": total_length, "count": queryset.count()})
+        return Response(self._get_length_totals(funding_status=True))
 
     @action(detail=False, methods=["get"])
     def length_with_internal_execution(self, request):
         """Return total length and count of internally-executed trenches, filterable by project and flag."""
-        project = self.request.query_params.get("project")
-        flag = self.request.query_params.get("flag")
-
-        queryset = self.get_queryset().filter(internal_execution=True)
-
-        if project:
-            queryset = queryset.filter(project=project)
-        if flag:
-            queryset = queryset.filter(flag=flag)
-
-        total_length = (
-            queryset.aggregate(total_length=Sum("length"))["total_length"] or 0
-        )
-
-        return Response({"total_length": total_length, "count": queryset.count()})
+        return Response(self._get_length_totals(internal_execution=True))
 
     @action(detail=False, methods=["get"])
     def length_by_status(self, request):
@@ -523,7 +540,7 @@ class TrenchViewSet(viewsets.ModelViewSet):
         project = self.request.query_params.get("project")
         flag = self.request.query_params.get("flag")
 
-        queryset = self.get_queryset()
+        queryset, length, _ = self._get_statistics_source()
 
         if project:
             queryset = queryset.filter(project=project)
@@ -533,7 +550,7 @@ class TrenchViewSet(viewsets.ModelViewSet):
         queryset = (
             queryset.annotate(status_name=F("status__status"))
             .values("status_name")
-            .annotate(gesamt_länge=Sum("length"))
+            .annotate(gesamt_länge=length)
             .order_by("status_name")
         )
 
@@ -547,7 +564,7 @@ class TrenchViewSet(viewsets.ModelViewSet):
         project = self.request.query_params.get("project")
         flag = self.request.query_params.get("flag")
 
-        queryset = self.get_queryset()
+        queryset, length, _ = self._get_statistics_source()
 
         if project:
             queryset = queryset.filter(project=project)
@@ -557,7 +574,7 @@ class TrenchViewSet(viewsets.ModelViewSet):
         queryset = (
             queryset.annotate(network_level=F("phase__phase"))
             .values("network_level")
-            .annotate(gesamt_länge=Sum("length"))
+            .annotate(gesamt_länge=length)
             .order_by("network_level")
         )
 
@@ -592,11 +609,53 @@ class TrenchViewSet(viewsets.ModelViewSet):
 
         return Response({"results": results, "count": len(results)})
 
-    @action(detail=False, methods=["get"], url_path="all")
+    @action(detail=False, methods=["get"], url_path="changes")
+    def trench_changes(self, request):
+        """Return trenches created, updated or deleted since a sync token.
+
+        Query Parameters:
+            since: ``token`` of an earlier response, or an ISO 8601 timestamp.
+                Without it only the current token is returned.
+            project: Filter by project ID.
+            flag: Filter by flag ID.
+
+        Returns:
+            StreamingHttpResponse: GeoJSON FeatureCollection of the changed
+                features, with ``removed`` keys and the next ``token``.
+        """
+        queryset = Trench.objects.select_related(
+            "surface",
+            "construction_type",
+            "status",
+            "phase",
+            "owner",
+            "constructor",
+            "project",
+            "flag",
+        )
+        changes = layer_changes(request, queryset)
+        return stream_json(
+            json_rows(changes.changed, TrenchSerializer, parse_fieldset(request)),
+            {
+                "type": "FeatureCollection",
+                "features": ROWS,
+                "removed": changes.removed,
+                "token": changes.token,
+            },
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="all",
+        renderer_classes=LAYER_RENDERER_CLASSES,
+    )
     def all_trenches(self, request):
         """
-        Returns all trenches with project, flag, and search filters.
-        No pagination is used.
+        Returns all trenches with project, flag, search and bbox filters.
+        Pass ``limit`` (and then ``cursor``) to page through the layer.
+        Request ``application/vnd.flatgeobuf`` (or ``?format=fgb``) to get
+        the whole filtered layer as a FlatGeobuf file instead.
         """
         queryset = Trench.objects.select_related(
             "surface",
@@ -629,8 +688,16 @@ class TrenchViewSet(viewsets.ModelViewSet):
         if search_term:
             queryset = queryset.filter(Q(id_trench__icontains=search_term))
 
-        serializer = TrenchSerializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = filter_bbox(queryset, parse_bbox(request.query_params.get("bbox")))
+        if wants_flatgeobuf(request):
+            return flatgeobuf_response(
+                queryset, TrenchSerializer, "trenches", parse_fieldset(request)
+            )
+        return stream_layer(
+            request,
+            json_rows(queryset, TrenchSerializer, parse_fieldset(request)),
+            {"type": "FeatureCollection", "features": ROWS},
+        )
 
 
 class FeatureFilesViewSet(viewsets.ModelViewSet):
@@ -1163,7 +1230,7 @@ class UserPermissionsView(APIView):
 
     def get(self, request):
         """Return the authenticated user's role-based permission set."""
-        permissions = get_user_permissions(request.user)
+        permissions = get_user_permissions(request.user, request)
         return Response(permissions)
 
 
@@ -1345,7 +1412,10 @@ class OlTrenchTileViewSet(APIView):
 
         params = {"z": int(z), "x": int(x), "y": int(y), "project": project_id}
 
-        with connection.cursor() as cursor:
+        with (
+            TILE_RENDER_DURATION.time(layer="ol_trench"),
+            connection.cursor() as cursor,
+        ):
             cursor.execute(sql, params)
             row = cursor.fetchone()
 
@@ -1391,7 +1461,7 @@ class FlagsViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_url_kwarg = "pk"
 
 
-class ConduitViewSet(viewsets.ModelViewSet):
+class ConduitViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD operations for :model:`api.Conduit`.
 
     Support filtering by trench, project, and flag with pagination.
@@ -1404,6 +1474,35 @@ class ConduitViewSet(viewsets.ModelViewSet):
     lookup_field = "uuid"
     lookup_url_kwarg = "pk"
 
+    @action(detail=False, methods=["get"], url_path="changes")
+    def conduit_changes(self, request):
+        """Return conduits created, updated or deleted since a sync token.
+
+        Query Parameters:
+            since: ``token`` of an earlier response, or an ISO 8601 timestamp.
+                Without it only the current token is returned.
+            project: Filter by project ID.
+            flag: Filter by flag ID.
+
+        Returns:
+            StreamingHttpResponse: ``results`` with the changed conduits,
+                ``removed`` keys and the next ``token``.
+        """
+        queryset = Conduit.objects.select_related(
+            "conduit_type",
+            "status",
+            "network_level",
+            "owner",
+            "constructor",
+            "manufacturer",
+            "flag",
+        )
+        changes = layer_changes(request, queryset)
+        return stream_json(
+            json_rows(changes.changed, ConduitListSerializer, parse_fieldset(request)),
+            {"results": ROWS, "removed": changes.removed, "token": changes.token},
+        )
+
     @action(detail=False, methods=["get"], url_path="all")
     def all_conduits(self, request):
         """
@@ -1416,6 +1515,9 @@ class ConduitViewSet(viewsets.ModelViewSet):
         - page: Page number (default: 1)
         - page_size: Items per page (default: 50, max: 200)
         - no_pagination: Return all results without pagination (default: false)
+        - bbox: Only conduits in a trench overlapping minx,miny,maxx,maxy
+          (EPSG:3857)
+        - limit / cursor: Keyset pagination instead of pages
         """
         queryset = Conduit.objects.select_related(
             "conduit_type",
@@ -1449,11 +1551,17 @@ class ConduitViewSet(viewsets.ModelViewSet):
                 | Q(flag__flag__icontains=search_term)
             )
 
-        total_count = queryset.count()
+        queryset = filter_conduits_bbox(
+            queryset, parse_bbox(request.query_params.get("bbox"))
+        )
+        rows = json_rows(queryset, ConduitListSerializer, parse_fieldset(request))
 
-        if request.query_params.get("no_pagination") == "true":
-            serializer = ConduitListSerializer(queryset, many=True)
-            return Response(serializer.data)
+        if request.query_params.get(
+            "no_pagination"
+        ) == "true" or KeysetPagination.is_requested(request):
+            return stream_layer(request, rows)
+
+        total_count = queryset.count()
 
         try:
             page = int(request.query_params.get("page", 1))
@@ -1464,18 +1572,16 @@ class ConduitViewSet(viewsets.ModelViewSet):
 
         start = (page - 1) * page_size
         end = start + page_size
-        queryset = queryset[start:end]
-
-        serializer = ConduitListSerializer(queryset, many=True)
 
-        return Response(
+        return stream_json(
+            rows[start:end],
             {
-                "results": serializer.data,
+                "results": ROWS,
                 "count": total_count,
                 "page": page,
                 "page_size": page_size,
                 "total_pages": (total_count + page_size - 1) // page_size,
-            }
+            },
         )
 
     @action(detail=True, methods=["get"], url_path="trenches")
@@ -1720,7 +1826,7 @@ class TrenchConduitCanvasViewSet(viewsets.ModelViewSet):
         return Response(result)
 
 
-class AddressViewSet(viewsets.ModelViewSet):
+class AddressViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD operations for :model:`api.Address`.
 
     Support filtering by project, flag, city, and spatial queries.
@@ -1777,7 +1883,41 @@ class AddressViewSet(viewsets.ModelViewSet):
 
         return queryset
 
-    @action(detail=False, methods=["get"], url_path="all")
+    @action(detail=False, methods=["get"], url_path="changes")
+    def address_changes(self, request):
+        """Return addresses created, updated or deleted since a sync token.
+
+        Query Parameters:
+            since: ``token`` of an earlier response, or an ISO 8601 timestamp.
+                Without it only the current token is returned.
+            project: Filter by project ID.
+            flag: Filter by flag ID.
+
+        Returns:
+            StreamingHttpResponse: GeoJSON FeatureCollection of the changed
+                features, with ``removed`` keys and the next ``token``.
+        """
+        queryset = Address.objects.select_related(
+            "status_development",
+            "flag",
+        )
+        changes = layer_changes(request, queryset)
+        return stream_json(
+            json_rows(changes.changed, AddressListSerializer, parse_fieldset(request)),
+            {
+                "type": "FeatureCollection",
+                "features": ROWS,
+                "removed": changes.removed,
+                "token": changes.token,
+            },
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="all",
+        renderer_classes=LAYER_RENDERER_CLASSES,
+    )
     def all_addresses(self, request):
         """Return addresses with server-side pagination.
 
@@ -1788,13 +1928,19 @@ class AddressViewSet(viewsets.ModelViewSet):
                 and district. Short tokens (<3 chars) fall back to icontains.
             page: Page number (default: 1).
             page_size: Items per page (default: 50, max: 200).
+            bbox: Only addresses inside ``minx,miny,maxx,maxy`` (EPSG:3857).
+            limit: Switch to keyset pagination with this many rows per page.
+            cursor: ``next_cursor`` of the previous keyset page.
+            format: ``fgb`` (or ``Accept: application/vnd.flatgeobuf``) for
+                all filtered addresses as one FlatGeobuf file.
 
         Args:
             request: DRF request with the query params above.
 
         Returns:
-            Response: Paginated JSON with ``results``, ``count``, ``page``,
-                ``page_size``, and ``total_pages``.
+            StreamingHttpResponse: Paginated JSON with ``results``, ``count``,
+                ``page``, ``page_size``, and ``total_pages``, or ``results``
+                and ``next_cursor`` for keyset pages.
         """
         queryset = Address.objects.select_related(
             "status_development",
@@ -1814,6 +1960,16 @@ class AddressViewSet(viewsets.ModelViewSet):
         if search_term:
             queryset = trigram_address_search(queryset, search_term)
 
+        queryset = filter_bbox(queryset, parse_bbox(request.query_params.get("bbox")))
+        if wants_flatgeobuf(request):
+            return flatgeobuf_response(
+                queryset, AddressListSerializer, "addresses", parse_fieldset(request)
+            )
+        rows = json_rows(queryset, AddressListSerializer, parse_fieldset(request))
+
+        if KeysetPagination.is_requested(request):
+            return stream_layer(request, rows)
+
         total_count = queryset.count()
 
         try:
@@ -1825,18 +1981,16 @@ class AddressViewSet(viewsets.ModelViewSet):
 
         start = (page - 1) * page_size
         end = start + page_size
-        queryset = queryset[start:end]
 
-        serializer = AddressListSerializer(queryset, many=True)
-
-        return Response(
+        return stream_json(
+            rows[start:end],
             {
-                "results": serializer.data,
+                "results": ROWS,
                 "count": total_count,
                 "page": page,
                 "page_size": page_size,
                 "total_pages": (total_count + page_size - 1) // page_size,
-            }
+            },
         )
 
     @action(detail=True, methods=["get"], url_path="fiber-connections")
@@ -1846,87 +2000,10 @@ class AddressViewSet(viewsets.ModelViewSet):
         Returns a dict mapping unit UUID to its fiber connections.
         """
         address = self.get_object()
-        units = ResidentialUnit.objects.filter(uuid_address=address)
-
-        color_map = {}
-        for color in AttributesFiberColor.objects.filter(is_active=True):
-            color_map[color.name_de] = color.hex_code
-            color_map[color.name_en] = color.hex_code
-
-        splices = FiberSplice.objects.filter(
-            Q(residential_unit_a__in=units) | Q(residential_unit_b__in=units)
-        ).select_related(
-            "node_structure__uuid_node__parent_node",
-            "residential_unit_a",
-            "residential_unit_b",
-            "fiber_a",
-            "cable_a",
-            "fiber_b",
-            "cable_b",
-            "shared_fiber_a",
-            "shared_cable_a",
-            "shared_fiber_b",
-            "shared_cable_b",
+        unit_ids = ResidentialUnit.objects.filter(uuid_address=address).values_list(
+            "uuid", flat=True
         )
-
-        result = {str(unit.uuid): [] for unit in units}
-
-        for splice in splices:
-            for unit, is_b_side in [
-                (splice.residential_unit_a, False),
-                (splice.residential_unit_b, True),
-            ]:
-                if unit is None or str(unit.uuid) not in result:
-                    continue
-
-                fiber = None
-                cable = None
-
-                if is_b_side:
-                    if splice.merge_group_a and splice.shared_fiber_a:
-                        fiber = splice.shared_fiber_a
-                        cable = splice.shared_cable_a
-                    else:
-                        fiber = splice.fiber_a
-                        cable = splice.cable_a
-                else:
-                    if splice.merge_group_b and splice.shared_fiber_b:
-                        fiber = splice.shared_fiber_b
-                        cable = splice.shared_cable_b
-                    else:
-                        fiber = splice.fiber_b
-                        cable = splice.cable_b
-
-                if fiber and cable:
-                    node_name = ""
-                    parent_node_name = ""
-                    if splice.node_structure and splice.node_structure.uuid_node:
-                        node_name = splice.node_structure.uuid_node.name or ""
-                        if splice.node_structure.uuid_node.parent_node:
-                            parent_node_name = (
-                                splice.node_structure.uuid_node.parent_node.name or ""
-                            )
-
-                    result[str(unit.uuid)].append(
-                        {
-                            "node_name": node_name,
-                            "parent_node_name": parent_node_name,
-                            "cable_name": cable.name or "",
-                            "fiber_number_absolute": fiber.fiber_number_absolute,
-                            "bundle_number": fiber.bundle_number,
-                            "bundle_color": fiber.bundle_color,
-                            "bundle_color_hex": color_map.get(
-                                fiber.bundle_color, "#999999"
-                            ),
-                            "fiber_number": fiber.fiber_number_in_bundle,
-                            "fiber_color": fiber.fiber_color,
-                            "fiber_color_hex": color_map.get(
-                                fiber.fiber_color, "#999999"
-                            ),
-                        }
-                    )
-
-        return Response(result)
+        return Response(get_residential_unit_fiber_connections(unit_ids))
 
     @action(detail=True, methods=["get"], url_path="linked-trenches")
     def linked_trenches(self, request, pk=None):
@@ -2083,74 +2160,8 @@ class ResidentialUnitViewSet(viewsets.ModelViewSet):
         Returns fiber details from fiber splices where this unit is connected.
         """
         unit = self.get_object()
-        connections = []
-
-        color_map = {}
-        for color in AttributesFiberColor.objects.filter(is_active=True):
-            color_map[color.name_de] = color.hex_code
-            color_map[color.name_en] = color.hex_code
-
-        splices = FiberSplice.objects.filter(
-            Q(residential_unit_a=unit) | Q(residential_unit_b=unit)
-        ).select_related(
-            "node_structure__uuid_node__parent_node",
-            "fiber_a",
-            "cable_a",
-            "fiber_b",
-            "cable_b",
-            "shared_fiber_a",
-            "shared_cable_a",
-            "shared_fiber_b",
-            "shared_cable_b",
-        )
-
-        for splice in splices:
-            fiber = None
-            cable = None
-
-            if splice.residential_unit_b == unit:
-                if splice.merge_group_a and splice.shared_fiber_a:
-                    fiber = splice.shared_fiber_a
-                    cable = splice.shared_cable_a
-                else:
-                    fiber = splice.fiber_a
-                    cable = splice.cable_a
-            elif splice.residential_unit_a == unit:
-                if splice.merge_group_b and splice.shared_fiber_b:
-                    fiber = splice.shared_fiber_b
-                    cable = splice.shared_cable_b
-                else:
-                    fiber = splice.fiber_b
-                    cable = splice.cable_b
-
-            if fiber and cable:
-                node_name = ""
-                parent_node_name = ""
-                if splice.node_structure and splice.node_structure.uuid_node:
-                    node_name = splice.node_structure.uuid_node.name or ""
-                    if splice.node_structure.uuid_node.parent_node:
-                        parent_node_name = (
-                            splice.node_structure.uuid_node.parent_node.name or ""
-                        )
-
-                connections.append(
-                    {
-                        "node_name": node_name,
-                        "parent_node_name": parent_node_name,
-                        "cable_name": cable.name,
-                        "fiber_number_absolute": fiber.fiber_number_absolute,
-                        "bundle_number": fiber.bundle_number,
-                        "bundle_color": fiber.bundle_color,
-                        "bundle_color_hex": color_map.get(
-                            fiber.bundle_color, "#999999"
-                        ),
-                        "fiber_number": fiber.fiber_number_in_bundle,
-                        "fiber_color": fiber.fiber_color,
-                        "fiber_color_hex": color_map.get(fiber.fiber_color, "#999999"),
-                    }
-                )
-
-        return Response(connections)
+        connections = get_residential_unit_fiber_connections([unit.uuid])
+        return Response(connections[str(unit.uuid)])
 
 
 class OlAddressTileViewSet(APIView):
@@ -2211,7 +2222,10 @@ class OlAddressTileViewSet(APIView):
 
         params = {"z": int(z), "x": int(x), "y": int(y), "project": project_id}
 
-        with connection.cursor() as cursor:
+        with (
+            TILE_RENDER_DURATION.time(layer="ol_address"),
+            connection.cursor() as cursor,
+        ):
             cursor.execute(sql, params)
             row = cursor.fetchone()
 
@@ -2223,7 +2237,7 @@ class OlAddressTileViewSet(APIView):
             return HttpResponse(status=204)
 
 
-class NodeViewSet(viewsets.ModelViewSet):
+class NodeViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD operations for :model:`api.Node`.
 
     Support spatial queries, filtering by project, flag, and node type,
@@ -2319,7 +2333,7 @@ class NodeViewSet(viewsets.ModelViewSet):
         project_id = request.query_params.get("project")
         flag = request.query_params.get("flag")
 
-        queryset = Node.objects.all()
+        queryset = NodeStatistics.objects.all()
         if project_id:
             queryset = queryset.filter(project=project_id)
         if flag:
@@ -2327,7 +2341,7 @@ class NodeViewSet(viewsets.ModelViewSet):
 
         queryset = (
             queryset.values("node_type__node_type")
-            .annotate(count=Count("node_type"))
+            .annotate(count=Sum("node_count"))
             .order_by("node_type__node_type")
         )
 
@@ -2392,22 +2406,22 @@ class NodeViewSet(viewsets.ModelViewSet):
         project_id = request.query_params.get("project")
         flag = request.query_params.get("flag")
 
-        queryset = Node.objects.filter(uuid_address__isnull=False)
+        queryset = NodeStatistics.objects.filter(city__isnull=False)
         if project_id:
             queryset = queryset.filter(project=project_id)
         if flag:
             queryset = queryset.filter(flag=flag)
 
         queryset = (
-            queryset.values("uuid_address__city")
-            .annotate(count=Count("uuid"))
+            queryset.values("city")
+            .annotate(count=Sum("node_count"))
             .order_by("-count")
         )
 
         result = [
-            {"city": row["uuid_address__city"], "count": row["count"]}
+            {"city": row["city"], "count": row["count"]}
             for row in queryset
-            if row["uuid_address__city"]
+            if row["city"]
         ]
 
         return Response({"results": result, "count": len(result)})
@@ -2420,7 +2434,7 @@ class NodeViewSet(viewsets.ModelViewSet):
         project_id = request.query_params.get("project")
         flag = request.query_params.get("flag")
 
-        queryset = Node.objects.all()
+        queryset = NodeStatistics.objects.all()
         if project_id:
             queryset = queryset.filter(project=project_id)
         if flag:
@@ -2428,7 +2442,7 @@ class NodeViewSet(viewsets.ModelViewSet):
 
         queryset = (
             queryset.values("status__status")
-            .annotate(count=Count("uuid"))
+            .annotate(count=Sum("node_count"))
             .order_by("-count")
         )
 
@@ -2448,7 +2462,7 @@ class NodeViewSet(viewsets.ModelViewSet):
         project_id = request.query_params.get("project")
         flag = request.query_params.get("flag")
 
-        queryset = Node.objects.all()
+        queryset = NodeStatistics.objects.all()
         if project_id:
             queryset = queryset.filter(project=project_id)
         if flag:
@@ -2456,7 +2470,7 @@ class NodeViewSet(viewsets.ModelViewSet):
 
         queryset = (
             queryset.values("network_level__network_level")
-            .annotate(count=Count("uuid"))
+            .annotate(count=Sum("node_count"))
             .order_by("-count")
         )
 
@@ -2479,7 +2493,7 @@ class NodeViewSet(viewsets.ModelViewSet):
         project_id = request.query_params.get("project")
         flag = request.query_params.get("flag")
 
-        queryset = Node.objects.filter(owner__isnull=False)
+        queryset = NodeStatistics.objects.filter(owner__isnull=False)
         if project_id:
             queryset = queryset.filter(project=project_id)
         if flag:
@@ -2487,7 +2501,7 @@ class NodeViewSet(viewsets.ModelViewSet):
 
         queryset = (
             queryset.values("owner__company")
-            .annotate(count=Count("uuid"))
+            .annotate(count=Sum("node_count"))
             .order_by("-count")
         )
 
@@ -2531,7 +2545,48 @@ class NodeViewSet(viewsets.ModelViewSet):
             }
         )
 
-    @action(detail=False, methods=["get"], url_path="all")
+    @action(detail=False, methods=["get"], url_path="changes")
+    def node_changes(self, request):
+        """Return nodes created, updated or deleted since a sync token.
+
+        Query Parameters:
+            since: ``token`` of an earlier response, or an ISO 8601 timestamp.
+                Without it only the current token is returned.
+            project: Filter by project ID.
+            flag: Filter by flag ID.
+
+        Returns:
+            StreamingHttpResponse: GeoJSON FeatureCollection of the changed
+                features, with ``removed`` keys and the next ``token``.
+        """
+        queryset = Node.objects.select_related(
+            "node_type",
+            "uuid_address",
+            "status",
+            "network_level",
+            "owner",
+            "constructor",
+            "manufacturer",
+            "project",
+            "flag",
+        )
+        changes = layer_changes(request, queryset)
+        return stream_json(
+            json_rows(changes.changed, NodeSerializer, parse_fieldset(request)),
+            {
+                "type": "FeatureCollection",
+                "features": ROWS,
+                "removed": changes.removed,
+                "token": changes.token,
+            },
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="all",
+        renderer_classes=LAYER_RENDERER_CLASSES,
+    )
     def all_nodes(self, request):
         """Return all nodes with project, flag, and fuzzy search filters.
 
@@ -2550,6 +2605,12 @@ class NodeViewSet(viewsets.ModelViewSet):
                 exclusions (for search).
             minimal: If ``'true'``, return only uuid and name
                 (no geometry/relations).
+            bbox: Only nodes inside ``minx,miny,maxx,maxy`` (EPSG:3857).
+            limit: Page through the features by primary key, this many at
+                a time; the collection then carries ``next_cursor``.
+            cursor: ``next_cursor`` of the previous page.
+            format: ``fgb`` (or ``Accept: application/vnd.flatgeobuf``) for
+                a FlatGeobuf file of the filtered nodes.
 
         If project settings are configured, excluded node types are
         automatically filtered out unless an explicit ``exclude_group``
@@ -2559,8 +2620,9 @@ class NodeViewSet(viewsets.ModelViewSet):
             request: DRF request with the query params above.
 
         Returns:
-            Response: GeoJSON FeatureCollection (or minimal JSON list
-                when ``minimal=true``).
+            StreamingHttpResponse: GeoJSON FeatureCollection (or ``nodes``
+                with uuid and name when ``minimal=true``), with
+                ``next_cursor`` when paging.
         """
         minimal = request.query_params.get("minimal") == "true"
 
@@ -2653,45 +2715,41 @@ class NodeViewSet(viewsets.ModelViewSet):
             ).annotate(similarity=Value(0.0))
             queryset = (trigram_qs | type_qs).distinct().order_by("-similarity")
 
+        queryset = filter_bbox(queryset, parse_bbox(request.query_params.get("bbox")))
+
         if minimal:
-            serializer = ParentNodeSerializer(queryset, many=True)
-            return Response(
+            return stream_layer(
+                request,
+                json_rows(queryset, ParentNodeSerializer),
                 {
-                    "nodes": serializer.data,
+                    "nodes": ROWS,
                     "metadata": {
                         "settings_configured": settings_configured,
                         "pipe_branch_configured": pipe_branch_configured,
                         "excluded_node_type_ids": excluded_type_ids,
                         "child_view_enabled_node_type_ids": child_view_enabled_type_ids,
                     },
-                }
+                },
             )
 
-        serializer = NodeSerializer(queryset, many=True)
-        data = serializer.data
-
-        # Add metadata about settings configuration to the GeoJSON response
-        if isinstance(data, dict) and data.get("type") == "FeatureCollection":
-            data["metadata"] = {
-                "settings_configured": settings_configured,
-                "pipe_branch_configured": pipe_branch_configured,
-                "excluded_node_type_ids": excluded_type_ids,
-                "child_view_enabled_node_type_ids": child_view_enabled_type_ids,
-            }
-        elif isinstance(data, list):
-            # Wrap in FeatureCollection format with metadata
-            data = {
+        if wants_flatgeobuf(request):
+            return flatgeobuf_response(
+                queryset, NodeSerializer, "nodes", parse_fieldset(request)
+            )
+        return stream_layer(
+            request,
+            json_rows(queryset, NodeSerializer, parse_fieldset(request)),
+            {
                 "type": "FeatureCollection",
-                "features": data,
+                "features": ROWS,
                 "metadata": {
                     "settings_configured": settings_configured,
                     "pipe_branch_configured": pipe_branch_configured,
                     "excluded_node_type_ids": excluded_type_ids,
                     "child_view_enabled_node_type_ids": child_view_enabled_type_ids,
                 },
-            }
-
-        return Response(data)
+            },
+        )
 
     @action(detail=True, methods=["get"])
     def addresses(self, request, pk=None):
@@ -3168,7 +3226,10 @@ class OlNodeTileViewSet(APIView):
 
         params = {"z": int(z), "x": int(x), "y": int(y), "project": project_id}
 
-        with connection.cursor() as cursor:
+        with (
+            TILE_RENDER_DURATION.time(layer="ol_node"),
+            connection.cursor() as cursor,
+        ):
             cursor.execute(sql, params)
             row = cursor.fetchone()
 
@@ -3415,7 +3476,7 @@ class MicroductViewSet(viewsets.ModelViewSet):
         - `color`: Filter by color
         - `uuid_node`: Filter by node UUID
         """
-        queryset = Microduct.objects.all()
+        queryset = MicroductSerializer.setup_eager_loading(Microduct.objects.all())
         uuid_conduit = self.request.query_params.get("uuid_conduit")
         number = self.request.query_params.get("number")
         color = self.request.query_params.get("color")
@@ -3435,9 +3496,9 @@ class MicroductViewSet(viewsets.ModelViewSet):
     def all_microducts(self, request):
         """
         Returns all microducts.
-        No pagination is applied.
+        Pass ``limit`` (and then ``cursor``) to page through them.
         """
-        queryset = Microduct.objects.all()
+        queryset = MicroductSerializer.setup_eager_loading(Microduct.objects.all())
         uuid_conduit = request.query_params.get("uuid_conduit")
         number = request.query_params.get("number")
         color = request.query_params.get("color")
@@ -3450,6 +3511,15 @@ class MicroductViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(uuid_conduit=uuid_conduit, color=color)
         if uuid_node:
             queryset = queryset.filter(uuid_node=uuid_node)
+
+        paginator = KeysetPagination(request)
+        if paginator.requested:
+            serializer = MicroductSerializer(
+                paginator.paginate_queryset(queryset), many=True
+            )
+            return Response(
+                {"results": serializer.data, "next_cursor": paginator.next_cursor}
+            )
         serializer = MicroductSerializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -3465,6 +3535,13 @@ class MicroductConnectionViewSet(viewsets.ModelViewSet):
     lookup_url_kwarg = "pk"
     pagination_class = CustomPagination
 
+    @staticmethod
+    def _with_microducts(queryset):
+        """Eager-load both nested microducts of the connections."""
+        for prefix in ("uuid_microduct_from__", "uuid_microduct_to__"):
+            queryset = MicroductSerializer.setup_eager_loading(queryset, prefix)
+        return queryset
+
     def get_queryset(self):  # type: ignore[override]
         """
         Optionally restricts the returned microduct connections by filtering against query parameters:
@@ -3472,7 +3549,7 @@ class MicroductConnectionViewSet(viewsets.ModelViewSet):
         - `uuid_microduct_to`: Filter by microduct to UUID
         - `uuid_node`: Filter by node UUID
         """
-        queryset = MicroductConnection.objects.all()
+        queryset = self._with_microducts(MicroductConnection.objects.all())
         uuid_microduct_from = self.request.query_params.get("uuid_microduct_from")
         uuid_microduct_to = self.request.query_params.get("uuid_microduct_to")
         uuid_node = self.request.query_params.get("uuid_node")
@@ -3491,7 +3568,7 @@ class MicroductConnectionViewSet(viewsets.ModelViewSet):
         Returns all microduct connections.
         - `uuid_node`: Filter by node UUID
         """
-        queryset = MicroductConnection.objects.all()
+        queryset = self._with_microducts(MicroductConnection.objects.all())
         uuid_node = request.query_params.get("uuid_node")
         if uuid_node:
             queryset = queryset.filter(uuid_node=uuid_node)
@@ -3671,7 +3748,7 @@ class TrenchesNearNodeView(APIView):
         )
 
 
-class CableViewSet(viewsets.ModelViewSet):
+class CableViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD operations for :model:`api.Cable`.
 
     Support filtering by project, flag, and node with cable-at-node serialization.
@@ -3716,11 +3793,19 @@ class CableViewSet(viewsets.ModelViewSet):
 
         return response
 
-    @action(detail=False, methods=["get"], url_path="all")
-    def all_cables(self, request):
-        """
-        Returns all cables with project, flag, and search filters.
-        No pagination is used.
+    @action(detail=False, methods=["get"], url_path="changes")
+    def cable_changes(self, request):
+        """Return cables created, updated or deleted since a sync token.
+
+        Query Parameters:
+            since: ``token`` of an earlier response, or an ISO 8601 timestamp.
+                Without it only the current token is returned.
+            project: Filter by project ID.
+            flag: Filter by flag ID.
+
+        Returns:
+            Response: ``results`` with the changed cables, ``removed`` keys
+                and the next ``token``.
         """
         queryset = Cable.objects.select_related(
             "cable_type",
@@ -3729,9 +3814,34 @@ class CableViewSet(viewsets.ModelViewSet):
             "owner",
             "constructor",
             "manufacturer",
-            "project",
             "flag",
-            "uuid_node_start",
+        )
+        changes = layer_changes(request, queryset)
+        serializer = CableSerializer(changes.changed, many=True)
+        return Response(
+            {
+                "results": serializer.data,
+                "removed": changes.removed,
+                "token": changes.token,
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="all")
+    def all_cables(self, request):
+        """
+        Returns all cables with project, flag, and search filters.
+        Pass ``limit`` (and then ``cursor``) to page through them.
+        """
+        queryset = Cable.objects.select_related(
+            "cable_type",
+            "status",
+            "network_level",
+            "owner",
+            "constructor",
+            "manufacturer",
+            "project",
+            "flag",
+            "uuid_node_start",
             "uuid_node_end",
         ).order_by("name")
         project_id = request.query_params.get("project")
@@ -3764,6 +3874,15 @@ class CableViewSet(viewsets.ModelViewSet):
                 | Q(manufacturer__company__icontains=search_term)
                 | Q(flag__flag__icontains=search_term)
             )
+
+        paginator = KeysetPagination(request)
+        if paginator.requested:
+            serializer = CableSerializer(
+                paginator.paginate_queryset(queryset), many=True
+            )
+            return Response(
+                {"results": serializer.data, "next_cursor": paginator.next_cursor}
+            )
         serializer = CableSerializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -3889,12 +4008,21 @@ class CableLabelViewSet(viewsets.ModelViewSet):
     def all_labels(self, request):
         """
         Returns all cable labels with optional cable filter.
-        No pagination is used.
+        Pass ``limit`` (and then ``cursor``) to page through them.
         """
         queryset = CableLabel.objects.all().order_by("cable", "order")
         cable_uuid = request.query_params.get("cable")
         if cable_uuid:
             queryset = queryset.filter(cable__uuid=cable_uuid)
+
+        paginator = KeysetPagination(request)
+        if paginator.requested:
+            serializer = CableLabelSerializer(
+                paginator.paginate_queryset(queryset), many=True
+            )
+            return Response(
+                {"results": serializer.data, "next_cursor": paginator.next_cursor}
+            )
         serializer = CableLabelSerializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -4068,53 +4196,97 @@ class FrontendLogView(APIView):
 
     POST /api/v1/logs/frontend/
 
-    Request body:
-    {
-        "level": "ERROR",
-        "message": "Error message",
-        "path": "/some/path",
-        "extra_data": {...},
-        "project": "1"
-    }
+    Request body: one entry, or an array of up to ``max_batch_size`` entries
+    (further entries are dropped):
+    [
+        {
+            "level": "ERROR",
+            "message": "Error message",
+            "path": "/some/path",
+            "extra_data": {...},
+            "project": "1"
+        },
+        ...
+    ]
+
+    Identical entries (same level, message and path) are collapsed into one
+    with ``extra_data.repeat_count``. Once an entry is stored, identical ones
+    from the same user are suppressed for ``dedup_window`` seconds; their
+    number is added to the next stored occurrence. Each user may store at
+    most ``max_entries_per_minute`` entries. Entries are written in bulk
+    through the buffered database log handler.
+
+    Response: ``{"status": "success", "accepted": n, "suppressed": n,
+    "dropped": n}``.
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "frontend_logs"
+
+    VALID_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+    max_batch_size = 100
+    max_entries_per_minute = 300
+    dedup_window = 60
 
     def post(self, request, *args, **kwargs):
-        """Submit a frontend log entry."""
+        """Submit one or more frontend log entries."""
         try:
-            level = request.data.get("level", "INFO").upper()
-            message = request.data.get("message", "")
-            path = request.data.get("path", "")
-            extra_data = request.data.get("extra_data", {})
-            project_id = request.data.get("project", None)
-
-            valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-            if level not in valid_levels:
-                level = "INFO"
-
-            project_instance = None
-            if project_id is not None:
-                try:
-                    if isinstance(project_id, list):
-                        project_id = project_id[0]
-                    project_id = int(project_id)
-                    project_instance = Projects.objects.get(id=project_id)
-                except (ValueError, Projects.DoesNotExist, TypeError):
-                    project_instance = None
-
-            LogEntry.objects.create(
-                level=level,
-                logger_name="frontend",
-                message=message[:10000],
-                user=request.user,
-                source="frontend",
-                path=path[:500] if path else None,
-                extra_data=extra_data,
-                project=project_instance,
-            )
-
-            return Response({"status": "success"}, status=status.HTTP_201_CREATED)
+            items = request.data if isinstance(request.data, list) else [request.data]
+            dropped = max(len(items) - self.max_batch_size, 0)
+            grouped, invalid = self._group_entries(items[: self.max_batch_size])
+            dropped += invalid
+
+            fresh, suppressed, over_quota = self._deduplicate(request.user, grouped)
+            dropped += over_quota
+
+            project_ids = {
+                fields["project_id"]
+                for fields, _ in fresh
+                if fields["project_id"] is not None
+            }
+            existing_projects = set()
+            if project_ids:
+                existing_projects = set(
+                    Projects.objects.filter(id__in=project_ids).values_list(
+                        "id", flat=True
+                    )
+                )
+
+            entries = []
+            for fields, repeat_count in fresh:
+                if fields["project_id"] not in existing_projects:
+                    fields["project_id"] = None
+                if repeat_count > 1:
+                    fields["extra_data"] = {
+                        **(fields["extra_data"] or {}),
+                        "repeat_count": repeat_count,
+                    }
+                entries.append(
+                    LogEntry(
+                        logger_name="frontend",
+                        source="frontend",
+                        user=request.user,
+                        **fields,
+                    )
+                )
+
+            handler = buffered_log_handler()
+            if handler is None:
+                LogEntry.objects.bulk_create(entries)
+            else:
+                for entry in entries:
+                    handler.enqueue(entry)
+
+            return Response(
+                {
+                    "status": "success",
+                    "accepted": len(entries),
+                    "suppressed": suppressed,
+                    "dropped": dropped,
+                },
+                status=status.HTTP_201_CREATED,
+            )
 
         except Exception as e:
             logger.error(f"Error creating frontend log entry: {e}")
@@ -4123,6 +4295,120 @@ class FrontendLogView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def _entry_fields(self, item) -> dict | None:
+        """Validate one submitted entry into ``LogEntry`` field values."""
+        if not isinstance(item, dict):
+            return None
+
+        level = str(item.get("level", "INFO")).upper()
+        if level not in self.VALID_LEVELS:
+            level = "INFO"
+
+        path = item.get("path", "")
+        project_id = item.get("project", None)
+        try:
+            if isinstance(project_id, list):
+                project_id = project_id[0]
+            project_id = int(project_id) if project_id is not None else None
+        except (ValueError, TypeError, IndexError):
+            project_id = None
+
+        extra_data = item.get("extra_data", {})
+        return {
+            "level": level,
+            "message": str(item.get("message", ""))[:10000],
+            "path": str(path)[:500] if path else None,
+            "extra_data": extra_data if isinstance(extra_data, dict) else {},
+            "project_id": project_id,
+        }
+
+    def _group_entries(self, items) -> tuple[dict, int]:
+        """Collapse identical entries of a batch, keeping the first of each.
+
+        Returns:
+            tuple[dict, int]: ``(level, message, path)`` mapped to
+                ``[fields, count]`` in submission order, and the number of
+                invalid items.
+        """
+        grouped, invalid = {}, 0
+        for item in items:
+            fields = self._entry_fields(item)
+            if fields is None:
+                invalid += 1
+                continue
+            key = (fields["level"], fields["message"], fields["path"])
+            if key in grouped:
+                grouped[key][1] += 1
+            else:
+                grouped[key] = [fields, 1]
+        return grouped, invalid
+
+    def _deduplicate(self, user, grouped) -> tuple[list, int, int]:
+        """Drop entries a user already stored within ``dedup_window``.
+
+        Suppressed occurrences are counted in the cache and added to the
+        repeat count of the next occurrence that is stored. The quota is
+        reserved before entries are marked as seen, so an entry dropped for
+        exceeding it is neither marked nor loses its pending count.
+
+        Returns:
+            tuple[list, int, int]: ``(fields, repeat_count)`` pairs to store,
+                the number of suppressed occurrences, and the number of
+                occurrences dropped for exceeding the quota.
+        """
+        keys = {}
+        for key in grouped:
+            digest = hashlib.sha256(
+                json.dumps(key, ensure_ascii=False).encode()
+            ).hexdigest()[:32]
+            keys[key] = (
+                f"frontend_log_seen:{user.pk}:{digest}",
+                f"frontend_log_suppressed:{user.pk}:{digest}",
+            )
+        seen = cache.get_many([seen_key for seen_key, _ in keys.values()])
+        candidates = [key for key in grouped if keys[key][0] not in seen]
+        allowed = self._reserve_quota(user, len(candidates))
+        admitted, over_quota = set(candidates[:allowed]), set(candidates[allowed:])
+
+        fresh, suppressed, dropped = [], 0, 0
+        for key, (fields, count) in grouped.items():
+            seen_key, pending_key = keys[key]
+            if key in admitted and cache.add(seen_key, True, timeout=self.dedup_window):
+                fresh.append((fields, count + (cache.get(pending_key) or 0)))
+                cache.delete(pending_key)
+                continue
+            if key in over_quota:
+                dropped += count
+                continue
+
+            suppressed += count
+            if not cache.add(pending_key, count, timeout=self.dedup_window * 10):
+                try:
+                    cache.incr(pending_key, count)
+                except ValueError:
+                    cache.set(pending_key, count, timeout=self.dedup_window * 10)
+        return fresh, suppressed, dropped
+
+    def _reserve_quota(self, user, wanted: int) -> int:
+        """Reserve up to ``wanted`` entries of the user's per-minute quota.
+
+        Returns:
+            int: Number of entries that may be stored.
+        """
+        if wanted <= 0:
+            return 0
+        key = f"frontend_log_quota:{user.pk}:{int(time.time() // 60)}"
+        if cache.add(key, wanted, timeout=60):
+            used = wanted
+        else:
+            try:
+                used = cache.incr(key, wanted)
+            except ValueError:
+                cache.set(key, wanted, timeout=60)
+                used = wanted
+        previous = used - wanted
+        return max(min(wanted, self.max_entries_per_minute - previous), 0)
+
 
 class LayerExtentView(APIView):
     """
@@ -4216,7 +4502,7 @@ class LayerExtentView(APIView):
             )
 
 
-class AreaViewSet(viewsets.ModelViewSet):
+class AreaViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """CRUD operations for :model:`api.Area`.
 
     Support filtering by project, flag, and name.
@@ -4261,7 +4547,37 @@ class AreaViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(name__icontains=name)
         return queryset
 
-    @action(detail=False, methods=["get"], url_path="all")
+    @action(detail=False, methods=["get"], url_path="changes")
+    def area_changes(self, request):
+        """Return areas created, updated or deleted since a sync token.
+
+        Query Parameters:
+            since: ``token`` of an earlier response, or an ISO 8601 timestamp.
+                Without it only the current token is returned.
+            project: Filter by project ID.
+            flag: Filter by flag ID.
+
+        Returns:
+            StreamingHttpResponse: GeoJSON FeatureCollection of the changed
+                features, with ``removed`` keys and the next ``token``.
+        """
+        changes = layer_changes(request, Area.objects.all())
+        return stream_json(
+            json_rows(changes.changed, AreaSerializer, parse_fieldset(request)),
+            {
+                "type": "FeatureCollection",
+                "features": ROWS,
+                "removed": changes.removed,
+                "token": changes.token,
+            },
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="all",
+        renderer_classes=LAYER_RENDERER_CLASSES,
+    )
     def all_areas(self, request):
         """Return all areas with project, flag, and fuzzy search filters.
 
@@ -4270,10 +4586,14 @@ class AreaViewSet(viewsets.ModelViewSet):
 
         Args:
             request: DRF request with query params ``project``, ``flag``,
-                and ``search``.
+                ``search``, ``bbox`` (``minx,miny,maxx,maxy`` in EPSG:3857)
+                and the keyset pagination params ``limit`` and ``cursor``.
+                ``Accept: application/vnd.flatgeobuf`` or ``?format=fgb``
+                selects a FlatGeobuf file of the filtered areas.
 
         Returns:
-            Response: JSON list of serialized :model:`api.Area` objects.
+            StreamingHttpResponse: GeoJSON FeatureCollection of
+                :model:`api.Area` features.
         """
         queryset = Area.objects.all().order_by("name")
         project_id = request.query_params.get("project")
@@ -4289,8 +4609,16 @@ class AreaViewSet(viewsets.ModelViewSet):
                 area_type__area_type__icontains=search_term
             ).annotate(similarity=Value(0.0))
             queryset = (trigram_qs | type_qs).distinct().order_by("-similarity")
-        serializer = AreaSerializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = filter_bbox(queryset, parse_bbox(request.query_params.get("bbox")))
+        if wants_flatgeobuf(request):
+            return flatgeobuf_response(
+                queryset, AreaSerializer, "areas", parse_fieldset(request)
+            )
+        return stream_layer(
+            request,
+            json_rows(queryset, AreaSerializer, parse_fieldset(request)),
+            {"type": "FeatureCollection", "features": ROWS},
+        )
 
 
 class OlAreaTileViewSet(APIView):
@@ -4345,7 +4673,10 @@ class OlAreaTileViewSet(APIView):
 
         params = {"z": int(z), "x": int(x), "y": int(y), "project": project_id}
 
-        with connection.cursor() as cursor:
+        with (
+            TILE_RENDER_DURATION.time(layer="ol_area"),
+            connection.cursor() as cursor,
+        ):
             cursor.execute(sql, params)
             row = cursor.fetchone()
 
@@ -4449,14 +4780,18 @@ class NodeSlotConfigurationViewSet(viewsets.ModelViewSet):
         node_uuid = self.request.query_params.get("node")
         if node_uuid:
             queryset = queryset.filter(uuid_node__uuid=node_uuid)
-        return queryset.select_related("uuid_node")
+        return NodeSlotConfigurationSerializer.annotate_used_slots(
+            queryset.select_related("uuid_node")
+        )
 
     @action(detail=False, methods=["get"], url_path="by-node/(?P<node_uuid>[^/.]+)")
     def by_node(self, request, node_uuid=None):
         """Get all slot configurations for a specific node with usage stats."""
-        configs = NodeSlotConfiguration.objects.filter(
-            uuid_node__uuid=node_uuid
-        ).select_related("uuid_node")
+        configs = NodeSlotConfigurationSerializer.annotate_used_slots(
+            NodeSlotConfiguration.objects.filter(
+                uuid_node__uuid=node_uuid
+            ).select_related("uuid_node")
+        )
         serializer = self.get_serializer(configs, many=True)
         return Response(serializer.data)
 
@@ -4894,7 +5229,7 @@ class FiberSpliceViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(cable_b=cable_b)
 
         return queryset.select_related(
-            "fiber_a", "cable_a", "fiber_b", "cable_b", "node_structure"
+            *FiberSpliceSerializer.RELATED_FIELDS, "node_structure"
         )
 
     @action(detail=False, methods=["post"], url_path="upsert")
@@ -5563,6 +5898,11 @@ class ContainerViewSet(viewsets.ModelViewSet):
         """
         Get the complete container hierarchy for a node.
         Returns a tree structure with nested containers and slot configurations.
+
+        All containers and slot configurations (with their slot usage) of the
+        node are loaded with one query each and assembled into the tree in
+        memory, so the number of queries does not grow with the depth or
+        size of the tree.
         """
         try:
             node = Node.objects.get(uuid=node_uuid)
@@ -5571,24 +5911,32 @@ class ContainerViewSet(viewsets.ModelViewSet):
                 {"error": "Node not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        # Get root-level containers (no parent)
-        root_containers = (
-            Container.objects.filter(uuid_node=node, parent_container__isnull=True)
+        children_by_parent = defaultdict(list)
+        for container in (
+            Container.objects.filter(uuid_node=node)
             .select_related("container_type")
-            .prefetch_related("children", "slot_configurations")
             .order_by("sort_order")
-        )
+        ):
+            children_by_parent[container.parent_container_id].append(container)  # type: ignore[attr-defined]
 
-        # Get root-level slot configurations (not in any container)
-        root_configs = NodeSlotConfiguration.objects.filter(
-            uuid_node=node, container__isnull=True
-        ).order_by("sort_order", "side")
+        configs_by_container = defaultdict(list)
+        for config in NodeSlotConfigurationListSerializer.annotate_used_slots(
+            NodeSlotConfiguration.objects.filter(uuid_node=node)
+        ).order_by("sort_order", "side"):
+            configs_by_container[config.container_id].append(config)  # type: ignore[attr-defined]
 
+        context = {
+            ContainerTreeSerializer.CHILDREN_CONTEXT_KEY: children_by_parent,
+            ContainerTreeSerializer.SLOT_CONFIGURATIONS_CONTEXT_KEY: configs_by_container,
+        }
         return Response(
             {
-                "containers": ContainerTreeSerializer(root_containers, many=True).data,
+                # Root-level containers and configurations have no parent.
+                "containers": ContainerTreeSerializer(
+                    children_by_parent[None], many=True, context=context
+                ).data,
                 "root_slot_configurations": NodeSlotConfigurationListSerializer(
-                    root_configs, many=True
+                    configs_by_container[None], many=True, context=context
                 ).data,
             }
         )
@@ -6301,9 +6649,13 @@ class WMSProxyView(APIView):
 
     def get(self, request, source_id):
         """Proxy WMS GET request to upstream server."""
+        start = time.perf_counter()
         acquired = _wms_upstream_semaphore.acquire(
             timeout=self.UPSTREAM_SEMAPHORE_TIMEOUT
         )
+        WMS_SEMAPHORE_WAIT.observe(
+            time.perf_counter() - start, acquired=str(acquired).lower()
+        )
         if not acquired:
             return Response(
                 {"error": "WMS service busy, please retry"},
@@ -6804,8 +7156,21 @@ class DashboardStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        cache_key = f"dashboard_stats_{project_id}_{flag_id or 'all'}"
+        try:
+            project_id = int(project_id)
+            flag_id = int(flag_id) if flag_id else None
+        except ValueError:
+            return Response(
+                {"error": "project and flag must be numeric values"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = versioned_key(
+            f"dashboard_stats_{project_id}_{flag_id or 'all'}",
+            project_namespace(project_id),
+        )
         cached_data = cache.get(cache_key)
+        record_cache_lookup("dashboard", cached_data is not None)
         if cached_data is not None:
             return Response(cached_data)
 
@@ -6821,61 +7186,109 @@ class DashboardStatisticsView(APIView):
 
         return Response(result)
 
-    def _get_trench_statistics(self, project_id, flag_id):
-        """Gather all trench-related statistics."""
-        base_queryset = Trench.objects.all()
-        if project_id:
-            base_queryset = base_queryset.filter(project=project_id)
-        if flag_id:
-            base_queryset = base_queryset.filter(flag=flag_id)
+    @staticmethod
+    def _fetch_grouping_sets(sql, params):
+        """Run a ``GROUPING SETS`` query and bucket its rows by grouping set.
 
-        totals = base_queryset.aggregate(
-            total_length=Sum("length"),
-            count=Count("uuid"),
-        )
+        The query must select ``GROUPING(...)`` as ``grouping_set``; rows are
+        keyed by that bitmask, in which a set bit marks a column that is *not*
+        part of the row's grouping set.
 
-        house_connection_qs = base_queryset.filter(house_connection=True)
-        avg_house_connection = house_connection_qs.aggregate(
-            average_length=Avg("length"),
-            count=Count("uuid"),
-        )
+        Args:
+            sql (str): SQL statement with named ``%(param)s`` placeholders.
+            params (dict): Query parameters.
 
-        funding_qs = base_queryset.filter(funding_status=True)
-        length_with_funding = funding_qs.aggregate(
-            total_length=Sum("length"),
-            count=Count("uuid"),
-        )
+        Returns:
+            defaultdict[int, list[dict]]: Rows per grouping-set bitmask, in
+                query order.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-        internal_qs = base_queryset.filter(internal_execution=True)
-        length_with_internal = internal_qs.aggregate(
-            total_length=Sum("length"),
-            count=Count("uuid"),
-        )
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[row.pop("grouping_set")].append(row)
+        return grouped
 
-        length_by_types = list(
-            base_queryset.annotate(
-                bauweise=F("construction_type__construction_type"),
-                oberfläche=F("surface__surface"),
-            )
-            .values("bauweise", "oberfläche")
-            .annotate(gesamt_länge=Sum("length"))
-            .order_by("bauweise", "oberfläche")
+    @staticmethod
+    def _order_desc(rows, key):
+        """Sort rows descending by ``key`` with NULLs first, like ``ORDER BY key DESC``."""
+        return sorted(
+            rows,
+            key=lambda row: (row[key] is None, row[key] or 0),
+            reverse=True,
         )
 
-        length_by_status = list(
-            base_queryset.annotate(status_name=F("status__status"))
-            .values("status_name")
-            .annotate(gesamt_länge=Sum("length"))
-            .order_by("status_name")
-        )
+    def _get_trench_statistics(self, project_id, flag_id):
+        """Gather all trench-related statistics.
 
-        length_by_phase = list(
-            base_queryset.annotate(network_level=F("phase__phase"))
-            .values("network_level")
-            .annotate(gesamt_länge=Sum("length"))
-            .order_by("network_level")
+        Totals and the type, status and phase breakdowns come from a single
+        ``GROUPING SETS`` scan over :model:`api.TrenchStatistics` with
+        ``FILTER`` aggregates; only the longest routes read ``trench`` itself.
+        """
+        flag_clause = "AND t.flag = %(flag)s" if flag_id else ""
+        grouped = self._fetch_grouping_sets(
+            f"""
+            SELECT
+                GROUPING(ct.construction_type, su.surface, st.status, ph.phase)
+                    AS grouping_set,
+                ct.construction_type,
+                su.surface,
+                st.status,
+                ph.phase,
+                SUM(t.total_length) AS total_length,
+                SUM(t.trench_count) AS trench_count,
+                SUM(t.total_length) FILTER (WHERE t.house_connection)
+                    / NULLIF(SUM(t.trench_count) FILTER (WHERE t.house_connection), 0)
+                    AS average_house_connection_length,
+                SUM(t.trench_count) FILTER (WHERE t.house_connection)
+                    AS house_connection_count,
+                SUM(t.total_length) FILTER (WHERE t.funding_status)
+                    AS length_with_funding,
+                SUM(t.trench_count) FILTER (WHERE t.funding_status) AS funding_count,
+                SUM(t.total_length) FILTER (WHERE t.internal_execution)
+                    AS length_with_internal_execution,
+                SUM(t.trench_count) FILTER (WHERE t.internal_execution)
+                    AS internal_execution_count
+            FROM trench_statistics t
+            JOIN attributes_construction_type ct ON ct.id = t.construction_type
+            JOIN attributes_surface su ON su.id = t.surface
+            LEFT JOIN attributes_status st ON st.id = t.status
+            LEFT JOIN attributes_phase ph ON ph.id = t.phase
+            WHERE t.project = %(project)s {flag_clause}
+            GROUP BY GROUPING SETS (
+                (ct.construction_type, su.surface), (st.status), (ph.phase), ()
+            )
+            ORDER BY grouping_set, ct.construction_type, su.surface, st.status, ph.phase
+            """,
+            {"project": project_id, "flag": flag_id},
         )
 
+        totals = grouped[0b1111][0]
+
+        length_by_types = [
+            {
+                "bauweise": row["construction_type"],
+                "oberfläche": row["surface"],
+                "gesamt_länge": row["total_length"],
+            }
+            for row in grouped[0b0011]
+        ]
+        length_by_status = [
+            {"status_name": row["status"], "gesamt_länge": row["total_length"]}
+            for row in grouped[0b1101]
+        ]
+        length_by_phase = [
+            {"network_level": row["phase"], "gesamt_länge": row["total_length"]}
+            for row in grouped[0b1110]
+        ]
+
+        base_queryset = Trench.objects.filter(project=project_id)
+        if flag_id:
+            base_queryset = base_queryset.filter(flag=flag_id)
+
         longest_routes = list(
             base_queryset.annotate(
                 construction_type_name=F("construction_type__construction_type"),
@@ -6887,14 +7300,17 @@ class DashboardStatisticsView(APIView):
 
         return {
             "total_length": totals["total_length"] or 0,
-            "count": totals["count"] or 0,
-            "average_house_connection_length": avg_house_connection["average_length"]
+            "count": totals["trench_count"] or 0,
+            "average_house_connection_length": totals[
+                "average_house_connection_length"
+            ]
+            or 0,
+            "house_connection_count": totals["house_connection_count"] or 0,
+            "length_with_funding": totals["length_with_funding"] or 0,
+            "funding_count": totals["funding_count"] or 0,
+            "length_with_internal_execution": totals["length_with_internal_execution"]
             or 0,
-            "house_connection_count": avg_house_connection["count"] or 0,
-            "length_with_funding": length_with_funding["total_length"] or 0,
-            "funding_count": length_with_funding["count"] or 0,
-            "length_with_internal_execution": length_with_internal["total_length"] or 0,
-            "internal_execution_count": length_with_internal["count"] or 0,
+            "internal_execution_count": totals["internal_execution_count"] or 0,
             "length_by_types": length_by_types,
             "length_by_status": length_by_status,
             "length_by_phase": length_by_phase,
@@ -6902,72 +7318,66 @@ class DashboardStatisticsView(APIView):
         }
 
     def _get_node_statistics(self, project_id, flag_id):
-        """Gather all node-related statistics."""
-        base_queryset = Node.objects.all()
-        if project_id:
-            base_queryset = base_queryset.filter(project=project_id)
-        if flag_id:
-            base_queryset = base_queryset.filter(flag=flag_id)
+        """Gather all node-related statistics.
 
-        count_by_type = list(
-            base_queryset.values("node_type__node_type")
-            .annotate(count=Count("node_type"))
-            .order_by("node_type__node_type")
+        The type, city, status, network level and owner counts come from a
+        single ``GROUPING SETS`` scan over :model:`api.NodeStatistics`.
+        """
+        flag_clause = "AND n.flag = %(flag)s" if flag_id else ""
+        grouped = self._fetch_grouping_sets(
+            f"""
+            SELECT
+                GROUPING(nt.node_type, n.city, st.status, nl.network_level, ow.company)
+                    AS grouping_set,
+                nt.node_type,
+                n.city,
+                st.status,
+                nl.network_level,
+                ow.company AS owner,
+                SUM(n.node_count) AS node_count
+            FROM node_statistics n
+            JOIN attributes_node_type nt ON nt.id = n.node_type
+            LEFT JOIN attributes_status st ON st.id = n.status
+            LEFT JOIN attributes_network_level nl ON nl.id = n.network_level
+            LEFT JOIN attributes_company ow ON ow.id = n.owner
+            WHERE n.project = %(project)s {flag_clause}
+            GROUP BY GROUPING SETS (
+                (nt.node_type), (n.city), (st.status), (nl.network_level), (ow.company)
+            )
+            ORDER BY grouping_set, nt.node_type, node_count DESC
+            """,
+            {"project": project_id, "flag": flag_id},
         )
+
         count_by_type = [
-            {"node_type": row["node_type__node_type"], "count": row["count"]}
-            for row in count_by_type
+            {"node_type": row["node_type"], "count": row["node_count"]}
+            for row in grouped[0b01111]
         ]
-
-        city_qs = base_queryset.filter(uuid_address__isnull=False)
-        count_by_city = list(
-            city_qs.values("uuid_address__city")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         count_by_city = [
-            {"city": row["uuid_address__city"], "count": row["count"]}
-            for row in count_by_city
-            if row["uuid_address__city"]
+            {"city": row["city"], "count": row["node_count"]}
+            for row in grouped[0b10111]
+            if row["city"]
         ]
-
-        count_by_status = list(
-            base_queryset.values("status__status")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         count_by_status = [
-            {"status": row["status__status"], "count": row["count"]}
-            for row in count_by_status
-            if row["status__status"]
+            {"status": row["status"], "count": row["node_count"]}
+            for row in grouped[0b11011]
+            if row["status"]
         ]
-
-        count_by_network_level = list(
-            base_queryset.values("network_level__network_level")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         count_by_network_level = [
-            {
-                "network_level": row["network_level__network_level"],
-                "count": row["count"],
-            }
-            for row in count_by_network_level
-            if row["network_level__network_level"]
+            {"network_level": row["network_level"], "count": row["node_count"]}
+            for row in grouped[0b11101]
+            if row["network_level"]
         ]
-
-        owner_qs = base_queryset.filter(owner__isnull=False)
-        count_by_owner = list(
-            owner_qs.values("owner__company")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         count_by_owner = [
-            {"owner": row["owner__company"], "count": row["count"]}
-            for row in count_by_owner
-            if row["owner__company"]
+            {"owner": row["owner"], "count": row["node_count"]}
+            for row in grouped[0b11110]
+            if row["owner"]
         ]
 
+        base_queryset = Node.objects.filter(project=project_id)
+        if flag_id:
+            base_queryset = base_queryset.filter(flag=flag_id)
+
         warranty_qs = (
             base_queryset.filter(warranty__isnull=False, warranty__gte=date.today())
             .select_related("node_type")
@@ -7011,60 +7421,67 @@ class DashboardStatisticsView(APIView):
         }
 
     def _get_address_statistics(self, project_id, flag_id):
-        """Gather all address and residential unit statistics."""
-        base_queryset = Address.objects.all()
-        if project_id:
-            base_queryset = base_queryset.filter(project=project_id)
-        if flag_id:
-            base_queryset = base_queryset.filter(flag=flag_id)
+        """Gather all address and residential unit statistics.
 
-        count_by_city = list(
-            base_queryset.values("city")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
+        Addresses and residential units are each aggregated in one
+        ``GROUPING SETS`` scan over their summary table that also yields the
+        totals.
+        """
+        flag_clause = "AND a.flag = %(flag)s" if flag_id else ""
+        unit_flag_clause = "AND ru.flag = %(flag)s" if flag_id else ""
+        params = {"project": project_id, "flag": flag_id}
+
+        addresses = self._fetch_grouping_sets(
+            f"""
+            SELECT
+                GROUPING(a.city, sd.status) AS grouping_set,
+                a.city,
+                sd.status,
+                SUM(a.address_count) AS address_count
+            FROM address_statistics a
+            LEFT JOIN attributes_status_development sd ON sd.id = a.status_development
+            WHERE a.project = %(project)s {flag_clause}
+            GROUP BY GROUPING SETS ((a.city), (sd.status), ())
+            ORDER BY grouping_set, address_count DESC
+            """,
+            params,
+        )
+        units = self._fetch_grouping_sets(
+            f"""
+            SELECT
+                GROUPING(ru.city, rt.residential_unit_type) AS grouping_set,
+                ru.city,
+                rt.residential_unit_type,
+                SUM(ru.unit_count) AS unit_count
+            FROM residential_unit_statistics ru
+            LEFT JOIN attributes_residential_unit_type rt
+                ON rt.id = ru.residential_unit_type
+            WHERE ru.project = %(project)s {unit_flag_clause}
+            GROUP BY GROUPING SETS ((ru.city), (rt.residential_unit_type), ())
+            ORDER BY grouping_set, unit_count DESC
+            """,
+            params,
         )
+
         count_by_city = [
-            {"city": row["city"], "count": row["count"]}
-            for row in count_by_city
+            {"city": row["city"], "count": row["address_count"]}
+            for row in addresses[0b01]
             if row["city"]
         ]
-
-        count_by_status = list(
-            base_queryset.values("status_development__status")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         count_by_status = [
-            {"status": row["status_development__status"], "count": row["count"]}
-            for row in count_by_status
-            if row["status_development__status"]
+            {"status": row["status"], "count": row["address_count"]}
+            for row in addresses[0b10]
+            if row["status"]
         ]
-
-        unit_queryset = ResidentialUnit.objects.filter(uuid_address__in=base_queryset)
-
-        units_by_city = list(
-            unit_queryset.values("uuid_address__city")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         units_by_city = [
-            {"city": row["uuid_address__city"], "count": row["count"]}
-            for row in units_by_city
-            if row["uuid_address__city"]
+            {"city": row["city"], "count": row["unit_count"]}
+            for row in units[0b01]
+            if row["city"]
         ]
-
-        units_by_type = list(
-            unit_queryset.values("residential_unit_type__residential_unit_type")
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         units_by_type = [
-            {
-                "type": row["residential_unit_type__residential_unit_type"],
-                "count": row["count"],
-            }
-            for row in units_by_type
-            if row["residential_unit_type__residential_unit_type"]
+            {"type": row["residential_unit_type"], "count": row["unit_count"]}
+            for row in units[0b10]
+            if row["residential_unit_type"]
         ]
 
         return {
@@ -7072,140 +7489,125 @@ class DashboardStatisticsView(APIView):
             "count_by_status": count_by_status,
             "units_by_city": units_by_city,
             "units_by_type": units_by_type,
-            "total_addresses": base_queryset.count(),
-            "total_units": unit_queryset.count(),
+            "total_addresses": addresses[0b11][0]["address_count"] or 0,
+            "total_units": units[0b11][0]["unit_count"] or 0,
         }
 
     def _get_conduit_statistics(self, project_id, flag_id):
-        """Gather all conduit-related statistics."""
-        base_queryset = Conduit.objects.all()
-        if project_id:
-            base_queryset = base_queryset.filter(project=project_id)
-        if flag_id:
-            base_queryset = base_queryset.filter(flag=flag_id)
-
-        # Conduit length is derived via TrenchConduitConnection -> Trench
-        trench_length_path = "trenchconduitconnection__uuid_trench__length"
+        """Gather all conduit-related statistics.
 
-        totals = base_queryset.aggregate(
-            total_length=Sum(trench_length_path),
-            count=Count("uuid", distinct=True),
+        Conduit length is derived via TrenchConduitConnection -> Trench and
+        kept per bucket in :model:`api.ConduitStatistics`; every breakdown is
+        taken from a single ``GROUPING SETS`` scan over it.
+        """
+        flag_clause = "AND cl.flag = %(flag)s" if flag_id else ""
+        grouped = self._fetch_grouping_sets(
+            f"""
+            SELECT
+                GROUPING(
+                    ty.conduit_type, st.status, nl.network_level,
+                    ow.company, mf.company, cl.month
+                ) AS grouping_set,
+                ty.conduit_type,
+                st.status,
+                nl.network_level,
+                ow.company AS owner,
+                mf.company AS manufacturer,
+                cl.month,
+                -- NULL, like SUM over no trench lengths, if no conduit
+                -- of the group runs through a trench.
+                SUM(cl.total_length) FILTER (WHERE cl.length_count > 0) AS total,
+                SUM(cl.conduit_count) AS conduit_count
+            FROM conduit_statistics cl
+            JOIN attributes_conduit_type ty ON ty.id = cl.conduit_type
+            LEFT JOIN attributes_status st ON st.id = cl.status
+            LEFT JOIN attributes_network_level nl ON nl.id = cl.network_level
+            LEFT JOIN attributes_company ow ON ow.id = cl.owner
+            LEFT JOIN attributes_company mf ON mf.id = cl.manufacturer
+            WHERE cl.project = %(project)s {flag_clause}
+            GROUP BY GROUPING SETS (
+                (ty.conduit_type),
+                (st.status, ty.conduit_type),
+                (st.status),
+                (nl.network_level),
+                (ow.company),
+                (mf.company),
+                (cl.month),
+                ()
+            )
+            ORDER BY grouping_set, st.status, ty.conduit_type, cl.month
+            """,
+            {"project": project_id, "flag": flag_id},
         )
 
-        length_by_type = list(
-            base_queryset.values(type_name=F("conduit_type__conduit_type"))
-            .annotate(total=Sum(trench_length_path))
-            .order_by("-total")
-        )
+        totals = grouped[0b111111][0]
+        by_type = self._order_desc(grouped[0b011111], "total")
+
         length_by_type = [
-            {"type_name": row["type_name"], "total": row["total"] or 0}
-            for row in length_by_type
-            if row["type_name"]
+            {"type_name": row["conduit_type"], "total": row["total"] or 0}
+            for row in by_type
+            if row["conduit_type"]
         ]
 
-        length_by_status_type = list(
-            base_queryset.values(
-                status_name=F("status__status"),
-                type_name=F("conduit_type__conduit_type"),
-            )
-            .annotate(total=Sum(trench_length_path))
-            .order_by("status_name", "type_name")
-        )
         length_by_status_type = [
             {
-                "status_name": row["status_name"],
-                "type_name": row["type_name"],
+                "status_name": row["status"],
+                "type_name": row["conduit_type"],
                 "total": row["total"] or 0,
             }
-            for row in length_by_status_type
-            if row["status_name"] and row["type_name"]
+            for row in grouped[0b001111]
+            if row["status"] and row["conduit_type"]
         ]
 
-        length_by_network_level = list(
-            base_queryset.values(network_level_name=F("network_level__network_level"))
-            .annotate(total=Sum(trench_length_path))
-            .order_by("-total")
-        )
         length_by_network_level = [
-            {"network_level": row["network_level_name"], "total": row["total"] or 0}
-            for row in length_by_network_level
-            if row["network_level_name"]
+            {"network_level": row["network_level"], "total": row["total"] or 0}
+            for row in self._order_desc(grouped[0b110111], "total")
+            if row["network_level"]
         ]
 
-        type_stats = list(
-            base_queryset.values(type_name=F("conduit_type__conduit_type"))
-            .annotate(
-                total_length=Sum(trench_length_path),
-                conduit_count=Count("uuid", distinct=True),
-            )
-            .order_by("-total_length")
-        )
         avg_length_by_type = [
             {
-                "type_name": row["type_name"],
-                "avg_length": (row["total_length"] / row["conduit_count"])
+                "type_name": row["conduit_type"],
+                "avg_length": (row["total"] / row["conduit_count"])
                 if row["conduit_count"]
                 else 0,
             }
-            for row in type_stats
-            if row["type_name"] and row["total_length"]
+            for row in by_type
+            if row["conduit_type"] and row["total"]
         ]
         avg_length_by_type.sort(key=lambda x: x["avg_length"], reverse=True)
 
-        count_by_status = list(
-            base_queryset.values(status_name=F("status__status"))
-            .annotate(count=Count("uuid"))
-            .order_by("-count")
-        )
         count_by_status = [
-            {"status_name": row["status_name"], "count": row["count"]}
-            for row in count_by_status
-            if row["status_name"]
+            {"status_name": row["status"], "count": row["conduit_count"]}
+            for row in self._order_desc(grouped[0b101111], "conduit_count")
+            if row["status"]
         ]
 
-        length_by_owner = list(
-            base_queryset.filter(owner__isnull=False)
-            .values(owner_name=F("owner__company"))
-            .annotate(total=Sum(trench_length_path))
-            .order_by("-total")
-        )
         length_by_owner = [
-            {"owner_name": row["owner_name"], "total": row["total"] or 0}
-            for row in length_by_owner
-            if row["owner_name"]
+            {"owner_name": row["owner"], "total": row["total"] or 0}
+            for row in self._order_desc(grouped[0b111011], "total")
+            if row["owner"]
         ]
 
-        length_by_manufacturer = list(
-            base_queryset.filter(manufacturer__isnull=False)
-            .values(manufacturer_name=F("manufacturer__company"))
-            .annotate(total=Sum(trench_length_path))
-            .order_by("-total")
-        )
         length_by_manufacturer = [
-            {"manufacturer_name": row["manufacturer_name"], "total": row["total"] or 0}
-            for row in length_by_manufacturer
-            if row["manufacturer_name"]
+            {"manufacturer_name": row["manufacturer"], "total": row["total"] or 0}
+            for row in self._order_desc(grouped[0b111101], "total")
+            if row["manufacturer"]
         ]
 
-        conduits_by_month = list(
-            base_queryset.filter(date__isnull=False)
-            .annotate(month=TruncMonth("date"))
-            .values("month")
-            .annotate(count=Count("uuid"))
-            .order_by("month")
-        )
         conduits_by_month = [
-            {
-                "month": row["month"].strftime("%Y-%m") if row["month"] else None,
-                "count": row["count"],
-            }
-            for row in conduits_by_month
+            {"month": row["month"].strftime("%Y-%m"), "count": row["conduit_count"]}
+            for row in grouped[0b111110]
             if row["month"]
         ]
 
+        base_queryset = Conduit.objects.filter(project=project_id)
+        if flag_id:
+            base_queryset = base_queryset.filter(flag=flag_id)
+
         longest_conduits = list(
             base_queryset.annotate(
-                total_length=Sum(trench_length_path),
+                total_length=Sum("trenchconduitconnection__uuid_trench__length"),
                 type_name=F("conduit_type__conduit_type"),
             )
             .filter(total_length__isnull=False)
@@ -7223,8 +7625,8 @@ class DashboardStatisticsView(APIView):
         ]
 
         return {
-            "total_length": totals["total_length"] or 0,
-            "count": totals["count"] or 0,
+            "total_length": totals["total"] or 0,
+            "count": totals["conduit_count"] or 0,
             "length_by_type": length_by_type,
             "length_by_status_type": length_by_status_type,
             "length_by_network_level": length_by_network_level,
@@ -7237,20 +7639,27 @@ class DashboardStatisticsView(APIView):
         }
 
     def _get_area_statistics(self, project_id, flag_id):
-        """Gather all area-related statistics with spatial analysis."""
-        from django.contrib.gis.db.models.aggregates import Collect
+        """Gather all area-related statistics with spatial analysis.
+
+        Coverage of addresses, nodes and residential units is taken from one
+        ``GROUPING SETS`` query over an index-backed ``ST_Within`` join of
+        points to area polygons, giving the per-area, per-area-type and
+        overall counts together. Clipped trench length per area is a single
+        ``ST_Intersects`` join.
+        """
         from django.contrib.gis.db.models.functions import Area as GISArea
-        from django.contrib.gis.db.models.functions import Intersection, Length
 
         base_queryset = Area.objects.filter(project_id=project_id)
         if flag_id:
             base_queryset = base_queryset.filter(flag_id=flag_id)
 
-        area_count = base_queryset.count()
-
-        total_coverage = base_queryset.annotate(area_m2=GISArea("geom")).aggregate(
-            total=Sum("area_m2")
-        )["total"]
+        areas = list(
+            base_queryset.annotate(area_m2=GISArea("geom"))
+            .values("uuid", "name", "area_m2", type_name=F("area_type__area_type"))
+            .order_by("name")
+        )
+        area_count = len(areas)
+        total_coverage = sum((row["area_m2"].sq_m for row in areas), 0.0)
 
         areas_by_type = list(
             base_queryset.values(type_name=F("area_type__area_type"))
@@ -7266,7 +7675,6 @@ class DashboardStatisticsView(APIView):
             for row in areas_by_type
         ]
 
-        # Coverage gap metrics — addresses/nodes NOT contained within any area polygon
         address_qs = Address.objects.filter(project_id=project_id)
         node_qs = Node.objects.filter(project_id=project_id)
         if flag_id:
@@ -7279,113 +7687,136 @@ class DashboardStatisticsView(APIView):
             uuid_address__project_id=project_id
         ).count()
 
-        # Union all area polygons for containment checks
-        all_areas_geom = base_queryset.aggregate(union=Collect("geom"))["union"]
-
-        addresses_in_areas = 0
-        nodes_in_areas = 0
-        residential_units_in_areas = 0
-        if all_areas_geom:
-            addresses_in_areas = address_qs.filter(geom__within=all_areas_geom).count()
-            nodes_in_areas = node_qs.filter(geom__within=all_areas_geom).count()
-            address_ids_in_areas = list(
-                address_qs.filter(geom__within=all_areas_geom).values_list(
-                    "uuid", flat=True
-                )
+        params = {"project": project_id, "flag": flag_id}
+        area_flag_clause = "AND ar.flag = %(flag)s" if flag_id else ""
+        address_flag_clause = "AND a.flag = %(flag)s" if flag_id else ""
+        node_flag_clause = "AND n.flag = %(flag)s" if flag_id else ""
+        trench_flag_clause = "AND t.flag = %(flag)s" if flag_id else ""
+
+        # Coverage gap metrics — addresses/nodes NOT contained within any area polygon
+        coverage = self._fetch_grouping_sets(
+            f"""
+            WITH areas AS (
+                SELECT ar.uuid, ar.area_type, ar.geom
+                FROM area ar
+                WHERE ar.project = %(project)s {area_flag_clause}
+            ),
+            hits AS (
+                SELECT 'address' AS kind, a.uuid AS feature, ar.uuid AS area,
+                       ar.area_type
+                FROM address a
+                JOIN areas ar ON ST_Within(a.geom, ar.geom)
+                WHERE a.project = %(project)s {address_flag_clause}
+                UNION ALL
+                SELECT 'node', n.uuid, ar.uuid, ar.area_type
+                FROM node n
+                JOIN areas ar ON ST_Within(n.geom, ar.geom)
+                WHERE n.project = %(project)s {node_flag_clause}
+            ),
+            all_hits AS (
+                SELECT kind, feature, area, area_type FROM hits
+                UNION ALL
+                SELECT 'unit', ru.uuid, h.area, h.area_type
+                FROM hits h
+                JOIN residential_unit ru ON ru.uuid_address = h.feature
+                WHERE h.kind = 'address'
             )
-            residential_units_in_areas = ResidentialUnit.objects.filter(
-                uuid_address_id__in=address_ids_in_areas
-            ).count()
+            SELECT
+                GROUPING(h.area, aty.area_type) AS grouping_set,
+                h.area,
+                aty.area_type,
+                COUNT(DISTINCT h.feature) FILTER (WHERE h.kind = 'address')
+                    AS address_count,
+                COUNT(DISTINCT h.feature) FILTER (WHERE h.kind = 'node')
+                    AS node_count,
+                COUNT(DISTINCT h.feature) FILTER (WHERE h.kind = 'unit')
+                    AS unit_count
+            FROM all_hits h
+            LEFT JOIN attributes_area_type aty ON aty.id = h.area_type
+            GROUP BY GROUPING SETS ((h.area), (aty.id, aty.area_type), ())
+            ORDER BY grouping_set, aty.id
+            """,
+            params,
+        )
+
+        totals = coverage[0b11][0] if coverage[0b11] else {}
+        addresses_in_areas = totals.get("address_count") or 0
+        nodes_in_areas = totals.get("node_count") or 0
+        residential_units_in_areas = totals.get("unit_count") or 0
+
+        per_area = {row["area"]: row for row in coverage[0b01]}
+        by_area_type = [row for row in coverage[0b10] if row["area_type"]]
 
         addresses_per_area = []
-        for area in base_queryset.annotate(area_m2=GISArea("geom")).select_related(
-            "area_type"
-        ):
-            addr_count = address_qs.filter(geom__within=area.geom).count()
-            if addr_count > 0:
+        nodes_per_area = []
+        for area in areas:
+            counts = per_area.get(area["uuid"])
+            if not counts:
+                continue
+            if counts["address_count"]:
                 addresses_per_area.append(
                     {
-                        "name": area.name,
-                        "type": area.area_type.area_type if area.area_type else None,
-                        "count": addr_count,
-                        "area_km2": area.area_m2.sq_km if area.area_m2 else 0,  # type: ignore[attr-defined]
+                        "name": area["name"],
+                        "type": area["type_name"],
+                        "count": counts["address_count"],
+                        "area_km2": area["area_m2"].sq_km if area["area_m2"] else 0,
                     }
                 )
+            if counts["node_count"]:
+                nodes_per_area.append(
+                    {"name": area["name"], "count": counts["node_count"]}
+                )
 
-        addresses_by_area_type = []
-        for area_type in AttributesAreaType.objects.all():
-            areas_of_type = base_queryset.filter(area_type=area_type)
-            combined_geom = areas_of_type.aggregate(union=Collect("geom"))["union"]
-            if combined_geom:
-                count = address_qs.filter(geom__within=combined_geom).count()
-                if count > 0:
-                    addresses_by_area_type.append(
-                        {"type": area_type.area_type, "count": count}
-                    )
-
-        nodes_per_area = []
-        for area in base_queryset.select_related("area_type"):
-            node_count = node_qs.filter(geom__within=area.geom).count()
-            if node_count > 0:
-                nodes_per_area.append({"name": area.name, "count": node_count})
-
-        nodes_by_area_type = []
-        for area_type in AttributesAreaType.objects.all():
-            areas_of_type = base_queryset.filter(area_type=area_type)
-            combined_geom = areas_of_type.aggregate(union=Collect("geom"))["union"]
-            if combined_geom:
-                count = node_qs.filter(geom__within=combined_geom).count()
-                if count > 0:
-                    nodes_by_area_type.append(
-                        {"type": area_type.area_type, "count": count}
-                    )
+        addresses_by_area_type = [
+            {"type": row["area_type"], "count": row["address_count"]}
+            for row in by_area_type
+            if row["address_count"]
+        ]
+        nodes_by_area_type = [
+            {"type": row["area_type"], "count": row["node_count"]}
+            for row in by_area_type
+            if row["node_count"]
+        ]
+        residential_by_area_type = [
+            {"type": row["area_type"], "count": row["unit_count"]}
+            for row in by_area_type
+            if row["unit_count"]
+        ]
 
         # Trench length clipped to each area boundary via ST_Intersection
-        trench_qs = Trench.objects.filter(project_id=project_id)
-        if flag_id:
-            trench_qs = trench_qs.filter(flag_id=flag_id)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT ar.uuid, SUM(ST_Length(ST_Intersection(t.geom, ar.geom)))
+                FROM area ar
+                JOIN trench t ON ST_Intersects(t.geom, ar.geom)
+                WHERE ar.project = %(project)s {area_flag_clause}
+                    AND t.project = %(project)s {trench_flag_clause}
+                GROUP BY ar.uuid
+                """,
+                params,
+            )
+            clipped_lengths = dict(cursor.fetchall())
 
         trench_length_per_area = []
-        for area in base_queryset.annotate(area_m2=GISArea("geom")):
-            intersecting = trench_qs.filter(geom__intersects=area.geom)
-            total_length = intersecting.annotate(
-                clipped_length=Length(Intersection("geom", area.geom))
-            ).aggregate(total=Sum("clipped_length"))["total"]
-
-            if total_length and total_length.m > 0:
-                area_km2 = area.area_m2.sq_km if area.area_m2 else 0  # type: ignore[attr-defined]
+        for area in areas:
+            length_m = clipped_lengths.get(area["uuid"])
+            if length_m and length_m > 0:
+                area_km2 = area["area_m2"].sq_km if area["area_m2"] else 0
                 trench_length_per_area.append(
                     {
-                        "name": area.name,
-                        "length_m": total_length.m,
+                        "name": area["name"],
+                        "length_m": length_m,
                         "area_km2": area_km2,
-                        "density": (total_length.m / 1000) / area_km2
+                        "density": (length_m / 1000) / area_km2
                         if area_km2 > 0
                         else 0,
                     }
                 )
 
-        residential_by_area_type = []
-        for area_type in AttributesAreaType.objects.all():
-            areas_of_type = base_queryset.filter(area_type=area_type)
-            combined_geom = areas_of_type.aggregate(union=Collect("geom"))["union"]
-            if combined_geom:
-                addr_ids = list(
-                    address_qs.filter(geom__within=combined_geom).values_list(
-                        "uuid", flat=True
-                    )
-                )
-                count = ResidentialUnit.objects.filter(
-                    uuid_address_id__in=addr_ids
-                ).count()
-                if count > 0:
-                    residential_by_area_type.append(
-                        {"type": area_type.area_type, "count": count}
-                    )
-
         return {
             "area_count": area_count,
-            "total_coverage_km2": total_coverage.sq_km if total_coverage else 0,
+            "total_coverage_km2": total_coverage / 1_000_000 if total_coverage else 0,
             "areas_by_type": areas_by_type,
             # Coverage gap
             "total_addresses": total_addresses,
@@ -7410,6 +7841,104 @@ class DashboardStatisticsView(APIView):
         }
 
 
+def _ranked_by_search_index(queryset, entity_type, search, project_id, limit=20):
+    """Return the best :model:`api.SearchIndex` matches of one entity type.
+
+    Args:
+        queryset: Queryset of the entity model, keyed by ``uuid``.
+        entity_type: ``SearchIndex.EntityType`` of the model.
+        search: Raw search input.
+        project_id: Optional project ID to scope results.
+        limit: Maximum number of results.
+
+    Returns:
+        list: Model instances in rank order.
+    """
+    ranked = list(
+        search_index(search, [entity_type], project_id).values_list(
+            "entity_uuid", flat=True
+        )[:limit]
+    )
+    instances = queryset.in_bulk(ranked, field_name="uuid")
+    return [instances[uuid] for uuid in ranked if uuid in instances]
+
+
+class SearchView(APIView):
+    """Typeahead search across all entity types.
+
+    Ranks addresses, nodes, cables, residential units, trenches and conduits
+    from :model:`api.SearchIndex` in one indexed query.
+
+    Query Parameters:
+        search: Search term (required, minimum 2 characters).
+        type: Comma-separated entity types to search (optional, default all).
+        project: Numeric project ID to scope results (optional).
+        limit: Maximum number of results (default 20, maximum 100).
+    """
+
+    authentication_classes = [JWTCookieAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Return ranked search results across entity types.
+
+        Args:
+            request: DRF request with query params ``search`` and optional
+                ``type``, ``project`` and ``limit``.
+
+        Returns:
+            Response: JSON with a ``results`` list of ``type``, ``uuid``,
+                ``label`` and ``project`` entries.
+        """
+        search = request.query_params.get("search", "").strip()
+        types_param = request.query_params.get("type", "")
+        project_id = request.query_params.get("project")
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            limit = 20
+
+        if project_id:
+            try:
+                project_id = int(project_id)
+            except ValueError:
+                return Response(
+                    {"error": "Project must be a numeric value"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        entity_types = [t for t in types_param.split(",") if t]
+        invalid = set(entity_types) - set(SearchIndex.EntityType.values)
+        if invalid:
+            return Response(
+                {
+                    "error": "Invalid type. Must be one of: "
+                    + ", ".join(SearchIndex.EntityType.values)
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(search) < 2 or limit < 1:
+            return Response({"results": []})
+
+        entries = search_index(search, entity_types, project_id).values(
+            "entity_type", "entity_uuid", "label", "project"
+        )[:limit]
+        return Response(
+            {
+                "results": [
+                    {
+                        "type": entry["entity_type"],
+                        "uuid": str(entry["entity_uuid"]),
+                        "label": entry["label"],
+                        "project": entry["project"],
+                    }
+                    for entry in entries
+                ]
+            }
+        )
+
+
 class TraceSearchView(APIView):
     """Search endpoint for the trace landing page.
 
@@ -7430,7 +7959,8 @@ class TraceSearchView(APIView):
         """Search across entity types and return lightweight picker results.
 
         Address and node searches use pg_trgm trigram similarity for
-        fuzzy matching; cable and residential_unit use icontains.
+        fuzzy matching; cable and residential_unit are looked up in
+        :model:`api.SearchIndex`.
 
         Args:
             request: DRF request with query params ``search``, ``type``,
@@ -7443,6 +7973,15 @@ class TraceSearchView(APIView):
         entity_type = request.query_params.get("type", "")
         project_id = request.query_params.get("project")
 
+        if project_id:
+            try:
+                project_id = int(project_id)
+            except ValueError:
+                return Response(
+                    {"error": "Project must be a numeric value"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         if len(search) < 2:
             return Response({"results": []})
 
@@ -7479,14 +8018,12 @@ class TraceSearchView(APIView):
             ]
 
         elif entity_type == "cable":
-            queryset = Cable.objects.select_related("cable_type", "project").order_by(
-                "name"
+            queryset = _ranked_by_search_index(
+                Cable.objects.select_related("cable_type", "project"),
+                SearchIndex.EntityType.CABLE,
+                search,
+                project_id,
             )
-            if project_id:
-                queryset = queryset.filter(project=project_id)
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(cable_type__cable_type__icontains=search)
-            )[:20]
             results = [
                 {
                     "uuid": str(c.uuid),
@@ -7501,17 +8038,14 @@ class TraceSearchView(APIView):
             ]
 
         elif entity_type == "residential_unit":
-            queryset = ResidentialUnit.objects.select_related(
-                "uuid_address", "residential_unit_type", "status"
-            ).order_by("uuid_address", "floor", "side")
-            if project_id:
-                queryset = queryset.filter(uuid_address__project=project_id)
-            queryset = queryset.filter(
-                Q(id_residential_unit__icontains=search)
-                | Q(uuid_address__street__icontains=search)
-                | Q(uuid_address__city__icontains=search)
-                | Q(side__icontains=search)
-            )[:20]
+            queryset = _ranked_by_search_index(
+                ResidentialUnit.objects.select_related(
+                    "uuid_address", "residential_unit_type", "status"
+                ),
+                SearchIndex.EntityType.RESIDENTIAL_UNIT,
+                search,
+                project_id,
+            )
             results = [
                 {
                     "uuid": str(ru.uuid),
@@ -7626,28 +8160,33 @@ class FiberTraceView(APIView):
 
         try:
             if fiber_id:
-                result = trace_fiber(
-                    fiber_id, include_geometry, geometry_mode, orient_geometry
-                )
+                with TRACE_DURATION.time(kind="fiber"):
+                    result = trace_fiber(
+                        fiber_id, include_geometry, geometry_mode, orient_geometry
+                    )
             elif cable_id:
-                result = trace_cable(
-                    cable_id, include_geometry, geometry_mode, orient_geometry
-                )
+                with TRACE_DURATION.time(kind="cable"):
+                    result = trace_cable(
+                        cable_id, include_geometry, geometry_mode, orient_geometry
+                    )
             elif node_id:
-                result = trace_node(
-                    node_id, include_geometry, geometry_mode, orient_geometry
-                )
+                with TRACE_DURATION.time(kind="node"):
+                    result = trace_node(
+                        node_id, include_geometry, geometry_mode, orient_geometry
+                    )
             elif address_id:
-                result = trace_address(
-                    address_id, include_geometry, geometry_mode, orient_geometry
-                )
+                with TRACE_DURATION.time(kind="address"):
+                    result = trace_address(
+                        address_id, include_geometry, geometry_mode, orient_geometry
+                    )
             else:
-                result = trace_residential_unit(
-                    residential_unit_id,
-                    include_geometry,
-                    geometry_mode,
-                    orient_geometry,
-                )
+                with TRACE_DURATION.time(kind="residential_unit"):
+                    result = trace_residential_unit(
+                        residential_unit_id,
+                        include_geometry,
+                        geometry_mode,
+                        orient_geometry,
+                    )
 
             if "_raw_segments" in result:
                 del result["_raw_segments"]
@@ -7697,7 +8236,8 @@ class FiberTraceSummaryView(APIView):
             )
 
         try:
-            result = trace_fiber_summary(fiber_id)
+            with TRACE_DURATION.time(kind="fiber_summary"):
+                result = trace_fiber_summary(fiber_id)
             return Response(result)
         except Exception:
             logger.exception("Fiber trace summary error")
@@ -7825,6 +8365,29 @@ class ConfigView(APIView):
         return response
 
 
+class MetricsView(APIView):
+    """Expose application metrics in the Prometheus text format.
+
+    Scraped with ``Authorization: Bearer <METRICS_TOKEN>``; user
+    authentication is not attempted, so the token is not mistaken for a JWT.
+    See :mod:`apps.api.metrics` for how workers are aggregated.
+    """
+
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+
+    def get(self, request):
+        """Return the current metrics of all worker processes.
+
+        Args:
+            request: DRF request object.
+
+        Returns:
+            HttpResponse: Metrics in the text exposition format.
+        """
+        return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
 class FaultSimulationView(APIView):
     """Simulate physical damage at a point and report affected infrastructure.
 
@@ -7866,10 +8429,11 @@ class FaultSimulationView(APIView):
             )
 
         try:
-            result = simulate_fault(
-                point=point,
-                project_id=project_id,
-            )
+            with FAULT_SIMULATION_DURATION.time():
+                result = simulate_fault(
+                    point=point,
+                    project_id=project_id,
+                )
             return Response(result)
         except ValueError as e:
             return Response(
@@ -8046,14 +8610,21 @@ class PipelineInquiryExportView(APIView):
             request (Request): DRF request object.
             pipeline_record_uuid (uuid.UUID): UUID of the pipeline record to export.
 
+        Query Parameters:
+            layer_format: ``geojson`` (default) or ``fgb`` for FlatGeobuf
+                layers.
+
         Returns:
             HttpResponse: ZIP file download response, or 400 if no inquiry
-                areas exist for the record.
+                areas exist for the record or the layer format is unknown.
         """
         from .services import build_inquiry_export_zip
 
         try:
-            buf = build_inquiry_export_zip(pipeline_record_uuid)
+            buf = build_inquiry_export_zip(
+                pipeline_record_uuid,
+                layer_format=request.query_params.get("layer_format", "geojson"),
+            )
         except ValueError as e:
             return Response(
                 {"detail": str(e)},
@@ -13,6 +13,9 @@ from urllib.parse import urlparse, urlunparse
 from django.core.cache import cache
 from owslib.wms import WebMapService
 
+from .caching import bump_version, get_version
+from .profiling import record_cache_lookup
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +33,7 @@ class WMSSecurityError(WMSServiceError):
 
 CACHE_TTL_SECONDS = 300  # 5 minutes
 CACHE_KEY_PREFIX = "wms_capabilities:"
+CACHE_VERSION_NAMESPACE = "wms_capabilities"
 QGIS_SERVER_INTERNAL_URL = "http://qgis-server"
 
 ALLOWED_URL_SCHEMES = frozenset({"http", "https"})
@@ -180,10 +184,12 @@ def _get_cache_key(url: str, username: Optional[str] = None) -> str:
         username: Optional username to scope the cache per user.
 
     Returns:
-        str: Cache key combining prefix and MD5 hash of url+username.
+        str: Cache key combining prefix, the capabilities cache version and
+            MD5 hash of url+username.
     """
     key_data = f"{url}:{username or ''}"
-    return f"{CACHE_KEY_PREFIX}{hashlib.md5(key_data.encode()).hexdigest()}"
+    version = get_version(CACHE_VERSION_NAMESPACE)
+    return f"{CACHE_KEY_PREFIX}{version}:{hashlib.md5(key_data.encode()).hexdigest()}"
 
 
 def _get_cached_layers(cache_key: str) -> Optional[list[dict]]:
@@ -195,7 +201,9 @@ def _get_cached_layers(cache_key: str) -> Optional[list[dict]]:
     Returns:
         Optional[list[dict]]: Cached layer list, or None on cache miss.
     """
-    return cache.get(cache_key)
+    layers = cache.get(cache_key)
+    record_cache_lookup("wms_capabilities", layers is not None)
+    return layers
 
 
 def _cache_layers(cache_key: str, layers: list[dict]) -> None:
@@ -213,8 +221,9 @@ def clear_capabilities_cache(
 ) -> None:
     """Clear cached WMS capabilities.
 
-    If no URL is provided, attempt to clear all WMS cache keys
-    (requires a cache backend that supports ``delete_pattern``).
+    If no URL is provided, every cached capabilities entry is invalidated by
+    bumping the capabilities cache version, which works on any shared cache
+    backend.
 
     Args:
         url: If provided, only clear the cache for this specific URL.
@@ -224,15 +233,7 @@ def clear_capabilities_cache(
         cache_key = _get_cache_key(url, username)
         cache.delete(cache_key)
     else:
-        # Clear all WMS capabilities cache keys using delete_pattern if available
-        # (Redis/Memcached), otherwise this is a no-op for LocMemCache
-        delete_pattern = getattr(cache, "delete_pattern", None)
-        if delete_pattern is not None:
-            delete_pattern(f"{CACHE_KEY_PREFIX}*")
-        else:
-            logger.warning(
-                "Cache backend does not support delete_pattern, cannot clear all WMS cache"
-            )
+        bump_version(CACHE_VERSION_NAMESPACE)
 
 
 def fetch_wms_layers(
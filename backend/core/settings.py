@@ -15,6 +15,7 @@ import platform
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -71,6 +72,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.api.middleware.RequestMetricsMiddleware",
+    "apps.api.middleware.RequestProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -89,6 +92,22 @@ USE_COOKIE_DOMAIN_MIDDLEWARE = os.getenv(
 )
 COOKIE_DOMAIN = os.getenv("COOKIE_DOMAIN", "localhost")
 
+# RequestProfilingMiddleware: share of requests to profile (0 to 1), the
+# duration above which a profiled request is logged, and how many of its
+# slowest statements to keep.
+REQUEST_PROFILING_SAMPLE_RATE = float(
+    os.getenv("REQUEST_PROFILING_SAMPLE_RATE", "0.05")
+)
+REQUEST_PROFILING_SLOW_MS = float(os.getenv("REQUEST_PROFILING_SLOW_MS", "1000"))
+REQUEST_PROFILING_TOP_QUERIES = int(os.getenv("REQUEST_PROFILING_TOP_QUERIES", "5"))
+
+# Metrics endpoint (apps.api.metrics). Worker processes share their samples
+# through files in METRICS_DIR; leave it empty for a single process. The
+# endpoint only answers requests with "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 if USE_COOKIE_DOMAIN_MIDDLEWARE:
     SESSION_COOKIE_DOMAIN = COOKIE_DOMAIN
     CSRF_COOKIE_DOMAIN = COOKIE_DOMAIN
@@ -129,6 +148,49 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# The cache is shared by all gunicorn workers (and, via a shared volume or
+# network store, by all backend containers) so that invalidation reaches
+# every process. CACHE_BACKEND selects the store:
+#   - "file" (default): FileBasedCache in CACHE_LOCATION
+#   - "database": DatabaseCache table (run ``manage.py createcachetable``)
+#   - "redis": RedisCache at CACHE_LOCATION (requires the ``redis`` package)
+#   - "locmem": per-process LocMemCache, for single-process development only
+#
+# The version counters that key invalidation live in the database (see
+# apps.api.caching), so invalidation is exact with every backend.
+
+CACHE_BACKENDS = {
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        os.path.join(BASE_DIR, "cache"),
+    ),
+    "database": ("django.core.cache.backends.db.DatabaseCache", "django_cache"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://redis:6379/1"),
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "qonnectra"),
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file").lower()
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}; "
+        f"expected one of {', '.join(CACHE_BACKENDS)}."
+    )
+_cache_backend, _cache_location = CACHE_BACKENDS[CACHE_BACKEND]
+
+CACHES = {
+    "default": {
+        "BACKEND": _cache_backend,
+        "LOCATION": os.getenv("CACHE_LOCATION") or _cache_location,
+        "KEY_PREFIX": "qonnectra",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000}
+        if CACHE_BACKEND in ("file", "database", "locmem")
+        else {},
+    }
+}
+
 # GDAL Configuration
 # Its need when running the django devserver
 # IMPORTANT: Windows and MacOS are not tested
@@ -222,12 +284,13 @@ REST_FRAMEWORK = {
     "ALLOWED_VERSIONS": ["v1"],
     "DEFAULT_VERSION": "v1",
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "apps.api.renderers.FastJSONRenderer",
     ]
     + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
     "DEFAULT_THROTTLE_RATES": {
         "app_login": "5/min",
         "app_token_refresh": "30/min",
+        "frontend_logs": "60/min",
     },
 }
 
@@ -285,6 +348,9 @@ MEDIA_URL = "/media/"
 # Increase max fields for large form submissions (e.g., bulk operations, complex GeoJSON)
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
 
+# Months of LogEntry rows kept by the prune_log_entries command.
+LOG_RETENTION_MONTHS = int(os.getenv("LOG_RETENTION_MONTHS", "12"))
+
 # Configure logging
 LOGGING = {
     "version": 1,
@@ -294,8 +360,13 @@ LOGGING = {
             "class": "logging.StreamHandler",
         },
         "database": {
-            "class": "apps.api.handlers.DatabaseLogHandler",
+            "class": "apps.api.handlers.BufferedDatabaseLogHandler",
             "level": "INFO",
+            "capacity": int(os.getenv("LOG_BUFFER_CAPACITY", "10000")),
+            "flush_size": int(os.getenv("LOG_BUFFER_FLUSH_SIZE", "200")),
+            "flush_interval": float(os.getenv("LOG_BUFFER_FLUSH_INTERVAL", "2")),
+            # "drop_oldest" or "drop_newest" once the buffer is full.
+            "overflow": os.getenv("LOG_BUFFER_OVERFLOW", "drop_oldest"),
         },
     },
     "root": {
@@ -0,0 +1,85 @@
+"""Gunicorn configuration, read from the working directory on startup.
+
+The command line options in the compose files still apply; this file only
+adds server hooks.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+from pathlib import Path
+
+# File in METRICS_DIR holding the added-up samples of exited workers.
+METRICS_ARCHIVE = "archive.json"
+
+# Lock file in METRICS_DIR; must match ``apps.api.metrics.LOCK_FILENAME``.
+METRICS_LOCK = "metrics.lock"
+
+
+def _metrics_dir() -> Path | None:
+    """Return the shared metrics directory, or None if not configured."""
+    directory = os.getenv("METRICS_DIR")
+    return Path(directory) if directory else None
+
+
+def on_starting(server):
+    """Empty ``METRICS_DIR`` before the first worker starts.
+
+    Every worker process writes its samples to its own file there (see
+    ``apps.api.metrics``). Files of workers from an earlier run would
+    otherwise be added to every scrape and pile up across restarts.
+    """
+    directory = _metrics_dir()
+    if directory is None:
+        return
+    if directory.is_dir():
+        for path in directory.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink(missing_ok=True)
+    server.log.info("Cleared metrics directory %s", directory)
+
+
+def child_exit(server, worker):
+    """Fold the samples of an exited worker into the archive file.
+
+    Counters must not go backwards while the server runs, so the samples are
+    kept, but in one file instead of one per worker that ever ran. Only the
+    arbiter runs this hook, so the archive has a single writer. The new
+    archive replaces the old one and the worker's files are removed under
+    an exclusive lock on ``METRICS_LOCK``; scrapes hold it shared, so they
+    never count the samples twice or not at all.
+    """
+    directory = _metrics_dir()
+    if directory is None:
+        return
+    paths = list(directory.glob(f"{worker.pid}-*.json"))
+    if not paths:
+        return
+    archive_path = directory / METRICS_ARCHIVE
+    with open(directory / METRICS_LOCK, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            totals = json.loads(archive_path.read_text())
+        except (OSError, ValueError):
+            totals = {}
+        for path in paths:
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, series in data.items():
+                merged = totals.setdefault(name, {})
+                for key, values in series.items():
+                    current = merged.get(key)
+                    if current is None or len(current) != len(values):
+                        merged[key] = list(values)
+                    else:
+                        merged[key] = [a + b for a, b in zip(current, values)]
+        tmp_path = archive_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(totals))
+        os.replace(tmp_path, archive_path)
+        for path in paths:
+            path.unlink(missing_ok=True)